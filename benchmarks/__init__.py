@@ -0,0 +1 @@
+"""Benchmarks and performance regression checks (run with ``python -m benchmarks.<name>``)."""
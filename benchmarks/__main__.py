@@ -0,0 +1,145 @@
+"""
+Benchmark suite: generate seeded synthetic databases and time the core scenarios.
+
+Usage:
+    python -m benchmarks                          # 1k scale, print table
+    python -m benchmarks --scale 1k --scale 100k --out results.json
+    python -m benchmarks --scale 100k --compare baseline.json
+    python -m benchmarks --scale 1m --scenario day_load --scenario search
+
+Generated databases are kept in --db-dir (keyed by scale, seed and date) and
+reused by later runs. With --compare, medians are checked against a previous
+JSON result; the exit status is 1 when any scenario is slower than --threshold.
+"""
+
+import argparse
+import json
+import platform
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from benchmarks.generator import SCALES, GeneratedDataset, SyntheticDataGenerator
+from benchmarks.scenarios import SCENARIOS, BenchContext, run_scenarios
+from repository.database import Database
+
+_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        proc = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=str(_ROOT), capture_output=True, text=True
+        )
+    except OSError:
+        return None
+    return proc.stdout.strip() or None
+
+
+def prepare_database(scale: str, seed: int, db_dir: Path) -> BenchContext:
+    """Return a context for scale, generating its database unless already cached."""
+    today = date.today()
+    db_dir.mkdir(parents=True, exist_ok=True)
+    path = db_dir / f"bench_{scale}_s{seed}_{today.isoformat()}.db"
+    generator = SyntheticDataGenerator(seed=seed, today=today)
+    if path.exists():
+        # Same seed and day -> same data; only the id summary is needed.
+        with Database(path, cache_size=0) as db:
+            conn = db.connect()
+            users = [r["user_id"] for r in conn.execute("SELECT user_id FROM user ORDER BY user_id")]
+            dataset = GeneratedDataset(today=today, users=users)
+            for r in conn.execute("SELECT user_id, goal_id FROM goal"):
+                dataset.goals.setdefault(r["user_id"], []).append(r["goal_id"])
+            dataset.task_count = conn.execute("SELECT COUNT(*) FROM task").fetchone()[0]
+    else:
+        # Generate into a temporary name so an interrupted run is never reused.
+        partial = path.with_suffix(".partial")
+        partial.unlink(missing_ok=True)
+        start = time.perf_counter()
+        print(f"[{scale}] generating {SCALES[scale]:,} tasks -> {path}", flush=True)
+        with Database(partial, cache_size=0) as db:
+            dataset = generator.populate(db, SCALES[scale])
+        partial.replace(path)
+        print(f"[{scale}] generated in {time.perf_counter() - start:.1f} s", flush=True)
+    return BenchContext(scale=scale, db_path=path, dataset=dataset, work_dir=db_dir, seed=seed)
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> int:
+    """Print median ratios against baseline; return 1 if any exceeds threshold."""
+    status = 0
+    for scale, scenarios in results["results"].items():
+        for name, current in scenarios.items():
+            previous = baseline.get("results", {}).get(scale, {}).get(name)
+            if not previous or not previous.get("median_ms"):
+                continue
+            ratio = current["median_ms"] / previous["median_ms"]
+            flag = "SLOWER" if ratio > threshold else ""
+            print(
+                f"  {scale:>5} {name:<15} {previous['median_ms']:10.3f} -> "
+                f"{current['median_ms']:10.3f} ms  x{ratio:5.2f} {flag}"
+            )
+            if ratio > threshold:
+                status = 1
+    return status
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run timed scenarios against synthetic databases.")
+    parser.add_argument("--scale", action="append", choices=sorted(SCALES), help="Dataset size (repeatable). Default: 1k.")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS), help="Scenario to run (repeatable). Default: all.")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per scenario.")
+    parser.add_argument("--seed", type=int, default=42, help="Generator seed.")
+    parser.add_argument(
+        "--db-dir",
+        type=Path,
+        default=Path(tempfile.gettempdir()) / "tasks_manager_bench",
+        help="Where generated databases are kept between runs.",
+    )
+    parser.add_argument("--out", type=Path, help="Write results as JSON to this file.")
+    parser.add_argument("--compare", type=Path, help="Previous JSON result to compare medians against.")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Median ratio counted as a regression.")
+    args = parser.parse_args(argv)
+
+    results: Dict[str, Any] = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "git_revision": _git_revision(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "results": {},
+    }
+    for scale in args.scale or ["1k"]:
+        ctx = prepare_database(scale, args.seed, args.db_dir)
+        print(f"[{scale}] {ctx.dataset.task_count:,} tasks, {len(ctx.dataset.users)} users")
+        print(f"  {'scenario':<15} {'min ms':>10} {'median ms':>10} {'p95 ms':>10} {'us/op':>10}")
+        scale_results = results["results"].setdefault(scale, {})
+        for result in run_scenarios(ctx, args.repeat, args.scenario):
+            row = result.to_dict()
+            scale_results[result.name] = row
+            print(
+                f"  {result.name:<15} {row['min_ms']:10.3f} {row['median_ms']:10.3f} "
+                f"{row['p95_ms']:10.3f} {row['median_us_per_op']:10.1f}",
+                flush=True,
+            )
+
+    if args.out:
+        args.out.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"results written to {args.out}")
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        print(f"compared with {args.compare} (threshold x{args.threshold}):")
+        return compare(results, baseline, args.threshold)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""
+Benchmark for online backups (services.backup): UI stall while a snapshot is taken.
+
+Builds a database of the requested size, then simulates the UI thread: one
+16 ms frame after another, each reading a task, with a task save every few
+frames. Frame work is timed while idle, while a snapshot is copied on the
+backup thread (page batches), and for a blocking copy on the UI thread (one
+step, the naive way). Reported per journal mode: copy time, restarts, and the
+p50/p99/max frame work and frames over budget.
+
+Usage:
+    python -m benchmarks.bench_backup
+    python -m benchmarks.bench_backup --size-mb 1024 --journal wal
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from repository.database import Database
+from repository.task_repository import TaskRepository
+from services.backup import DEFAULT_PAGES_PER_STEP, DEFAULT_STEP_PAUSE, BackupManager
+
+FRAME_MS = 16.0
+
+
+def build(path: Path, size_mb: int) -> int:
+    """Fill path with ~1 KiB tasks up to size_mb; returns the task count."""
+    count = size_mb * 1024
+    db = Database(path, cache_size=0)
+    conn = db.connect()
+    conn.execute(
+        """INSERT INTO task (task_id, user_id, title, description, priority, status, created_at)
+           WITH RECURSIVE n(i) AS (SELECT 0 UNION ALL SELECT i + 1 FROM n WHERE i + 1 < ?)
+           SELECT 't' || i, 'bench', 'Task ' || i, hex(randomblob(420)), 'medium', 'pending',
+                  '2026-01-01T00:00:00' FROM n""",
+        (count,),
+    )
+    conn.commit()
+    db.close()
+    return count
+
+
+def frames(repo: TaskRepository, count: int, write_every: int, rng: random.Random, until: Callable[[], bool]) -> List[float]:
+    """Run UI-like frames until until() is true; returns each frame's work in ms."""
+    work = []
+    frame = 0
+    while not until():
+        t0 = time.perf_counter()
+        task = repo.get_by_id(f"t{rng.randrange(count)}")
+        if task is not None and frame % write_every == 0:
+            task.title = f"Task edited {frame}"
+            repo.save(task)
+        elapsed = (time.perf_counter() - t0) * 1000
+        work.append(elapsed)
+        frame += 1
+        time.sleep(max(FRAME_MS - elapsed, 0) / 1000)
+    return work
+
+
+def report(mode: str, scenario: str, copy_s: Optional[float], restarts: Optional[int], work: List[float]) -> None:
+    ordered = sorted(work)
+    p99 = ordered[min(int(len(ordered) * 0.99), len(ordered) - 1)]
+    over = sum(1 for w in work if w > FRAME_MS)
+    copy = f"{copy_s:8.2f}s" if copy_s is not None else f"{'-':>9}"
+    restart = f"{restarts:8d}" if restarts is not None else f"{'-':>8}"
+    print(
+        f"{mode:<8} {scenario:<11} {copy} {restart} {len(work):7d} "
+        f"{statistics.median(ordered):8.2f} {p99:8.2f} {ordered[-1]:9.2f} {over:6d}"
+    )
+
+
+def run(size_mb: int, journals: List[str], pages: int, pause: float, write_every: int, seed: int) -> int:
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.db"
+        t0 = time.perf_counter()
+        count = build(path, size_mb)
+        print(f"{count:,} tasks, {path.stat().st_size / 2**20:,.0f} MiB (built in {time.perf_counter() - t0:.1f}s); "
+              f"{pages} pages per step, a save every {write_every} frames")
+        print(f"{'journal':<8} {'scenario':<11} {'copy':>9} {'restarts':>8} {'frames':>7} "
+              f"{'p50 ms':>8} {'p99 ms':>8} {'max ms':>9} {'>16ms':>6}")
+        for mode in journals:
+            db = Database(path, cache_size=0, journal_mode=mode)
+            db.connect()
+            repo = TaskRepository(db)
+            manager = BackupManager(db, directory=Path(tmp) / "backups", pages_per_step=pages, step_pause=pause)
+
+            start = time.perf_counter()
+            report(mode, "idle", None, None, frames(repo, count, write_every, rng, lambda: time.perf_counter() - start > 2.0))
+
+            restarts = [0]
+            last = [0]
+
+            def progress(copied: int, total: int) -> None:
+                if copied <= last[0]:
+                    restarts[0] += 1
+                last[0] = copied
+
+            start = time.perf_counter()
+            future = manager.submit("bench", progress)
+            work = frames(repo, count, write_every, rng, future.done)
+            snapshot = future.result()
+            report(mode, "background", time.perf_counter() - start, restarts[0], work)
+            snapshot.path.unlink()
+
+            blocking = BackupManager(db, directory=Path(tmp) / "backups", pages_per_step=-1, step_pause=0)
+            t0 = time.perf_counter()
+            blocking.backup("bench").path.unlink()
+            stall = (time.perf_counter() - t0) * 1000
+            report(mode, "blocking", stall / 1000, 0, [stall])
+            manager.close()
+            db.close()
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Online backup UI-stall benchmark.")
+    parser.add_argument("--size-mb", type=int, default=256, help="Database size (1024 for the 1 GB case).")
+    parser.add_argument("--journal", action="append", choices=["wal", "delete"], help="Journal mode(s) (default: both).")
+    parser.add_argument("--pages", type=int, default=DEFAULT_PAGES_PER_STEP, help="Pages per backup step.")
+    parser.add_argument("--pause", type=float, default=DEFAULT_STEP_PAUSE, help="Seconds between backup steps.")
+    parser.add_argument("--write-every", type=int, default=10, help="Frames between task saves.")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+    return run(args.size_mb, args.journal or ["wal", "delete"], args.pages, args.pause, args.write_every, args.seed)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""
+Benchmark for the Calendar month grid (ui.components.month_canvas).
+
+Times month navigation, selection changes and resizes on a MonthCanvas until Tk
+is idle, and reports how many cells each step redrew. Needs a display.
+
+Usage:
+    python -m benchmarks.bench_calendar
+    python -m benchmarks.bench_calendar --months 24 --tasks-per-day 6
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date
+from typing import Callable, Dict, List, Optional, Tuple
+
+FRAME_BUDGET_MS = 16.0
+
+
+def _counts(year: int, month: int, per_day: int, rng: random.Random) -> Dict[int, Tuple[int, int]]:
+    from ui.components.month_canvas import month_days
+
+    return {
+        day: (rng.randint(0, per_day), rng.randint(0, per_day))
+        for day in month_days(year, month)
+        if day
+    }
+
+
+def _median_ms(step: Callable[[int], None], runs: int, root) -> float:
+    samples = []
+    for i in range(runs):
+        t0 = time.perf_counter()
+        step(i)
+        root.update_idletasks()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def run(months: int, per_day: int) -> int:
+    """Print median ms and cells redrawn per step; return 1 if a step is over the frame budget."""
+    import customtkinter as ctk
+    from ui.components.month_canvas import MonthCanvas
+
+    rng = random.Random(42)
+    root = ctk.CTk()
+    root.geometry("900x640")
+    grid = MonthCanvas(root)
+    grid.pack(fill="both", expand=True)
+    root.update()
+    start = date.today()
+    month_list = [((start.month - 1 + i) // 12 + start.year, (start.month - 1 + i) % 12 + 1) for i in range(months)]
+    data = {ym: _counts(*ym, per_day, rng) for ym in month_list}
+
+    results: List[Tuple[str, float, int]] = []
+
+    def navigate(i: int) -> None:
+        year, month = month_list[i % months]
+        grid.set_month(year, month, data[(year, month)])
+
+    results.append(("navigate", _median_ms(navigate, months, root), grid.damaged_last))
+    year, month = month_list[-1]
+
+    def select(i: int) -> None:
+        grid.select(date(year, month, 1 + i % 28))
+
+    results.append(("select", _median_ms(select, 28, root), grid.damaged_last))
+
+    def resize(i: int) -> None:
+        root.geometry(f"{800 + (i % 10) * 20}x{600 + (i % 10) * 10}")
+        root.update()
+
+    results.append(("resize", _median_ms(resize, 20, root), 0))
+    root.destroy()
+    print(f"{'step':<10}  {'median ms':>9}  {'cells redrawn':>13}")
+    for name, ms, cells in results:
+        print(f"{name:<10}  {ms:9.2f}  {cells:>13}")
+    return 1 if any(ms > FRAME_BUDGET_MS for _, ms, _ in results) else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Calendar month grid benchmark.")
+    parser.add_argument("--months", type=int, default=12, help="Months to navigate through.")
+    parser.add_argument("--tasks-per-day", type=int, default=4, help="Max open/completed tasks per day.")
+    args = parser.parse_args(argv)
+    if sys.platform not in ("win32", "darwin") and not os.environ.get("DISPLAY"):
+        print("a display is required", file=sys.stderr)
+        return 2
+    return run(args.months, args.tasks_per_day)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""
+Benchmark for batched task edits (services.commands).
+
+Simulates progress slider drags: each drag is a burst of updates to one task.
+Times them written one commit per update through TaskService, against the
+CommandStack, which merges each drag into one undo step and writes a batch per
+flush (here: every --flush-every updates, standing in for the Tk timer).
+Reports time per update and commits (fsyncs) per drag, and checks that the
+stored rows agree and that undo takes a whole drag back.
+
+Usage:
+    python -m benchmarks.bench_commands
+    python -m benchmarks.bench_commands --drags 200 --steps 50 --flush-every 20
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from models import Task
+from repository.database import Database
+from repository.task_repository import TaskRepository
+from services.commands import CommandStack
+from services.events import EventBus
+from services.task_service import TaskService
+
+
+def _setup(path: Path, tasks: int) -> TaskRepository:
+    db = Database(path, instrument=True)
+    repo = TaskRepository(db)
+    repo.save_many(Task(task_id=f"t{i}", user_id="bench", title=f"Task {i}") for i in range(tasks))
+    db.reset_stats()
+    return repo
+
+
+def _commits(repo: TaskRepository) -> int:
+    """Transactions actually committed (traced by SQLite; empty commits are not counted)."""
+    return repo._db.stats()["queries"]["traced"].get("COMMIT", 0)
+
+
+def _drag(update: Callable[[str, int], None], drags: int, steps: int, tasks: int,
+          after_step: Callable[[int], None] = lambda step: None) -> float:
+    t0 = time.perf_counter()
+    step = 0
+    for d in range(drags):
+        task_id = f"t{d % tasks}"
+        for s in range(1, steps + 1):
+            update(task_id, s * 100 // steps)
+            step += 1
+            after_step(step)
+    return time.perf_counter() - t0
+
+
+def run(drags: int, steps: int, tasks: int, flush_every: int) -> int:
+    updates = drags * steps
+    with tempfile.TemporaryDirectory() as tmp:
+        direct_repo = _setup(Path(tmp) / "direct.db", tasks)
+        service = TaskService(direct_repo, event_bus=EventBus())
+        direct = _drag(lambda task_id, pct: service.update_task(task_id, progress_percent=pct), drags, steps, tasks)
+        direct_commits = _commits(direct_repo)
+
+        batched_repo = _setup(Path(tmp) / "batched.db", tasks)
+        stack = CommandStack(batched_repo, event_bus=EventBus(), coalesce_seconds=3600)
+        stack.set_scheduler(lambda ms, flush: None)  # flushed below instead of by a timer
+        batched = _drag(
+            lambda task_id, pct: stack.update(task_id, progress_percent=pct),
+            drags,
+            steps,
+            tasks,
+            after_step=lambda step: stack.flush() if step % flush_every == 0 else None,
+        )
+        stack.flush()
+        batched_commits = _commits(batched_repo)
+
+        a = [(t.task_id, t.progress_percent) for t in direct_repo.iter_by_user("bench")]
+        b = [(t.task_id, t.progress_percent) for t in batched_repo.iter_by_user("bench")]
+        if a != b:
+            raise AssertionError("batched edits stored different rows")
+        last = f"t{(drags - 1) % tasks}"
+        stack.undo()
+        stack.flush()
+        undone = batched_repo.get_by_id(last).progress_percent
+        direct_repo._db.close()
+        batched_repo._db.close()
+
+    print(f"{drags:,} drags x {steps} steps ({updates:,} updates), batch flushed every {flush_every} updates")
+    print(f"  commit per update   {direct / updates * 1e6:9.1f} us/update   {direct_commits / drags:6.1f} commits/drag")
+    print(f"  command stack       {batched / updates * 1e6:9.1f} us/update   {batched_commits / drags:6.1f} commits/drag")
+    print(f"  undo of last drag   progress {undone}% (merged steps: one undo step per task)")
+    return 0 if batched_commits < direct_commits else 1
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Batched task edit benchmark.")
+    parser.add_argument("--drags", type=int, default=200, help="Slider drags (bursts of updates to one task).")
+    parser.add_argument("--steps", type=int, default=50, help="Updates per drag.")
+    parser.add_argument("--tasks", type=int, default=1000, help="Tasks in the database.")
+    parser.add_argument("--flush-every", type=int, default=20, help="Updates per batch write.")
+    args = parser.parse_args(argv)
+    return run(args.drags, args.steps, args.tasks, max(1, args.flush_every))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
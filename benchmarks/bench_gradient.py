@@ -0,0 +1,81 @@
+"""
+Benchmark for ui.utils gradient generation.
+
+Compares the original per-pixel loop with the column-broadcast implementation,
+both uncached (cache cleared before every call) and cached.
+
+Usage:
+    python -m benchmarks.bench_gradient
+    python -m benchmarks.bench_gradient --size 200x200 --size 800x600 --number 200
+"""
+
+import argparse
+import sys
+import timeit
+from typing import List, Optional, Tuple
+
+from ui import utils
+
+
+def _reference_gradient(width: int, height: int, top_color: str, bottom_color: str):
+    """The original implementation: one pixels[x, y] write per pixel."""
+    top = utils.hex_to_rgb(top_color)
+    bottom = utils.hex_to_rgb(bottom_color)
+    img = utils.Image.new("RGB", (width, height))
+    pixels = img.load()
+    for y in range(height):
+        t = y / max(height - 1, 1)
+        r = int(top[0] * (1 - t) + bottom[0] * t)
+        g = int(top[1] * (1 - t) + bottom[1] * t)
+        b = int(top[2] * (1 - t) + bottom[2] * t)
+        for x in range(width):
+            pixels[x, y] = (r, g, b)
+    return img
+
+
+def _parse_size(text: str) -> Tuple[int, int]:
+    w, _, h = text.lower().partition("x")
+    return int(w), int(h)
+
+
+def run(sizes: List[Tuple[int, int]], number: int, top: str, bottom: str) -> None:
+    """Print per-call timings (microseconds) for each size."""
+    print(f"{'size':>10}  {'loop':>10}  {'broadcast':>10}  {'cached':>10}  speedup")
+    for w, h in sizes:
+        expected = _reference_gradient(w, h, top, bottom)
+        utils.clear_gradient_cache()
+        if utils.create_vertical_gradient_image(w, h, top, bottom).tobytes() != expected.tobytes():
+            raise AssertionError(f"{w}x{h}: broadcast output differs from reference")
+
+        def uncached() -> None:
+            utils.clear_gradient_cache()
+            utils.create_vertical_gradient_image(w, h, top, bottom)
+
+        loop_n = max(1, number // 10)
+        loop_us = timeit.timeit(lambda: _reference_gradient(w, h, top, bottom), number=loop_n) / loop_n * 1e6
+        new_us = timeit.timeit(uncached, number=number) / number * 1e6
+        utils.create_vertical_gradient_image(w, h, top, bottom)
+        cached_us = timeit.timeit(
+            lambda: utils.create_vertical_gradient_image(w, h, top, bottom), number=number
+        ) / number * 1e6
+        print(
+            f"{w:>4}x{h:<5}  {loop_us:10.1f}  {new_us:10.1f}  {cached_us:10.1f}  {loop_us / new_us:6.1f}x"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Gradient image benchmark.")
+    parser.add_argument("--size", action="append", type=_parse_size, help="WIDTHxHEIGHT (repeatable).")
+    parser.add_argument("--number", type=int, default=100, help="Calls per measurement.")
+    parser.add_argument("--top", default="#B7E4C7")
+    parser.add_argument("--bottom", default="#52B788")
+    args = parser.parse_args(argv)
+    if utils.Image is None:
+        print("Pillow is required: pip install Pillow", file=sys.stderr)
+        return 2
+    run(args.size or [(200, 100), (200, 200), (800, 600)], args.number, args.top, args.bottom)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
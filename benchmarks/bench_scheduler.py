@@ -0,0 +1,119 @@
+"""
+Benchmark for the auto-scheduler (services.scheduler).
+
+Creates a temporary database with busy timed tasks and N unscheduled tasks, then
+times planning (read + placement) and applying (one bulk write) over a horizon.
+The plan is checked: no placed task overlaps another or a busy task, and every
+task starts inside its window.
+
+Usage:
+    python -m benchmarks.bench_scheduler
+    python -m benchmarks.bench_scheduler --pending 10000 --days 90 --student
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional
+
+from models import Task, User
+from models.enums import Priority, TaskType
+from repository.database import Database
+from repository.task_repository import TaskRepository
+from services.events import EventBus
+from services.scheduler import AutoScheduler, SchedulePlan, SchedulerConfig
+from services.task_service import TaskService
+
+BUDGET_S = 1.0
+
+
+def _populate(repo: TaskRepository, user_id: str, pending: int, busy_per_day: int, days: int, seed: int) -> None:
+    rng = random.Random(seed)
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+    tasks: List[Task] = []
+    for day in range(days):
+        for _ in range(busy_per_day):
+            start = today + timedelta(days=day, minutes=rng.randrange(8 * 60, 20 * 60, 5))
+            tasks.append(
+                Task(
+                    task_id=f"busy-{len(tasks)}",
+                    user_id=user_id,
+                    title="Meeting",
+                    due_date_time=start,
+                    duration_minutes=rng.choice([30, 45, 60, 90]),
+                )
+            )
+    for i in range(pending):
+        tasks.append(
+            Task(
+                task_id=f"pending-{i}",
+                user_id=user_id,
+                title=f"Pending {i}",
+                duration_minutes=rng.choice([15, 25, 30, 45, 60, 120]),
+                priority=rng.choice(list(Priority)),
+                type=TaskType.STUDY_SESSION if rng.random() < 0.2 else TaskType.FREE,
+                created_at=today - timedelta(minutes=rng.randrange(0, 60 * 24 * 60)),
+            )
+        )
+    repo.save_many(tasks)
+
+
+def check_plan(plan: SchedulePlan, busy: List[tuple], config: SchedulerConfig) -> None:
+    """Placed tasks must fit their window and overlap neither each other nor busy slots."""
+    slots = [(s, s + timedelta(minutes=m), None) for s, m in busy if m > 0]
+    slots += [(s, s + timedelta(minutes=t.duration_minutes), t) for t, s in plan.assignments]
+    slots.sort(key=lambda x: (x[0], x[1]))
+    any_end = placed_end = datetime.min
+    for start, end, task in slots:
+        if task is not None:
+            windows = [(config.work_start, config.work_end), (config.study_start, config.study_end)]
+            if not any(start.time() >= ws and end.time() <= we and start.date() == end.date() for ws, we in windows):
+                raise AssertionError(f"{task.task_id} ({start}-{end}) is outside the windows")
+            if start < any_end:
+                raise AssertionError(f"{task.task_id} ({start}-{end}) overlaps another slot")
+            placed_end = max(placed_end, end)
+        elif start < placed_end:
+            raise AssertionError(f"busy slot {start}-{end} overlaps a placed task")
+        any_end = max(any_end, end)
+
+
+def run(pending: int, days: int, busy_per_day: int, student: bool, seed: int) -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(Path(tmp) / "schedule.db", cache_size=0)
+        repo = TaskRepository(db)
+        user = User(user_id="bench", name="Bench", email="", is_student_mode=student)
+        _populate(repo, user.user_id, pending, busy_per_day, days, seed)
+        scheduler = AutoScheduler(TaskService(repo, event_bus=EventBus()), repo)
+        busy = [(s, m) for _, s, m in repo.iter_open_intervals(user.user_id)]
+
+        t0 = time.perf_counter()
+        plan = scheduler.plan(user, days=days)
+        t1 = time.perf_counter()
+        written = scheduler.apply(plan)
+        t2 = time.perf_counter()
+        db.close()
+    check_plan(plan, busy, scheduler.config)
+    total = t2 - t0
+    print(f"pending {pending:,} over {days} days ({'student' if student else 'work'} mode)")
+    print(f"  placed {len(plan.assignments):,}, unplaced {len(plan.unplaced):,}, written {written:,}")
+    print(f"  plan {(t1 - t0) * 1000:8.1f} ms   apply {(t2 - t1) * 1000:8.1f} ms   total {total * 1000:8.1f} ms")
+    return 1 if total > BUDGET_S else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Auto-scheduler benchmark.")
+    parser.add_argument("--pending", type=int, default=10_000, help="Unscheduled tasks.")
+    parser.add_argument("--days", type=int, default=90, help="Horizon in days.")
+    parser.add_argument("--busy-per-day", type=int, default=3, help="Existing timed tasks per day.")
+    parser.add_argument("--student", action="store_true", help="Student mode (study window).")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+    return run(args.pending, args.days, args.busy_per_day, args.student, args.seed)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
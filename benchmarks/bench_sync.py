@@ -0,0 +1,148 @@
+"""
+Benchmark for change-log sync (repository.change_log, services.sync).
+
+Builds a database with N tasks, enables the change log and copies the file to a
+second "machine". Both sides then edit random tasks (some edits touch the same
+task, so last-writer-wins decides) and delete a few; the copies are synced and
+must end with identical task tables. Reports the cost of logging on single
+saves, the sync time, how many change rows and bytes moved compared with the
+file size, and what compaction removes.
+
+Usage:
+    python -m benchmarks.bench_sync
+    python -m benchmarks.bench_sync --tasks 100000 --edits 5000
+"""
+
+import argparse
+import json
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from models import Task
+from models.enums import Priority
+from repository.change_log import Change
+from repository.database import Database
+from repository.task_repository import TaskRepository
+from services.sync import LocalFilePeer, SyncEngine, SyncPeer
+
+
+class _CountingPeer(SyncPeer):
+    """Wraps a peer and counts the JSON bytes that would cross the wire."""
+
+    def __init__(self, peer: SyncPeer) -> None:
+        self._peer = peer
+        self.bytes = 0
+
+    def node_id(self) -> str:
+        return self._peer.node_id()
+
+    def origin(self) -> Optional[Tuple[str, int]]:
+        return self._peer.origin()
+
+    def pull(self, after_seq: int, exclude_node: str, limit: int) -> Tuple[List[Change], int]:
+        changes, cursor = self._peer.pull(after_seq, exclude_node, limit)
+        self.bytes += len(json.dumps({"changes": changes, "cursor": cursor}))
+        return changes, cursor
+
+    def push(self, changes: List[Change]) -> int:
+        self.bytes += len(json.dumps({"changes": changes}))
+        return self._peer.push(changes)
+
+    def close(self) -> None:
+        self._peer.close()
+
+
+def _edit(repo: TaskRepository, ids: List[str], edits: int, deletes: int, rng: random.Random) -> float:
+    """Apply random edits and deletes; returns seconds per save."""
+    t0 = time.perf_counter()
+    for _ in range(edits):
+        task = repo.get_by_id(rng.choice(ids))
+        if task is None:
+            continue
+        task.title = f"{task.title.split(' #')[0]} #{rng.randrange(1000)}"
+        task.priority = rng.choice(list(Priority))
+        repo.save(task)
+    per_save = (time.perf_counter() - t0) / max(edits, 1)
+    for task_id in rng.sample(ids, deletes):
+        repo.delete(task_id)
+    return per_save
+
+
+def _rows(path: Path) -> list:
+    conn = sqlite3.connect(str(path))
+    try:
+        return conn.execute(
+            "SELECT task_id, title, priority, is_completed, due_date_time FROM task ORDER BY task_id"
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def run(count: int, edits: int, deletes: int, seed: int) -> int:
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        a_path, b_path = Path(tmp) / "a.db", Path(tmp) / "b.db"
+        db = Database(a_path, cache_size=0)
+        repo = TaskRepository(db)
+        ids = [f"t{i}" for i in range(count)]
+        repo.save_many(Task(task_id=task_id, user_id="bench", title=f"Task {task_id}") for task_id in ids)
+
+        plain = _edit(repo, ids, min(edits, 1000), 0, rng)
+        t0 = time.perf_counter()
+        baseline = SyncEngine(db).enable()
+        enable_s = time.perf_counter() - t0
+        db.close()
+        shutil.copy(a_path, b_path)
+
+        results = []
+        for path in (a_path, b_path):
+            side = Database(path, cache_size=0)
+            results.append(_edit(TaskRepository(side), ids, edits, deletes, rng))
+            side.close()
+        logged = sum(results) / len(results)
+
+        db = Database(a_path, cache_size=0)
+        engine = SyncEngine(db, compact_every=10**12)
+        peer = _CountingPeer(LocalFilePeer(b_path))
+        t0 = time.perf_counter()
+        result = engine.sync(peer)
+        sync_s = time.perf_counter() - t0
+        peer.close()
+        before = engine.log.stats()["rows"]
+        t0 = time.perf_counter()
+        removed = engine.compact()
+        compact_s = time.perf_counter() - t0
+        db.close()
+        size = a_path.stat().st_size
+        same = _rows(a_path) == _rows(b_path)
+
+    print(f"tasks {count:,}, {edits:,} edits and {deletes:,} deletes on each of two copies")
+    print(f"  save, log off            {plain * 1000:9.3f} ms")
+    print(f"  save, log on             {logged * 1000:9.3f} ms")
+    print(f"  enable (baseline)        {enable_s * 1000:9.1f} ms   ({baseline:,} rows)")
+    print(f"  sync                     {sync_s * 1000:9.1f} ms   pulled {result.pulled:,} / applied {result.applied:,}, "
+          f"pushed {result.pushed:,} / accepted {result.accepted:,}")
+    print(f"  moved                    {peer.bytes / 1024:9.1f} KiB  (file {size / 1024:,.0f} KiB)")
+    print(f"  compact                  {compact_s * 1000:9.1f} ms   {before:,} -> {before - removed:,} rows")
+    print(f"  copies identical         {same}")
+    return 0 if same else 1
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Change-log sync benchmark.")
+    parser.add_argument("--tasks", type=int, default=20_000, help="Tasks in the database.")
+    parser.add_argument("--edits", type=int, default=2_000, help="Task saves on each copy.")
+    parser.add_argument("--deletes", type=int, default=100, help="Task deletes on each copy.")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+    return run(args.tasks, args.edits, args.deletes, args.seed)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""
+Benchmark for TaskCard construction (ui.components.task_card).
+
+Style resolution is timed headless: the per-card substring matching the card
+used to do (status color and label) against the cached style sheet lookup. With
+a display, cards are then built with and without the avatar placeholders and
+the Tk widgets per card and the median creation time (until Tk is idle) are
+reported.
+
+Usage:
+    python -m benchmarks.bench_task_card
+    python -m benchmarks.bench_task_card --cards 200 --number 100000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import timeit
+from typing import List, Optional
+
+from models import Task
+from models.enums import Priority, TaskStatus
+from ui.components.card_style import CardTemplate, _STYLES, card_style, clear_card_styles, status_display_name
+from ui.theme import status_to_color
+
+
+def make_tasks(count: int, seed: int = 42) -> List[Task]:
+    rng = random.Random(seed)
+    return [
+        Task(
+            task_id=f"t{i}",
+            user_id="bench",
+            title=f"Task {i}",
+            description="Notes" if rng.random() < 0.5 else "",
+            status=rng.choice(list(TaskStatus)),
+            priority=rng.choice(list(Priority)),
+        )
+        for i in range(count)
+    ]
+
+
+def _uncached_style(task: Task) -> tuple:
+    """What each card did before: match the status string twice."""
+    status = getattr(task.status, "value", str(task.status))
+    return status_to_color.__wrapped__(status), status_display_name(status)
+
+
+def bench_styles(tasks: List[Task], number: int) -> None:
+    clear_card_styles()
+    n = len(tasks)
+    uncached = min(timeit.repeat(lambda: [_uncached_style(t) for t in tasks], number=max(number // n, 1), repeat=5))
+    cached = min(timeit.repeat(lambda: [card_style(t.status) for t in tasks], number=max(number // n, 1), repeat=5))
+    per = max(number // n, 1) * n
+    print(f"style resolution ({len(_STYLES)} distinct styles)")
+    print(f"  per-card matching  {uncached / per * 1e6:8.3f} µs/card")
+    print(f"  style sheet        {cached / per * 1e6:8.3f} µs/card")
+
+
+def _count_widgets(widget) -> int:
+    return 1 + sum(_count_widgets(child) for child in widget.winfo_children())
+
+
+def bench_cards(tasks: List[Task]) -> None:
+    import customtkinter as ctk
+    from ui.components.task_card import TaskCard
+
+    root = ctk.CTk()
+    root.geometry("480x800")
+    frame = ctk.CTkScrollableFrame(root)
+    frame.pack(fill="both", expand=True)
+    root.update()
+    print(f"{'template':<12}  {'widgets/card':>12}  {'median ms/card':>14}")
+    for name, template in (("avatars", CardTemplate(avatar_placeholders=True)), ("lean", CardTemplate(avatar_placeholders=False))):
+        samples, widgets = [], []
+        for task in tasks:
+            t0 = time.perf_counter()
+            card = TaskCard(frame, task=task, template=template)
+            card.pack(fill="x")
+            root.update_idletasks()
+            samples.append((time.perf_counter() - t0) * 1000)
+            widgets.append(_count_widgets(card))
+        for child in frame.winfo_children():
+            child.destroy()
+        root.update()
+        print(f"{name:<12}  {statistics.mean(widgets):12.1f}  {statistics.median(samples):14.2f}")
+    root.destroy()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Task card construction benchmark.")
+    parser.add_argument("--cards", type=int, default=100, help="Cards built per template.")
+    parser.add_argument("--number", type=int, default=100_000, help="Style lookups per timing.")
+    args = parser.parse_args(argv)
+    tasks = make_tasks(args.cards)
+    bench_styles(tasks, args.number)
+    if sys.platform not in ("win32", "darwin") and not os.environ.get("DISPLAY"):
+        print("card creation skipped: a display is required")
+        return 0
+    bench_cards(tasks)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""
+Benchmark for the Tasks timeline: layout (ui.timeline_layout) and, when a
+display is available, drawing on a TimelineCanvas (until Tk is idle).
+
+Days are generated with clustered start times so many tasks overlap, which is
+the worst case for column assignment. The frame budget is 16 ms.
+
+Usage:
+    python -m benchmarks.bench_timeline
+    python -m benchmarks.bench_timeline --tasks 100 --tasks 500 --tasks 2000 --number 50
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import timeit
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+
+from models import Task
+from ui.timeline_layout import layout_day
+
+FRAME_BUDGET_MS = 16.0
+
+
+def make_day(day: date, count: int, seed: int = 42) -> List[Task]:
+    """count tasks on day, bunched around office hours, 15-120 minutes long."""
+    rng = random.Random(seed)
+    start = datetime(day.year, day.month, day.day)
+    tasks = []
+    for i in range(count):
+        minute = min(int(rng.gauss(13 * 60, 180)), 24 * 60 - 1)
+        tasks.append(
+            Task(
+                task_id=f"t{i}",
+                user_id="bench",
+                title=f"Task {i} " + "x" * rng.randint(0, 30),
+                due_date_time=start + timedelta(minutes=max(0, minute) // 5 * 5),
+                duration_minutes=rng.choice([0, 15, 30, 45, 60, 90, 120]),
+            )
+        )
+    return tasks
+
+
+def check_layout(blocks) -> None:
+    """Overlapping blocks must never share a column of the same cluster."""
+    for i, a in enumerate(blocks):
+        for b in blocks[i + 1:]:
+            if b.start >= a.end:
+                break
+            if a.column == b.column:
+                raise AssertionError(f"{a.task.task_id} and {b.task.task_id} overlap in column {a.column}")
+            if a.columns != b.columns:
+                raise AssertionError(f"{a.task.task_id} and {b.task.task_id} overlap but differ in width")
+
+
+def _display_available() -> bool:
+    return sys.platform in ("win32", "darwin") or bool(os.environ.get("DISPLAY"))
+
+
+def run(counts: List[int], number: int) -> int:
+    """Print per-call timings (ms); return 1 if a measured draw is over the frame budget."""
+    day = date.today()
+    canvas = root = None
+    if _display_available():
+        import customtkinter as ctk
+        from ui.components.timeline_canvas import TimelineCanvas
+
+        root = ctk.CTk()
+        root.geometry("480x800")
+        canvas = TimelineCanvas(root)
+        canvas.pack(fill="both", expand=True)
+        root.update()
+    else:
+        print("no display: timing layout only")
+    over = 0
+    print(f"{'tasks':>6}  {'columns':>7}  {'layout ms':>9}  {'draw ms':>9}")
+    for count in counts:
+        tasks = make_day(day, count)
+        blocks = layout_day(tasks, day)
+        check_layout(blocks)
+        layout_ms = timeit.timeit(lambda: layout_day(tasks, day), number=number) / number * 1000
+        draw = "-"
+        if canvas is not None:
+            samples = []
+            for _ in range(number):
+                t0 = time.perf_counter()
+                canvas.set_tasks(day, tasks)
+                root.update_idletasks()
+                samples.append((time.perf_counter() - t0) * 1000)
+            draw_ms = sorted(samples)[len(samples) // 2]
+            over += draw_ms > FRAME_BUDGET_MS
+            draw = f"{draw_ms:9.2f}"
+        print(f"{count:>6}  {max(b.columns for b in blocks):>7}  {layout_ms:9.3f}  {draw:>9}")
+    if root is not None:
+        root.destroy()
+    return 1 if over else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Tasks timeline layout/draw benchmark.")
+    parser.add_argument("--tasks", action="append", type=int, help="Tasks on the day (repeatable).")
+    parser.add_argument("--number", type=int, default=20, help="Calls per measurement.")
+    args = parser.parse_args(argv)
+    return run(args.tasks or [50, 500, 2000], args.number)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
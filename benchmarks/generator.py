@@ -0,0 +1,189 @@
+"""
+Seeded synthetic data generator for users, goals and tasks.
+
+Distributions (roughly what a real task list looks like):
+    - one "primary" user owns about half of all tasks; the rest are spread
+      over the other users;
+    - 85% of tasks have a due date, clustered around today (triangular over
+      -180..+90 days, mode today) at quarter-hour times between 07:00 and 22:00;
+      the other 15% are unscheduled (PENDING);
+    - priority: low 30%, medium 45%, high 20%, urgent 5%;
+    - past-due tasks are completed 80% of the time, future ones 5%; 3% are cancelled;
+    - 30% of tasks belong to one of the owner's goals; 20% of goals are archived.
+
+The same seed and "today" always produce the same data.
+"""
+
+import random
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterator, List, Optional
+
+from models import Goal, Task, User
+from models.enums import FrequencyType, GoalCategory, Priority, TaskStatus, TaskType
+from repository.database import Database
+from repository.goal_repository import GoalRepository
+from repository.task_repository import TaskRepository
+from repository.user_repository import UserRepository
+
+SCALES: Dict[str, int] = {
+    "1k": 1_000,
+    "10k": 10_000,
+    "100k": 100_000,
+    "1m": 1_000_000,
+}
+
+PRIMARY_USER_ID = "default_user"
+
+_WORDS = (
+    "report review call email plan draft read write study gym run groceries "
+    "invoice meeting budget slides lecture essay exam lab practice clean fix "
+    "deploy design sketch notes backup update refactor taxes dentist laundry"
+).split()
+_PRIORITIES = [Priority.LOW, Priority.MEDIUM, Priority.HIGH, Priority.URGENT]
+_PRIORITY_WEIGHTS = [30, 45, 20, 5]
+_DURATIONS = [0, 15, 30, 45, 60, 90, 120]
+_DURATION_WEIGHTS = [10, 20, 25, 10, 20, 10, 5]
+_TYPES = [TaskType.FREE, TaskType.ASSIGNMENT, TaskType.EXAM, TaskType.STUDY_SESSION]
+_TYPE_WEIGHTS = [80, 10, 3, 7]
+_COLORS = ["#4CAF50", "#7B68EE", "#00CED1", "#FF9F1C", "#FF6B6B", "#4169E1"]
+
+
+@dataclass
+class GeneratedDataset:
+    """Summary of what was generated (ids the scenarios pick from)."""
+
+    users: List[str] = field(default_factory=list)
+    goals: Dict[str, List[str]] = field(default_factory=dict)  # user_id -> goal ids
+    task_count: int = 0
+    today: Optional[date] = None
+
+
+class SyntheticDataGenerator:
+    """Deterministic generator writing through the repositories' bulk paths."""
+
+    def __init__(self, seed: int = 42, today: Optional[date] = None) -> None:
+        self._seed = seed
+        self._today = today or date.today()
+        self._rng = random.Random(seed)
+
+    def _uuid(self) -> str:
+        return str(uuid.UUID(int=self._rng.getrandbits(128), version=4))
+
+    def users(self, count: int) -> List[User]:
+        """Primary user first, then count-1 others."""
+        created = datetime.combine(self._today - timedelta(days=400), time(9, 0))
+        result = [User(user_id=PRIMARY_USER_ID, name="User", email="user@local", created_at=created)]
+        for i in range(1, count):
+            result.append(
+                User(
+                    user_id=f"user_{i:05d}",
+                    name=f"User {i}",
+                    email=f"user{i}@local",
+                    is_student_mode=self._rng.random() < 0.3,
+                    created_at=created,
+                )
+            )
+        return result
+
+    def goals(self, user_id: str) -> List[Goal]:
+        """3-12 goals per user, 20% archived, geometric streaks."""
+        result = []
+        for _ in range(self._rng.randint(3, 12)):
+            streak = int(self._rng.expovariate(1 / 5))
+            result.append(
+                Goal(
+                    goal_id=self._uuid(),
+                    user_id=user_id,
+                    title=" ".join(self._rng.choices(_WORDS, k=2)).capitalize(),
+                    category=self._rng.choice(list(GoalCategory)),
+                    color_hex=self._rng.choice(_COLORS),
+                    frequency=self._rng.choice(list(FrequencyType)),
+                    created_at=datetime.combine(self._today - timedelta(days=self._rng.randint(30, 365)), time(8)),
+                    is_archived=self._rng.random() < 0.2,
+                    current_streak=streak,
+                    longest_streak=streak + int(self._rng.expovariate(1 / 3)),
+                )
+            )
+        return result
+
+    def tasks(self, user_id: str, count: int, goal_ids: List[str]) -> Iterator[Task]:
+        """Yield count tasks for user following the module's distributions."""
+        rng = self._rng
+        now = datetime.combine(self._today, time(12, 0))
+        for _ in range(count):
+            if rng.random() < 0.85:
+                offset = int(round(rng.triangular(-180, 90, 0)))
+                minutes = rng.randrange(7 * 60, 22 * 60, 15)
+                due = datetime.combine(self._today + timedelta(days=offset), time(minutes // 60, minutes % 60))
+            else:
+                due = None
+            created = (due or now) - timedelta(days=rng.randint(0, 30), minutes=rng.randint(0, 600))
+            if due is None:
+                status = TaskStatus.PENDING
+                done = rng.random() < 0.05
+            elif due.date() < self._today:
+                done = rng.random() < 0.8
+                status = TaskStatus.OVERDUE
+            else:
+                done = rng.random() < 0.05
+                status = TaskStatus.TODAY if due.date() == self._today else TaskStatus.UPCOMING
+            if rng.random() < 0.03:
+                done, status = False, TaskStatus.CANCELLED
+            completed_at = None
+            if done:
+                status = TaskStatus.COMPLETED
+                completed_at = (due or created) + timedelta(minutes=rng.randint(-120, 240))
+            goal_id = rng.choice(goal_ids) if goal_ids and rng.random() < 0.3 else None
+            yield Task(
+                task_id=self._uuid(),
+                user_id=user_id,
+                goal_id=goal_id,
+                title=" ".join(rng.choices(_WORDS, k=rng.randint(2, 4))).capitalize(),
+                description=" ".join(rng.choices(_WORDS, k=rng.randint(0, 8))),
+                due_date_time=due,
+                duration_minutes=rng.choices(_DURATIONS, _DURATION_WEIGHTS)[0],
+                priority=rng.choices(_PRIORITIES, _PRIORITY_WEIGHTS)[0],
+                type=TaskType.GOAL if goal_id else rng.choices(_TYPES, _TYPE_WEIGHTS)[0],
+                is_completed=done,
+                completed_at=completed_at,
+                status=status,
+                progress_percent=100 if done else rng.choice([0, 0, 0, 25, 50, 75]),
+                created_at=created,
+                updated_at=completed_at or created,
+            )
+
+    def populate(self, db: Database, task_count: int, batch_size: int = 10_000) -> GeneratedDataset:
+        """
+        Write users, goals and task_count tasks into db.
+
+        Returns:
+            GeneratedDataset describing the generated ids.
+        """
+        user_count = 1 + task_count // 50_000
+        dataset = GeneratedDataset(today=self._today)
+        user_repo = UserRepository(db)
+        goal_repo = GoalRepository(db)
+        task_repo = TaskRepository(db)
+        users = self.users(user_count)
+        for user in users:
+            user_repo.save(user)
+            goals = self.goals(user.user_id)
+            goal_repo.save_many(goals)
+            dataset.users.append(user.user_id)
+            dataset.goals[user.user_id] = [g.goal_id for g in goals]
+        # Primary user gets half of the tasks, the others share the rest
+        shares = {PRIMARY_USER_ID: task_count if user_count == 1 else task_count // 2}
+        others = dataset.users[1:]
+        for i, user_id in enumerate(others):
+            rest = task_count - shares[PRIMARY_USER_ID]
+            shares[user_id] = rest // len(others) + (1 if i < rest % len(others) else 0)
+        for user_id, count in shares.items():
+            stream = self.tasks(user_id, count, dataset.goals[user_id])
+            while True:
+                batch = [t for _, t in zip(range(batch_size), stream)]
+                if not batch:
+                    break
+                dataset.task_count += task_repo.save_many(batch)
+        return dataset
@@ -0,0 +1,239 @@
+"""
+Load test for the local HTTP API (``tasks_manager/server.py``).
+
+Starts a server on an ephemeral port over a generated database (or targets a
+running one with --url), then drives it with keep-alive asyncio clients for a
+fixed duration. Every client replays a mix of list reads (half of them
+revalidated with If-None-Match), page reads, stats and task creates.
+
+Usage:
+    python -m benchmarks.http_load
+    python -m benchmarks.http_load --scale 100k --concurrency 32 --duration 20 --workers 4
+    python -m benchmarks.http_load --url http://127.0.0.1:8765 --writes 0.2
+
+Reports requests/s, p50/p99 latency and the status mix per request kind.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from benchmarks.generator import SCALES, SyntheticDataGenerator
+from repository.database import Database
+from tasks_manager.server import TaskApiServer
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class _Client:
+    """One keep-alive HTTP/1.1 connection."""
+
+    def __init__(self, host: str, port: int) -> None:
+        self._host = host
+        self._port = port
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def request(
+        self, method: str, path: str, body: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self._host, self._port)
+        payload = json.dumps(body).encode("utf-8") if body is not None else b""
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self._host}", f"Content-Length: {len(payload)}"]
+        lines += [f"{k}: {v}" for k, v in (headers or {}).items()]
+        self._writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + payload)
+        await self._writer.drain()
+        head = await self._reader.readuntil(b"\r\n\r\n")
+        status_line, *header_lines = head.decode("latin-1").split("\r\n")
+        status = int(status_line.split(" ", 2)[1])
+        response_headers = {}
+        for line in header_lines:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                response_headers[name.strip().lower()] = value.strip()
+        length = int(response_headers.get("content-length") or 0)
+        data = await self._reader.readexactly(length) if length else b""
+        if response_headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, response_headers, data
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except ConnectionError:
+                pass
+        self._reader = self._writer = None
+
+
+async def _worker(
+    host: str,
+    port: int,
+    deadline: float,
+    writes: float,
+    seed: int,
+    latencies: Dict[str, List[float]],
+    statuses: Dict[str, Counter],
+) -> None:
+    rng = random.Random(seed)
+    client = _Client(host, port)
+    etags: Dict[str, str] = {}
+    today = date.today().isoformat()
+    reads = [
+        ("list_day", f"/tasks?date={today}"),
+        ("list_open", "/tasks?open=1&limit=50"),
+        ("page", "/tasks?limit=100"),
+        ("stats", "/stats"),
+    ]
+    n = 0
+    try:
+        while time.perf_counter() < deadline:
+            n += 1
+            if rng.random() < writes:
+                kind, method, path = "create", "POST", "/tasks"
+                body: Optional[Dict[str, Any]] = {
+                    "title": f"load test {seed}-{n}",
+                    "due_date_time": f"{today}T{rng.randrange(8, 20):02d}:00:00",
+                    "duration_minutes": 30,
+                }
+                headers = {}
+            else:
+                kind, path = rng.choice(reads)
+                method, body, headers = "GET", None, {}
+                if path in etags and rng.random() < 0.5:
+                    kind += "_revalidate"
+                    headers["If-None-Match"] = etags[path]
+            start = time.perf_counter()
+            status, response_headers, _ = await client.request(method, path, body, headers)
+            latencies[kind].append((time.perf_counter() - start) * 1000.0)
+            statuses[kind][status] += 1
+            if "etag" in response_headers:
+                etags[path] = response_headers["etag"]
+    finally:
+        await client.close()
+
+
+async def run_load(host: str, port: int, concurrency: int, duration: float, writes: float) -> Dict[str, Any]:
+    """Drive the server at host:port and return the aggregated results."""
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    statuses: Dict[str, Counter] = defaultdict(Counter)
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(
+        *(_worker(host, port, deadline, writes, seed, latencies, statuses) for seed in range(concurrency))
+    )
+    elapsed = time.perf_counter() - started
+    everything = [ms for values in latencies.values() for ms in values]
+    return {
+        "concurrency": concurrency,
+        "duration_s": round(elapsed, 3),
+        "requests": len(everything),
+        "requests_per_s": round(len(everything) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(_percentile(everything, 50), 3),
+        "p99_ms": round(_percentile(everything, 99), 3),
+        "kinds": {
+            kind: {
+                "requests": len(values),
+                "p50_ms": round(statistics.median(values), 3),
+                "p99_ms": round(_percentile(values, 99), 3),
+                "statuses": dict(statuses[kind]),
+            }
+            for kind, values in sorted(latencies.items())
+        },
+    }
+
+
+def _start_local_server(db_path: Path, workers: int) -> Tuple[TaskApiServer, asyncio.AbstractEventLoop, threading.Thread]:
+    """Run a server on an ephemeral port in a background thread (separate loop from the clients)."""
+    server = TaskApiServer(db_path, port=0, workers=workers)
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+
+    def run() -> None:
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(server.start())
+        started.set()
+        loop.run_forever()
+
+    thread = threading.Thread(target=run, name="http-load-server", daemon=True)
+    thread.start()
+    started.wait()
+    return server, loop, thread
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="benchmarks.http_load", description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--url", help="Target a running server instead of starting one.")
+    parser.add_argument("--scale", choices=list(SCALES), default="10k", help="Generated dataset size.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=1, help="Server SQLite worker threads.")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent keep-alive clients.")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load.")
+    parser.add_argument("--writes", type=float, default=0.1, help="Fraction of requests that create a task.")
+    parser.add_argument("--out", type=Path, help="Write the results as JSON.")
+    args = parser.parse_args(argv)
+
+    server = loop = thread = None
+    tmp = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname or "127.0.0.1", url.port or 80
+    else:
+        tmp = tempfile.TemporaryDirectory(prefix="tasks_manager_http_")
+        db_path = Path(tmp.name) / "load.db"
+        db = Database(db_path, cache_size=0)
+        try:
+            SyntheticDataGenerator(seed=args.seed).populate(db, SCALES[args.scale])
+        finally:
+            db.close()
+        server, loop, thread = _start_local_server(db_path, args.workers)
+        host, port = server.host, server.port
+        print(f"server: http://{host}:{port} ({args.scale} tasks, workers={args.workers})", file=sys.stderr)
+
+    try:
+        results = asyncio.run(run_load(host, port, args.concurrency, args.duration, args.writes))
+    finally:
+        if server is not None:
+            asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+        if tmp is not None:
+            tmp.cleanup()
+
+    results["timestamp"] = datetime.now().isoformat(timespec="seconds")
+    results["scale"] = None if args.url else args.scale
+    results["workers"] = None if args.url else args.workers
+    print(
+        f"{results['requests']:,} requests in {results['duration_s']:.1f}s: "
+        f"{results['requests_per_s']:,.1f} req/s, p50 {results['p50_ms']:.2f} ms, p99 {results['p99_ms']:.2f} ms"
+    )
+    print(f"{'kind':<22} {'requests':>9} {'p50 ms':>9} {'p99 ms':>9}  statuses")
+    for kind, row in results["kinds"].items():
+        mix = " ".join(f"{code}x{count}" for code, count in sorted(row["statuses"].items()))
+        print(f"{kind:<22} {row['requests']:>9,} {row['p50_ms']:>9.2f} {row['p99_ms']:>9.2f}  {mix}")
+    if args.out:
+        args.out.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""
+Cold import-time regression check based on ``python -X importtime``.
+
+Each module is imported in a fresh interpreter (so nothing is cached in
+``sys.modules``) and the cumulative time reported by ``-X importtime`` for the
+module itself is compared against its budget. The median of ``--repeat`` runs
+is used so a single noisy run does not fail the check.
+
+Usage:
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --module services --budget-ms 80
+    python -m benchmarks.import_time --top 15
+
+Exit status: 0 if all modules are within budget, 1 if any exceeds it,
+2 if a module fails to import.
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+_ROOT = Path(__file__).resolve().parent.parent
+
+# Default budgets in milliseconds (cold import, cumulative). Keep these loose
+# enough for slow CI machines; they exist to catch eager imports creeping back.
+DEFAULT_BUDGETS_MS: Dict[str, float] = {
+    "models": 30.0,
+    "repository": 30.0,
+    "services": 30.0,
+    "ui": 30.0,
+    "services.task_service": 120.0,
+    "ui.main_window": 1500.0,
+}
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+class ImportFailed(Exception):
+    """Raised when the measured module cannot be imported."""
+
+    pass
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """
+    Parse ``-X importtime`` output.
+
+    Returns:
+        List of (module, self_us, cumulative_us, depth) in report order.
+    """
+    rows = []
+    for line in stderr.splitlines():
+        m = _LINE_RE.match(line)
+        if m is None:
+            continue
+        self_us, cumulative_us, indent, name = m.groups()
+        rows.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def measure_once(module: str) -> Tuple[int, List[Tuple[str, int, int, int]]]:
+    """Import ``module`` in a fresh interpreter; return (cumulative_us, parsed rows)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=str(_ROOT),
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        tail = proc.stderr.strip().splitlines()[-1:] or ["unknown error"]
+        raise ImportFailed(f"import {module} failed: {tail[0]}")
+    rows = parse_importtime(proc.stderr)
+    # The top-level package of a dotted import is reported as its own entry;
+    # the requested module is the last entry with the exact name.
+    cumulative = [cum for name, _, cum, _ in rows if name == module]
+    if not cumulative:
+        raise ImportFailed(f"import {module}: no importtime entry found")
+    top = module.split(".")[0]
+    total = cumulative[-1]
+    if top != module:
+        total = max(total, max(cum for name, _, cum, _ in rows if name == top))
+    return total, rows
+
+
+def measure(module: str, repeat: int = 5) -> Tuple[float, List[Tuple[str, int, int, int]]]:
+    """Return (median cumulative ms, rows of the median run)."""
+    runs = [measure_once(module) for _ in range(max(1, repeat))]
+    runs.sort(key=lambda r: r[0])
+    median_us, rows = runs[len(runs) // 2]
+    return median_us / 1000.0, rows
+
+
+def _print_top(rows: List[Tuple[str, int, int, int]], top: int) -> None:
+    for name, self_us, cum_us, depth in sorted(rows, key=lambda r: r[1], reverse=True)[:top]:
+        print(f"      {self_us / 1000.0:8.2f} ms self  {cum_us / 1000.0:8.2f} ms cum  {name}")
+
+
+def run(budgets: Dict[str, float], repeat: int = 5, top: int = 0) -> int:
+    """Measure every module against its budget and print a report. Returns exit status."""
+    status = 0
+    for module, budget in budgets.items():
+        try:
+            ms, rows = measure(module, repeat)
+        except ImportFailed as e:
+            print(f"ERROR {module}: {e}")
+            status = max(status, 2)
+            continue
+        ok = ms <= budget
+        print(f"{'ok  ' if ok else 'FAIL'} {module:<28} {ms:8.2f} ms  (budget {budget:.0f} ms)")
+        if top:
+            _print_top(rows, top)
+        if not ok:
+            status = max(status, 1)
+    return status
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Cold import-time regression check.")
+    parser.add_argument("--module", action="append", help="Module to check (repeatable). Default: built-in set.")
+    parser.add_argument("--budget-ms", type=float, help="Budget for every --module given.")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh-interpreter runs per module (median is used).")
+    parser.add_argument("--top", type=int, default=0, help="Also list the N slowest imports (self time).")
+    args = parser.parse_args(argv)
+    if args.module:
+        budgets = {
+            m: args.budget_ms if args.budget_ms is not None else DEFAULT_BUDGETS_MS.get(m, 100.0)
+            for m in args.module
+        }
+    else:
+        budgets = dict(DEFAULT_BUDGETS_MS)
+    return run(budgets, repeat=args.repeat, top=args.top)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
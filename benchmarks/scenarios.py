@@ -0,0 +1,274 @@
+"""
+Timed benchmark scenarios against a generated database.
+
+Read scenarios open the database with caching disabled so every call measures
+SQLite plus row mapping; write scenarios run last on a private copy of the file,
+so the generated database can be reused by the next run.
+"""
+
+import random
+import shutil
+import statistics
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.generator import PRIMARY_USER_ID, GeneratedDataset
+from repository.database import Database
+from repository.goal_repository import GoalRepository
+from repository.summary_repository import DailySummaryRepository
+from repository.task_repository import TaskRepository
+from repository.user_repository import UserRepository
+from services.events import EventBus
+from services.goal_service import GoalService
+from services.history_service import HistoryService
+from services.ranking import RankingEngine
+from services.schedule_index import ScheduleIndex
+from services.task_service import TaskService
+from services.user_service import UserService
+from ui.presenter import TaskPresenter
+
+# Calls per timed run for write scenarios (results are reported per run and per op)
+WRITE_BATCH = 100
+
+
+@dataclass
+class ScenarioResult:
+    """Timings of one scenario at one scale (seconds per run)."""
+
+    name: str
+    scale: str
+    ops_per_run: int
+    runs: List[float] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, float]:
+        ordered = sorted(self.runs)
+        p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+        median = statistics.median(ordered)
+        return {
+            "ops_per_run": self.ops_per_run,
+            "runs": len(ordered),
+            "min_ms": round(ordered[0] * 1000, 4),
+            "median_ms": round(median * 1000, 4),
+            "p95_ms": round(p95 * 1000, 4),
+            "median_us_per_op": round(median * 1e6 / self.ops_per_run, 2),
+        }
+
+
+@dataclass
+class BenchContext:
+    """Inputs shared by the scenarios of one scale."""
+
+    scale: str
+    db_path: Path
+    dataset: GeneratedDataset
+    work_dir: Path
+    seed: int = 42
+
+    @property
+    def today(self) -> date:
+        return self.dataset.today or date.today()
+
+
+def _time_runs(step: Callable[[int], None], repeat: int, warmup: int = 1) -> List[float]:
+    """Call step(i) warmup + repeat times; return the timed durations."""
+    for i in range(warmup):
+        step(-1 - i)
+    runs = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        step(i)
+        runs.append(time.perf_counter() - start)
+    return runs
+
+
+def _day_bounds(day: date) -> tuple:
+    return datetime(day.year, day.month, day.day), datetime(day.year, day.month, day.day, 23, 59, 59)
+
+
+def day_load(ctx: BenchContext, repeat: int) -> ScenarioResult:
+    """Tasks of one day (TasksView), a different day near today each run."""
+    db = Database(ctx.db_path, cache_size=0)
+    repo = TaskRepository(db)
+    rng = random.Random(ctx.seed)
+    days = [ctx.today + timedelta(days=rng.randint(-14, 14)) for _ in range(repeat)]
+
+    def step(i: int) -> None:
+        start, end = _day_bounds(days[i] if i >= 0 else ctx.today)
+        repo.get_all_by_user(PRIMARY_USER_ID, from_date=start, to_date=end)
+
+    try:
+        return ScenarioResult("day_load", ctx.scale, 1, _time_runs(step, repeat))
+    finally:
+        db.close()
+
+
+def month_load(ctx: BenchContext, repeat: int) -> ScenarioResult:
+    """Tasks of one calendar month (CalendarView), cycling over the months around today."""
+    db = Database(ctx.db_path, cache_size=0)
+    repo = TaskRepository(db)
+
+    def step(i: int) -> None:
+        first = (ctx.today.replace(day=1) - timedelta(days=31 * (max(i, 0) % 6))).replace(day=1)
+        nxt = (first + timedelta(days=32)).replace(day=1)
+        repo.get_all_by_user(
+            PRIMARY_USER_ID,
+            from_date=datetime(first.year, first.month, first.day),
+            to_date=datetime(nxt.year, nxt.month, nxt.day) - timedelta(seconds=1),
+        )
+
+    try:
+        return ScenarioResult("month_load", ctx.scale, 1, _time_runs(step, repeat))
+    finally:
+        db.close()
+
+
+def search(ctx: BenchContext, repeat: int) -> ScenarioResult:
+    """Title/description search over all of the user's tasks (no date filter)."""
+    db = Database(ctx.db_path, cache_size=0)
+    repo = TaskRepository(db)
+    terms = ["report", "gym", "meet", "dentist", "xyz-no-match", "plan"]
+
+    def step(i: int) -> None:
+        repo.get_all_by_user(PRIMARY_USER_ID, search_query=terms[max(i, 0) % len(terms)])
+
+    try:
+        return ScenarioResult("search", ctx.scale, 1, _time_runs(step, repeat))
+    finally:
+        db.close()
+
+
+def dashboard_kpis(ctx: BenchContext, repeat: int) -> ScenarioResult:
+    """The three presenter calls behind one HomeDashboardView refresh (no widgets)."""
+    db = Database(ctx.db_path, cache_size=0)
+    bus = EventBus()
+    task_repo, goal_repo = TaskRepository(db), GoalRepository(db)
+    presenter = TaskPresenter(
+        task_service=TaskService(task_repo, event_bus=bus),
+        user_service=UserService(UserRepository(db)),
+        goal_service=GoalService(goal_repo, event_bus=bus),
+        event_bus=bus,
+        ranking_engine=RankingEngine(task_repo, goal_repo, event_bus=bus),
+    )
+
+    def step(i: int) -> None:
+        presenter.get_completion_rate_today()
+        presenter.get_active_streaks()
+        presenter.get_upcoming_tasks(limit=10)
+
+    try:
+        return ScenarioResult("dashboard_kpis", ctx.scale, 1, _time_runs(step, repeat))
+    finally:
+        db.close()
+
+
+def trend(ctx: BenchContext, repeat: int) -> ScenarioResult:
+    """Home trend chart reads: 30 days, then a year in weekly buckets (daily_summary rows only)."""
+    db = Database(ctx.db_path, cache_size=0)
+    history = HistoryService(DailySummaryRepository(db))
+
+    def step(i: int) -> None:
+        end = ctx.today - timedelta(days=i % 28)
+        history.get_trend(PRIMARY_USER_ID, days=30, end=end)
+        history.get_trend(PRIMARY_USER_ID, days=365, end=end, bucket_days=7)
+
+    try:
+        return ScenarioResult("trend", ctx.scale, 2, _time_runs(step, repeat))
+    finally:
+        db.close()
+
+
+def schedule_check(ctx: BenchContext, repeat: int) -> ScenarioResult:
+    """WRITE_BATCH ScheduleIndex.check calls (TaskDialog save) on a warm index; warm-up load excluded."""
+    db = Database(ctx.db_path, cache_size=0)
+    index = ScheduleIndex(TaskRepository(db), event_bus=EventBus())
+    rng = random.Random(ctx.seed)
+    start = datetime.combine(ctx.today, datetime.min.time()) - timedelta(days=30)
+    index.planned_minutes(PRIMARY_USER_ID, ctx.today)
+
+    def step(i: int) -> None:
+        for _ in range(WRITE_BATCH):
+            slot = start + timedelta(minutes=rng.randrange(0, 60 * 24 * 60, 15))
+            index.check(PRIMARY_USER_ID, slot, 60)
+
+    try:
+        return ScenarioResult("schedule_check", ctx.scale, WRITE_BATCH, _time_runs(step, repeat))
+    finally:
+        db.close()
+
+
+def _writable_copy(ctx: BenchContext, name: str) -> Path:
+    path = ctx.work_dir / f"{ctx.db_path.stem}.{name}.db"
+    shutil.copyfile(ctx.db_path, path)
+    return path
+
+
+def bulk_create(ctx: BenchContext, repeat: int) -> ScenarioResult:
+    """WRITE_BATCH TaskService.create_task calls per run (one commit each, as in the UI)."""
+    path = _writable_copy(ctx, "bulk_create")
+    db = Database(path)
+    service = TaskService(TaskRepository(db), event_bus=EventBus())
+    due = datetime.combine(ctx.today, datetime.min.time()) + timedelta(hours=9)
+
+    def step(i: int) -> None:
+        for n in range(WRITE_BATCH):
+            service.create_task(PRIMARY_USER_ID, f"Bench task {i}.{n}", due_date_time=due)
+
+    try:
+        return ScenarioResult("bulk_create", ctx.scale, WRITE_BATCH, _time_runs(step, repeat))
+    finally:
+        db.close()
+        path.unlink(missing_ok=True)
+
+
+def complete(ctx: BenchContext, repeat: int) -> ScenarioResult:
+    """WRITE_BATCH TaskService.complete_task calls per run on distinct open tasks."""
+    path = _writable_copy(ctx, "complete")
+    db = Database(path)
+    service = TaskService(TaskRepository(db), event_bus=EventBus())
+    needed = WRITE_BATCH * (repeat + 1)
+    rows = db.connect().execute(
+        "SELECT task_id FROM task WHERE user_id = ? AND is_completed = 0 ORDER BY task_id LIMIT ?",
+        (PRIMARY_USER_ID, needed),
+    ).fetchall()
+    ids = [r["task_id"] for r in rows]
+    if not ids:
+        db.close()
+        path.unlink(missing_ok=True)
+        raise ValueError(f"{ctx.scale}: no open tasks to complete")
+
+    def step(i: int) -> None:
+        offset = (i + 1) * WRITE_BATCH
+        for n in range(WRITE_BATCH):
+            service.complete_task(ids[(offset + n) % len(ids)])
+
+    try:
+        return ScenarioResult("complete", ctx.scale, WRITE_BATCH, _time_runs(step, repeat))
+    finally:
+        db.close()
+        path.unlink(missing_ok=True)
+
+
+# Reads first, then writes (which run on throwaway copies of the generated file)
+SCENARIOS: Dict[str, Callable[[BenchContext, int], ScenarioResult]] = {
+    "day_load": day_load,
+    "month_load": month_load,
+    "search": search,
+    "dashboard_kpis": dashboard_kpis,
+    "trend": trend,
+    "schedule_check": schedule_check,
+    "bulk_create": bulk_create,
+    "complete": complete,
+}
+
+
+def run_scenarios(
+    ctx: BenchContext,
+    repeat: int,
+    names: Optional[List[str]] = None,
+) -> List[ScenarioResult]:
+    """Run the selected scenarios (default all) in SCENARIOS order."""
+    selected = [n for n in SCENARIOS if names is None or n in names]
+    return [SCENARIOS[name](ctx, repeat) for name in selected]
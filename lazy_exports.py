@@ -0,0 +1,41 @@
+"""
+Lazy package exports (PEP 562), shared by the packages' ``__init__`` modules.
+
+A package maps each public name to the submodule defining it; the submodule is
+imported on first attribute access, so importing one submodule (e.g.
+``models.enums``) does not pull in the whole package:
+
+    _LAZY_ATTRS = {"Task": ".task", "Database": "repository.database"}
+    __all__ = list(_LAZY_ATTRS)
+    __getattr__, __dir__ = lazy_exports(__name__, _LAZY_ATTRS)
+"""
+
+import sys
+from importlib import import_module
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(
+    package: str, attrs: Dict[str, str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Return module-level ``__getattr__`` and ``__dir__`` for package.
+
+    Args:
+        package: The package's ``__name__``.
+        attrs: Public name -> defining submodule (absolute, or relative to package).
+    """
+
+    def __getattr__(name: str) -> Any:
+        """Import the submodule defining ``name`` on first access and cache the attribute."""
+        module_name = attrs.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(import_module(module_name, package), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(attrs))
+
+    return __getattr__, __dir__
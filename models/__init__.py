@@ -1,33 +1,50 @@
-"""Domain models for the Task Management application."""
+"""Domain models for the Task Management application.
 
-from .enums import (
-    Priority,
-    TaskType,
-    TaskStatus,
-    RecurrenceType,
-    DayOfWeek,
-    ReminderType,
-    GoalCategory,
-    FrequencyType,
-)
-from .user import User
-from .goal import Goal
-from .task import Task
-from .recurrence_rule import RecurrenceRule
-from .reminder import Reminder
+Public names are resolved lazily (PEP 562) so that importing a single submodule,
+e.g. ``models.enums``, does not pull in every model.
+"""
 
-__all__ = [
-    "Priority",
-    "TaskType",
-    "TaskStatus",
-    "RecurrenceType",
-    "DayOfWeek",
-    "ReminderType",
-    "GoalCategory",
-    "FrequencyType",
-    "User",
-    "Goal",
-    "Task",
-    "RecurrenceRule",
-    "Reminder",
-]
+from typing import TYPE_CHECKING
+
+from lazy_exports import lazy_exports
+
+if TYPE_CHECKING:
+    from .enums import (
+        Priority,
+        TaskType,
+        TaskStatus,
+        RecurrenceType,
+        DayOfWeek,
+        ReminderType,
+        GoalCategory,
+        FrequencyType,
+    )
+    from .user import User
+    from .goal import Goal, GoalProgress
+    from .daily_summary import DailySummary
+    from .task import Task
+    from .recurrence_rule import RecurrenceRule
+    from .reminder import Reminder
+
+# Public name -> defining submodule
+_LAZY_ATTRS = {
+    "Priority": ".enums",
+    "TaskType": ".enums",
+    "TaskStatus": ".enums",
+    "RecurrenceType": ".enums",
+    "DayOfWeek": ".enums",
+    "ReminderType": ".enums",
+    "GoalCategory": ".enums",
+    "FrequencyType": ".enums",
+    "User": ".user",
+    "Goal": ".goal",
+    "GoalProgress": ".goal",
+    "DailySummary": ".daily_summary",
+    "Task": ".task",
+    "RecurrenceRule": ".recurrence_rule",
+    "Reminder": ".reminder",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_ATTRS)
@@ -0,0 +1,33 @@
+"""Daily activity summary (read model over tasks)."""
+
+from dataclasses import dataclass
+from datetime import date
+
+
+@dataclass
+class DailySummary:
+    """
+    Task activity of one user on one day (maintained incrementally in the daily_summary table).
+
+    Attributes:
+        user_id: Owner user id.
+        day: Calendar day (or the first day of an aggregated bucket).
+        created: Tasks created that day.
+        completed: Tasks completed that day.
+        minutes_planned: Planned minutes of the tasks due that day.
+        minutes_done: Planned minutes of the tasks completed that day.
+    """
+
+    user_id: str
+    day: date
+    created: int = 0
+    completed: int = 0
+    minutes_planned: int = 0
+    minutes_done: int = 0
+
+    def add(self, other: "DailySummary") -> None:
+        """Accumulate another day's counters into this one."""
+        self.created += other.created
+        self.completed += other.completed
+        self.minutes_planned += other.minutes_planned
+        self.minutes_done += other.minutes_done
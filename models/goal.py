@@ -57,3 +57,30 @@ class Goal:
         if scheduled <= 0:
             return 0.0
         return min(1.0, completed / scheduled)
+
+
+@dataclass
+class GoalProgress:
+    """
+    Task counters of a goal (maintained incrementally in the goal_progress table).
+
+    Attributes:
+        goal_id: Goal the counters belong to.
+        scheduled: Tasks linked to the goal.
+        completed: Linked tasks that are completed.
+        total_minutes: Planned minutes of all linked tasks.
+        completed_minutes: Planned minutes of the completed ones.
+    """
+
+    goal_id: str
+    scheduled: int = 0
+    completed: int = 0
+    total_minutes: int = 0
+    completed_minutes: int = 0
+
+    @property
+    def completion_rate(self) -> float:
+        """Completed / scheduled (0.0 to 1.0; 0 when nothing is scheduled)."""
+        if self.scheduled <= 0:
+            return 0.0
+        return min(1.0, self.completed / self.scheduled)
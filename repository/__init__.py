@@ -1,14 +1,41 @@
-"""Repository layer for data access."""
-
-from repository.database import Database, get_database
-from repository.task_repository import TaskRepository
-from repository.goal_repository import GoalRepository
-from repository.user_repository import UserRepository
-
-__all__ = [
-    "Database",
-    "get_database",
-    "TaskRepository",
-    "GoalRepository",
-    "UserRepository",
-]
+"""Repository layer for data access.
+
+Public names are resolved lazily (PEP 562); see ``lazy_exports``.
+"""
+
+from typing import TYPE_CHECKING
+
+from lazy_exports import lazy_exports
+
+if TYPE_CHECKING:
+    from repository.database import Database, get_database
+    from repository.task_repository import TaskPage, TaskRepository
+    from repository.goal_repository import GoalRepository
+    from repository.user_repository import UserRepository
+    from repository.user_registry import UserRegistry, get_user_registry
+    from repository.summary_repository import DailySummaryRepository
+    from repository.change_log import ChangeLog, HybridClock
+    from repository.cache import CacheStats, RepositoryCache
+    from repository.instrumentation import QueryInstrumentation
+
+# Public name -> defining submodule
+_LAZY_ATTRS = {
+    "Database": "repository.database",
+    "get_database": "repository.database",
+    "TaskRepository": "repository.task_repository",
+    "TaskPage": "repository.task_repository",
+    "GoalRepository": "repository.goal_repository",
+    "UserRepository": "repository.user_repository",
+    "UserRegistry": "repository.user_registry",
+    "get_user_registry": "repository.user_registry",
+    "DailySummaryRepository": "repository.summary_repository",
+    "ChangeLog": "repository.change_log",
+    "HybridClock": "repository.change_log",
+    "RepositoryCache": "repository.cache",
+    "CacheStats": "repository.cache",
+    "QueryInstrumentation": "repository.instrumentation",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_ATTRS)
@@ -0,0 +1,143 @@
+"""In-memory read-through cache shared by the repositories of one Database."""
+
+import copy
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for one RepositoryCache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Hits / lookups (0.0 when nothing was looked up)."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class RepositoryCache:
+    """
+    Entity cache keyed by id plus per-user collection results (LRU, optional TTL).
+
+    Repositories read through it and write through it: a save replaces the cached
+    entity and drops the owner's cached collections; a delete evicts the entity.
+    Entities are copied on the way in and out, so callers can mutate what they get
+    (as they could with a fresh database read) without corrupting the cache.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_collections: int = 64,
+        ttl_seconds: Optional[float] = None,
+        copier: Callable[[Any], Any] = copy.copy,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            max_entries: Max cached entities (least recently used are evicted).
+            max_collections: Max cached collection results across all users.
+            ttl_seconds: Entry lifetime; None = until evicted or invalidated.
+            copier: Copies an entity (default shallow copy).
+            clock: Monotonic time source.
+        """
+        self._max_entries = max_entries
+        self._max_collections = max_collections
+        self._ttl = ttl_seconds
+        self._copy = copier
+        self._clock = clock
+        self._entities: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._collections: "OrderedDict[Tuple[str, Hashable], Tuple[float, List[Any]]]" = OrderedDict()
+        self.stats = CacheStats()
+
+    def _expires_at(self) -> float:
+        return self._clock() + self._ttl if self._ttl is not None else float("inf")
+
+    def get(self, entity_id: str) -> Optional[Any]:
+        """Return a copy of the cached entity, or None on a miss."""
+        item = self._entities.get(entity_id)
+        if item is None or item[0] <= self._clock():
+            if item is not None:
+                del self._entities[entity_id]
+            self.stats.misses += 1
+            return None
+        self._entities.move_to_end(entity_id)
+        self.stats.hits += 1
+        return self._copy(item[1])
+
+    def put(self, entity_id: str, entity: Any) -> None:
+        """Store a copy of entity."""
+        self._entities[entity_id] = (self._expires_at(), self._copy(entity))
+        self._entities.move_to_end(entity_id)
+        while len(self._entities) > self._max_entries:
+            self._entities.popitem(last=False)
+            self.stats.evictions += 1
+
+    def evict(self, entity_id: str) -> Optional[Any]:
+        """Drop entity from the cache. Returns the dropped entity (not copied) or None."""
+        item = self._entities.pop(entity_id, None)
+        if item is not None:
+            self.stats.invalidations += 1
+            return item[1]
+        return None
+
+    def get_collection(self, user_id: str, key: Hashable) -> Optional[List[Any]]:
+        """Return copies of a cached collection result, or None on a miss."""
+        ck = (user_id, key)
+        item = self._collections.get(ck)
+        if item is None or item[0] <= self._clock():
+            if item is not None:
+                del self._collections[ck]
+            self.stats.misses += 1
+            return None
+        self._collections.move_to_end(ck)
+        self.stats.hits += 1
+        return [self._copy(e) for e in item[1]]
+
+    def put_collection(self, user_id: str, key: Hashable, entities: List[Any]) -> None:
+        """Store copies of a collection result for user."""
+        ck = (user_id, key)
+        self._collections[ck] = (self._expires_at(), [self._copy(e) for e in entities])
+        self._collections.move_to_end(ck)
+        while len(self._collections) > self._max_collections:
+            self._collections.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate_user(self, user_id: Optional[str]) -> None:
+        """Drop cached collections of user (all users when user_id is None)."""
+        stale = [ck for ck in self._collections if user_id is None or ck[0] == user_id]
+        for ck in stale:
+            del self._collections[ck]
+        self.stats.invalidations += len(stale)
+
+    def clear(self) -> None:
+        """Drop everything (stats are kept)."""
+        self.stats.invalidations += len(self._entities) + len(self._collections)
+        self._entities.clear()
+        self._collections.clear()
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+
+def stats_snapshot(caches: Dict[str, RepositoryCache]) -> Dict[str, Dict[str, float]]:
+    """Plain-dict view of cache stats, e.g. for logging or a diagnostics screen."""
+    return {
+        name: {
+            "entries": len(cache),
+            "hits": cache.stats.hits,
+            "misses": cache.stats.misses,
+            "evictions": cache.stats.evictions,
+            "invalidations": cache.stats.invalidations,
+            "hit_rate": round(cache.stats.hit_rate, 4),
+        }
+        for name, cache in caches.items()
+    }
@@ -0,0 +1,513 @@
+"""
+Append-only change log for syncing copies of the database.
+
+Once enabled, every task, goal and user write appends one row per changed
+field (and one tombstone row per delete) in the same transaction as the write.
+Rows are stamped with a hybrid logical clock (HLC): wall-clock milliseconds, a
+counter for events within the same millisecond and the id of the database copy
+("node") that made the change. HLC strings sort in causal order, so the latest
+value of a field is the row with the greatest hlc (last writer wins, per field);
+a tombstone is final.
+
+Peers exchange rows after a per-peer cursor (the local seq), never whole files;
+rows received from a peer are applied if they win and appended to the local log,
+so changes also travel on to third copies. Compaction drops rows superseded by a
+later row for the same field, and field rows of deleted entities: a peer that
+has not seen them still converges, because the winning rows come later in seq.
+
+Like Database, a change log belongs to one thread.
+"""
+
+import json
+import socket
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from repository.database import Database, DatabaseError
+
+# Wire/storage form of a change row
+Change = Dict[str, Any]
+
+
+class HybridClock:
+    """
+    Hybrid logical clock for one node.
+
+    Timestamps are "<ms:12 hex>-<counter:4 hex>-<node>": greater than any
+    timestamp this clock issued or observed, and close to wall-clock time.
+    """
+
+    def __init__(self, node_id: str, wall: Callable[[], float] = time.time) -> None:
+        self.node_id = node_id
+        self._wall = wall
+        self._ms = 0
+        self._counter = 0
+
+    @staticmethod
+    def parse(timestamp: str) -> Tuple[int, int, str]:
+        ms, counter, node = timestamp.split("-", 2)
+        return int(ms, 16), int(counter, 16), node
+
+    def now(self) -> str:
+        ms = int(self._wall() * 1000)
+        if ms > self._ms:
+            self._ms, self._counter = ms, 0
+        else:
+            self._counter += 1
+        return f"{self._ms:012x}-{self._counter:04x}-{self.node_id}"
+
+    def observe(self, timestamp: str) -> None:
+        """Move past a timestamp seen from another node (so later local changes win over it)."""
+        ms, counter, _ = self.parse(timestamp)
+        if ms > self._ms:
+            self._ms, self._counter = ms, counter
+        elif ms == self._ms and counter > self._counter:
+            self._counter = counter
+
+
+@dataclass(frozen=True)
+class _Table:
+    """A table holding some of an entity's fields."""
+
+    name: str
+    key: str                                   # column holding the entity id
+    fields: Tuple[str, ...]                    # logged columns
+    required: Dict[str, Any] = field(default_factory=dict)  # NOT NULL columns: placeholder on insert
+    touch: Optional[str] = None                # column set to now on every applied change
+    row_id: Optional[Tuple[str, str]] = None   # (primary key column, prefix) when the key is not the primary key
+    soft_delete: Optional[str] = None          # deleted-at column: synced like a field (delete/undo), not an INSERT parameter
+
+    @property
+    def synced(self) -> Tuple[str, ...]:
+        return self.fields + ((self.soft_delete,) if self.soft_delete else ())
+
+    @property
+    def conflict(self) -> str:
+        return self.row_id[0] if self.row_id else self.key
+
+
+# Logged fields per entity. The order is the repositories' INSERT parameter order
+# (after the id), which record_row() relies on.
+_ENTITIES: Dict[str, Tuple[_Table, ...]] = {
+    "task": (
+        _Table(
+            "task",
+            "task_id",
+            (
+                "user_id", "goal_id", "title", "description", "due_date_time", "duration_minutes",
+                "priority", "task_type", "is_completed", "completed_at", "status", "progress_percent",
+                "created_at",
+            ),
+            required={"user_id": "", "title": ""},
+            touch="updated_at",
+            soft_delete="deleted_at",
+        ),
+    ),
+    "goal": (
+        _Table(
+            "goal",
+            "goal_id",
+            (
+                "user_id", "title", "description", "category", "color_hex", "frequency_type",
+                "created_at", "is_archived", "current_streak", "longest_streak",
+            ),
+            required={"user_id": "", "title": ""},
+            soft_delete="deleted_at",
+        ),
+    ),
+    "user": (
+        _Table(
+            "user",
+            "user_id",
+            ("name", "email", "is_student_mode", "created_at"),
+            required={"name": "", "email": ""},
+            touch="updated_at",
+        ),
+        _Table(
+            "user_preferences",
+            "user_id",
+            ("notifications_enabled", "default_reminder_minutes"),
+            row_id=("pref_id", "pref_"),
+        ),
+    ),
+}
+
+ENTITY_FIELDS: Dict[str, Tuple[str, ...]] = {
+    entity: tuple(f for table in tables for f in table.fields) for entity, tables in _ENTITIES.items()
+}
+# Fields apply() accepts: the above plus soft-delete columns
+_SYNCED_FIELDS: Dict[str, frozenset] = {
+    entity: frozenset(f for table in tables for f in table.synced) for entity, tables in _ENTITIES.items()
+}
+
+# Tombstone rows have this field name
+DELETED = ""
+
+
+def _encode(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+class ChangeLog:
+    """
+    The change_log table of one database, with its node id and clock.
+
+    Logging starts with enable(); until then record_row/record_delete do nothing,
+    so databases that never sync pay nothing on writes. Use Database.change_log()
+    to get the instance its repositories share.
+    """
+
+    def __init__(self, db: Database) -> None:
+        self._db = db
+        self._enabled: Optional[bool] = None
+        self._clock: Optional[HybridClock] = None
+
+    # --- state --------------------------------------------------------------
+
+    def _state(self, key: str) -> Optional[str]:
+        row = self._db.connect().execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row is not None else None
+
+    def _set_state(self, conn, key: str, value: str) -> None:
+        conn.execute(
+            "INSERT INTO sync_state (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+
+    def _host(self) -> str:
+        # A copied file keeps the original's node id; a different host or path means a new node.
+        return f"{socket.gethostname()}:{self._db.path.resolve()}"
+
+    @property
+    def enabled(self) -> bool:
+        if self._enabled is None:
+            try:
+                node_id = self._state("node_id")
+                if node_id is not None and self._state("node_host") != self._host():
+                    self._adopt_copy(node_id)
+                self._enabled = node_id is not None
+            except DatabaseError:
+                raise
+            except Exception as e:
+                raise DatabaseError(f"read sync state failed: {e}") from e
+        return self._enabled
+
+    def _adopt_copy(self, origin: str) -> None:
+        """
+        Become a node of its own after the file was copied from origin.
+
+        The copy holds origin's log up to the copy's last seq, with the same seqs,
+        so both cursors for origin start there (see SyncEngine.sync for the other side).
+        """
+        conn = self._db.connect()
+        try:
+            last = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM change_log").fetchone()[0]
+            self._new_node(conn)
+            self._set_state(conn, "copied_from", f"{origin}:{last}")
+            for direction in ("received", "sent"):
+                self._set_state(conn, f"cursor:{direction}:{origin}", str(last))
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise DatabaseError(f"save sync state failed: {e}") from e
+
+    def origin(self) -> Optional[Tuple[str, int]]:
+        """(node id, seq) of the copy this file was made from, if it was copied while syncing."""
+        value = self._state("copied_from") if self.enabled else None
+        if not value:
+            return None
+        node, _, seq = value.partition(":")
+        return node, int(seq)
+
+    def _new_node(self, conn) -> str:
+        """Store a new node id for this file (in the caller's transaction)."""
+        node_id = uuid.uuid4().hex[:16]
+        self._set_state(conn, "node_id", node_id)
+        self._set_state(conn, "node_host", self._host())
+        self._clock = None
+        return node_id
+
+    def rekey(self) -> None:
+        """
+        Continue as a new node with no peer cursors, after the file went back in time (a restore).
+
+        Peers' cursors for the old node point past the end of the restored log; as
+        a new node every peer exchanges from the start, which is harmless (rows that
+        do not win are ignored). Newer changes held by peers come back on the next sync.
+        """
+        self._enabled = None
+        self._clock = None
+        if not self.enabled:
+            return
+        conn = self._db.connect()
+        try:
+            self._new_node(conn)
+            conn.execute("DELETE FROM sync_state WHERE key LIKE 'cursor:%' OR key = 'copied_from'")
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise DatabaseError(f"save sync state failed: {e}") from e
+
+    @property
+    def node_id(self) -> Optional[str]:
+        """This copy's node id (None until enabled)."""
+        return self._state("node_id") if self.enabled else None
+
+    def _now(self) -> str:
+        if self._clock is None:
+            self._clock = HybridClock(self._state("node_id"))
+            latest = self._db.connect().execute("SELECT MAX(hlc) FROM change_log").fetchone()[0]
+            if latest:
+                self._clock.observe(latest)
+        return self._clock.now()
+
+    def enable(self) -> int:
+        """
+        Start logging (no-op when already enabled); returns the baseline rows written.
+
+        An empty log first gets a baseline: every field of every existing row,
+        stamped with time zero so any real change wins over it. Enable sync before
+        copying a file to another machine: the copy then logs as a node of its own
+        from its first write. Copies that diverged before sync was enabled only
+        reconcile through their baselines (ties go to the greater node id).
+        """
+        if self.enabled:
+            return 0
+        conn = self._db.connect()
+        written = 0
+        try:
+            node_id = self._new_node(conn)
+            if conn.execute("SELECT 1 FROM change_log LIMIT 1").fetchone() is None:
+                baseline = f"{0:012x}-{0:04x}-{node_id}"
+                for entity, tables in _ENTITIES.items():
+                    for table in tables:
+                        for column in table.synced:
+                            # Soft-delete columns are NULL for live rows, which is also the default
+                            where = f" WHERE {column} IS NOT NULL" if column == table.soft_delete else ""
+                            cursor = conn.execute(
+                                f"""INSERT INTO change_log (hlc, node, entity, entity_id, field, value)
+                                    SELECT ?, ?, ?, {table.key}, ?, json_quote({column}) FROM {table.name}{where}""",
+                                (baseline, node_id, entity, column),
+                            )
+                            written += cursor.rowcount
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise DatabaseError(f"enable change log failed: {e}") from e
+        self._enabled = True
+        return written
+
+    # --- recording (inside the caller's transaction) ------------------------
+
+    def record_row(self, conn, entity: str, entity_id: str, values: Iterable[Any]) -> int:
+        """
+        Log the fields of entity_id that differ from the stored row, before it is written.
+
+        values are the repository's INSERT parameters after the id (extra trailing
+        values such as updated_at are ignored). Returns the rows logged.
+        """
+        if not self.enabled:
+            return 0
+        new = dict(zip(ENTITY_FIELDS[entity], values))
+        old: Dict[str, Any] = {}
+        for table in _ENTITIES[entity]:
+            row = conn.execute(
+                f"SELECT {', '.join(table.fields)} FROM {table.name} WHERE {table.key} = ?", (entity_id,)
+            ).fetchone()
+            if row is not None:
+                old.update(zip(table.fields, row))
+        rows = [
+            (self._now(), self._clock.node_id, entity, entity_id, name, _encode(value))
+            for name, value in new.items()
+            if name not in old or old[name] != value
+        ]
+        conn.executemany(
+            "INSERT INTO change_log (hlc, node, entity, entity_id, field, value) VALUES (?, ?, ?, ?, ?, ?)", rows
+        )
+        return len(rows)
+
+    def record_field(self, conn, entity: str, entity_ids: Iterable[str], name: str, value: Any) -> None:
+        """Log one field set to value on each of entity_ids (soft delete and undo)."""
+        if not self.enabled:
+            return
+        encoded = _encode(value)
+        conn.executemany(
+            "INSERT INTO change_log (hlc, node, entity, entity_id, field, value) VALUES (?, ?, ?, ?, ?, ?)",
+            [(self._now(), self._clock.node_id, entity, entity_id, name, encoded) for entity_id in entity_ids],
+        )
+
+    def record_delete(self, conn, entity: str, entity_id: str) -> None:
+        """Log a tombstone for entity_id."""
+        if not self.enabled:
+            return
+        conn.execute(
+            "INSERT INTO change_log (hlc, node, entity, entity_id, field, value) VALUES (?, ?, ?, ?, ?, 'null')",
+            (self._now(), self._clock.node_id, entity, entity_id, DELETED),
+        )
+
+    # --- exchange -----------------------------------------------------------
+
+    def since(self, after_seq: int, exclude_node: Optional[str] = None, limit: int = 1000) -> Tuple[List[Change], int]:
+        """
+        Rows after after_seq (oldest first), skipping those made by exclude_node.
+
+        Returns (changes, cursor): pass cursor as after_seq next time; fewer than
+        limit changes means the log is exhausted.
+        """
+        try:
+            conn = self._db.connect()
+            last = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM change_log").fetchone()[0]
+            rows = conn.execute(
+                """SELECT seq, hlc, node, entity, entity_id, field, value FROM change_log
+                   WHERE seq > ? AND seq <= ? AND node IS NOT ? ORDER BY seq LIMIT ?""",
+                (after_seq, last, exclude_node, limit),
+            ).fetchall()
+        except Exception as e:
+            raise DatabaseError(f"read change log failed: {e}") from e
+        changes = [
+            {"hlc": r[1], "node": r[2], "entity": r[3], "entity_id": r[4], "field": r[5], "value": json.loads(r[6])}
+            for r in rows
+        ]
+        cursor = rows[-1][0] if len(rows) == limit else max(after_seq, last)
+        return changes, cursor
+
+    def apply(self, changes: Iterable[Change]) -> int:
+        """
+        Apply changes from another node in one transaction; returns how many won.
+
+        A field change wins when its hlc is newer than every logged change of that
+        field; a tombstone always wins and deletes the row. Winners are appended to
+        the log and written to the tables (triggers keep the counters current).
+        Unknown entities and fields are skipped. The repository caches are cleared.
+        """
+        if not self.enabled:
+            self.enable()
+        conn = self._db.connect()
+        fields: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        deleted = set()
+        applied = 0
+        try:
+            for change in changes:
+                entity, entity_id, name, hlc = change["entity"], change["entity_id"], change["field"], change["hlc"]
+                if entity not in _ENTITIES or (name != DELETED and name not in _SYNCED_FIELDS[entity]):
+                    continue
+                if self._clock is None:
+                    self._now()
+                self._clock.observe(hlc)
+                key = (entity, entity_id)
+                if key in deleted or self._latest(conn, entity, entity_id, DELETED) is not None:
+                    continue
+                if name == DELETED:
+                    deleted.add(key)
+                    fields.pop(key, None)
+                else:
+                    latest = self._latest(conn, entity, entity_id, name)
+                    if latest is not None and latest >= hlc:
+                        continue
+                    fields.setdefault(key, {})[name] = change["value"]
+                conn.execute(
+                    "INSERT INTO change_log (hlc, node, entity, entity_id, field, value) VALUES (?, ?, ?, ?, ?, ?)",
+                    (hlc, change["node"], entity, entity_id, name, _encode(change.get("value"))),
+                )
+                applied += 1
+            for entity, entity_id in deleted:
+                for table in _ENTITIES[entity]:
+                    conn.execute(f"DELETE FROM {table.name} WHERE {table.key} = ?", (entity_id,))
+            now = datetime.now().isoformat()
+            for (entity, entity_id), values in fields.items():
+                for table in _ENTITIES[entity]:
+                    self._upsert(conn, table, entity_id, values, now)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise DatabaseError(f"apply changes failed: {e}") from e
+        finally:
+            if applied:
+                self._db.clear_caches()
+        return applied
+
+    def _latest(self, conn, entity: str, entity_id: str, name: str) -> Optional[str]:
+        return conn.execute(
+            "SELECT MAX(hlc) FROM change_log WHERE entity = ? AND entity_id = ? AND field = ?",
+            (entity, entity_id, name),
+        ).fetchone()[0]
+
+    def _upsert(self, conn, table: _Table, entity_id: str, values: Dict[str, Any], now: str) -> None:
+        winners = {name: values[name] for name in table.synced if name in values}
+        if not winners:
+            return
+        updates = dict(winners)
+        if table.touch:
+            updates[table.touch] = now
+        # Missing NOT NULL columns get a placeholder until their own rows arrive
+        row = {table.key: entity_id, **{k: v for k, v in table.required.items() if k not in updates}, **updates}
+        if table.row_id:
+            row[table.row_id[0]] = table.row_id[1] + entity_id
+        columns = list(row)
+        conn.execute(
+            f"""INSERT INTO {table.name} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})
+                ON CONFLICT({table.conflict}) DO UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in updates)}""",
+            [row[c] for c in columns],
+        )
+
+    # --- cursors and maintenance -------------------------------------------
+
+    def cursor(self, name: str) -> int:
+        """A stored sync cursor (0 if unset)."""
+        value = self._state(f"cursor:{name}")
+        return int(value) if value is not None else 0
+
+    def set_cursor(self, name: str, seq: int) -> None:
+        conn = self._db.connect()
+        try:
+            self._set_state(conn, f"cursor:{name}", str(seq))
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise DatabaseError(f"save sync cursor failed: {e}") from e
+
+    def compact(self) -> int:
+        """Drop superseded field rows and field rows of deleted entities; returns rows removed."""
+        conn = self._db.connect()
+        try:
+            removed = conn.execute(
+                """DELETE FROM change_log WHERE EXISTS (
+                       SELECT 1 FROM change_log AS later
+                       WHERE later.entity = change_log.entity AND later.entity_id = change_log.entity_id
+                         AND later.field = change_log.field AND later.hlc > change_log.hlc)"""
+            ).rowcount
+            removed += conn.execute(
+                """DELETE FROM change_log WHERE field <> '' AND EXISTS (
+                       SELECT 1 FROM change_log AS tomb
+                       WHERE tomb.entity = change_log.entity AND tomb.entity_id = change_log.entity_id
+                         AND tomb.field = '')"""
+            ).rowcount
+            last = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM change_log").fetchone()[0]
+            self._set_state(conn, "compacted_seq", str(last))
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise DatabaseError(f"compact change log failed: {e}") from e
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Rows, tombstones, last seq and seq at the last compaction."""
+        try:
+            conn = self._db.connect()
+            rows, tombstones, last = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(field = ''), 0), COALESCE(MAX(seq), 0) FROM change_log"
+            ).fetchone()
+            compacted = self._state("compacted_seq")
+        except Exception as e:
+            raise DatabaseError(f"read change log failed: {e}") from e
+        return {
+            "enabled": self.enabled,
+            "node_id": self.node_id,
+            "rows": rows,
+            "tombstones": tombstones,
+            "last_seq": last,
+            "compacted_seq": int(compacted) if compacted is not None else 0,
+        }
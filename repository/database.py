@@ -1,8 +1,25 @@
 """SQLite database initialization and schema (ER Diagram compliant)."""
 
+import copy
+import os
 import sqlite3
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+from repository.cache import RepositoryCache, stats_snapshot
+from repository.instrumentation import InstrumentedConnection, QueryInstrumentation
+
+if TYPE_CHECKING:
+    from repository.change_log import ChangeLog
+
+# Set to 1 to instrument every Database that does not pass instrument= explicitly;
+# TASKS_DB_SLOW_MS and TASKS_DB_SLOW_LOG tune the slow-query log.
+INSTRUMENT_ENV = "TASKS_DB_INSTRUMENT"
+SLOW_MS_ENV = "TASKS_DB_SLOW_MS"
+SLOW_LOG_ENV = "TASKS_DB_SLOW_LOG"
+# Journal mode of every Database that does not pass journal_mode= explicitly (default "wal":
+# readers such as a background backup never block writers and see one consistent version).
+JOURNAL_ENV = "TASKS_DB_JOURNAL"
 
 # Default DB path: same directory as this file, or cwd for PyInstaller bundle
 def _default_db_path() -> Path:
@@ -11,6 +28,153 @@ def _default_db_path() -> Path:
     return base / "tasks.db"
 
 
+# Recomputes goal_progress from the task table (backfill and consistency repair).
+GOAL_PROGRESS_REBUILD_SQL = """
+    DELETE FROM goal_progress;
+    INSERT INTO goal_progress (goal_id, scheduled, completed, total_minutes, completed_minutes)
+    SELECT goal_id,
+           COUNT(*),
+           SUM(is_completed),
+           SUM(COALESCE(duration_minutes, 0)),
+           SUM(CASE WHEN is_completed THEN COALESCE(duration_minutes, 0) ELSE 0 END)
+    FROM task WHERE goal_id IS NOT NULL AND deleted_at IS NULL GROUP BY goal_id;
+"""
+
+# daily_summary rebuild for one user ({user} = "user_id = :user_id") or all ({user} = "1").
+# Each task counts on up to three days: created, due (planned minutes) and completed.
+DAILY_SUMMARY_DELETE_SQL = "DELETE FROM daily_summary WHERE {user}"
+DAILY_SUMMARY_SELECT_SQL = """
+    SELECT user_id, day, SUM(created), SUM(completed), SUM(minutes_planned), SUM(minutes_done)
+    FROM (
+        SELECT user_id, substr(created_at, 1, 10) AS day,
+               1 AS created, 0 AS completed, 0 AS minutes_planned, 0 AS minutes_done
+        FROM task WHERE {user} AND deleted_at IS NULL AND created_at IS NOT NULL
+        UNION ALL
+        SELECT user_id, substr(due_date_time, 1, 10), 0, 0, duration_minutes, 0
+        FROM task WHERE {user} AND deleted_at IS NULL AND due_date_time IS NOT NULL
+                        AND COALESCE(duration_minutes, 0) <> 0
+        UNION ALL
+        SELECT user_id, substr(completed_at, 1, 10), 0, 1, 0, COALESCE(duration_minutes, 0)
+        FROM task WHERE {user} AND deleted_at IS NULL AND is_completed AND completed_at IS NOT NULL
+    )
+    GROUP BY user_id, day
+"""
+DAILY_SUMMARY_INSERT_SQL = (
+    "INSERT INTO daily_summary (user_id, day, created, completed, minutes_planned, minutes_done)"
+    + DAILY_SUMMARY_SELECT_SQL
+)
+
+
+def _daily_summary_apply(row: str, sign: int) -> str:
+    """Trigger statements adding (sign=1) or removing (sign=-1) one task row's contribution (none if deleted)."""
+    upsert = """
+        INSERT INTO daily_summary (user_id, day, created, completed, minutes_planned, minutes_done)
+        SELECT {row}.user_id, substr({day}, 1, 10), {values} WHERE {cond}
+        ON CONFLICT(user_id, day) DO UPDATE SET
+            created = created + excluded.created,
+            completed = completed + excluded.completed,
+            minutes_planned = minutes_planned + excluded.minutes_planned,
+            minutes_done = minutes_done + excluded.minutes_done;"""
+    minutes = f"{sign} * COALESCE({row}.duration_minutes, 0)"
+    parts = [
+        (f"{row}.created_at", f"{sign}, 0, 0, 0", f"{row}.created_at IS NOT NULL"),
+        (
+            f"{row}.due_date_time",
+            f"0, 0, {minutes}, 0",
+            f"{row}.due_date_time IS NOT NULL AND COALESCE({row}.duration_minutes, 0) <> 0",
+        ),
+        (
+            f"{row}.completed_at",
+            f"0, {sign}, 0, {minutes}",
+            f"{row}.is_completed AND {row}.completed_at IS NOT NULL",
+        ),
+    ]
+    return "".join(
+        upsert.format(row=row, day=day, values=values, cond=f"{row}.deleted_at IS NULL AND {cond}")
+        for day, values, cond in parts
+    )
+
+
+_DAILY_SUMMARY_SCHEMA = f"""
+    CREATE TABLE IF NOT EXISTS daily_summary (
+        user_id TEXT NOT NULL,
+        day TEXT NOT NULL,
+        created INTEGER NOT NULL DEFAULT 0,
+        completed INTEGER NOT NULL DEFAULT 0,
+        minutes_planned INTEGER NOT NULL DEFAULT 0,
+        minutes_done INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (user_id, day)
+    ) WITHOUT ROWID;
+
+    CREATE TRIGGER IF NOT EXISTS trg_daily_summary_insert AFTER INSERT ON task
+    BEGIN {_daily_summary_apply("NEW", 1)}
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_daily_summary_delete AFTER DELETE ON task
+    BEGIN {_daily_summary_apply("OLD", -1)}
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_daily_summary_update
+    AFTER UPDATE OF user_id, created_at, due_date_time, duration_minutes, is_completed, completed_at, deleted_at
+    ON task
+    WHEN OLD.user_id IS NOT NEW.user_id
+      OR OLD.created_at IS NOT NEW.created_at
+      OR OLD.due_date_time IS NOT NEW.due_date_time
+      OR OLD.duration_minutes IS NOT NEW.duration_minutes
+      OR OLD.is_completed IS NOT NEW.is_completed
+      OR OLD.completed_at IS NOT NEW.completed_at
+      OR OLD.deleted_at IS NOT NEW.deleted_at
+    BEGIN {_daily_summary_apply("OLD", -1)}{_daily_summary_apply("NEW", 1)}
+    END;
+"""
+
+# Sync change log (see repository.change_log): one row per changed field or delete.
+_CHANGE_LOG_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS change_log (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        hlc TEXT NOT NULL,
+        node TEXT NOT NULL,
+        entity TEXT NOT NULL,
+        entity_id TEXT NOT NULL,
+        field TEXT NOT NULL,
+        value TEXT
+    );
+    -- Latest value of a field (last-writer-wins checks and compaction)
+    CREATE INDEX IF NOT EXISTS idx_change_log_field ON change_log(entity, entity_id, field, hlc);
+
+    CREATE TABLE IF NOT EXISTS sync_state (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    );
+"""
+
+
+# Triggers whose definitions changed when soft delete was added; dropped and recreated
+# by the migration so existing files get the versions that skip deleted tasks.
+_SOFT_DELETE_TRIGGERS = (
+    "trg_goal_progress_insert",
+    "trg_goal_progress_delete",
+    "trg_goal_progress_update",
+    "trg_daily_summary_insert",
+    "trg_daily_summary_delete",
+    "trg_daily_summary_update",
+)
+
+
+def add_missing_columns(conn: sqlite3.Connection, table: str, columns: Dict[str, str]) -> List[str]:
+    """
+    ALTER TABLE table ADD COLUMN for each of columns (name -> declaration) it lacks.
+
+    Returns:
+        The names of the columns added (empty if the table already had them all).
+    """
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    added = [name for name in columns if name not in existing]
+    for name in added:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {columns[name]}")
+    return added
+
+
 class DatabaseError(Exception):
     """Raised when database operations fail (missing/corrupt file or query error)."""
 
@@ -21,18 +185,53 @@ class Database:
     """
     SQLite database wrapper with schema creation and error handling.
 
-    Handles missing or corrupt database by recreating schema.
+    Handles missing or corrupt database by recreating schema. Also owns the
+    read-through caches its repositories share (see repository.cache) and,
+    when instrumented, the query statistics (see repository.instrumentation).
     """
 
-    def __init__(self, path: Optional[Path] = None) -> None:
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        cache_size: int = 1024,
+        cache_ttl: Optional[float] = 60.0,
+        instrument: Optional[bool] = None,
+        slow_query_ms: Optional[float] = None,
+        slow_log_path: Optional[Path] = None,
+        journal_mode: Optional[str] = None,
+    ) -> None:
         """
         Initialize database connection path.
 
         Args:
             path: Path to SQLite file. If None, uses default tasks.db in project root.
+            cache_size: Max cached entities per repository cache (0 disables caching).
+            cache_ttl: Seconds a cached entry stays valid (None = until invalidated).
+                Bounds staleness when another process writes the same file.
+            instrument: Record per-statement timings (None = TASKS_DB_INSTRUMENT env var).
+            slow_query_ms: Slow-query threshold (default TASKS_DB_SLOW_MS or 50).
+            slow_log_path: File slow queries are appended to (default TASKS_DB_SLOW_LOG, if set).
+            journal_mode: SQLite journal mode, e.g. "wal" or "delete" (default TASKS_DB_JOURNAL or "wal").
         """
         self._path = path or _default_db_path()
         self._conn: Optional[sqlite3.Connection] = None
+        self._cache_size = cache_size
+        self._cache_ttl = cache_ttl
+        self._caches: Dict[str, RepositoryCache] = {}
+        self._change_log: Optional["ChangeLog"] = None
+        self._journal_mode = (journal_mode or os.environ.get(JOURNAL_ENV) or "wal").strip().lower()
+        if not self._journal_mode.isalpha():
+            raise ValueError(f"invalid journal mode {self._journal_mode!r}")
+        if instrument is None:
+            instrument = os.environ.get(INSTRUMENT_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+        self._instrumentation: Optional[QueryInstrumentation] = None
+        if instrument:
+            if slow_log_path is None and os.environ.get(SLOW_LOG_ENV):
+                slow_log_path = Path(os.environ[SLOW_LOG_ENV])
+            self._instrumentation = QueryInstrumentation(
+                slow_query_ms=slow_query_ms if slow_query_ms is not None else float(os.environ.get(SLOW_MS_ENV, 50)),
+                slow_log_path=slow_log_path,
+            )
 
     def connect(self) -> sqlite3.Connection:
         """
@@ -48,8 +247,18 @@ class Database:
             return self._conn
         try:
             self._path.parent.mkdir(parents=True, exist_ok=True)
-            self._conn = sqlite3.connect(str(self._path), detect_types=sqlite3.PARSE_DECLTYPES)
+            if self._instrumentation is not None:
+                conn = sqlite3.connect(
+                    str(self._path),
+                    detect_types=sqlite3.PARSE_DECLTYPES,
+                    factory=InstrumentedConnection,
+                )
+                conn.attach(self._instrumentation)
+                self._conn = conn
+            else:
+                self._conn = sqlite3.connect(str(self._path), detect_types=sqlite3.PARSE_DECLTYPES)
             self._conn.row_factory = sqlite3.Row
+            self._conn.execute(f"PRAGMA journal_mode = {self._journal_mode}")
             self._create_schema()
             return self._conn
         except sqlite3.Error as e:
@@ -61,6 +270,16 @@ class Database:
         if conn is None:
             return
         try:
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+            if "task" in tables:
+                # Soft delete: files created before it get the column and the triggers that ignore tombstones
+                conn.execute("BEGIN")
+                added = add_missing_columns(conn, "task", {"deleted_at": "TEXT"})
+                added += add_missing_columns(conn, "goal", {"deleted_at": "TEXT"})
+                for trigger in _SOFT_DELETE_TRIGGERS if added else ():
+                    conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+                conn.commit()
             conn.executescript("""
                 CREATE TABLE IF NOT EXISTS user (
                     user_id TEXT PRIMARY KEY,
@@ -89,7 +308,8 @@ class Database:
                     created_at TEXT,
                     is_archived INTEGER DEFAULT 0,
                     current_streak INTEGER DEFAULT 0,
-                    longest_streak INTEGER DEFAULT 0
+                    longest_streak INTEGER DEFAULT 0,
+                    deleted_at TEXT
                 );
 
                 CREATE TABLE IF NOT EXISTS task (
@@ -107,19 +327,197 @@ class Database:
                     status TEXT,
                     progress_percent INTEGER DEFAULT 0,
                     created_at TEXT,
-                    updated_at TEXT
+                    updated_at TEXT,
+                    deleted_at TEXT
                 );
 
-                CREATE INDEX IF NOT EXISTS idx_task_user ON task(user_id);
                 CREATE INDEX IF NOT EXISTS idx_task_due ON task(due_date_time);
                 CREATE INDEX IF NOT EXISTS idx_task_goal ON task(goal_id);
-                CREATE INDEX IF NOT EXISTS idx_goal_user ON goal(user_id);
+                -- Hot queries only see live rows (deleted_at IS NULL), so their indexes
+                -- leave tombstones out; the purge finds expired ones in the tombstone indexes.
+                CREATE INDEX IF NOT EXISTS idx_goal_user_live ON goal(user_id) WHERE deleted_at IS NULL;
+                DROP INDEX IF EXISTS idx_goal_user;
+                -- Listing order: day filters and keyset pages seek on it. It also serves
+                -- plain user_id lookups, so the old single-column index is dropped.
+                CREATE INDEX IF NOT EXISTS idx_task_user_due_live ON task(user_id, due_date_time, created_at, task_id)
+                    WHERE deleted_at IS NULL;
+                DROP INDEX IF EXISTS idx_task_user_due;
+                DROP INDEX IF EXISTS idx_task_user;
+                CREATE INDEX IF NOT EXISTS idx_task_deleted ON task(deleted_at) WHERE deleted_at IS NOT NULL;
+                CREATE INDEX IF NOT EXISTS idx_goal_deleted ON goal(deleted_at) WHERE deleted_at IS NOT NULL;
+
+                -- Per-goal task counters, kept current by the triggers below so goal
+                -- progress never needs a task scan. GOAL_PROGRESS_REBUILD_SQL recomputes them.
+                CREATE TABLE IF NOT EXISTS goal_progress (
+                    goal_id TEXT PRIMARY KEY,
+                    scheduled INTEGER NOT NULL DEFAULT 0,
+                    completed INTEGER NOT NULL DEFAULT 0,
+                    total_minutes INTEGER NOT NULL DEFAULT 0,
+                    completed_minutes INTEGER NOT NULL DEFAULT 0
+                );
+
+                CREATE TRIGGER IF NOT EXISTS trg_goal_progress_insert AFTER INSERT ON task
+                WHEN NEW.goal_id IS NOT NULL AND NEW.deleted_at IS NULL
+                BEGIN
+                    INSERT INTO goal_progress (goal_id, scheduled, completed, total_minutes, completed_minutes)
+                    VALUES (NEW.goal_id, 1, NEW.is_completed, COALESCE(NEW.duration_minutes, 0),
+                            CASE WHEN NEW.is_completed THEN COALESCE(NEW.duration_minutes, 0) ELSE 0 END)
+                    ON CONFLICT(goal_id) DO UPDATE SET
+                        scheduled = scheduled + 1,
+                        completed = completed + excluded.completed,
+                        total_minutes = total_minutes + excluded.total_minutes,
+                        completed_minutes = completed_minutes + excluded.completed_minutes;
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS trg_goal_progress_delete AFTER DELETE ON task
+                WHEN OLD.goal_id IS NOT NULL AND OLD.deleted_at IS NULL
+                BEGIN
+                    UPDATE goal_progress SET
+                        scheduled = scheduled - 1,
+                        completed = completed - OLD.is_completed,
+                        total_minutes = total_minutes - COALESCE(OLD.duration_minutes, 0),
+                        completed_minutes = completed_minutes
+                            - CASE WHEN OLD.is_completed THEN COALESCE(OLD.duration_minutes, 0) ELSE 0 END
+                    WHERE goal_id = OLD.goal_id;
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS trg_goal_progress_update
+                AFTER UPDATE OF goal_id, is_completed, duration_minutes, deleted_at ON task
+                WHEN OLD.goal_id IS NOT NEW.goal_id
+                  OR OLD.is_completed IS NOT NEW.is_completed
+                  OR OLD.duration_minutes IS NOT NEW.duration_minutes
+                  OR OLD.deleted_at IS NOT NEW.deleted_at
+                BEGIN
+                    UPDATE goal_progress SET
+                        scheduled = scheduled - 1,
+                        completed = completed - OLD.is_completed,
+                        total_minutes = total_minutes - COALESCE(OLD.duration_minutes, 0),
+                        completed_minutes = completed_minutes
+                            - CASE WHEN OLD.is_completed THEN COALESCE(OLD.duration_minutes, 0) ELSE 0 END
+                    WHERE goal_id = OLD.goal_id AND OLD.deleted_at IS NULL;
+                    INSERT INTO goal_progress (goal_id, scheduled, completed, total_minutes, completed_minutes)
+                    SELECT NEW.goal_id, 1, NEW.is_completed, COALESCE(NEW.duration_minutes, 0),
+                           CASE WHEN NEW.is_completed THEN COALESCE(NEW.duration_minutes, 0) ELSE 0 END
+                    WHERE NEW.goal_id IS NOT NULL AND NEW.deleted_at IS NULL
+                    ON CONFLICT(goal_id) DO UPDATE SET
+                        scheduled = scheduled + 1,
+                        completed = completed + excluded.completed,
+                        total_minutes = total_minutes + excluded.total_minutes,
+                        completed_minutes = completed_minutes + excluded.completed_minutes;
+                END;
             """)
-            conn.commit()
+            if "idx_task_user_due_live" not in indexes:
+                # First open since keyset pagination: it compares created_at, so make the
+                # order total for old rows (new tasks always get one; see Task.__post_init__).
+                conn.execute(
+                    "UPDATE task SET created_at = COALESCE(updated_at, '1970-01-01T00:00:00') WHERE created_at IS NULL"
+                )
+                conn.commit()
+            if "goal_progress" not in tables:
+                # First open since goal_progress was added: backfill from existing tasks.
+                conn.executescript("BEGIN;" + GOAL_PROGRESS_REBUILD_SQL + "COMMIT;")
+            # Created and backfilled in one transaction so no task write lands in between
+            backfill = "" if "daily_summary" in tables else DAILY_SUMMARY_INSERT_SQL.format(user="1") + ";"
+            conn.executescript("BEGIN;" + _DAILY_SUMMARY_SCHEMA + backfill + "COMMIT;")
+            conn.executescript(_CHANGE_LOG_SCHEMA)
         except sqlite3.Error as e:
             conn.rollback()
             raise DatabaseError(f"Failed to create schema: {e}") from e
 
+    def cache(self, name: str, copier: Callable[[Any], Any] = copy.copy) -> Optional[RepositoryCache]:
+        """
+        Return the named repository cache, creating it on first use.
+
+        Returns:
+            The cache, or None if caching is disabled (cache_size=0).
+        """
+        if self._cache_size <= 0:
+            return None
+        cache = self._caches.get(name)
+        if cache is None:
+            cache = RepositoryCache(
+                max_entries=self._cache_size,
+                ttl_seconds=self._cache_ttl,
+                copier=copier,
+            )
+            self._caches[name] = cache
+        return cache
+
+    def change_log(self) -> "ChangeLog":
+        """Return the change log shared by this database's repositories (see repository.change_log)."""
+        if self._change_log is None:
+            from repository.change_log import ChangeLog
+
+            self._change_log = ChangeLog(self)
+        return self._change_log
+
+    def cache_stats(self) -> Dict[str, Dict[str, float]]:
+        """Return hit/miss stats of every repository cache."""
+        return stats_snapshot(self._caches)
+
+    def clear_caches(self) -> None:
+        """Drop all cached entities and collections (e.g. after an external write)."""
+        for cache in self._caches.values():
+            cache.clear()
+
+    def vacuum(self) -> Dict[str, int]:
+        """
+        Rebuild the database file (VACUUM) and refresh planner statistics.
+
+        Returns:
+            Dict with file size in bytes "before" and "after".
+
+        Raises:
+            DatabaseError: If VACUUM fails (e.g. another connection holds a transaction).
+        """
+        conn = self.connect()
+        before = self._path.stat().st_size if self._path.exists() else 0
+        try:
+            conn.commit()  # VACUUM cannot run inside a transaction
+            conn.execute("VACUUM")
+            conn.execute("PRAGMA optimize")
+        except sqlite3.Error as e:
+            raise DatabaseError(f"vacuum failed: {e}") from e
+        after = self._path.stat().st_size if self._path.exists() else 0
+        return {"before": before, "after": after}
+
+    @property
+    def path(self) -> Path:
+        """Path of the SQLite file."""
+        return self._path
+
+    @property
+    def is_connected(self) -> bool:
+        """True while a connection is open (connect() reopens after close())."""
+        return self._conn is not None
+
+    @property
+    def instrumented(self) -> bool:
+        """True when query timings are being recorded."""
+        return self._instrumentation is not None
+
+    def stats(self, top: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Diagnostics snapshot: query statistics (if instrumented) and cache stats.
+
+        Args:
+            top: Only include the N statements with the highest total time.
+
+        Returns:
+            JSON-serialisable dict with "path", "instrumented", "queries" and "caches".
+        """
+        return {
+            "path": str(self._path),
+            "instrumented": self.instrumented,
+            "queries": self._instrumentation.stats(top) if self._instrumentation is not None else None,
+            "caches": self.cache_stats(),
+        }
+
+    def reset_stats(self) -> None:
+        """Clear collected query statistics."""
+        if self._instrumentation is not None:
+            self._instrumentation.reset()
+
     def close(self) -> None:
         """Close the connection if open."""
         if self._conn is not None:
@@ -1,94 +1,343 @@
 """Goal repository for CRUD on Goal entity."""
 
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from repository.database import Database, DatabaseError, get_database
-from models import Goal
+from repository.database import GOAL_PROGRESS_REBUILD_SQL, Database, DatabaseError, get_database
+from models import Goal, GoalProgress
 from models.enums import GoalCategory, FrequencyType
 
 
 class GoalRepository:
-    """Data access for Goal entity."""
+    """Data access for Goal entity (reads and writes go through the db's "goal" cache)."""
+
+    # Upsert rather than INSERT OR REPLACE: REPLACE would reset deleted_at and
+    # bring a soft-deleted goal back when a stale copy is saved. user_id is not
+    # updated: a save never moves a goal to another owner.
+    _INSERT_SQL = """INSERT INTO goal
+                   (goal_id, user_id, title, description, category, color_hex, frequency_type,
+                    created_at, is_archived, current_streak, longest_streak)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(goal_id) DO UPDATE SET
+                    title = excluded.title, description = excluded.description,
+                    category = excluded.category, color_hex = excluded.color_hex,
+                    frequency_type = excluded.frequency_type, created_at = excluded.created_at,
+                    is_archived = excluded.is_archived, current_streak = excluded.current_streak,
+                    longest_streak = excluded.longest_streak"""
 
     def __init__(self, db: Optional[Database] = None) -> None:
         self._db = db or get_database()
+        self._cache = self._db.cache("goal")
+        self._log = self._db.change_log()
 
     def get_by_id(self, goal_id: str) -> Optional[Goal]:
         """Return goal by id or None."""
+        if self._cache is not None:
+            cached = self._cache.get(goal_id)
+            if cached is not None:
+                return cached
         try:
             conn = self._db.connect()
             row = conn.execute(
                 """SELECT goal_id, user_id, title, description, category, color_hex,
                           frequency_type, created_at, is_archived, current_streak, longest_streak
-                   FROM goal WHERE goal_id = ?""",
+                   FROM goal WHERE goal_id = ? AND deleted_at IS NULL""",
                 (goal_id,),
             ).fetchone()
             if row is None:
                 return None
-            return self._row_to_goal(row)
+            goal = self._row_to_goal(row)
         except Exception as e:
             raise DatabaseError(f"get_by_id failed: {e}") from e
+        if self._cache is not None:
+            self._cache.put(goal_id, goal)
+        return goal
 
     def get_all_by_user(self, user_id: str, include_archived: bool = False) -> List[Goal]:
         """Return all goals for user, optionally including archived."""
+        if self._cache is not None:
+            cached = self._cache.get_collection(user_id, include_archived)
+            if cached is not None:
+                return cached
         try:
             conn = self._db.connect()
             if include_archived:
                 rows = conn.execute(
                     """SELECT goal_id, user_id, title, description, category, color_hex,
                               frequency_type, created_at, is_archived, current_streak, longest_streak
-                       FROM goal WHERE user_id = ?""",
+                       FROM goal WHERE user_id = ? AND deleted_at IS NULL""",
                     (user_id,),
                 ).fetchall()
             else:
                 rows = conn.execute(
                     """SELECT goal_id, user_id, title, description, category, color_hex,
                               frequency_type, created_at, is_archived, current_streak, longest_streak
-                       FROM goal WHERE user_id = ? AND is_archived = 0""",
+                       FROM goal WHERE user_id = ? AND deleted_at IS NULL AND is_archived = 0""",
                     (user_id,),
                 ).fetchall()
-            return [self._row_to_goal(r) for r in rows]
+            goals = [self._row_to_goal(r) for r in rows]
         except Exception as e:
             raise DatabaseError(f"get_all_by_user failed: {e}") from e
+        if self._cache is not None:
+            self._cache.put_collection(user_id, include_archived, goals)
+        return goals
 
     def save(self, goal: Goal) -> None:
         """Insert or replace goal."""
         try:
             conn = self._db.connect()
-            conn.execute(
-                """INSERT OR REPLACE INTO goal
-                   (goal_id, user_id, title, description, category, color_hex, frequency_type,
-                    created_at, is_archived, current_streak, longest_streak)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    goal.goal_id,
-                    goal.user_id,
-                    goal.title,
-                    goal.description,
-                    goal.category.value if hasattr(goal.category, "value") else str(goal.category),
-                    goal.color_hex,
-                    goal.frequency.value if hasattr(goal.frequency, "value") else str(goal.frequency),
-                    goal.created_at.isoformat() if goal.created_at else None,
-                    1 if goal.is_archived else 0,
-                    goal.current_streak,
-                    goal.longest_streak,
-                ),
-            )
+            params = self._goal_params(goal)
+            self._log.record_row(conn, "goal", goal.goal_id, params[1:])
+            conn.execute(self._INSERT_SQL, params)
             conn.commit()
         except Exception as e:
             conn.rollback()
+            if self._cache is not None:
+                self._cache.evict(goal.goal_id)
+                self._cache.invalidate_user(goal.user_id)
             raise DatabaseError(f"save goal failed: {e}") from e
+        if self._cache is not None:
+            self._cache.put(goal.goal_id, goal)
+            self._cache.invalidate_user(goal.user_id)
+
+    def save_many(self, goals: Iterable[Goal]) -> int:
+        """Insert or replace many goals in one transaction. Returns number written."""
+        goals = list(goals)
+        try:
+            conn = self._db.connect()
+            rows = [self._goal_params(g) for g in goals]
+            for row in rows:
+                self._log.record_row(conn, "goal", row[0], row[1:])
+            conn.executemany(self._INSERT_SQL, rows)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise DatabaseError(f"save_many goals failed: {e}") from e
+        finally:
+            if self._cache is not None:
+                for goal in goals:
+                    self._cache.evict(goal.goal_id)
+                for user_id in {g.user_id for g in goals}:
+                    self._cache.invalidate_user(user_id)
+        return len(goals)
+
+    def _goal_params(self, goal: Goal) -> tuple:
+        """Map Goal model to INSERT parameters."""
+        return (
+            goal.goal_id,
+            goal.user_id,
+            goal.title,
+            goal.description,
+            goal.category.value if hasattr(goal.category, "value") else str(goal.category),
+            goal.color_hex,
+            goal.frequency.value if hasattr(goal.frequency, "value") else str(goal.frequency),
+            goal.created_at.isoformat() if goal.created_at else None,
+            1 if goal.is_archived else 0,
+            goal.current_streak,
+            goal.longest_streak,
+        )
 
-    def delete(self, goal_id: str) -> None:
-        """Delete goal by id."""
+    def delete(self, goal_id: str, now: Optional[datetime] = None) -> List[str]:
+        """
+        Soft-delete goal by id together with its live tasks (same deleted_at stamp).
+
+        restore() brings the goal and exactly those tasks back; purge() removes them for good.
+
+        Returns:
+            Ids of the tasks deleted with the goal (empty if the goal was not live).
+        """
+        stamp = (now or datetime.now()).isoformat()
+        task_ids: List[str] = []
         try:
             conn = self._db.connect()
-            conn.execute("DELETE FROM goal WHERE goal_id = ?", (goal_id,))
+            if conn.execute(
+                "UPDATE goal SET deleted_at = ? WHERE goal_id = ? AND deleted_at IS NULL", (stamp, goal_id)
+            ).rowcount:
+                task_ids = [
+                    row[0]
+                    for row in conn.execute(
+                        "SELECT task_id FROM task WHERE goal_id = ? AND deleted_at IS NULL", (goal_id,)
+                    )
+                ]
+                conn.execute(
+                    "UPDATE task SET deleted_at = ? WHERE goal_id = ? AND deleted_at IS NULL", (stamp, goal_id)
+                )
+                self._log.record_field(conn, "goal", [goal_id], "deleted_at", stamp)
+                self._log.record_field(conn, "task", task_ids, "deleted_at", stamp)
             conn.commit()
         except Exception as e:
             conn.rollback()
             raise DatabaseError(f"delete goal failed: {e}") from e
+        finally:
+            self._invalidate(goal_id, task_ids)
+        return task_ids
+
+    def restore(self, goal_id: str, deleted_after: Optional[datetime] = None) -> Optional[Tuple[Goal, List[str]]]:
+        """
+        Undo a soft delete of goal_id and of the tasks deleted with it.
+
+        Args:
+            deleted_after: Only restore if it was deleted at or after this time (the undo window).
+
+        Returns:
+            (goal, ids of the restored tasks), or None if there is no such deleted goal
+            (or it is too old).
+        """
+        task_ids: List[str] = []
+        try:
+            conn = self._db.connect()
+            row = conn.execute(
+                "SELECT deleted_at FROM goal WHERE goal_id = ? AND deleted_at IS NOT NULL", (goal_id,)
+            ).fetchone()
+            if row is None or (deleted_after is not None and row[0] < deleted_after.isoformat()):
+                return None
+            stamp = row[0]
+            task_ids = [
+                r[0]
+                for r in conn.execute("SELECT task_id FROM task WHERE goal_id = ? AND deleted_at = ?", (goal_id, stamp))
+            ]
+            conn.execute("UPDATE goal SET deleted_at = NULL WHERE goal_id = ?", (goal_id,))
+            conn.execute("UPDATE task SET deleted_at = NULL WHERE goal_id = ? AND deleted_at = ?", (goal_id, stamp))
+            self._log.record_field(conn, "goal", [goal_id], "deleted_at", None)
+            self._log.record_field(conn, "task", task_ids, "deleted_at", None)
+            goal = self._row_to_goal(
+                conn.execute(
+                    """SELECT goal_id, user_id, title, description, category, color_hex,
+                              frequency_type, created_at, is_archived, current_streak, longest_streak
+                       FROM goal WHERE goal_id = ?""",
+                    (goal_id,),
+                ).fetchone()
+            )
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise DatabaseError(f"restore goal failed: {e}") from e
+        finally:
+            self._invalidate(goal_id, task_ids)
+        return goal, task_ids
+
+    def purge(self, deleted_before: datetime, batch_size: int = 500) -> int:
+        """
+        Hard-delete up to batch_size goals soft-deleted before deleted_before (one transaction).
+
+        The delete cascades: the goals' deleted tasks and counters are removed, and
+        tasks restored on their own since are detached (goal_id cleared). Each purged
+        row gets a final change-log tombstone. Call until it returns less than batch_size.
+
+        Returns:
+            Number of goals purged.
+        """
+        try:
+            conn = self._db.connect()
+            ids = [
+                row[0]
+                for row in conn.execute(
+                    """SELECT goal_id FROM goal WHERE deleted_at IS NOT NULL AND deleted_at < ?
+                       ORDER BY deleted_at LIMIT ?""",
+                    (deleted_before.isoformat(), batch_size),
+                )
+            ]
+            for goal_id in ids:
+                tasks = conn.execute(
+                    "SELECT task_id, deleted_at IS NOT NULL FROM task WHERE goal_id = ?", (goal_id,)
+                ).fetchall()
+                deleted = [task_id for task_id, is_deleted in tasks if is_deleted]
+                detached = [task_id for task_id, is_deleted in tasks if not is_deleted]
+                for task_id in deleted:
+                    self._log.record_delete(conn, "task", task_id)
+                self._log.record_field(conn, "task", detached, "goal_id", None)
+                self._log.record_delete(conn, "goal", goal_id)
+                conn.execute("DELETE FROM task WHERE goal_id = ? AND deleted_at IS NOT NULL", (goal_id,))
+                conn.execute("UPDATE task SET goal_id = NULL WHERE goal_id = ?", (goal_id,))
+                conn.execute("DELETE FROM goal_progress WHERE goal_id = ?", (goal_id,))
+                conn.execute("DELETE FROM goal WHERE goal_id = ?", (goal_id,))
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise DatabaseError(f"purge goals failed: {e}") from e
+        return len(ids)
+
+    def _invalidate(self, goal_id: str, task_ids: List[str]) -> None:
+        if self._cache is not None:
+            goal = self._cache.evict(goal_id)
+            self._cache.invalidate_user(goal.user_id if goal is not None else None)
+        tasks = self._db.cache("task")
+        if tasks is not None and task_ids:
+            for task_id in task_ids:
+                tasks.evict(task_id)
+            tasks.invalidate_user(None)
+
+    def get_progress(self, goal_ids: Iterable[str]) -> Dict[str, GoalProgress]:
+        """
+        Return the task counters of the given goals (one indexed lookup, no task scan).
+
+        Goals without linked tasks get zero counters.
+        """
+        ids = list(dict.fromkeys(goal_ids))
+        progress = {goal_id: GoalProgress(goal_id) for goal_id in ids}
+        if not ids:
+            return progress
+        try:
+            conn = self._db.connect()
+            # Chunked to stay under SQLite's host-parameter limit
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                rows = conn.execute(
+                    f"""SELECT goal_id, scheduled, completed, total_minutes, completed_minutes
+                        FROM goal_progress WHERE goal_id IN ({",".join("?" * len(chunk))})""",
+                    chunk,
+                )
+                for row in rows:
+                    progress[row["goal_id"]] = GoalProgress(
+                        goal_id=row["goal_id"],
+                        scheduled=row["scheduled"],
+                        completed=row["completed"],
+                        total_minutes=row["total_minutes"],
+                        completed_minutes=row["completed_minutes"],
+                    )
+        except Exception as e:
+            raise DatabaseError(f"get_progress failed: {e}") from e
+        return progress
+
+    def check_progress(self) -> List[str]:
+        """
+        Compare the goal_progress counters with a full recount of the task table.
+
+        Returns:
+            Ids of goals whose counters differ (empty when consistent).
+        """
+        try:
+            conn = self._db.connect()
+            rows = conn.execute(
+                """WITH actual AS (
+                       SELECT goal_id, COUNT(*) AS scheduled, SUM(is_completed) AS completed,
+                              SUM(COALESCE(duration_minutes, 0)) AS total_minutes,
+                              SUM(CASE WHEN is_completed THEN COALESCE(duration_minutes, 0) ELSE 0 END)
+                                  AS completed_minutes
+                       FROM task WHERE goal_id IS NOT NULL AND deleted_at IS NULL GROUP BY goal_id
+                   ),
+                   stored AS (
+                       SELECT goal_id, scheduled, completed, total_minutes, completed_minutes
+                       FROM goal_progress
+                       WHERE scheduled <> 0 OR completed <> 0 OR total_minutes <> 0 OR completed_minutes <> 0
+                   )
+                   SELECT goal_id FROM (SELECT * FROM actual EXCEPT SELECT * FROM stored)
+                   UNION
+                   SELECT goal_id FROM (SELECT * FROM stored EXCEPT SELECT * FROM actual)"""
+            ).fetchall()
+        except Exception as e:
+            raise DatabaseError(f"check_progress failed: {e}") from e
+        return sorted(row["goal_id"] for row in rows)
+
+    def rebuild_progress(self) -> None:
+        """Recompute every goal's counters from the task table (one transaction)."""
+        conn = self._db.connect()
+        try:
+            conn.commit()
+            conn.executescript("BEGIN;" + GOAL_PROGRESS_REBUILD_SQL + "COMMIT;")
+        except Exception as e:
+            conn.rollback()
+            raise DatabaseError(f"rebuild_progress failed: {e}") from e
 
     def _row_to_goal(self, row) -> Goal:
         """Map DB row to Goal model."""
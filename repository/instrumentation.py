@@ -0,0 +1,352 @@
+"""
+Opt-in query instrumentation for Database connections.
+
+An instrumented connection times every statement (execute plus the fetches that
+drain it), counts rows returned, keeps per-statement latency percentiles and logs
+statements slower than a threshold together with their EXPLAIN QUERY PLAN.
+``set_trace_callback`` supplies the SQL as SQLite actually ran it (parameters
+expanded), and also sees statements issued outside the wrappers
+(``executescript``, trigger bodies).
+
+Enable with ``Database(instrument=True)`` or the ``TASKS_DB_INSTRUMENT=1``
+environment variable; ``Database.stats()`` returns the snapshot.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+_WHITESPACE = re.compile(r"\s+")
+# Statements with no useful query plan
+_NO_PLAN = ("BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE", "PRAGMA", "CREATE", "DROP", "ALTER", "VACUUM")
+
+
+def normalize_sql(sql: str) -> str:
+    """Collapse whitespace so the same statement always maps to one key."""
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+@dataclass
+class StatementStats:
+    """Aggregates for one normalized statement (latencies in seconds)."""
+
+    sql: str
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    rows: int = 0
+    errors: int = 0
+    samples: Deque[float] = field(default_factory=lambda: deque(maxlen=1000))
+
+    def to_dict(self) -> Dict[str, Any]:
+        ordered = sorted(self.samples)
+        return {
+            "sql": self.sql,
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 3),
+            "mean_ms": round(self.total * 1000 / self.count, 3) if self.count else 0.0,
+            "p50_ms": round(_percentile(ordered, 50) * 1000, 3),
+            "p95_ms": round(_percentile(ordered, 95) * 1000, 3),
+            "p99_ms": round(_percentile(ordered, 99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+            "rows": self.rows,
+            "errors": self.errors,
+        }
+
+
+@dataclass
+class SlowQuery:
+    """One statement that took longer than the slow-query threshold."""
+
+    sql: str
+    expanded_sql: Optional[str]
+    duration_ms: float
+    rows: int
+    plan: Optional[List[str]]
+    at: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "at": self.at,
+            "duration_ms": round(self.duration_ms, 3),
+            "rows": self.rows,
+            "sql": self.sql,
+            "expanded_sql": self.expanded_sql,
+            "plan": self.plan,
+        }
+
+
+class QueryInstrumentation:
+    """
+    Collects statement timings for one Database.
+
+    Percentiles are computed over the most recent ``sample_size`` executions of
+    each statement; counts and totals cover the whole lifetime (until reset()).
+    """
+
+    def __init__(
+        self,
+        slow_query_ms: float = 50.0,
+        slow_log_path: Optional[Path] = None,
+        sample_size: int = 1000,
+        max_slow_entries: int = 200,
+    ) -> None:
+        """
+        Args:
+            slow_query_ms: Statements at or above this duration go to the slow log.
+            slow_log_path: Also append slow queries to this file (one JSON object per line).
+            sample_size: Latency samples kept per statement for percentiles.
+            max_slow_entries: Recent slow queries kept in memory.
+        """
+        self.slow_query_ms = slow_query_ms
+        self.slow_log_path = slow_log_path
+        self._sample_size = sample_size
+        self._statements: Dict[str, StatementStats] = {}
+        self._slow: Deque[SlowQuery] = deque(maxlen=max_slow_entries)
+        self._traced: Dict[str, int] = {}
+        self._last_traced: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def trace(self, statement: str) -> None:
+        """sqlite3 trace callback: remember the expanded SQL and count by verb."""
+        self._last_traced = statement
+        verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+        with self._lock:
+            self._traced[verb] = self._traced.get(verb, 0) + 1
+
+    def take_traced(self) -> Optional[str]:
+        """Return and clear the last traced statement."""
+        statement, self._last_traced = self._last_traced, None
+        return statement
+
+    def record(
+        self,
+        sql: str,
+        seconds: float,
+        rows: int = 0,
+        error: bool = False,
+        conn: Optional[sqlite3.Connection] = None,
+        params: Any = None,
+        expanded_sql: Optional[str] = None,
+    ) -> None:
+        """Add one execution; logs it as slow (with its plan, if conn is given) when over threshold."""
+        key = normalize_sql(sql)
+        with self._lock:
+            stats = self._statements.get(key)
+            if stats is None:
+                stats = StatementStats(key, samples=deque(maxlen=self._sample_size))
+                self._statements[key] = stats
+            stats.count += 1
+            stats.total += seconds
+            stats.max = max(stats.max, seconds)
+            stats.rows += rows
+            stats.errors += int(error)
+            stats.samples.append(seconds)
+        if seconds * 1000 >= self.slow_query_ms:
+            plan = explain(conn, sql, params) if conn is not None else None
+            entry = SlowQuery(
+                sql=key,
+                expanded_sql=expanded_sql,
+                duration_ms=seconds * 1000,
+                rows=rows,
+                plan=plan,
+                at=datetime.now().isoformat(timespec="milliseconds"),
+            )
+            self._slow.append(entry)
+            if self.slow_log_path is not None:
+                try:
+                    with open(self.slow_log_path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(entry.to_dict()) + "\n")
+                except OSError:
+                    pass  # diagnostics must never break the app
+
+    def stats(self, top: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Snapshot: statements ordered by total time, traced verb counts, recent slow queries.
+
+        Args:
+            top: Only include the N statements with the highest total time.
+        """
+        with self._lock:
+            statements = sorted(self._statements.values(), key=lambda s: s.total, reverse=True)
+            if top is not None:
+                statements = statements[:top]
+            return {
+                "slow_query_ms": self.slow_query_ms,
+                "statements": [s.to_dict() for s in statements],
+                "traced": dict(self._traced),
+                "slow_queries": [q.to_dict() for q in self._slow],
+            }
+
+    def reset(self) -> None:
+        """Drop all collected data."""
+        with self._lock:
+            self._statements.clear()
+            self._slow.clear()
+            self._traced.clear()
+
+
+def explain(conn: sqlite3.Connection, sql: str, params: Any = None) -> Optional[List[str]]:
+    """
+    Return EXPLAIN QUERY PLAN of sql as indented lines (like the sqlite3 shell), or None.
+
+    Runs on the base Connection.execute so the EXPLAIN itself is not instrumented.
+    """
+    if normalize_sql(sql).split(" ", 1)[0].upper() in _NO_PLAN:
+        return None
+    try:
+        rows = sqlite3.Connection.execute(conn, "EXPLAIN QUERY PLAN " + sql, params or ()).fetchall()
+    except (sqlite3.Error, ValueError):
+        return None
+    depth: Dict[int, int] = {0: -1}
+    lines = []
+    for row in rows:
+        node, parent, detail = row[0], row[1], row[3]
+        depth[node] = depth.get(parent, -1) + 1
+        lines.append("  " * depth[node] + detail)
+    return lines
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """
+    Cursor that times each statement from execute until its rows are drained.
+
+    A statement is recorded when the cursor runs its next statement, is closed or
+    garbage-collected, or a fetch reports no more rows, so time spent stepping
+    through a large result set is attributed to the query that produced it.
+    """
+
+    _pending: Optional[list] = None  # [sql, params, seconds, rows, error, expanded_sql]
+
+    def _finish(self) -> None:
+        pending, self._pending = self._pending, None
+        if pending is None:
+            return
+        conn = self.connection
+        instrumentation = getattr(conn, "instrumentation", None)
+        if instrumentation is not None:
+            sql, params, seconds, rows, error, expanded = pending
+            instrumentation.record(sql, seconds, rows, error, conn, params, expanded)
+
+    def _run(self, method: Any, sql: str, params: Any, plan_params: Any) -> "InstrumentedCursor":
+        self._finish()
+        instrumentation = getattr(self.connection, "instrumentation", None)
+        if instrumentation is not None:
+            instrumentation.take_traced()
+        start = time.perf_counter()
+        try:
+            method(self, sql, params)
+        except Exception:
+            self._pending = [sql, plan_params, time.perf_counter() - start, 0, True, None]
+            self._finish()
+            raise
+        expanded = instrumentation.take_traced() if instrumentation is not None else None
+        self._pending = [sql, plan_params, time.perf_counter() - start, 0, False, expanded]
+        if self.description is None:
+            # Not a query: nothing to fetch, record now.
+            self._finish()
+        return self
+
+    def execute(self, sql: str, parameters: Any = ()) -> "InstrumentedCursor":
+        return self._run(sqlite3.Cursor.execute, sql, parameters, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: Any) -> "InstrumentedCursor":
+        # The parameter iterator is consumed, so slow bulk statements are explained without values.
+        return self._run(sqlite3.Cursor.executemany, sql, seq_of_parameters, None)
+
+    def _fetched(self, start: float, rows: int, exhausted: bool) -> None:
+        pending = self._pending
+        if pending is not None:
+            pending[2] += time.perf_counter() - start
+            pending[3] += rows
+            if exhausted:
+                self._finish()
+
+    def fetchone(self) -> Any:
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(start, row is not None, row is None)
+        return row
+
+    def fetchmany(self, size: Optional[int] = None) -> List[Any]:
+        start = time.perf_counter()
+        size = self.arraysize if size is None else size
+        rows = super().fetchmany(size)
+        self._fetched(start, len(rows), len(rows) < size)
+        return rows
+
+    def fetchall(self) -> List[Any]:
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(start, len(rows), True)
+        return rows
+
+    def __iter__(self) -> "InstrumentedCursor":
+        return self
+
+    def __next__(self) -> Any:
+        row = self.fetchone()
+        if row is None:
+            raise StopIteration
+        return row
+
+    def close(self) -> None:
+        self._finish()
+        super().close()
+
+    def __del__(self) -> None:
+        try:
+            self._finish()
+        except Exception:
+            pass
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose cursors (and execute shortcuts) are instrumented. Pass as ``factory=``."""
+
+    instrumentation: Optional[QueryInstrumentation] = None
+
+    def attach(self, instrumentation: QueryInstrumentation) -> None:
+        """Start recording into instrumentation."""
+        self.instrumentation = instrumentation
+        self.set_trace_callback(instrumentation.trace)
+
+    def cursor(self, factory: Any = InstrumentedCursor) -> Any:  # type: ignore[override]
+        return super().cursor(factory)
+
+    def execute(self, sql: str, parameters: Any = ()) -> Any:  # type: ignore[override]
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, parameters: Any) -> Any:  # type: ignore[override]
+        return self.cursor().executemany(sql, parameters)
+
+    def commit(self) -> None:
+        start = time.perf_counter()
+        try:
+            super().commit()
+        finally:
+            if self.instrumentation is not None:
+                self.instrumentation.take_traced()
+                self.instrumentation.record("COMMIT", time.perf_counter() - start)
+
+    def rollback(self) -> None:
+        start = time.perf_counter()
+        try:
+            super().rollback()
+        finally:
+            if self.instrumentation is not None:
+                self.instrumentation.take_traced()
+                self.instrumentation.record("ROLLBACK", time.perf_counter() - start)
@@ -0,0 +1,107 @@
+"""Repository for the daily_summary table (history and trend reads)."""
+
+from datetime import date, timedelta
+from typing import List, Optional
+
+from repository.database import (
+    DAILY_SUMMARY_DELETE_SQL,
+    DAILY_SUMMARY_INSERT_SQL,
+    DAILY_SUMMARY_SELECT_SQL,
+    Database,
+    DatabaseError,
+    get_database,
+)
+from models import DailySummary
+
+
+class DailySummaryRepository:
+    """
+    Data access for per-user daily counters.
+
+    The rows are written by triggers on the task table (see repository.database);
+    this class only reads them and rebuilds them from the tasks.
+    """
+
+    def __init__(self, db: Optional[Database] = None) -> None:
+        self._db = db or get_database()
+
+    def get_range(self, user_id: str, start: date, end: date) -> List[DailySummary]:
+        """
+        Return one DailySummary per day from start to end (inclusive); days without
+        activity are zero-filled. Reads at most end - start + 1 rows.
+        """
+        try:
+            conn = self._db.connect()
+            rows = conn.execute(
+                """SELECT day, created, completed, minutes_planned, minutes_done
+                   FROM daily_summary WHERE user_id = ? AND day >= ? AND day <= ?""",
+                (user_id, start.isoformat(), end.isoformat()),
+            ).fetchall()
+        except Exception as e:
+            raise DatabaseError(f"get_range failed: {e}") from e
+        by_day = {row["day"]: row for row in rows}
+        days = []
+        for offset in range((end - start).days + 1):
+            day = start + timedelta(days=offset)
+            row = by_day.get(day.isoformat())
+            if row is None:
+                days.append(DailySummary(user_id, day))
+            else:
+                days.append(
+                    DailySummary(
+                        user_id,
+                        day,
+                        created=row["created"],
+                        completed=row["completed"],
+                        minutes_planned=row["minutes_planned"],
+                        minutes_done=row["minutes_done"],
+                    )
+                )
+        return days
+
+    def user_ids(self) -> List[str]:
+        """Ids of all users owning tasks (backfill work list)."""
+        try:
+            conn = self._db.connect()
+            return [row[0] for row in conn.execute("SELECT DISTINCT user_id FROM task ORDER BY user_id")]
+        except Exception as e:
+            raise DatabaseError(f"user_ids failed: {e}") from e
+
+    def rebuild(self, user_id: Optional[str] = None) -> None:
+        """Recompute the rows of one user (None = all users) from the task table in one transaction."""
+        where = "1" if user_id is None else "user_id = :user_id"
+        params = {"user_id": user_id}
+        conn = self._db.connect()
+        try:
+            conn.execute(DAILY_SUMMARY_DELETE_SQL.format(user=where), params)
+            conn.execute(DAILY_SUMMARY_INSERT_SQL.format(user=where), params)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise DatabaseError(f"rebuild daily summary failed: {e}") from e
+
+    def check(self, user_id: str) -> List[date]:
+        """
+        Compare one user's rows with a recount of their tasks.
+
+        Returns:
+            Days whose counters differ (empty when consistent).
+        """
+        where = "user_id = :user_id"
+        try:
+            conn = self._db.connect()
+            rows = conn.execute(
+                f"""WITH actual AS ({DAILY_SUMMARY_SELECT_SQL.format(user=where)}),
+                         stored AS (
+                             SELECT user_id, day, created, completed, minutes_planned, minutes_done
+                             FROM daily_summary WHERE {where}
+                               AND (created <> 0 OR completed <> 0 OR minutes_planned <> 0 OR minutes_done <> 0)
+                         )
+                    SELECT day FROM (SELECT * FROM actual EXCEPT SELECT * FROM stored)
+                    UNION
+                    SELECT day FROM (SELECT * FROM stored EXCEPT SELECT * FROM actual)""",
+                {"user_id": user_id},
+            ).fetchall()
+        except Exception as e:
+            raise DatabaseError(f"check daily summary failed: {e}") from e
+        return sorted(date.fromisoformat(row[0]) for row in rows if row[0])
@@ -1,35 +1,119 @@
 """Task repository for CRUD on Task entity."""
 
-from datetime import datetime
-from typing import List, Optional
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 from repository.database import Database, DatabaseError, get_database
 from models import Task
 from models.enums import Priority, TaskType, TaskStatus
 
 
+def _escape_like(text: str) -> str:
+    """Escape LIKE wildcards so the search text matches literally (ESCAPE '\\')."""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+@dataclass
+class TaskPage:
+    """
+    One page of a keyset-paginated task listing.
+
+    Attributes:
+        tasks: Tasks of this page, in listing order.
+        next_cursor: Opaque token for the following page; None on the last page.
+    """
+
+    tasks: List[Task]
+    next_cursor: Optional[str] = None
+
+
+def _encode_cursor(task: Task, due: Optional[str], created: str) -> str:
+    raw = json.dumps([1, due, created, task.task_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[Optional[str], str, str]:
+    """Return (due, created_at, task_id) of the last row of the previous page."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        version, due, created, task_id = json.loads(raw)
+        if version != 1 or not isinstance(created, str) or not isinstance(task_id, str):
+            raise ValueError
+        return due, created, task_id
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"invalid page cursor: {cursor!r}") from e
+
+
 class TaskRepository:
-    """Data access for Task entity."""
+    """Data access for Task entity (reads and writes go through the db's "task" cache)."""
+
+    # Upsert rather than INSERT OR REPLACE: REPLACE deletes the old row without
+    # firing delete triggers, which would leave the goal_progress counters stale.
+    # user_id is not updated: a save never moves a task to another owner.
+    _INSERT_SQL = """INSERT INTO task
+                   (task_id, user_id, goal_id, title, description, due_date_time, duration_minutes,
+                    priority, task_type, is_completed, completed_at, status, progress_percent, created_at, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(task_id) DO UPDATE SET
+                    goal_id = excluded.goal_id, title = excluded.title,
+                    description = excluded.description, due_date_time = excluded.due_date_time,
+                    duration_minutes = excluded.duration_minutes, priority = excluded.priority,
+                    task_type = excluded.task_type, is_completed = excluded.is_completed,
+                    completed_at = excluded.completed_at, status = excluded.status,
+                    progress_percent = excluded.progress_percent, created_at = excluded.created_at,
+                    updated_at = excluded.updated_at"""
+
+    _SELECT_SQL = """SELECT task_id, user_id, goal_id, title, description, due_date_time,
+                            duration_minutes, priority, task_type, is_completed, completed_at,
+                            status, progress_percent, created_at, updated_at
+                     FROM task"""
 
     def __init__(self, db: Optional[Database] = None) -> None:
         self._db = db or get_database()
+        self._cache = self._db.cache("task")
+        self._log = self._db.change_log()
+
+    @property
+    def db(self) -> Database:
+        """The database this repository reads and writes."""
+        return self._db
 
     def get_by_id(self, task_id: str) -> Optional[Task]:
         """Return task by id or None."""
+        if self._cache is not None:
+            cached = self._cache.get(task_id)
+            if cached is not None:
+                return cached
         try:
             conn = self._db.connect()
-            row = conn.execute(
-                """SELECT task_id, user_id, goal_id, title, description, due_date_time,
-                          duration_minutes, priority, task_type, is_completed, completed_at,
-                          status, progress_percent, created_at, updated_at
-                   FROM task WHERE task_id = ?""",
-                (task_id,),
-            ).fetchone()
+            row = conn.execute(self._SELECT_SQL + " WHERE task_id = ? AND deleted_at IS NULL", (task_id,)).fetchone()
             if row is None:
                 return None
-            return self._row_to_task(row)
+            task = self._row_to_task(row)
         except Exception as e:
             raise DatabaseError(f"get_by_id failed: {e}") from e
+        if self._cache is not None:
+            self._cache.put(task_id, task)
+        return task
+
+    def owners(self, task_ids: Iterable[str]) -> Dict[str, str]:
+        """Return {task_id: user_id} for the ids that exist (soft-deleted rows included)."""
+        ids = list(dict.fromkeys(task_ids))
+        result: Dict[str, str] = {}
+        try:
+            conn = self._db.connect()
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                result.update(
+                    conn.execute(f"SELECT task_id, user_id FROM task WHERE task_id IN ({placeholders})", chunk)
+                )
+        except Exception as e:
+            raise DatabaseError(f"owners failed: {e}") from e
+        return result
 
     def get_all_by_user(
         self,
@@ -47,74 +131,567 @@ class TaskRepository:
             from_date: Only tasks due on or after this date (date part).
             to_date: Only tasks due on or before this date (date part).
             include_completed: Include completed tasks.
-            search_query: If set, filter by title/description containing this string (case-insensitive).
+            search_query: If set, filter by title/description containing this string literally
+                (ASCII case-insensitive, like SQLite LIKE; % and _ are not wildcards).
         """
+        cache_key = (
+            from_date.strftime("%Y-%m-%d") if from_date is not None else None,
+            to_date.strftime("%Y-%m-%d") if to_date is not None else None,
+            include_completed,
+            search_query.strip() if search_query and search_query.strip() else None,
+        )
+        if self._cache is not None:
+            cached = self._cache.get_collection(user_id, cache_key)
+            if cached is not None:
+                return cached
         try:
             conn = self._db.connect()
-            sql = """SELECT task_id, user_id, goal_id, title, description, due_date_time,
-                            duration_minutes, priority, task_type, is_completed, completed_at,
-                            status, progress_percent, created_at, updated_at
-                     FROM task WHERE user_id = ?"""
-            params: list = [user_id]
-            if not include_completed:
-                sql += " AND is_completed = 0"
-            if from_date is not None:
-                sql += " AND date(due_date_time) >= date(?)"
-                params.append(from_date.strftime("%Y-%m-%d"))
-            if to_date is not None:
-                sql += " AND date(due_date_time) <= date(?)"
-                params.append(to_date.strftime("%Y-%m-%d"))
-            if search_query and search_query.strip():
-                sql += " AND (title LIKE ? OR description LIKE ?)"
-                q = f"%{search_query.strip()}%"
-                params.extend([q, q])
-            sql += " ORDER BY due_date_time IS NULL, due_date_time ASC, created_at ASC"
+            sql, params = self._filter_sql(user_id, from_date, to_date, include_completed, search_query)
             rows = conn.execute(sql, params).fetchall()
-            return [self._row_to_task(r) for r in rows]
+            tasks = [self._row_to_task(r) for r in rows]
         except Exception as e:
             raise DatabaseError(f"get_all_by_user failed: {e}") from e
+        if self._cache is not None:
+            self._cache.put_collection(user_id, cache_key, tasks)
+        return tasks
 
-    def save(self, task: Task) -> None:
-        """Insert or replace task."""
+    def iter_by_user(
+        self,
+        user_id: Optional[str],
+        from_date: Optional[datetime] = None,
+        to_date: Optional[datetime] = None,
+        include_completed: bool = True,
+        search_query: Optional[str] = None,
+        batch_size: int = 500,
+    ) -> Iterator[Task]:
+        """
+        Stream tasks (same filters and order as get_all_by_user) without loading them all.
+
+        Rows are fetched batch_size at a time and bypass the cache, so memory stays
+        constant for exports and CLI listings. user_id None streams every user's tasks.
+        Consume the iterator before writing through the same Database.
+        """
         try:
             conn = self._db.connect()
-            conn.execute(
-                """INSERT OR REPLACE INTO task
-                   (task_id, user_id, goal_id, title, description, due_date_time, duration_minutes,
-                    priority, task_type, is_completed, completed_at, status, progress_percent, created_at, updated_at)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    task.task_id,
-                    task.user_id,
-                    task.goal_id,
-                    task.title,
-                    task.description,
-                    task.due_date_time.isoformat() if task.due_date_time else None,
-                    task.duration_minutes,
-                    task.priority.value if hasattr(task.priority, "value") else str(task.priority),
-                    task.type.value if hasattr(task.type, "value") else str(task.type),
-                    1 if task.is_completed else 0,
-                    task.completed_at.isoformat() if task.completed_at else None,
-                    task.status.value if hasattr(task.status, "value") else str(task.status),
-                    task.progress_percent,
-                    task.created_at.isoformat() if task.created_at else None,
-                    task.updated_at.isoformat() if task.updated_at else datetime.now().isoformat(),
-                ),
+            sql, params = self._filter_sql(user_id, from_date, to_date, include_completed, search_query)
+            cursor = conn.execute(sql, params)
+        except Exception as e:
+            raise DatabaseError(f"iter_by_user failed: {e}") from e
+        try:
+            while True:
+                try:
+                    rows = cursor.fetchmany(batch_size)
+                except Exception as e:
+                    raise DatabaseError(f"iter_by_user failed: {e}") from e
+                if not rows:
+                    return
+                for row in rows:
+                    yield self._row_to_task(row)
+        finally:
+            cursor.close()
+
+    def get_page(
+        self,
+        user_id: str,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        from_date: Optional[datetime] = None,
+        to_date: Optional[datetime] = None,
+        include_completed: bool = True,
+        search_query: Optional[str] = None,
+    ) -> TaskPage:
+        """
+        Return up to limit tasks following cursor, in get_all_by_user order.
+
+        Keyset (seek) pagination on (due_date_time, created_at, task_id): each page
+        starts right after the last row of the previous one, so page N costs the
+        same as page 1 and rows inserted meanwhile are neither skipped nor repeated.
+        Dated tasks come first, then undated ones; both runs are read in index order
+        from idx_task_user_due_live with the limit in SQL.
+
+        Args:
+            user_id: Owner user id.
+            limit: Max tasks per page (>= 1).
+            cursor: next_cursor of the previous page; None for the first page.
+            from_date, to_date, include_completed, search_query: As in get_all_by_user
+                (pass the same values for every page).
+
+        Raises:
+            ValueError: If cursor is malformed.
+            DatabaseError: If the query fails.
+        """
+        limit = max(1, int(limit))
+        after = _decode_cursor(cursor) if cursor else None
+        cache_key = (
+            "page",
+            cursor,
+            limit,
+            from_date.strftime("%Y-%m-%d") if from_date is not None else None,
+            to_date.strftime("%Y-%m-%d") if to_date is not None else None,
+            include_completed,
+            search_query.strip() if search_query and search_query.strip() else None,
+        )
+        if self._cache is not None:
+            cached = self._cache.get_collection(user_id, cache_key)
+            if cached is not None:
+                return TaskPage(cached[:limit], self._next_cursor(cached, limit))
+        clauses, params = self._filter_clauses(user_id, from_date, to_date, include_completed, search_query)
+        rows: List[Any] = []
+        try:
+            conn = self._db.connect()
+            # Run 1: dated tasks after the cursor (skipped once the cursor is in the undated run)
+            if after is None or after[0] is not None:
+                seek, seek_params = ["due_date_time IS NOT NULL"], []
+                if after is not None:
+                    seek.append("(due_date_time, created_at, task_id) > (?, ?, ?)")
+                    seek_params = list(after)
+                rows = conn.execute(
+                    f"{self._SELECT_SQL} WHERE {' AND '.join(clauses + seek)}"
+                    " ORDER BY due_date_time, created_at, task_id LIMIT ?",
+                    params + seek_params + [limit + 1],
+                ).fetchall()
+            # Run 2: undated tasks (a date filter excludes them)
+            if len(rows) <= limit and from_date is None and to_date is None:
+                seek, seek_params = ["due_date_time IS NULL"], []
+                if after is not None and after[0] is None:
+                    seek.append("(created_at, task_id) > (?, ?)")
+                    seek_params = [after[1], after[2]]
+                rows += conn.execute(
+                    f"{self._SELECT_SQL} WHERE {' AND '.join(clauses + seek)}"
+                    " ORDER BY created_at, task_id LIMIT ?",
+                    params + seek_params + [limit + 1 - len(rows)],
+                ).fetchall()
+            tasks = [self._row_to_task(r) for r in rows]
+        except Exception as e:
+            raise DatabaseError(f"get_page failed: {e}") from e
+        if self._cache is not None:
+            self._cache.put_collection(user_id, cache_key, tasks)
+        return TaskPage(tasks[:limit], self._next_cursor(tasks, limit))
+
+    def _next_cursor(self, tasks: List[Task], limit: int) -> Optional[str]:
+        """Cursor after tasks[limit - 1] if a further row was fetched (limit + 1 rows)."""
+        if len(tasks) <= limit:
+            return None
+        last = tasks[limit - 1]
+        params = self._task_params(last)
+        return _encode_cursor(last, params[5], params[13])
+
+    def _filter_sql(
+        self,
+        user_id: Optional[str],
+        from_date: Optional[datetime],
+        to_date: Optional[datetime],
+        include_completed: bool,
+        search_query: Optional[str],
+    ) -> Tuple[str, List[Any]]:
+        """Build the filtered, ordered SELECT shared by get_all_by_user and iter_by_user."""
+        clauses, params = self._filter_clauses(user_id, from_date, to_date, include_completed, search_query)
+        sql = self._SELECT_SQL
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY due_date_time IS NULL, due_date_time ASC, created_at ASC, task_id ASC"
+        return sql, params
+
+    def _filter_clauses(
+        self,
+        user_id: Optional[str],
+        from_date: Optional[datetime],
+        to_date: Optional[datetime],
+        include_completed: bool,
+        search_query: Optional[str],
+    ) -> Tuple[List[str], List[Any]]:
+        """
+        WHERE clauses for the listing filters.
+
+        Due dates are stored as ISO strings, so day bounds compare the raw column
+        (due >= 'YYYY-MM-DD' and due < next day) and can use idx_task_user_due_live.
+        Deleted tasks are always left out (the partial index only holds live rows).
+        """
+        clauses = ["deleted_at IS NULL"]
+        params: List[Any] = []
+        if user_id is not None:
+            clauses.append("user_id = ?")
+            params.append(user_id)
+        if not include_completed:
+            clauses.append("is_completed = 0")
+        if from_date is not None:
+            clauses.append("due_date_time >= ?")
+            params.append(from_date.strftime("%Y-%m-%d"))
+        if to_date is not None:
+            clauses.append("due_date_time < ?")
+            params.append((to_date.date() + timedelta(days=1)).strftime("%Y-%m-%d"))
+        if search_query and search_query.strip():
+            clauses.append("(title LIKE ? ESCAPE '\\' OR description LIKE ? ESCAPE '\\')")
+            q = f"%{_escape_like(search_query.strip())}%"
+            params.extend([q, q])
+        return clauses, params
+
+    def summary_by_user(self, user_id: str, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Aggregate counts computed in SQL (no rows are loaded).
+
+        Returns:
+            Dict with total, completed, open, overdue, unscheduled and by_priority counts.
+        """
+        now = now or datetime.now()
+        try:
+            conn = self._db.connect()
+            row = conn.execute(
+                """SELECT COUNT(*) AS total,
+                          COALESCE(SUM(is_completed), 0) AS completed,
+                          COALESCE(SUM(is_completed = 0 AND due_date_time < ?), 0) AS overdue,
+                          COALESCE(SUM(is_completed = 0 AND due_date_time IS NULL), 0) AS unscheduled
+                   FROM task WHERE user_id = ? AND deleted_at IS NULL""",
+                (now.isoformat(), user_id),
+            ).fetchone()
+            by_priority = {
+                r["priority"]: r["n"]
+                for r in conn.execute(
+                    """SELECT priority, COUNT(*) AS n FROM task
+                       WHERE user_id = ? AND deleted_at IS NULL AND is_completed = 0 GROUP BY priority""",
+                    (user_id,),
+                )
+            }
+        except Exception as e:
+            raise DatabaseError(f"summary_by_user failed: {e}") from e
+        return {
+            "total": row["total"],
+            "completed": row["completed"],
+            "open": row["total"] - row["completed"],
+            "overdue": row["overdue"],
+            "unscheduled": row["unscheduled"],
+            "by_priority": by_priority,
+        }
+
+    def get_unscheduled(self, user_id: str) -> List[Task]:
+        """Open tasks of user with a duration but no due date (auto-scheduler input), oldest first."""
+        try:
+            conn = self._db.connect()
+            rows = conn.execute(
+                f"""{self._SELECT_SQL}
+                    WHERE user_id = ? AND deleted_at IS NULL AND due_date_time IS NULL AND is_completed = 0
+                      AND duration_minutes > 0
+                    ORDER BY created_at, task_id""",
+                (user_id,),
+            ).fetchall()
+        except Exception as e:
+            raise DatabaseError(f"get_unscheduled failed: {e}") from e
+        return [self._row_to_task(row) for row in rows]
+
+    def iter_open_intervals(self, user_id: str) -> Iterator[Tuple[str, datetime, int]]:
+        """
+        Stream (task_id, due_date_time, duration_minutes) of the user's open timed tasks.
+
+        Only three columns are read and no Task objects are built (schedule index warm-up).
+        """
+        try:
+            conn = self._db.connect()
+            cursor = conn.execute(
+                """SELECT task_id, due_date_time, duration_minutes FROM task
+                   WHERE user_id = ? AND deleted_at IS NULL AND due_date_time IS NOT NULL AND is_completed = 0""",
+                (user_id,),
+            )
+            for task_id, due, duration in cursor:
+                yield task_id, datetime.fromisoformat(due), duration or 0
+        except Exception as e:
+            raise DatabaseError(f"iter_open_intervals failed: {e}") from e
+
+    def iter_open_rank_rows(
+        self, user_id: str
+    ) -> Iterator[Tuple[str, Priority, Optional[datetime], int, Optional[str]]]:
+        """
+        Stream (task_id, priority, due_date_time, duration_minutes, goal_id) of the user's open tasks.
+
+        Only the columns urgency ranking needs are read and no Task objects are built.
+        """
+        try:
+            conn = self._db.connect()
+            cursor = conn.execute(
+                """SELECT task_id, priority, due_date_time, duration_minutes, goal_id FROM task
+                   WHERE user_id = ? AND deleted_at IS NULL AND is_completed = 0""",
+                (user_id,),
             )
+            for task_id, priority, due, duration, goal_id in cursor:
+                yield (
+                    task_id,
+                    Priority(priority) if priority else Priority.MEDIUM,
+                    datetime.fromisoformat(due) if due else None,
+                    duration or 0,
+                    goal_id,
+                )
+        except Exception as e:
+            raise DatabaseError(f"iter_open_rank_rows failed: {e}") from e
+
+    def save(self, task: Task) -> None:
+        """Insert or replace task (a soft-deleted task stays deleted and is not cached)."""
+        try:
+            conn = self._db.connect()
+            params = self._task_params(task)
+            self._log.record_row(conn, "task", task.task_id, params[1:])
+            conn.execute(self._INSERT_SQL, params)
+            cacheable = self._cacheable(conn, [task])
             conn.commit()
         except Exception as e:
             conn.rollback()
+            if self._cache is not None:
+                self._cache.evict(task.task_id)
+                self._cache.invalidate_user(task.user_id)
             raise DatabaseError(f"save task failed: {e}") from e
+        if self._cache is not None:
+            if task.task_id in cacheable:
+                self._cache.put(task.task_id, task)
+            else:
+                self._cache.evict(task.task_id)
+            self._cache.invalidate_user(task.user_id)
+
+    def save_many(self, tasks: Iterable[Task]) -> int:
+        """
+        Insert or replace many tasks in one transaction (bulk path for imports/generators).
+
+        Saved tasks are not added to the entity cache; affected users' collections are dropped.
+
+        Returns:
+            Number of tasks written.
+        """
+        users = set()
+        ids = []
+
+        def params():
+            for task in tasks:
+                users.add(task.user_id)
+                ids.append(task.task_id)
+                yield self._task_params(task)
 
-    def delete(self, task_id: str) -> None:
-        """Delete task by id."""
         try:
             conn = self._db.connect()
-            conn.execute("DELETE FROM task WHERE task_id = ?", (task_id,))
+            rows = params()
+            if self._log.enabled:
+                rows = list(rows)
+                for row in rows:
+                    self._log.record_row(conn, "task", row[0], row[1:])
+            conn.executemany(self._INSERT_SQL, rows)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise DatabaseError(f"save_many tasks failed: {e}") from e
+        finally:
+            if self._cache is not None:
+                for task_id in ids:
+                    self._cache.evict(task_id)
+                for user_id in users:
+                    self._cache.invalidate_user(user_id)
+        return len(ids)
+
+    def _task_params(self, task: Task) -> tuple:
+        """Map Task model to INSERT parameters."""
+        return (
+            task.task_id,
+            task.user_id,
+            task.goal_id,
+            task.title,
+            task.description,
+            task.due_date_time.isoformat() if task.due_date_time else None,
+            task.duration_minutes,
+            task.priority.value if hasattr(task.priority, "value") else str(task.priority),
+            task.type.value if hasattr(task.type, "value") else str(task.type),
+            1 if task.is_completed else 0,
+            task.completed_at.isoformat() if task.completed_at else None,
+            task.status.value if hasattr(task.status, "value") else str(task.status),
+            task.progress_percent,
+            task.created_at.isoformat() if task.created_at else None,
+            task.updated_at.isoformat() if task.updated_at else datetime.now().isoformat(),
+        )
+
+    def delete(self, task_id: str, now: Optional[datetime] = None) -> bool:
+        """
+        Soft-delete task by id: stamp deleted_at so reads skip it until restore() or purge().
+
+        Returns:
+            True if a live task was deleted.
+        """
+        try:
+            conn = self._db.connect()
+            deleted = self._soft_delete(conn, task_id, (now or datetime.now()).isoformat())
             conn.commit()
         except Exception as e:
             conn.rollback()
             raise DatabaseError(f"delete task failed: {e}") from e
+        finally:
+            self._invalidate_deleted(task_id)
+        return deleted
+
+    def restore(self, task_id: str, deleted_after: Optional[datetime] = None) -> Optional[Task]:
+        """
+        Undo a soft delete of task_id.
+
+        A task whose goal is deleted too is restored without the goal (goal_id cleared),
+        so it never points at a row that purge() will remove.
+
+        Args:
+            deleted_after: Only restore if it was deleted at or after this time (the undo window).
+
+        Returns:
+            The restored task, or None if there is no such deleted task (or it is too old).
+        """
+        try:
+            conn = self._db.connect()
+            task = None
+            if self._restore(conn, task_id, deleted_after):
+                task = self._row_to_task(conn.execute(self._SELECT_SQL + " WHERE task_id = ?", (task_id,)).fetchone())
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise DatabaseError(f"restore task failed: {e}") from e
+        if task is not None and self._cache is not None:
+            self._cache.put(task_id, task)
+            self._cache.invalidate_user(task.user_id)
+        return task
+
+    def write_batch(
+        self,
+        saves: Iterable[Task] = (),
+        deletes: Iterable[str] = (),
+        restores: Iterable[str] = (),
+        deleted_after: Optional[datetime] = None,
+        now: Optional[datetime] = None,
+    ) -> Tuple[List[Task], List[str]]:
+        """
+        Restore, then save, then soft-delete tasks, all in one transaction (one commit).
+
+        The write path of batched edits (services.commands): a burst of changes costs
+        one fsync instead of one per change.
+
+        Args:
+            saves: Tasks to insert or replace.
+            deletes: Ids to soft-delete.
+            restores: Ids to restore (deleted_after as in restore()).
+
+        Returns:
+            (restored tasks as stored after the saves, ids actually deleted).
+        """
+        saves, deletes = list(saves), list(deletes)
+        stamp = (now or datetime.now()).isoformat()
+        restored: List[Task] = []
+        deleted: List[str] = []
+        try:
+            conn = self._db.connect()
+            restored_ids = [task_id for task_id in restores if self._restore(conn, task_id, deleted_after)]
+            rows = [self._task_params(task) for task in saves]
+            for row in rows:
+                self._log.record_row(conn, "task", row[0], row[1:])
+            conn.executemany(self._INSERT_SQL, rows)
+            cacheable = self._cacheable(conn, saves)
+            deleted = [task_id for task_id in deletes if self._soft_delete(conn, task_id, stamp)]
+            restored = [
+                self._row_to_task(conn.execute(self._SELECT_SQL + " WHERE task_id = ?", (task_id,)).fetchone())
+                for task_id in restored_ids
+            ]
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            if self._cache is not None:
+                for task in saves:
+                    self._cache.evict(task.task_id)
+                    self._cache.invalidate_user(task.user_id)
+            raise DatabaseError(f"write_batch tasks failed: {e}") from e
+        finally:
+            for task_id in deletes:
+                self._invalidate_deleted(task_id)
+        if self._cache is not None:
+            for task in saves:
+                if task.task_id in cacheable and task.task_id not in deleted:
+                    self._cache.put(task.task_id, task)
+                else:
+                    self._cache.evict(task.task_id)
+                self._cache.invalidate_user(task.user_id)
+            for task in restored:
+                if task.task_id not in deleted:
+                    self._cache.put(task.task_id, task)
+                self._cache.invalidate_user(task.user_id)
+        return restored, deleted
+
+    def _cacheable(self, conn, tasks: List[Task]) -> Set[str]:
+        """
+        Ids of just-saved tasks whose stored row matches the saved object.
+
+        The upsert keeps deleted_at and user_id, so saving a stale copy of a deleted
+        (or another user's) task must not put that copy into the cache.
+        """
+        owners = {task.task_id: task.user_id for task in tasks}
+        ids = list(owners)
+        result: Set[str] = set()
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            for task_id, user_id in conn.execute(
+                f"SELECT task_id, user_id FROM task WHERE task_id IN ({placeholders}) AND deleted_at IS NULL", chunk
+            ):
+                if owners[task_id] == user_id:
+                    result.add(task_id)
+        return result
+
+    def _soft_delete(self, conn, task_id: str, stamp: str) -> bool:
+        """Stamp deleted_at on a live task (in the caller's transaction)."""
+        if not conn.execute(
+            "UPDATE task SET deleted_at = ? WHERE task_id = ? AND deleted_at IS NULL", (stamp, task_id)
+        ).rowcount:
+            return False
+        self._log.record_field(conn, "task", [task_id], "deleted_at", stamp)
+        return True
+
+    def _restore(self, conn, task_id: str, deleted_after: Optional[datetime]) -> bool:
+        """Clear deleted_at (and a deleted goal's goal_id) in the caller's transaction."""
+        row = conn.execute(
+            "SELECT deleted_at FROM task WHERE task_id = ? AND deleted_at IS NOT NULL", (task_id,)
+        ).fetchone()
+        if row is None or (deleted_after is not None and row[0] < deleted_after.isoformat()):
+            return False
+        conn.execute("UPDATE task SET deleted_at = NULL WHERE task_id = ?", (task_id,))
+        self._log.record_field(conn, "task", [task_id], "deleted_at", None)
+        detached = conn.execute(
+            """UPDATE task SET goal_id = NULL WHERE task_id = ? AND goal_id IN (
+                   SELECT goal_id FROM goal WHERE deleted_at IS NOT NULL)""",
+            (task_id,),
+        ).rowcount
+        if detached:
+            self._log.record_field(conn, "task", [task_id], "goal_id", None)
+        return True
+
+    def purge(self, deleted_before: datetime, batch_size: int = 500) -> int:
+        """
+        Hard-delete up to batch_size tasks soft-deleted before deleted_before (one transaction).
+
+        Expired tombstones are found through idx_task_deleted; each purged task gets a
+        final change-log tombstone. Call until it returns less than batch_size.
+
+        Returns:
+            Number of tasks purged.
+        """
+        try:
+            conn = self._db.connect()
+            ids = [
+                row[0]
+                for row in conn.execute(
+                    """SELECT task_id FROM task WHERE deleted_at IS NOT NULL AND deleted_at < ?
+                       ORDER BY deleted_at LIMIT ?""",
+                    (deleted_before.isoformat(), batch_size),
+                )
+            ]
+            for task_id in ids:
+                self._log.record_delete(conn, "task", task_id)
+            conn.executemany("DELETE FROM task WHERE task_id = ?", [(task_id,) for task_id in ids])
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise DatabaseError(f"purge tasks failed: {e}") from e
+        return len(ids)
+
+    def _invalidate_deleted(self, task_id: str) -> None:
+        if self._cache is None:
+            return
+        task = self._cache.evict(task_id)
+        # Owner unknown if the task was not cached: drop every user's collections
+        self._cache.invalidate_user(task.user_id if task is not None else None)
 
     def _row_to_task(self, row) -> Task:
         """Map DB row to Task model."""
@@ -0,0 +1,185 @@
+"""
+Routing of users to databases: one shared file, or one shard file per user.
+
+The shared database (tasks.db) is always the user directory. With sharding
+enabled each user's goals and tasks live in ``<shard_dir>/<user>.db``, so files
+stay small (hot in the page cache) and users never wait on each other's write
+locks. Shard connections are opened on first use and closed lazily: when more
+than ``max_open`` are open, or a user has been inactive for ``idle_seconds``.
+A closed shard reconnects transparently on its next query.
+
+Like Database, a registry belongs to one thread (SQLite connections do).
+"""
+
+import hashlib
+import os
+import re
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from repository.database import Database, DatabaseError, get_database
+from repository.goal_repository import GoalRepository
+from repository.task_repository import TaskRepository
+
+# Directory for per-user shard files; unset = everyone shares tasks.db.
+SHARDS_ENV = "TASKS_DB_SHARDS"
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+class UserRegistry:
+    """Returns the Database holding a user's goals and tasks."""
+
+    def __init__(
+        self,
+        directory: Optional[Database] = None,
+        shard_dir: Optional[Path] = None,
+        max_open: int = 8,
+        idle_seconds: Optional[float] = 300.0,
+        **db_options: Any,
+    ) -> None:
+        """
+        Args:
+            directory: Shared database with the user table (default: the app database).
+            shard_dir: Directory of per-user files (None = no sharding).
+            max_open: Shard connections kept open; least recently used are closed first.
+            idle_seconds: Close shards unused for this long (None = only max_open applies).
+            db_options: Passed to Database() for shard files (cache_size, instrument, ...).
+        """
+        self._directory = directory or get_database()
+        self._shard_dir = Path(shard_dir) if shard_dir is not None else None
+        self._max_open = max(1, max_open)
+        self._idle_seconds = idle_seconds
+        self._db_options = db_options
+        # user_id -> (Database, last used); most recently used last
+        self._shards: "OrderedDict[str, tuple]" = OrderedDict()
+
+    @property
+    def directory(self) -> Database:
+        """The shared database (user directory; all data when not sharded)."""
+        return self._directory
+
+    @property
+    def sharded(self) -> bool:
+        return self._shard_dir is not None
+
+    def shard_path(self, user_id: str) -> Path:
+        """
+        File holding user_id's data when sharded.
+
+        Ids that are not plain file names are made safe and suffixed with a hash
+        so different ids never share a file.
+        """
+        if self._shard_dir is None:
+            raise DatabaseError("sharding is not enabled")
+        safe = _UNSAFE.sub("_", user_id)[:64]
+        if safe != user_id:
+            safe += "-" + hashlib.sha1(user_id.encode("utf-8")).hexdigest()[:10]
+        return self._shard_dir / f"{safe}.db"
+
+    def database_for(self, user_id: str) -> Database:
+        """Return the Database for user_id (opens the shard lazily; closes idle ones)."""
+        if self._shard_dir is None:
+            return self._directory
+        now = time.monotonic()
+        entry = self._shards.pop(user_id, None)
+        db = entry[0] if entry is not None else Database(self.shard_path(user_id), **self._db_options)
+        self._shards[user_id] = (db, now)
+        self.close_idle(now)
+        return db
+
+    def close_idle(self, now: Optional[float] = None) -> int:
+        """
+        Close shard connections beyond max_open or idle longer than idle_seconds.
+
+        The Database objects are kept (repositories may hold them) and reconnect on
+        next use; their caches are dropped with the connection.
+
+        Returns:
+            Number of connections closed.
+        """
+        now = time.monotonic() if now is None else now
+        open_ids = [uid for uid, (db, _) in self._shards.items() if db.is_connected]
+        excess = len(open_ids) - self._max_open
+        closed = 0
+        for user_id in open_ids:  # least recently used first
+            db, last_used = self._shards[user_id]
+            idle = self._idle_seconds is not None and now - last_used > self._idle_seconds
+            if closed < excess or idle:
+                db.close()
+                db.clear_caches()
+                closed += 1
+        return closed
+
+    def open_count(self) -> int:
+        """Number of shard connections currently open."""
+        return sum(1 for db, _ in self._shards.values() if db.is_connected)
+
+    def close(self) -> None:
+        """Close every shard connection (the directory database is left open)."""
+        for db, _ in self._shards.values():
+            db.close()
+        self._shards.clear()
+
+    def migrate_user(self, user_id: str, batch_size: int = 5000) -> Dict[str, int]:
+        """
+        Move user_id's goals and tasks from the shared file into their shard.
+
+        Rows are copied in batches and only deleted from the shared file once the
+        copy is complete; re-running after an interruption is safe (rows are upserted).
+        Soft-deleted rows are not moved: migrating ends their undo window early.
+
+        Returns:
+            Dict with the number of "goals" and "tasks" moved.
+
+        Raises:
+            DatabaseError: If sharding is not enabled or a write fails.
+        """
+        if self._shard_dir is None:
+            raise DatabaseError("sharding is not enabled")
+        shard = self.database_for(user_id)
+        goals = GoalRepository(self._directory).get_all_by_user(user_id, include_archived=True)
+        moved = {"goals": GoalRepository(shard).save_many(goals), "tasks": 0}
+        target = TaskRepository(shard)
+        batch = []
+        for task in TaskRepository(self._directory).iter_by_user(user_id, batch_size=batch_size):
+            batch.append(task)
+            if len(batch) >= batch_size:
+                moved["tasks"] += target.save_many(batch)
+                batch = []
+        if batch:
+            moved["tasks"] += target.save_many(batch)
+        conn = self._directory.connect()
+        try:
+            conn.execute("DELETE FROM task WHERE user_id = ?", (user_id,))
+            conn.execute("DELETE FROM goal WHERE user_id = ?", (user_id,))
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise DatabaseError(f"migrate_user failed: {e}") from e
+        self._directory.clear_caches()
+        return moved
+
+    def stats(self) -> Dict[str, Any]:
+        """Shard routing snapshot (for diagnostics)."""
+        return {
+            "sharded": self.sharded,
+            "shard_dir": str(self._shard_dir) if self._shard_dir is not None else None,
+            "shards": len(self._shards),
+            "open": self.open_count(),
+            "max_open": self._max_open,
+        }
+
+
+_registry: Optional[UserRegistry] = None
+
+
+def get_user_registry() -> UserRegistry:
+    """Return singleton UserRegistry over the app database (sharded if TASKS_DB_SHARDS is set)."""
+    global _registry
+    if _registry is None:
+        shard_dir = os.environ.get(SHARDS_ENV)
+        _registry = UserRegistry(shard_dir=Path(shard_dir) if shard_dir else None)
+    return _registry
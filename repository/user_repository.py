@@ -1,21 +1,33 @@
 """User repository for CRUD on User entity."""
 
+from dataclasses import replace
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from repository.database import Database, DatabaseError, get_database
 from models import User
 from models.user import NotificationPreferences
 
 
+def _copy_user(user: User) -> User:
+    """Copy user including its (mutable) preferences."""
+    return replace(user, preferences=replace(user.preferences))
+
+
 class UserRepository:
-    """Data access for User and preferences."""
+    """Data access for User and preferences (reads and writes go through the db's "user" cache)."""
 
     def __init__(self, db: Optional[Database] = None) -> None:
         self._db = db or get_database()
+        self._cache = self._db.cache("user", copier=_copy_user)
+        self._log = self._db.change_log()
 
     def get_by_id(self, user_id: str) -> Optional[User]:
         """Return user by id or None if not found."""
+        if self._cache is not None:
+            cached = self._cache.get(user_id)
+            if cached is not None:
+                return cached
         try:
             conn = self._db.connect()
             row = conn.execute(
@@ -25,7 +37,7 @@ class UserRepository:
             if row is None:
                 return None
             prefs = self._get_preferences(conn, user_id)
-            return User(
+            user = User(
                 user_id=row["user_id"],
                 name=row["name"],
                 email=row["email"],
@@ -35,6 +47,18 @@ class UserRepository:
             )
         except Exception as e:
             raise DatabaseError(f"get_by_id failed: {e}") from e
+        if self._cache is not None:
+            self._cache.put(user_id, user)
+        return user
+
+    def get_all(self) -> List[User]:
+        """Return all users ordered by name."""
+        try:
+            conn = self._db.connect()
+            ids = [row["user_id"] for row in conn.execute("SELECT user_id FROM user ORDER BY name, user_id")]
+        except Exception as e:
+            raise DatabaseError(f"get_all failed: {e}") from e
+        return [user for user in (self.get_by_id(user_id) for user_id in ids) if user is not None]
 
     def _get_preferences(self, conn, user_id: str) -> NotificationPreferences:
         """Load preferences for user."""
@@ -51,8 +75,21 @@ class UserRepository:
 
     def save(self, user: User) -> None:
         """Insert or replace user and preferences."""
+        conn = self._db.connect()
         try:
-            conn = self._db.connect()
+            self._log.record_row(
+                conn,
+                "user",
+                user.user_id,
+                (
+                    user.name,
+                    user.email,
+                    1 if user.is_student_mode else 0,
+                    user.created_at.isoformat() if user.created_at else None,
+                    1 if user.preferences.enabled else 0,
+                    user.preferences.default_reminder_minutes,
+                ),
+            )
             conn.execute(
                 """INSERT OR REPLACE INTO user (user_id, name, email, is_student_mode, created_at, updated_at)
                    VALUES (?, ?, ?, ?, ?, ?)""",
@@ -77,8 +114,9 @@ class UserRepository:
             )
             conn.commit()
         except Exception as e:
-            try:
-                conn.rollback()
-            except NameError:
-                pass
+            conn.rollback()
+            if self._cache is not None:
+                self._cache.evict(user.user_id)
             raise DatabaseError(f"save user failed: {e}") from e
+        if self._cache is not None:
+            self._cache.put(user.user_id, user)
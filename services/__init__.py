@@ -1,7 +1,55 @@
-"""Service layer (use cases / business logic)."""
+"""Service layer (use cases / business logic).
 
-from .task_service import TaskService
-from .goal_service import GoalService
-from .user_service import UserService
+Public names are resolved lazily (PEP 562); see ``lazy_exports``.
+"""
 
-__all__ = ["TaskService", "GoalService", "UserService"]
+from typing import TYPE_CHECKING
+
+from lazy_exports import lazy_exports
+
+if TYPE_CHECKING:
+    from .task_service import TaskService
+    from .goal_service import GoalService
+    from .user_service import UserService
+    from .import_export import ImportExportService
+    from .history_service import HistoryService
+    from .schedule_index import ScheduleIndex
+    from .scheduler import AutoScheduler, SchedulerConfig
+    from .ranking import RankingEngine
+    from .sync import SyncEngine
+    from .backup import BackupManager, BackupScheduler, RetentionPolicy
+    from .purge import PurgeResult, PurgeScheduler, TombstonePurger
+    from .commands import CommandStack
+    from .session import UserSession, open_session
+    from .events import ChangeEvent, ChangeKind, EventBus, get_event_bus
+
+# Public name -> defining submodule
+_LAZY_ATTRS = {
+    "TaskService": ".task_service",
+    "GoalService": ".goal_service",
+    "UserService": ".user_service",
+    "ImportExportService": ".import_export",
+    "HistoryService": ".history_service",
+    "ScheduleIndex": ".schedule_index",
+    "AutoScheduler": ".scheduler",
+    "SchedulerConfig": ".scheduler",
+    "RankingEngine": ".ranking",
+    "SyncEngine": ".sync",
+    "BackupManager": ".backup",
+    "BackupScheduler": ".backup",
+    "RetentionPolicy": ".backup",
+    "TombstonePurger": ".purge",
+    "PurgeScheduler": ".purge",
+    "PurgeResult": ".purge",
+    "CommandStack": ".commands",
+    "UserSession": ".session",
+    "open_session": ".session",
+    "ChangeEvent": ".events",
+    "ChangeKind": ".events",
+    "EventBus": ".events",
+    "get_event_bus": ".events",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_ATTRS)
@@ -0,0 +1,420 @@
+"""
+Online snapshots of the database file, with retention and restore.
+
+Snapshots are copied with SQLite's online backup API on connections of their
+own, a batch of pages per step, so they can run on a background thread while
+the app keeps reading and writing. In WAL mode (the Database default) the copy
+reads one consistent version of the file and never blocks writers. With a
+rollback journal each step holds a read lock only briefly, but a write in
+between restarts the copy; the batch then grows so the copy still finishes.
+
+A snapshot is written to "<name>.partial", checked, flushed to disk and only
+then renamed, so a crash never leaves a half-written file that looks complete.
+Files live in backups/ next to the database (or TASKS_BACKUP_DIR) and are named
+"<db stem>-<YYYYmmdd-HHMMSSffffff>[-<label>].db". Unlabelled snapshots are the
+automatic ones; retention (RetentionPolicy) only prunes those by default.
+
+    manager = BackupManager(db)
+    snapshot = manager.submit("before-import").result()   # copied on a worker thread
+    manager.restore(snapshot)                              # on the database's thread
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, List, Optional, Sequence, Set
+
+from repository.database import Database, DatabaseError
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+BACKUP_DIR_ENV = "TASKS_BACKUP_DIR"
+# Pages copied per backup step (4 MiB at the default 4 KiB page size)
+DEFAULT_PAGES_PER_STEP = 1024
+# Seconds the copy yields between steps, so writers and the UI thread get a turn
+DEFAULT_STEP_PAUSE = 0.002
+# Automatic snapshots: at most one per interval, and only if the file changed
+DEFAULT_INTERVAL = timedelta(hours=6)
+
+_STAMP = "%Y%m%d-%H%M%S%f"
+
+# (copied pages, total pages) after each step
+Progress = Callable[[int, int], None]
+
+
+class _Restarted(Exception):
+    """The source changed under a stepped copy (rollback journal only)."""
+
+
+class _Cancelled(Exception):
+    """BackupManager.cancel() or close() was called during a copy."""
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """One snapshot file. label is "" for automatic snapshots."""
+
+    path: Path
+    created: datetime
+    label: str = ""
+    size: int = 0
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+
+@dataclass
+class RetentionPolicy:
+    """
+    Which snapshots prune() keeps: the newest keep_last, plus the newest one of
+    each of the last `daily` days, `weekly` ISO weeks and `monthly` months that
+    have a snapshot. Labelled snapshots are kept unless prune_labelled is set.
+    """
+
+    keep_last: int = 5
+    daily: int = 7
+    weekly: int = 4
+    monthly: int = 12
+    prune_labelled: bool = False
+
+    def keep(self, snapshots: Sequence[Snapshot]) -> Set[Path]:
+        """Paths of the snapshots to keep."""
+        ordered = sorted(snapshots, key=lambda s: s.created, reverse=True)
+        kept = {s.path for s in ordered if s.label and not self.prune_labelled}
+        candidates = [s for s in ordered if s.path not in kept]
+        kept.update(s.path for s in candidates[: max(self.keep_last, 0)])
+        periods = (
+            (self.daily, lambda d: d.date()),
+            (self.weekly, lambda d: d.isocalendar()[:2]),
+            (self.monthly, lambda d: (d.year, d.month)),
+        )
+        for count, period in periods:
+            seen = set()
+            for snapshot in candidates:
+                key = period(snapshot.created)
+                if key in seen:
+                    continue
+                if len(seen) >= count:
+                    break
+                seen.add(key)
+                kept.add(snapshot.path)
+        return kept
+
+
+def _default_directory(db: Database) -> Path:
+    env = os.environ.get(BACKUP_DIR_ENV)
+    return Path(env) if env else db.path.parent / "backups"
+
+
+def _fsync(path: Path) -> None:
+    """Flush a file (or, where supported, a directory entry) to disk."""
+    try:
+        fd = os.open(str(path), os.O_RDONLY)
+    except OSError:
+        return  # directories cannot be opened on Windows
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class BackupManager:
+    """
+    Snapshots of one database: create (here or on a worker thread), list, prune, restore.
+
+    backup() and prune() may run on any thread; restore() uses the database's
+    own connection, so it belongs to the thread that owns the Database.
+    """
+
+    def __init__(
+        self,
+        db: Database,
+        directory: Optional[Path] = None,
+        policy: Optional[RetentionPolicy] = None,
+        pages_per_step: int = DEFAULT_PAGES_PER_STEP,
+        step_pause: float = DEFAULT_STEP_PAUSE,
+    ) -> None:
+        self._db = db
+        self._directory = directory or _default_directory(db)
+        self.policy = policy or RetentionPolicy()
+        self._pages_per_step = pages_per_step
+        self._step_pause = step_pause
+        self._lock = threading.Lock()  # one copy at a time
+        self._cancel = threading.Event()
+        self._executor: Optional["ThreadPoolExecutor"] = None
+        self._pattern = re.compile(rf"^{re.escape(db.path.stem)}-(\d{{8}}-\d{{12}})(?:-([a-z0-9_]+))?\.db$")
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    # --- listing ------------------------------------------------------------
+
+    def snapshots(self) -> List[Snapshot]:
+        """This database's snapshots, newest first."""
+        if not self._directory.is_dir():
+            return []
+        found = []
+        for path in self._directory.iterdir():
+            match = self._pattern.match(path.name)
+            if match is None:
+                continue
+            try:
+                size = path.stat().st_size
+            except OSError:
+                continue  # pruned meanwhile
+            created = datetime.strptime(match.group(1), _STAMP)
+            found.append(Snapshot(path=path, created=created, label=match.group(2) or "", size=size))
+        found.sort(key=lambda s: s.created, reverse=True)
+        return found
+
+    def latest(self, automatic: bool = False) -> Optional[Snapshot]:
+        """Newest snapshot (only unlabelled ones if automatic)."""
+        for snapshot in self.snapshots():
+            if not automatic or not snapshot.label:
+                return snapshot
+        return None
+
+    def find(self, name: str) -> Snapshot:
+        """
+        Snapshot by file name, path or "latest".
+
+        Raises:
+            DatabaseError: If there is no such snapshot of this database.
+        """
+        snapshots = self.snapshots()
+        if name == "latest":
+            if not snapshots:
+                raise DatabaseError(f"no snapshots in {self._directory}")
+            return snapshots[0]
+        for snapshot in snapshots:
+            if name in (snapshot.name, str(snapshot.path)) or Path(name).resolve() == snapshot.path.resolve():
+                return snapshot
+        raise DatabaseError(f"no snapshot {name!r} of {self._db.path.name} in {self._directory}")
+
+    def changed_since(self, snapshot: Optional[Snapshot]) -> bool:
+        """True if the database file (or its WAL) was written after snapshot was taken."""
+        if snapshot is None:
+            return True
+        since = snapshot.created.timestamp()
+        for path in (self._db.path, self._db.path.with_name(self._db.path.name + "-wal")):
+            try:
+                if path.stat().st_mtime > since:
+                    return True
+            except OSError:
+                continue
+        return False
+
+    # --- creating -----------------------------------------------------------
+
+    def backup(self, label: str = "", progress: Optional[Progress] = None) -> Snapshot:
+        """
+        Copy the database into a new snapshot on the calling thread.
+
+        Args:
+            label: Marks a manual snapshot ("" = automatic); lowercased, other characters become "_".
+            progress: Called with (copied pages, total pages) after each step.
+
+        Raises:
+            DatabaseError: If the copy fails, is cancelled, or does not pass an integrity check.
+        """
+        label = re.sub(r"[^a-z0-9_]+", "_", label.strip().lower()).strip("_")
+        with self._lock:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            for stale in self._directory.glob(f"{self._db.path.stem}-*.db.partial"):
+                stale.unlink(missing_ok=True)  # left by a crash or a cancelled copy
+            created = datetime.now()
+            name = f"{self._db.path.stem}-{created.strftime(_STAMP)}{'-' + label if label else ''}.db"
+            path = self._directory / name
+            partial = path.with_name(name + ".partial")
+            try:
+                self._copy(partial, progress)
+                _fsync(partial)
+                os.replace(partial, path)
+                _fsync(self._directory)
+            except _Cancelled:
+                partial.unlink(missing_ok=True)
+                raise DatabaseError("backup cancelled") from None
+            except (sqlite3.Error, OSError) as e:
+                partial.unlink(missing_ok=True)
+                raise DatabaseError(f"backup failed: {e}") from e
+            except DatabaseError:
+                partial.unlink(missing_ok=True)
+                raise
+            return Snapshot(path=path, created=created, label=label, size=path.stat().st_size)
+
+    def _copy(self, target: Path, progress: Optional[Progress]) -> None:
+        source = sqlite3.connect(str(self._db.path), isolation_level=None, timeout=30.0)
+        dest = sqlite3.connect(str(target))
+        try:
+            if source.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal":
+                # Pin one version of the file for the whole copy: no restarts, writers go on
+                source.execute("BEGIN")
+                source.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+            pages = self._pages_per_step
+            while True:
+                last: List[Optional[int]] = [None]
+
+                def step(status: int, remaining: int, total: int) -> None:
+                    if self._cancel.is_set():
+                        raise _Cancelled()
+                    if last[0] is not None and remaining >= last[0]:
+                        raise _Restarted()
+                    last[0] = remaining
+                    if progress is not None:
+                        progress(total - remaining, total)
+                    if self._step_pause > 0 and remaining:
+                        time.sleep(self._step_pause)
+
+                try:
+                    source.backup(dest, pages=pages, progress=step)
+                    break
+                except _Restarted:
+                    pages *= 4
+            # A self-contained file: no -wal/-shm next to the snapshot
+            dest.execute("PRAGMA journal_mode = delete")
+            check = dest.execute("PRAGMA quick_check").fetchone()[0]
+            if check != "ok":
+                raise DatabaseError(f"snapshot failed its integrity check: {check}")
+        finally:
+            dest.close()
+            source.close()
+
+    def submit(self, label: str = "", progress: Optional[Progress] = None) -> "Future[Snapshot]":
+        """Run backup() on the manager's worker thread; the future holds the Snapshot."""
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tasks-backup")
+        return self._executor.submit(self.backup, label, progress)
+
+    # --- retention and restore ----------------------------------------------
+
+    def prune(self, policy: Optional[RetentionPolicy] = None, dry_run: bool = False) -> List[Snapshot]:
+        """Delete the snapshots policy (default: self.policy) does not keep; returns them."""
+        snapshots = self.snapshots()
+        kept = (policy or self.policy).keep(snapshots)
+        removed = [s for s in snapshots if s.path not in kept]
+        if not dry_run:
+            for snapshot in removed:
+                snapshot.path.unlink(missing_ok=True)
+        return removed
+
+    def restore(self, snapshot: Snapshot, keep_current: bool = True) -> Optional[Snapshot]:
+        """
+        Replace the database contents with snapshot, in one transaction.
+
+        Call on the thread that owns the database. Caches are cleared and the
+        connection is reopened (so tables added since the snapshot are created);
+        a syncing database continues as a new node (see ChangeLog.rekey).
+
+        Args:
+            keep_current: First save the current contents as a "pre_restore" snapshot.
+
+        Returns:
+            The pre-restore snapshot, if one was taken.
+
+        Raises:
+            DatabaseError: If the snapshot is unreadable or damaged, or the copy fails.
+        """
+        safety = self.backup("pre_restore") if keep_current else None
+        try:
+            source = sqlite3.connect(f"{snapshot.path.resolve().as_uri()}?mode=ro", uri=True)
+        except sqlite3.Error as e:
+            raise DatabaseError(f"cannot open snapshot {snapshot.name}: {e}") from e
+        try:
+            check = source.execute("PRAGMA quick_check").fetchone()[0]
+            if check != "ok":
+                raise DatabaseError(f"snapshot {snapshot.name} is damaged: {check}")
+            conn = self._db.connect()
+            conn.commit()
+            source.backup(conn)
+        except sqlite3.Error as e:
+            raise DatabaseError(f"restore failed: {e}") from e
+        finally:
+            source.close()
+        self._db.close()
+        self._db.clear_caches()
+        self._db.change_log().rekey()
+        return safety
+
+    def cancel(self) -> None:
+        """Make copies in progress (and started until close()) stop with DatabaseError."""
+        self._cancel.set()
+
+    def close(self) -> None:
+        """Cancel queued and running copies on the worker thread and stop it."""
+        self._cancel.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        self._cancel.clear()
+
+
+class BackupScheduler:
+    """
+    Automatic snapshots on a background thread: when the newest automatic
+    snapshot is older than interval and the database changed since, take one
+    and prune by the manager's policy.
+    """
+
+    def __init__(
+        self,
+        manager: BackupManager,
+        interval: timedelta = DEFAULT_INTERVAL,
+        poll_seconds: float = 300.0,
+        on_error: Optional[Callable[[Exception], None]] = None,
+    ) -> None:
+        self._manager = manager
+        self._interval = interval
+        self._poll = poll_seconds
+        self._on_error = on_error
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def due(self) -> bool:
+        latest = self._manager.latest(automatic=True)
+        if latest is not None and datetime.now() - latest.created < self._interval:
+            return False
+        return self._manager.changed_since(latest)
+
+    def run_once(self) -> Optional[Snapshot]:
+        """Take a snapshot and prune if one is due; returns it."""
+        if not self.due():
+            return None
+        snapshot = self._manager.backup()
+        self._manager.prune()
+        return snapshot
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                if self._on_error is not None:
+                    self._on_error(e)
+            self._stop.wait(self._poll)
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="tasks-backup-scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the thread, cancelling a copy in progress (it leaves no file behind)."""
+        self._stop.set()
+        if self._thread is not None:
+            self._manager.cancel()
+            self._thread.join()
+            self._thread = None
+        self._manager.close()
@@ -0,0 +1,323 @@
+"""
+Undo/redo of task edits, with batched persistence.
+
+Every edit is a command (EditTask for updates and completes, DeleteTask) that
+knows how to reverse itself; CommandStack keeps the undo and redo stacks. It
+does not write each command at once: it stages the resulting state (the latest
+row per task, pending deletes and restores) and writes it with
+TaskRepository.write_batch, one transaction for the whole batch, when the flush
+runs:
+
+- flush_delay_ms after an update, the edits that come in bursts (a progress
+  slider drag, retyping a title); the timer is not restarted, so a long burst
+  is still written every flush_delay_ms;
+- on the next turn of the event loop after a complete, delete, undo or redo;
+- before any read (call flush(); TaskPresenter does), so reads see every edit.
+
+Consecutive updates of the same task within coalesce_seconds merge into one
+command: one undo step and one row written. Change events are published after
+the batch commits and describe its net effect (a delete undone before the flush
+publishes nothing), so subscribers never read state older than an event.
+
+    stack = CommandStack(task_repo, event_bus)
+    stack.set_scheduler(root.after)        # Tk; without a scheduler every command is written at once
+    stack.update(task_id, progress_percent=40)
+    stack.undo()
+"""
+
+import copy
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Deque, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from models import Task
+from repository.database import DatabaseError
+from repository.task_repository import TaskRepository
+from services.events import ChangeEvent, ChangeKind, EventBus, get_event_bus
+from services.purge import DEFAULT_UNDO_WINDOW
+from services.task_service import apply_updates
+
+# Milliseconds an update waits for more edits before the batch is written
+DEFAULT_FLUSH_DELAY_MS = 500
+# Updates of the same task closer together than this are one undo step
+DEFAULT_COALESCE_SECONDS = 1.5
+# Undo steps kept
+DEFAULT_MAX_DEPTH = 100
+
+_COMPLETE_FIELDS = frozenset({"is_completed", "completed_at", "status", "progress_percent", "updated_at"})
+
+
+class Command:
+    """An undoable change to one task. do() and undo() only stage writes on the stack."""
+
+    label = ""
+    # Written after flush_delay_ms (more edits likely follow) rather than on the next loop turn
+    deferred = False
+
+    def do(self, stack: "CommandStack") -> None:
+        raise NotImplementedError
+
+    def undo(self, stack: "CommandStack") -> None:
+        raise NotImplementedError
+
+    def merge(self, other: "Command") -> bool:
+        """Absorb other (executed right after this command) if both are one edit; True if merged."""
+        return False
+
+
+@dataclass
+class EditTask(Command):
+    """Set a task's fields: an update, or a complete (kind TASK_COMPLETED)."""
+
+    before: Task
+    after: Task
+    changed: FrozenSet[str]
+    kind: ChangeKind = ChangeKind.TASK_UPDATED
+    at: float = field(default_factory=time.monotonic)
+    window: float = DEFAULT_COALESCE_SECONDS
+
+    @property
+    def label(self) -> str:  # type: ignore[override]
+        return "Complete task" if self.kind == ChangeKind.TASK_COMPLETED else "Edit task"
+
+    @property
+    def deferred(self) -> bool:  # type: ignore[override]
+        return self.kind == ChangeKind.TASK_UPDATED
+
+    def do(self, stack: "CommandStack") -> None:
+        stack._stage_save(copy.copy(self.after), self.kind, self.changed)
+
+    def undo(self, stack: "CommandStack") -> None:
+        stack._stage_save(copy.copy(self.before), ChangeKind.TASK_UPDATED, self.changed)
+
+    def merge(self, other: Command) -> bool:
+        if (
+            not isinstance(other, EditTask)
+            or self.kind != ChangeKind.TASK_UPDATED
+            or other.kind != ChangeKind.TASK_UPDATED
+            or other.after.task_id != self.after.task_id
+            or other.at - self.at > self.window
+        ):
+            return False
+        self.after = other.after
+        self.changed = self.changed | other.changed
+        self.at = other.at
+        return True
+
+
+@dataclass
+class DeleteTask(Command):
+    """Soft-delete a task; undo restores it (within the repository's undo window)."""
+
+    task: Task
+    label = "Delete task"
+
+    def do(self, stack: "CommandStack") -> None:
+        stack._stage_delete(self.task)
+
+    def undo(self, stack: "CommandStack") -> None:
+        stack._stage_restore(self.task)
+
+
+class CommandStack:
+    """
+    Undo/redo stacks over one TaskRepository, writing staged edits in batches.
+
+    Like the repository, a stack belongs to one thread (the UI thread).
+    """
+
+    def __init__(
+        self,
+        task_repo: Optional[TaskRepository] = None,
+        event_bus: Optional[EventBus] = None,
+        flush_delay_ms: int = DEFAULT_FLUSH_DELAY_MS,
+        coalesce_seconds: float = DEFAULT_COALESCE_SECONDS,
+        max_depth: int = DEFAULT_MAX_DEPTH,
+        undo_window: timedelta = DEFAULT_UNDO_WINDOW,
+    ) -> None:
+        self._repo = task_repo or TaskRepository()
+        self._events = event_bus or get_event_bus()
+        self._flush_delay_ms = flush_delay_ms
+        self._coalesce = coalesce_seconds
+        self._undo_window = undo_window
+        self._done: Deque[Command] = deque(maxlen=max_depth)
+        self._undone: List[Command] = []
+        # Staged writes: latest row (with event kind and changed fields), deletes, restores
+        self._saves: Dict[str, Tuple[Task, ChangeKind, Set[str]]] = {}
+        self._deletes: Dict[str, Task] = {}
+        self._restores: Dict[str, Task] = {}
+        self._after: Optional[Callable[[int, Callable[[], None]], Any]] = None
+        self._flush_due: Optional[float] = None
+        self._on_error: Optional[Callable[[str], None]] = None
+
+    def set_scheduler(self, after: Optional[Callable[[int, Callable[[], None]], Any]]) -> None:
+        """Set the function that runs a callback after N ms, e.g. Tk's after (None = write at once)."""
+        self._after = after
+        if after is None:
+            self.flush()
+
+    def set_on_error(self, callback: Optional[Callable[[str], None]]) -> None:
+        """Set callback for write failures of scheduled flushes (flush() itself raises)."""
+        self._on_error = callback
+
+    # --- commands -----------------------------------------------------------
+
+    def update(self, task_id: str, **changes: Any) -> Optional[Task]:
+        """
+        Change task fields (as TaskService.update_task). Returns the task as it will be saved,
+        or None if it does not exist.
+        """
+        before = self._current(task_id)
+        if before is None:
+            return None
+        after = copy.copy(before)
+        changed = apply_updates(after, **changes)
+        self.execute(EditTask(before, after, frozenset(changed), window=self._coalesce))
+        return copy.copy(after)
+
+    def complete(self, task_id: str) -> Optional[Task]:
+        """Mark task completed. Returns the task as it will be saved, or None if it does not exist."""
+        before = self._current(task_id)
+        if before is None:
+            return None
+        after = copy.copy(before)
+        after.complete()
+        self.execute(EditTask(before, after, _COMPLETE_FIELDS, kind=ChangeKind.TASK_COMPLETED))
+        return copy.copy(after)
+
+    def delete(self, task_id: str) -> bool:
+        """Delete task (undo restores it). Returns False if it does not exist."""
+        task = self._current(task_id)
+        if task is None:
+            return False
+        self.execute(DeleteTask(task))
+        return True
+
+    def execute(self, command: Command) -> None:
+        """Run command and push it on the undo stack (merging it into the top one if it can)."""
+        command.do(self)
+        self._undone.clear()
+        if not (self._done and self._done[-1].merge(command)):
+            self._done.append(command)
+        self._request_flush(self._flush_delay_ms if command.deferred else 0)
+
+    def undo(self) -> Optional[str]:
+        """Reverse the last command; returns its label, or None if there is nothing to undo."""
+        if not self._done:
+            return None
+        command = self._done.pop()
+        command.undo(self)
+        self._undone.append(command)
+        self._request_flush(0)
+        return command.label
+
+    def redo(self) -> Optional[str]:
+        """Run the last undone command again; returns its label, or None if there is nothing to redo."""
+        if not self._undone:
+            return None
+        command = self._undone.pop()
+        command.do(self)
+        self._done.append(command)
+        self._request_flush(0)
+        return command.label
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._done)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._undone)
+
+    @property
+    def pending(self) -> int:
+        """Staged writes not yet flushed."""
+        return len(self._saves) + len(self._deletes) + len(self._restores)
+
+    def clear(self) -> None:
+        """Forget the undo history (staged writes are kept; flush them first if needed)."""
+        self._done.clear()
+        self._undone.clear()
+
+    # --- staging and flushing -----------------------------------------------
+
+    def _current(self, task_id: str) -> Optional[Task]:
+        """The task as the staged writes leave it (None if missing or deleted)."""
+        if task_id in self._saves:
+            return copy.copy(self._saves[task_id][0])
+        if task_id in self._deletes:
+            return None
+        if task_id in self._restores:
+            return copy.copy(self._restores[task_id])
+        task = self._repo.get_by_id(task_id)
+        return copy.copy(task) if task is not None else None
+
+    def _stage_save(self, task: Task, kind: ChangeKind, changed: FrozenSet[str]) -> None:
+        previous = self._saves.get(task.task_id)
+        if previous is not None:
+            if previous[1] == ChangeKind.TASK_COMPLETED and kind == ChangeKind.TASK_UPDATED and task.is_completed:
+                kind = ChangeKind.TASK_COMPLETED
+            changed = changed | previous[2]
+        self._saves[task.task_id] = (task, kind, set(changed))
+
+    def _stage_delete(self, task: Task) -> None:
+        if self._restores.pop(task.task_id, None) is None:
+            self._deletes[task.task_id] = task
+
+    def _stage_restore(self, task: Task) -> None:
+        if self._deletes.pop(task.task_id, None) is None:
+            self._restores[task.task_id] = task
+
+    def _request_flush(self, delay_ms: int) -> None:
+        if self._after is None:
+            self.flush()
+            return
+        due = time.monotonic() + delay_ms / 1000
+        if self._flush_due is not None and self._flush_due <= due:
+            return  # an earlier flush is already scheduled
+        self._flush_due = due
+        self._after(delay_ms, self._scheduled_flush)
+
+    def _scheduled_flush(self) -> None:
+        try:
+            self.flush()
+        except DatabaseError as e:
+            if self._on_error is not None:
+                self._on_error(str(e))
+
+    def flush(self) -> int:
+        """
+        Write all staged changes in one transaction, then publish their change events.
+
+        Returns:
+            Number of tasks written.
+
+        Raises:
+            DatabaseError: If the write fails (the staged changes are dropped; the
+                database keeps its state from before the batch).
+        """
+        self._flush_due = None
+        if not self.pending:
+            return 0
+        saves, deletes, restores = self._saves, self._deletes, self._restores
+        self._saves, self._deletes, self._restores = {}, {}, {}
+        restored, deleted = self._repo.write_batch(
+            saves=[task for task, _, _ in saves.values()],
+            deletes=list(deletes),
+            restores=list(restores),
+            deleted_after=datetime.now() - self._undo_window,
+        )
+        restored_ids = {task.task_id for task in restored}
+        for task in restored:
+            self._events.publish(ChangeEvent(ChangeKind.TASK_CREATED, task.task_id, task.user_id, frozenset(), task))
+        for task_id, (task, kind, changed) in saves.items():
+            if task_id not in restored_ids and task_id not in deletes and task_id not in restores:
+                self._events.publish(ChangeEvent(kind, task_id, task.user_id, frozenset(changed), task))
+        for task_id in deleted:
+            self._events.publish(ChangeEvent(ChangeKind.TASK_DELETED, task_id, deletes[task_id].user_id))
+        missed = len(restores) - len(restored)
+        if missed:
+            raise DatabaseError(f"{missed} deleted task(s) could not be restored (undo window has passed)")
+        return len(saves) + len(deleted) + len(restored)
@@ -0,0 +1,184 @@
+"""Change-event bus: services publish model changes, views subscribe and patch."""
+
+from dataclasses import dataclass, replace
+from enum import Enum
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+
+class ChangeKind(str, Enum):
+    """Kind of model change published by the service layer."""
+
+    TASK_CREATED = "task_created"
+    TASK_UPDATED = "task_updated"
+    TASK_COMPLETED = "task_completed"
+    TASK_DELETED = "task_deleted"
+    GOAL_CREATED = "goal_created"
+    GOAL_UPDATED = "goal_updated"
+    GOAL_ARCHIVED = "goal_archived"
+    GOAL_DELETED = "goal_deleted"
+
+    @property
+    def entity(self) -> str:
+        """Entity type name ("task" or "goal")."""
+        return self.value.split("_", 1)[0]
+
+
+TASK_KINDS: FrozenSet[ChangeKind] = frozenset(k for k in ChangeKind if k.entity == "task")
+GOAL_KINDS: FrozenSet[ChangeKind] = frozenset(k for k in ChangeKind if k.entity == "goal")
+
+# When two events for the same entity are coalesced, the higher rank wins.
+_RANK = {
+    ChangeKind.TASK_UPDATED: 0,
+    ChangeKind.TASK_COMPLETED: 1,
+    ChangeKind.TASK_CREATED: 2,
+    ChangeKind.TASK_DELETED: 3,
+    ChangeKind.GOAL_UPDATED: 0,
+    ChangeKind.GOAL_ARCHIVED: 1,
+    ChangeKind.GOAL_CREATED: 2,
+    ChangeKind.GOAL_DELETED: 3,
+}
+_CREATED = (ChangeKind.TASK_CREATED, ChangeKind.GOAL_CREATED)
+_DELETED = (ChangeKind.TASK_DELETED, ChangeKind.GOAL_DELETED)
+_CREATED_KIND = {"task": ChangeKind.TASK_CREATED, "goal": ChangeKind.GOAL_CREATED}
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """
+    A single model change.
+
+    Attributes:
+        kind: What happened.
+        entity_id: Task or goal id.
+        user_id: Owner user id (None when not known, e.g. delete by id).
+        changed_fields: Model field names that changed (all fields for creates).
+        entity: The Task or Goal after the change; None for deletes.
+    """
+
+    kind: ChangeKind
+    entity_id: str
+    user_id: Optional[str] = None
+    changed_fields: FrozenSet[str] = frozenset()
+    entity: Optional[Any] = None
+
+
+def coalesce(events: Iterable[ChangeEvent]) -> List[ChangeEvent]:
+    """
+    Merge events for the same entity into one, keeping first-seen order.
+
+    Changed fields are unioned and the latest entity kept; the strongest kind wins
+    (deleted > created > completed/archived > updated). An entity created and
+    deleted within the same batch disappears entirely; one deleted and then
+    created again (a restore) comes out as created, with the new entity.
+    """
+    merged: Dict[Tuple[str, str], Optional[ChangeEvent]] = {}
+    new: Set[Tuple[str, str]] = set()  # entities whose first event in the batch is a create
+    for ev in events:
+        key = (ev.kind.entity, ev.entity_id)
+        prev = merged.get(key)
+        if prev is None:
+            # First event for this entity (or it was created and deleted earlier in the batch).
+            if key not in merged and ev.kind in _CREATED:
+                new.add(key)
+            merged[key] = ev
+            continue
+        if prev.kind in _CREATED and ev.kind in _DELETED:
+            merged[key] = None if key in new else replace(ev, user_id=ev.user_id or prev.user_id)
+            continue
+        if prev.kind in _DELETED:
+            # Deleted, then back: the later event's entity is the whole current state
+            merged[key] = replace(ev, kind=_CREATED_KIND[ev.kind.entity], user_id=ev.user_id or prev.user_id)
+            continue
+        kind = ev.kind if _RANK[ev.kind] >= _RANK[prev.kind] else prev.kind
+        merged[key] = replace(
+            prev,
+            kind=kind,
+            user_id=ev.user_id or prev.user_id,
+            changed_fields=prev.changed_fields | ev.changed_fields,
+            entity=None if kind in _DELETED else (ev.entity if ev.entity is not None else prev.entity),
+        )
+    return [ev for ev in merged.values() if ev is not None]
+
+
+Subscriber = Callable[[List[ChangeEvent]], None]
+
+
+class EventBus:
+    """
+    Publish/subscribe hub for ChangeEvents.
+
+    Without a scheduler, events are delivered synchronously one at a time. With a
+    scheduler (e.g. Tk's ``after_idle``), events are queued, coalesced and delivered
+    as one batch per scheduled flush, so a burst of writes causes one UI update.
+    """
+
+    def __init__(self) -> None:
+        self._subscribers: List[Tuple[Subscriber, Optional[FrozenSet[ChangeKind]]]] = []
+        self._pending: List[ChangeEvent] = []
+        self._schedule: Optional[Callable[[Callable[[], None]], Any]] = None
+        self._flush_scheduled = False
+
+    def subscribe(
+        self,
+        callback: Subscriber,
+        kinds: Optional[Iterable[ChangeKind]] = None,
+    ) -> Callable[[], None]:
+        """
+        Register callback for a batch of events (optionally only the given kinds).
+
+        Returns:
+            Function that removes the subscription.
+        """
+        entry = (callback, frozenset(kinds) if kinds is not None else None)
+        self._subscribers.append(entry)
+
+        def unsubscribe() -> None:
+            if entry in self._subscribers:
+                self._subscribers.remove(entry)
+
+        return unsubscribe
+
+    def set_scheduler(self, schedule: Optional[Callable[[Callable[[], None]], Any]]) -> None:
+        """Set the function used to defer flushes (None = deliver synchronously)."""
+        self._schedule = schedule
+        if schedule is None and self._pending:
+            self.flush()
+
+    def publish(self, event: ChangeEvent) -> None:
+        """Queue event and schedule a flush, or deliver immediately without a scheduler."""
+        self._pending.append(event)
+        if self._schedule is None:
+            self.flush()
+        elif not self._flush_scheduled:
+            self._flush_scheduled = True
+            self._schedule(self.flush)
+
+    def flush(self) -> None:
+        """Deliver all pending events (coalesced) to subscribers."""
+        self._flush_scheduled = False
+        if not self._pending:
+            return
+        events = coalesce(self._pending)
+        self._pending = []
+        error: Optional[BaseException] = None
+        for callback, kinds in list(self._subscribers):
+            batch = events if kinds is None else [e for e in events if e.kind in kinds]
+            if not batch:
+                continue
+            try:
+                callback(batch)
+            except Exception as e:  # one broken view must not starve the others
+                error = error or e
+        if error is not None:
+            raise error
+
+
+_bus: Optional[EventBus] = None
+
+
+def get_event_bus() -> EventBus:
+    """Return singleton EventBus instance."""
+    global _bus
+    if _bus is None:
+        _bus = EventBus()
+    return _bus
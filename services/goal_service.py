@@ -1,17 +1,48 @@
 """Goal service (use cases for Goal)."""
 
-from typing import List, Optional
+from dataclasses import fields
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
 
-from repository import GoalRepository
+from repository import GoalRepository, TaskRepository
 from repository.database import DatabaseError
-from models import Goal
+from models import Goal, GoalProgress
+from services.events import ChangeEvent, ChangeKind, EventBus, get_event_bus
+from services.purge import DEFAULT_UNDO_WINDOW
+
+_GOAL_FIELDS = frozenset(f.name for f in fields(Goal))
 
 
 class GoalService:
-    """Use cases for Goal: CRUD and list by user."""
+    """
+    Use cases for Goal: CRUD and list by user. Writes publish ChangeEvents.
+
+    Deleting a goal also deletes its tasks; both can be restored within undo_window.
+    task_repo (same database) supplies the restored tasks for their TASK_CREATED events.
+    """
 
-    def __init__(self, goal_repo: Optional[GoalRepository] = None) -> None:
+    def __init__(
+        self,
+        goal_repo: Optional[GoalRepository] = None,
+        event_bus: Optional[EventBus] = None,
+        task_repo: Optional[TaskRepository] = None,
+        undo_window: timedelta = DEFAULT_UNDO_WINDOW,
+    ) -> None:
         self._repo = goal_repo or GoalRepository()
+        self._events = event_bus or get_event_bus()
+        self._task_repo = task_repo
+        self.undo_window = undo_window
+
+    def _publish(self, kind: ChangeKind, goal: Goal, changed_fields: Iterable[str] = _GOAL_FIELDS) -> None:
+        self._events.publish(
+            ChangeEvent(
+                kind=kind,
+                entity_id=goal.goal_id,
+                user_id=goal.user_id,
+                changed_fields=frozenset(changed_fields),
+                entity=goal,
+            )
+        )
 
     def get_by_id(self, goal_id: str) -> Optional[Goal]:
         """Return goal by id or None."""
@@ -31,20 +62,106 @@ class GoalService:
         except Exception as e:
             raise DatabaseError(f"get_all_for_user failed: {e}") from e
 
+    def get_progress(self, goal_ids: Iterable[str]) -> Dict[str, GoalProgress]:
+        """Return task counters (scheduled, completed, minutes) per goal id."""
+        try:
+            return self._repo.get_progress(goal_ids)
+        except DatabaseError:
+            raise
+        except Exception as e:
+            raise DatabaseError(f"get_progress failed: {e}") from e
+
+    def check_progress(self, repair: bool = False) -> List[str]:
+        """
+        Verify the goal counters against the task table.
+
+        Args:
+            repair: Rebuild all counters when any differ.
+
+        Returns:
+            Ids of goals whose counters were inconsistent.
+        """
+        try:
+            mismatched = self._repo.check_progress()
+            if mismatched and repair:
+                self._repo.rebuild_progress()
+        except DatabaseError:
+            raise
+        except Exception as e:
+            raise DatabaseError(f"check_progress failed: {e}") from e
+        return mismatched
+
     def save_goal(self, goal: Goal) -> None:
         """Create or update goal."""
         try:
+            existing = self._repo.get_by_id(goal.goal_id)
             self._repo.save(goal)
         except DatabaseError:
             raise
         except Exception as e:
             raise DatabaseError(f"save_goal failed: {e}") from e
+        if existing is None:
+            self._publish(ChangeKind.GOAL_CREATED, goal)
+            return
+        changed = {name for name in _GOAL_FIELDS if getattr(existing, name) != getattr(goal, name)}
+        if "is_archived" in changed and goal.is_archived:
+            self._publish(ChangeKind.GOAL_ARCHIVED, goal, changed)
+        else:
+            self._publish(ChangeKind.GOAL_UPDATED, goal, changed)
+
+    def archive_goal(self, goal_id: str) -> Optional[Goal]:
+        """Archive goal by id. Returns the archived goal or None if not found."""
+        goal = self.get_by_id(goal_id)
+        if goal is None:
+            return None
+        goal.archive()
+        try:
+            self._repo.save(goal)
+        except DatabaseError:
+            raise
+        except Exception as e:
+            raise DatabaseError(f"archive_goal failed: {e}") from e
+        self._publish(ChangeKind.GOAL_ARCHIVED, goal, ("is_archived",))
+        return goal
 
     def delete_goal(self, goal_id: str) -> None:
-        """Delete goal by id."""
+        """Delete goal by id, with its tasks (restore_goal undoes it within undo_window)."""
         try:
-            self._repo.delete(goal_id)
+            task_ids = self._repo.delete(goal_id)
         except DatabaseError:
             raise
         except Exception as e:
             raise DatabaseError(f"delete_goal failed: {e}") from e
+        self._events.publish(ChangeEvent(kind=ChangeKind.GOAL_DELETED, entity_id=goal_id))
+        for task_id in task_ids:
+            self._events.publish(ChangeEvent(kind=ChangeKind.TASK_DELETED, entity_id=task_id))
+
+    def restore_goal(self, goal_id: str) -> Optional[Goal]:
+        """
+        Undo delete_goal if it happened within undo_window (its tasks come back too).
+
+        Returns:
+            The restored goal, or None if it is not deleted or the window has passed.
+        """
+        try:
+            restored = self._repo.restore(goal_id, deleted_after=datetime.now() - self.undo_window)
+            if restored is None:
+                return None
+            goal, task_ids = restored
+            tasks = [self._task_repo.get_by_id(task_id) if self._task_repo else None for task_id in task_ids]
+        except DatabaseError:
+            raise
+        except Exception as e:
+            raise DatabaseError(f"restore_goal failed: {e}") from e
+        self._publish(ChangeKind.GOAL_CREATED, goal)
+        for task_id, task in zip(task_ids, tasks):
+            self._events.publish(
+                ChangeEvent(
+                    kind=ChangeKind.TASK_CREATED,
+                    entity_id=task_id,
+                    user_id=goal.user_id,
+                    changed_fields=frozenset(),
+                    entity=task,
+                )
+            )
+        return goal
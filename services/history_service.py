@@ -0,0 +1,102 @@
+"""History service: activity trends from the daily_summary table."""
+
+from datetime import date, timedelta
+from typing import Callable, List, Optional
+
+from models import DailySummary
+from repository.database import DatabaseError
+from repository.summary_repository import DailySummaryRepository
+
+
+class HistoryService:
+    """Use cases for activity history: trends over N days and the summary backfill."""
+
+    def __init__(self, summary_repo: Optional[DailySummaryRepository] = None) -> None:
+        self._repo = summary_repo or DailySummaryRepository()
+
+    def get_trend(
+        self,
+        user_id: str,
+        days: int = 30,
+        end: Optional[date] = None,
+        bucket_days: int = 1,
+    ) -> List[DailySummary]:
+        """
+        Return the last `days` days up to end (default today), oldest first.
+
+        Args:
+            bucket_days: Sum consecutive days into buckets (e.g. 7 for a weekly
+                365-day chart); each bucket's day is its first day, and the oldest
+                bucket may be partial.
+        """
+        end = end or date.today()
+        start = end - timedelta(days=max(1, days) - 1)
+        try:
+            daily = self._repo.get_range(user_id, start, end)
+        except DatabaseError:
+            raise
+        except Exception as e:
+            raise DatabaseError(f"get_trend failed: {e}") from e
+        if bucket_days <= 1:
+            return daily
+        buckets: List[DailySummary] = []
+        # Align buckets on end so the newest bucket is always complete
+        first = len(daily) % bucket_days
+        if first:
+            buckets.append(DailySummary(user_id, daily[0].day))
+            for summary in daily[:first]:
+                buckets[-1].add(summary)
+        for i in range(first, len(daily), bucket_days):
+            bucket = DailySummary(user_id, daily[i].day)
+            for summary in daily[i:i + bucket_days]:
+                bucket.add(summary)
+            buckets.append(bucket)
+        return buckets
+
+    def backfill(
+        self,
+        user_id: Optional[str] = None,
+        progress: Optional[Callable[[str], None]] = None,
+    ) -> int:
+        """
+        Rebuild daily_summary from the task table, one transaction per user so the
+        write lock is released between users.
+
+        Args:
+            user_id: Only this user (None = every user owning tasks).
+            progress: Called with each user id after it is rebuilt.
+
+        Returns:
+            Number of users rebuilt.
+        """
+        try:
+            user_ids = [user_id] if user_id is not None else self._repo.user_ids()
+            for uid in user_ids:
+                self._repo.rebuild(uid)
+                if progress is not None:
+                    progress(uid)
+        except DatabaseError:
+            raise
+        except Exception as e:
+            raise DatabaseError(f"backfill failed: {e}") from e
+        return len(user_ids)
+
+    def check(self, user_id: str, repair: bool = False) -> List[date]:
+        """
+        Verify a user's daily counters against their tasks.
+
+        Args:
+            repair: Rebuild the user's rows when any day differs.
+
+        Returns:
+            Days that were inconsistent.
+        """
+        try:
+            mismatched = self._repo.check(user_id)
+            if mismatched and repair:
+                self._repo.rebuild(user_id)
+        except DatabaseError:
+            raise
+        except Exception as e:
+            raise DatabaseError(f"check failed: {e}") from e
+        return mismatched
@@ -0,0 +1,454 @@
+"""
+Streaming task import/export: CSV, JSON Lines and iCalendar (VTODO).
+
+Exports read through TaskService.iter_tasks_for_user (a fetchmany cursor) and
+write one record at a time; imports parse lazily and commit every batch_size
+tasks through the bulk save path. Memory use is bounded by one batch either way,
+so multi-million-row files are fine. Progress is reported through an optional
+callback with the running record count.
+"""
+
+import csv
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Union
+
+from models import Task
+from models.enums import Priority, TaskStatus, TaskType
+from services.task_service import TaskService
+
+ProgressCallback = Callable[[int], None]
+
+FORMATS = ("csv", "jsonl", "ics")
+_SUFFIXES = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".json": "jsonl",
+    ".ics": "ics",
+    ".ical": "ics",
+    ".ifb": "ics",
+}
+
+# Column order of CSV exports (and keys of JSON Lines records)
+FIELDS = [
+    "task_id",
+    "user_id",
+    "goal_id",
+    "title",
+    "description",
+    "due_date_time",
+    "duration_minutes",
+    "priority",
+    "type",
+    "is_completed",
+    "completed_at",
+    "status",
+    "progress_percent",
+    "created_at",
+    "updated_at",
+]
+
+# iCalendar PRIORITY is 1 (highest) .. 9 (lowest); 0 = undefined
+_ICAL_PRIORITY = {Priority.URGENT: 1, Priority.HIGH: 3, Priority.MEDIUM: 5, Priority.LOW: 9}
+_ICAL_STATUS = {
+    TaskStatus.COMPLETED: "COMPLETED",
+    TaskStatus.IN_PROGRESS: "IN-PROCESS",
+    TaskStatus.CANCELLED: "CANCELLED",
+}
+_STATUS_FROM_ICAL = {
+    "COMPLETED": TaskStatus.COMPLETED,
+    "IN-PROCESS": TaskStatus.IN_PROGRESS,
+    "CANCELLED": TaskStatus.CANCELLED,
+}
+
+
+class ImportFormatError(ValueError):
+    """Raised when an import file cannot be parsed (message includes the record number)."""
+
+    pass
+
+
+def detect_format(path: Union[str, Path], default: str = "jsonl") -> str:
+    """Guess the format from the file suffix ("csv", "jsonl" or "ics")."""
+    return _SUFFIXES.get(Path(str(path)).suffix.lower(), default)
+
+
+def parse_local_datetime(value: str) -> datetime:
+    """
+    ISO 8601 date/time as naive local time (tasks store local wall-clock times).
+
+    A value with a UTC offset is converted to local time, so it compares with the
+    stored ones; one without is taken as local already.
+    """
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+
+def task_to_record(task: Task) -> Dict[str, Any]:
+    """Task as a JSON-serialisable dict (enums by value, datetimes in ISO format)."""
+    return {
+        "task_id": task.task_id,
+        "user_id": task.user_id,
+        "goal_id": task.goal_id,
+        "title": task.title,
+        "description": task.description,
+        "due_date_time": task.due_date_time.isoformat() if task.due_date_time else None,
+        "duration_minutes": task.duration_minutes,
+        "priority": task.priority.value,
+        "type": task.type.value,
+        "is_completed": task.is_completed,
+        "completed_at": task.completed_at.isoformat() if task.completed_at else None,
+        "status": task.status.value,
+        "progress_percent": task.progress_percent,
+        "created_at": task.created_at.isoformat() if task.created_at else None,
+        "updated_at": task.updated_at.isoformat() if task.updated_at else None,
+    }
+
+
+def _as_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "y", "x")
+    return bool(value)
+
+
+def task_from_record(record: Dict[str, Any], user_id: str) -> Task:
+    """
+    Build a Task owned by user_id from a record (JSON object or CSV row).
+
+    Only "title" is required; a missing task_id creates a new task, an existing one
+    overwrites the stored task on import (if user_id owns it; see TaskService.import_tasks).
+    Empty strings count as missing.
+    """
+
+    def get(key: str) -> Any:
+        value = record.get(key)
+        return None if value == "" else value
+
+    def when(key: str) -> Optional[datetime]:
+        value = get(key)
+        return parse_local_datetime(value) if value else None
+
+    title = get("title")
+    if not title:
+        raise ValueError("missing title")
+    is_completed = _as_bool(get("is_completed"))
+    return Task(
+        task_id=get("task_id") or str(uuid.uuid4()),
+        user_id=user_id,
+        goal_id=get("goal_id"),
+        title=title,
+        description=get("description") or "",
+        due_date_time=when("due_date_time"),
+        duration_minutes=int(get("duration_minutes") or 0),
+        priority=Priority(get("priority") or Priority.MEDIUM.value),
+        type=TaskType(get("type") or TaskType.FREE.value),
+        is_completed=is_completed,
+        completed_at=when("completed_at"),
+        status=TaskStatus(get("status") or (TaskStatus.COMPLETED if is_completed else TaskStatus.CREATED).value),
+        progress_percent=int(get("progress_percent") or 0),
+        created_at=when("created_at"),
+        updated_at=when("updated_at"),
+    )
+
+
+# --- iCalendar -------------------------------------------------------------
+
+def _ical_escape(text: str) -> str:
+    return (
+        text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\r\n", "\\n").replace("\n", "\\n")
+    )
+
+
+def _ical_unescape(text: str) -> str:
+    out = []
+    i = 0
+    while i < len(text):
+        ch = text[i]
+        if ch == "\\" and i + 1 < len(text):
+            nxt = text[i + 1]
+            out.append("\n" if nxt in "nN" else nxt)
+            i += 2
+            continue
+        out.append(ch)
+        i += 1
+    return "".join(out)
+
+
+def _ical_fold(line: str) -> str:
+    """Fold a content line at 75 octets (RFC 5545 3.1); returns CRLF-terminated text."""
+    data = line.encode("utf-8")
+    if len(data) <= 75:
+        return line + "\r\n"
+    parts = []
+    limit = 75
+    while data:
+        cut = min(limit, len(data))
+        while cut < len(data) and (data[cut] & 0xC0) == 0x80:  # don't split a UTF-8 sequence
+            cut -= 1
+        parts.append(data[:cut].decode("utf-8"))
+        data = data[cut:]
+        limit = 74  # continuation lines start with a space
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _ical_datetime(value: datetime) -> str:
+    return value.strftime("%Y%m%dT%H%M%S")
+
+
+def _parse_ical_datetime(value: str) -> datetime:
+    """DATE or DATE-TIME (floating or UTC 'Z'); returned as naive local time."""
+    value = value.strip()
+    if len(value) == 8:
+        return datetime.strptime(value, "%Y%m%d")
+    if value.endswith("Z"):
+        utc = datetime.strptime(value[:-1], "%Y%m%dT%H%M%S").replace(tzinfo=timezone.utc)
+        return utc.astimezone().replace(tzinfo=None)
+    return datetime.strptime(value, "%Y%m%dT%H%M%S")
+
+
+def task_to_vtodo(task: Task, stamp: str) -> str:
+    """One VTODO component (folded, CRLF line endings)."""
+    lines = ["BEGIN:VTODO", f"UID:{task.task_id}", f"DTSTAMP:{stamp}", f"SUMMARY:{_ical_escape(task.title)}"]
+    if task.description:
+        lines.append(f"DESCRIPTION:{_ical_escape(task.description)}")
+    if task.due_date_time:
+        # due_date_time is when the task starts (as in the scheduler and timeline)
+        lines.append(f"DTSTART:{_ical_datetime(task.due_date_time)}")
+        if task.duration_minutes:
+            lines.append(f"DUE:{_ical_datetime(task.due_date_time + timedelta(minutes=task.duration_minutes))}")
+    elif task.duration_minutes:
+        lines.append(f"X-TASKS-DURATION:{task.duration_minutes}")
+    lines.append(f"PRIORITY:{_ICAL_PRIORITY.get(task.priority, 0)}")
+    lines.append(f"STATUS:{_ICAL_STATUS.get(task.status, 'COMPLETED' if task.is_completed else 'NEEDS-ACTION')}")
+    if task.completed_at:
+        lines.append(f"COMPLETED:{_ical_datetime(task.completed_at)}")
+    if task.progress_percent:
+        lines.append(f"PERCENT-COMPLETE:{task.progress_percent}")
+    if task.created_at:
+        lines.append(f"CREATED:{_ical_datetime(task.created_at)}")
+    if task.updated_at:
+        lines.append(f"LAST-MODIFIED:{_ical_datetime(task.updated_at)}")
+    # Round-trip fields with no iCalendar equivalent
+    lines.append(f"X-TASKS-STATUS:{task.status.value}")
+    lines.append(f"X-TASKS-TYPE:{task.type.value}")
+    if task.goal_id:
+        lines.append(f"X-TASKS-GOAL-ID:{task.goal_id}")
+    lines.append("END:VTODO")
+    return "".join(_ical_fold(line) for line in lines)
+
+
+def _unfolded(lines: Iterable[str]) -> Iterator[str]:
+    """Join continuation lines (leading space/tab) lazily."""
+    current: Optional[str] = None
+    for raw in lines:
+        line = raw.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current:
+        yield current
+
+
+def _iter_vtodos(lines: Iterable[str]) -> Iterator[Dict[str, str]]:
+    """Yield each VTODO as {PROPERTY: raw value} (parameters dropped, first occurrence kept)."""
+    props: Optional[Dict[str, str]] = None
+    for line in _unfolded(lines):
+        if not line:
+            continue
+        upper = line.upper()
+        if upper == "BEGIN:VTODO":
+            props = {}
+        elif upper == "END:VTODO":
+            if props is not None:
+                yield props
+            props = None
+        elif props is not None and ":" in line:
+            head, value = line.split(":", 1)
+            name = head.split(";", 1)[0].upper()
+            props.setdefault(name, value)
+
+
+def vtodo_to_task(props: Dict[str, str], user_id: str) -> Task:
+    """Build a Task from VTODO properties (see task_to_vtodo for the mapping)."""
+    if not props.get("SUMMARY"):
+        raise ValueError("VTODO without SUMMARY")
+    end = _parse_ical_datetime(props["DUE"]) if props.get("DUE") else None
+    start = _parse_ical_datetime(props["DTSTART"]) if props.get("DTSTART") else None
+    # DTSTART is the task's due_date_time; without one, fall back to DUE
+    due = start or end
+    if end and start and end > start:
+        duration = int((end - start).total_seconds() // 60)
+    else:
+        duration = int(props.get("X-TASKS-DURATION") or 0)
+    ical_priority = int(props.get("PRIORITY") or 0)
+    if ical_priority == 0:
+        priority = Priority.MEDIUM
+    elif ical_priority <= 2:
+        priority = Priority.URGENT
+    elif ical_priority <= 4:
+        priority = Priority.HIGH
+    elif ical_priority <= 6:
+        priority = Priority.MEDIUM
+    else:
+        priority = Priority.LOW
+    if props.get("X-TASKS-STATUS"):
+        status = TaskStatus(props["X-TASKS-STATUS"])
+    else:
+        status = _STATUS_FROM_ICAL.get(props.get("STATUS", "").upper(), TaskStatus.UPCOMING if due else TaskStatus.PENDING)
+    completed_at = _parse_ical_datetime(props["COMPLETED"]) if props.get("COMPLETED") else None
+    is_completed = status == TaskStatus.COMPLETED or completed_at is not None
+    return Task(
+        task_id=_ical_unescape(props.get("UID", "")) or str(uuid.uuid4()),
+        user_id=user_id,
+        goal_id=props.get("X-TASKS-GOAL-ID") or None,
+        title=_ical_unescape(props["SUMMARY"]),
+        description=_ical_unescape(props.get("DESCRIPTION", "")),
+        due_date_time=due,
+        duration_minutes=duration,
+        priority=priority,
+        type=TaskType(props["X-TASKS-TYPE"]) if props.get("X-TASKS-TYPE") else TaskType.FREE,
+        is_completed=is_completed,
+        completed_at=completed_at,
+        status=TaskStatus.COMPLETED if is_completed else status,
+        progress_percent=int(props.get("PERCENT-COMPLETE") or (100 if is_completed else 0)),
+        created_at=_parse_ical_datetime(props["CREATED"]) if props.get("CREATED") else None,
+        updated_at=_parse_ical_datetime(props["LAST-MODIFIED"]) if props.get("LAST-MODIFIED") else None,
+    )
+
+
+# --- Service ---------------------------------------------------------------
+
+class ImportExportService:
+    """Use cases for bulk task import and export in CSV, JSON Lines and iCalendar."""
+
+    def __init__(
+        self,
+        task_service: Optional[TaskService] = None,
+        batch_size: int = 5000,
+        progress_every: int = 10000,
+    ) -> None:
+        """
+        Args:
+            task_service: Service used for reading and bulk writing tasks.
+            batch_size: Tasks per import transaction / rows per export fetch.
+            progress_every: Call the progress callback every N records (and at the end).
+        """
+        self._tasks = task_service or TaskService()
+        self._batch_size = batch_size
+        self._progress_every = progress_every
+
+    def export_tasks(
+        self,
+        out: TextIO,
+        fmt: str,
+        user_id: Optional[str],
+        include_completed: bool = True,
+        progress: Optional[ProgressCallback] = None,
+    ) -> int:
+        """
+        Stream tasks of user (None = all users) to out in fmt.
+
+        Returns:
+            Number of tasks written.
+        """
+        tasks = self._tasks.iter_tasks_for_user(
+            user_id, include_completed=include_completed, batch_size=self._batch_size
+        )
+        if fmt not in FORMATS:
+            raise ValueError(f"unknown format {fmt!r} (expected one of {', '.join(FORMATS)})")
+        csv_writer = csv.writer(out) if fmt == "csv" else None
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+        def write(task: Task) -> None:
+            if csv_writer is not None:
+                csv_writer.writerow(
+                    ["" if v is None else int(v) if isinstance(v, bool) else v for v in task_to_record(task).values()]
+                )
+            elif fmt == "ics":
+                out.write(task_to_vtodo(task, stamp))
+            else:
+                out.write(json.dumps(task_to_record(task), ensure_ascii=False) + "\n")
+
+        if csv_writer is not None:
+            csv_writer.writerow(FIELDS)
+        elif fmt == "ics":
+            out.write("BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//Task Manager//Tasks//EN\r\n")
+        count = 0
+        for task in tasks:
+            write(task)
+            count += 1
+            if progress is not None and count % self._progress_every == 0:
+                progress(count)
+        if fmt == "ics":
+            out.write("END:VCALENDAR\r\n")
+        if progress is not None:
+            progress(count)
+        return count
+
+    def import_tasks(
+        self,
+        source: TextIO,
+        fmt: str,
+        user_id: str,
+        progress: Optional[ProgressCallback] = None,
+    ) -> int:
+        """
+        Parse source in fmt and save its tasks for user_id, committing every batch_size tasks.
+
+        Tasks keep their ids, so re-importing a file updates instead of duplicating;
+        ids that belong to another user are replaced with new ones. On a parse error the batches committed so far remain.
+
+        Returns:
+            Number of tasks imported.
+
+        Raises:
+            ImportFormatError: If a record cannot be parsed.
+            DatabaseError: If a batch cannot be saved.
+        """
+        count = 0
+        batch: List[Task] = []
+        for task in self._parse(source, fmt, user_id):
+            batch.append(task)
+            if len(batch) >= self._batch_size:
+                count += self._tasks.import_tasks(batch)
+                batch = []
+                if progress is not None:
+                    progress(count)
+        if batch:
+            count += self._tasks.import_tasks(batch)
+        if progress is not None:
+            progress(count)
+        return count
+
+    def _parse(self, source: TextIO, fmt: str, user_id: str) -> Iterator[Task]:
+        records: Iterator[Any]
+        if fmt == "jsonl":
+            records = (json.loads(line) for line in source if line.strip())
+        elif fmt == "csv":
+            records = iter(csv.DictReader(source))
+        elif fmt == "ics":
+            records = _iter_vtodos(source)
+        else:
+            raise ValueError(f"unknown format {fmt!r} (expected one of {', '.join(FORMATS)})")
+        n = 0
+        while True:
+            n += 1
+            try:
+                record = next(records)
+            except StopIteration:
+                return
+            except (ValueError, csv.Error) as e:
+                raise ImportFormatError(f"{fmt} record {n}: {e}") from e
+            try:
+                task = vtodo_to_task(record, user_id) if fmt == "ics" else task_from_record(record, user_id)
+            except (ValueError, KeyError, TypeError) as e:
+                raise ImportFormatError(f"{fmt} record {n}: {e}") from e
+            yield task
@@ -0,0 +1,138 @@
+"""
+Background purge of soft-deleted tasks and goals.
+
+Deletes only stamp deleted_at (TaskRepository.delete, GoalRepository.delete);
+reads skip those rows and the undo window lets TaskService.restore_task and
+GoalService.restore_goal bring them back. Once a tombstone is older than the
+window it can no longer be undone, and the purge removes it for good: in
+batches of batch_size rows, one short transaction each, so a large purge never
+holds the write lock for long. Purging a goal cascades to its tasks (see
+GoalRepository.purge).
+
+    purger = TombstonePurger(db)
+    purger.run_once()                         # on the database's thread
+    scheduler = PurgeScheduler(db.path)       # or periodically, on a thread of its own
+    scheduler.start()
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Optional
+
+from repository.database import Database
+from repository.goal_repository import GoalRepository
+from repository.task_repository import TaskRepository
+
+# How long a delete can be undone; tombstones older than this are purged.
+DEFAULT_UNDO_WINDOW = timedelta(minutes=30)
+# Rows deleted per purge transaction
+DEFAULT_BATCH_SIZE = 500
+# Seconds between batches, so other writers get the lock in between
+DEFAULT_BATCH_PAUSE = 0.01
+
+
+@dataclass
+class PurgeResult:
+    """Rows removed by one purge run."""
+
+    goals: int = 0
+    tasks: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.goals + self.tasks
+
+
+class TombstonePurger:
+    """
+    Purges one database's expired tombstones through its repositories.
+
+    Like Database, a purger belongs to one thread (see PurgeScheduler for a background one).
+    """
+
+    def __init__(
+        self,
+        db: Database,
+        undo_window: timedelta = DEFAULT_UNDO_WINDOW,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        batch_pause: float = DEFAULT_BATCH_PAUSE,
+    ) -> None:
+        self._tasks = TaskRepository(db)
+        self._goals = GoalRepository(db)
+        self.undo_window = undo_window
+        self._batch_size = max(1, batch_size)
+        self._batch_pause = batch_pause
+
+    def run_once(self, now: Optional[datetime] = None) -> PurgeResult:
+        """
+        Purge everything deleted more than undo_window before now, batch by batch.
+
+        Goals go first, so their tasks are removed by the cascade rather than one by one.
+
+        Raises:
+            DatabaseError: If a batch fails (batches already committed stay purged).
+        """
+        cutoff = (now or datetime.now()) - self.undo_window
+        result = PurgeResult()
+        for repo, attr in ((self._goals, "goals"), (self._tasks, "tasks")):
+            while True:
+                purged = repo.purge(cutoff, self._batch_size)
+                setattr(result, attr, getattr(result, attr) + purged)
+                if purged < self._batch_size:
+                    break
+                if self._batch_pause > 0:
+                    time.sleep(self._batch_pause)
+        return result
+
+
+class PurgeScheduler:
+    """
+    Runs TombstonePurger every poll_seconds on a background thread.
+
+    The thread opens its own uncached Database on path: purged rows are already
+    invisible to reads, so the app's caches stay valid.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        undo_window: timedelta = DEFAULT_UNDO_WINDOW,
+        poll_seconds: float = 600.0,
+        on_error: Optional[Callable[[Exception], None]] = None,
+    ) -> None:
+        self._path = path
+        self._undo_window = undo_window
+        self._poll = poll_seconds
+        self._on_error = on_error
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self) -> None:
+        db = Database(self._path, cache_size=0)
+        try:
+            purger = TombstonePurger(db, self._undo_window)
+            while not self._stop.is_set():
+                try:
+                    purger.run_once()
+                except Exception as e:
+                    if self._on_error is not None:
+                        self._on_error(e)
+                self._stop.wait(self._poll)
+        finally:
+            db.close()
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="tasks-purge-scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the thread after the batch in progress."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
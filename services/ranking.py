@@ -0,0 +1,313 @@
+"""
+Urgency ranking: which open tasks to do next.
+
+A task's score combines its priority, its slack (time until due minus its
+duration: a long task due tomorrow is as pressing as a short one due sooner),
+how long it has been overdue, and whether it keeps a goal streak alive. See
+urgency_score().
+
+RankingEngine keeps, per user, the scores of all open tasks and the best K in
+a min-heap (the rest in a max-heap, so a removed top task is replaced without a
+scan). Task change events move single entries between the heaps in O(log n);
+since scores depend on the current time, everything is rescored when the
+scores are older than ``rescore_after`` or the day changes. Stale heap entries
+are skipped lazily and compacted away.
+
+Like EventBus, an engine belongs to one thread.
+"""
+
+import heapq
+import itertools
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from models import Task
+from models.enums import Priority
+from repository.database import DatabaseError
+from repository.goal_repository import GoalRepository
+from repository.task_repository import TaskRepository
+from services.events import GOAL_KINDS, TASK_KINDS, ChangeEvent, ChangeKind, EventBus, get_event_bus
+
+PRIORITY_WEIGHT = {Priority.LOW: 1.0, Priority.MEDIUM: 2.0, Priority.HIGH: 4.0, Priority.URGENT: 8.0}
+
+
+@dataclass(frozen=True)
+class RankingWeights:
+    """
+    Tuning of urgency_score.
+
+    Attributes:
+        slack_scale_hours: Slack at which a task's time pressure halves.
+        overdue_weight: Growth of time pressure per log-day overdue.
+        unscheduled: Time pressure of tasks without a due date.
+        streak_weight: Bonus per log(streak) for goal tasks due within streak_window_hours.
+        streak_window_hours: How close a goal task must be to count as streak risk.
+    """
+
+    slack_scale_hours: float = 24.0
+    overdue_weight: float = 1.0
+    unscheduled: float = 0.05
+    streak_weight: float = 2.0
+    streak_window_hours: float = 24.0
+
+
+DEFAULT_WEIGHTS = RankingWeights()
+
+# (priority, due_date_time, duration_minutes, goal_id): what a score is computed from
+RankRow = Tuple[Priority, Optional[datetime], int, Optional[str]]
+
+
+def urgency_score(
+    row: RankRow,
+    now: datetime,
+    goal_streaks: Optional[Dict[str, int]] = None,
+    weights: RankingWeights = DEFAULT_WEIGHTS,
+) -> float:
+    """
+    Score one open task at now (higher = do sooner).
+
+    priority weight x time pressure, where time pressure is 1 / (1 + slack / scale)
+    for tasks not yet due, 1 + overdue_weight * log(1 + overdue days) for overdue
+    ones and a small constant for unscheduled ones; plus a streak bonus for tasks of
+    goals with a running streak that are due soon.
+    """
+    priority, due, duration, goal_id = row
+    base = PRIORITY_WEIGHT.get(priority, 2.0)
+    if due is None:
+        return base * weights.unscheduled
+    slack_hours = (due - now).total_seconds() / 3600 - duration / 60
+    if slack_hours >= 0:
+        pressure = 1.0 / (1.0 + slack_hours / weights.slack_scale_hours)
+    else:
+        pressure = 1.0 + weights.overdue_weight * math.log1p(-slack_hours / 24)
+    score = base * pressure
+    if goal_id and goal_streaks and slack_hours < weights.streak_window_hours:
+        streak = goal_streaks.get(goal_id, 0)
+        if streak > 0:
+            score += weights.streak_weight * math.log1p(streak)
+    return score
+
+
+def task_rank_row(task: Task) -> RankRow:
+    return task.priority, task.due_date_time, task.duration_minutes or 0, task.goal_id
+
+
+class _UserRanking:
+    """Scores of one user's open tasks with the best k in a min-heap and the rest in a max-heap."""
+
+    def __init__(self, k: int) -> None:
+        self.k = k
+        self.rows: Dict[str, RankRow] = {}
+        self.entry: Dict[str, Tuple[float, int]] = {}  # task_id -> (score, version) of its live entry
+        self.in_top: Dict[str, bool] = {}
+        self.top: List[Tuple[float, int, str]] = []     # min-heap (score, version, id)
+        self.rest: List[Tuple[float, int, str]] = []    # max-heap (-score, version, id)
+        self.top_count = 0
+        self.goal_streaks: Dict[str, int] = {}
+        self.scored_at = datetime.min
+
+    def _live(self, score: float, version: int, task_id: str) -> bool:
+        return self.entry.get(task_id) == (score, version)
+
+    def rebuild(self, now: datetime, versions: "itertools.count", weights: RankingWeights) -> None:
+        """Rescore every task at now and rebuild both heaps (O(n))."""
+        self.entry.clear()
+        scored = []
+        for task_id, row in self.rows.items():
+            entry = (urgency_score(row, now, self.goal_streaks, weights), next(versions))
+            self.entry[task_id] = entry
+            scored.append((entry[0], entry[1], task_id))
+        best = heapq.nlargest(self.k, scored)
+        best_ids = {task_id for _, _, task_id in best}
+        self.top = best
+        heapq.heapify(self.top)
+        self.rest = [(-s, v, task_id) for s, v, task_id in scored if task_id not in best_ids]
+        heapq.heapify(self.rest)
+        self.in_top = {task_id: task_id in best_ids for task_id in self.rows}
+        self.top_count = len(best)
+        self.scored_at = now
+
+    def _peek_min_top(self) -> Optional[Tuple[float, int, str]]:
+        while self.top and not (self._live(*self.top[0]) and self.in_top.get(self.top[0][2])):
+            heapq.heappop(self.top)
+        return self.top[0] if self.top else None
+
+    def _pop_max_rest(self) -> Optional[Tuple[float, int, str]]:
+        while self.rest:
+            neg, version, task_id = heapq.heappop(self.rest)
+            if self._live(-neg, version, task_id) and not self.in_top.get(task_id):
+                return -neg, version, task_id
+        return None
+
+    def remove(self, task_id: str) -> None:
+        self.rows.pop(task_id, None)
+        self.entry.pop(task_id, None)
+        if self.in_top.pop(task_id, False):
+            self.top_count -= 1
+            self._refill()
+
+    def _peek_max_rest(self) -> Optional[Tuple[float, int, str]]:
+        while self.rest:
+            neg, version, task_id = self.rest[0]
+            if self._live(-neg, version, task_id) and not self.in_top.get(task_id):
+                return -neg, version, task_id
+            heapq.heappop(self.rest)
+        return None
+
+    def upsert(self, task_id: str, row: RankRow, now: datetime, version: int, weights: RankingWeights) -> None:
+        """Add or rescore one task: it enters the rest, then the heaps are rebalanced."""
+        self.rows[task_id] = row
+        self.entry[task_id] = (urgency_score(row, now, self.goal_streaks, weights), version)
+        if self.in_top.get(task_id):
+            self.top_count -= 1
+        self.in_top[task_id] = False
+        heapq.heappush(self.rest, (-self.entry[task_id][0], version, task_id))
+        self._refill()
+        # Swap while the best of the rest beats the worst of the top (once per upsert at most)
+        while True:
+            best, worst = self._peek_max_rest(), self._peek_min_top()
+            if best is None or worst is None or best[0] <= worst[0]:
+                break
+            heapq.heappop(self.rest)
+            heapq.heappop(self.top)
+            heapq.heappush(self.top, best)
+            heapq.heappush(self.rest, (-worst[0], worst[1], worst[2]))
+            self.in_top[best[2]] = True
+            self.in_top[worst[2]] = False
+        self._compact()
+
+    def _refill(self) -> None:
+        """Promote the best of the rest while the top has room."""
+        while self.top_count < self.k:
+            item = self._pop_max_rest()
+            if item is None:
+                return
+            heapq.heappush(self.top, item)
+            self.in_top[item[2]] = True
+            self.top_count += 1
+
+    def _compact(self) -> None:
+        """Drop stale entries once they make up most of a heap."""
+        if len(self.top) > 4 * max(self.k, 16):
+            self.top = [e for e in self.top if self._live(*e) and self.in_top.get(e[2])]
+            heapq.heapify(self.top)
+        if len(self.rest) > 2 * len(self.rows) + 64:
+            self.rest = [e for e in self.rest if self._live(-e[0], e[1], e[2]) and not self.in_top.get(e[2])]
+            heapq.heapify(self.rest)
+
+    def best(self, limit: int) -> List[Tuple[float, str]]:
+        live = [(s, task_id) for s, v, task_id in self.top if self._live(s, v, task_id) and self.in_top.get(task_id)]
+        live.sort(key=lambda x: (-x[0], x[1]))
+        return live[:limit]
+
+
+class RankingEngine:
+    """
+    Incrementally maintained "what next" ranking of users' open tasks.
+
+    top_tasks() serves the Home dashboard's upcoming list from the heap instead
+    of a query and sort; a user's ranking is loaded on first use.
+    """
+
+    def __init__(
+        self,
+        task_repo: Optional[TaskRepository] = None,
+        goal_repo: Optional[GoalRepository] = None,
+        event_bus: Optional[EventBus] = None,
+        k: int = 50,
+        rescore_after: timedelta = timedelta(minutes=15),
+        weights: RankingWeights = DEFAULT_WEIGHTS,
+    ) -> None:
+        """
+        Args:
+            k: Tasks kept ranked per user (the most top_tasks can return).
+            rescore_after: Age after which all scores are recomputed (they depend on now).
+        """
+        self._tasks = task_repo or TaskRepository()
+        self._goals = goal_repo or GoalRepository()
+        self._k = k
+        self._rescore_after = rescore_after
+        self._weights = weights
+        self._users: Dict[str, _UserRanking] = {}
+        self._owner: Dict[str, str] = {}
+        self._versions = itertools.count()
+        self._stale_users: set = set()  # goal streaks changed: rescore on next read
+        bus = event_bus or get_event_bus()
+        bus.subscribe(self._on_task_changes, kinds=TASK_KINDS)
+        bus.subscribe(self._on_goal_changes, kinds=GOAL_KINDS)
+
+    def _ranking(self, user_id: str, now: datetime) -> _UserRanking:
+        ranking = self._users.get(user_id)
+        if ranking is None:
+            ranking = _UserRanking(self._k)
+            try:
+                for task_id, *row in self._tasks.iter_open_rank_rows(user_id):
+                    ranking.rows[task_id] = tuple(row)
+                    self._owner[task_id] = user_id
+                ranking.goal_streaks = self._load_streaks(user_id)
+            except DatabaseError:
+                raise
+            except Exception as e:
+                raise DatabaseError(f"load ranking failed: {e}") from e
+            self._users[user_id] = ranking
+            ranking.rebuild(now, self._versions, self._weights)
+        elif (
+            user_id in self._stale_users
+            or now - ranking.scored_at > self._rescore_after
+            or now.date() != ranking.scored_at.date()
+        ):
+            if user_id in self._stale_users:
+                ranking.goal_streaks = self._load_streaks(user_id)
+                self._stale_users.discard(user_id)
+            ranking.rebuild(now, self._versions, self._weights)
+        return ranking
+
+    def _load_streaks(self, user_id: str) -> Dict[str, int]:
+        return {g.goal_id: g.current_streak for g in self._goals.get_all_by_user(user_id) if g.current_streak}
+
+    def top(self, user_id: str, limit: int = 10, now: Optional[datetime] = None) -> List[Tuple[float, str]]:
+        """Return up to limit (score, task_id) pairs, most urgent first."""
+        return self._ranking(user_id, now or datetime.now()).best(min(limit, self._k))
+
+    def top_tasks(self, user_id: str, limit: int = 10, now: Optional[datetime] = None) -> List[Task]:
+        """Return up to limit open tasks, most urgent first (rows come from the task cache)."""
+        tasks = []
+        for _, task_id in self.top(user_id, limit, now):
+            task = self._tasks.get_by_id(task_id)
+            if task is not None:
+                tasks.append(task)
+        return tasks
+
+    def invalidate(self, user_id: Optional[str] = None) -> None:
+        """Drop a user's ranking (None = all); it is reloaded on next use. Call after bulk imports."""
+        for uid in [user_id] if user_id is not None else list(self._users):
+            ranking = self._users.pop(uid, None)
+            if ranking is not None:
+                for task_id in ranking.rows:
+                    self._owner.pop(task_id, None)
+
+    def _on_task_changes(self, events: Iterable[ChangeEvent]) -> None:
+        for ev in events:
+            task = ev.entity
+            user_id = task.user_id if task is not None else self._owner.get(ev.entity_id)
+            ranking = self._users.get(user_id) if user_id is not None else None
+            if ranking is None:
+                continue  # not loaded yet: read from the table on first use
+            if ev.kind == ChangeKind.TASK_DELETED or task is None or task.is_completed:
+                ranking.remove(ev.entity_id)
+                self._owner.pop(ev.entity_id, None)
+                continue
+            # Score against the ranking's clock so all scores stay comparable
+            ranking.upsert(task.task_id, task_rank_row(task), ranking.scored_at, next(self._versions), self._weights)
+            self._owner[task.task_id] = user_id
+
+    def _on_goal_changes(self, events: Iterable[ChangeEvent]) -> None:
+        for ev in events:
+            if ev.entity is not None and "current_streak" not in ev.changed_fields:
+                continue
+            if ev.user_id is None:
+                self._stale_users.update(self._users)  # delete by id: owner unknown
+            elif ev.user_id in self._users:
+                self._stale_users.add(ev.user_id)
@@ -0,0 +1,208 @@
+"""
+Schedule index: double-booking and day-overload checks without querying SQLite.
+
+For each user the open timed tasks are kept in memory as intervals
+[due_date_time, due_date_time + duration_minutes), sorted by start, plus a
+per-day total of planned minutes. A user's index is loaded on first use and
+then kept up to date from the event bus, so checks cost a bisect and a dict
+lookup. Completed and unscheduled tasks are not indexed; tasks without a
+duration count for nothing.
+
+Like EventBus, an index belongs to one thread.
+"""
+
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from repository.database import DatabaseError
+from repository.task_repository import TaskRepository
+from services.events import TASK_KINDS, ChangeEvent, ChangeKind, EventBus, get_event_bus
+
+# Planned minutes per day before a day counts as overloaded (8 hours).
+DEFAULT_DAY_CAPACITY_MINUTES = 8 * 60
+
+
+@dataclass(frozen=True)
+class ScheduledSlot:
+    """An indexed task's time slot (end is exclusive)."""
+
+    task_id: str
+    start: datetime
+    end: datetime
+
+
+@dataclass
+class ScheduleCheck:
+    """
+    Result of checking a proposed slot.
+
+    Attributes:
+        conflicts: Open tasks overlapping the slot.
+        day_minutes: Minutes already planned on the slot's day (excluding the checked task).
+        minutes: Duration of the proposed slot.
+        capacity: Day capacity the check used.
+    """
+
+    conflicts: List[ScheduledSlot] = field(default_factory=list)
+    day_minutes: int = 0
+    minutes: int = 0
+    capacity: int = DEFAULT_DAY_CAPACITY_MINUTES
+
+    @property
+    def overloaded(self) -> bool:
+        return self.day_minutes + self.minutes > self.capacity
+
+    @property
+    def ok(self) -> bool:
+        return not self.conflicts and not self.overloaded
+
+
+class _UserSchedule:
+    """One user's intervals: (start, end, task_id) sorted by start, and minutes per day."""
+
+    def __init__(self) -> None:
+        self.starts: List[Tuple[datetime, datetime, str]] = []
+        self.by_id: Dict[str, Tuple[datetime, datetime, str]] = {}
+        self.day_minutes: Dict[date, int] = {}
+        # Upper bound on any indexed interval's length: overlap scans start this far back.
+        self.longest = timedelta(0)
+
+    def add(self, task_id: str, start: datetime, minutes: int) -> bool:
+        """Index a slot; returns False (nothing indexed) for tasks without a duration."""
+        if minutes <= 0:
+            return False
+        entry = (start, start + timedelta(minutes=minutes), task_id)
+        insort(self.starts, entry)
+        self.by_id[task_id] = entry
+        day = start.date()
+        self.day_minutes[day] = self.day_minutes.get(day, 0) + minutes
+        self.longest = max(self.longest, entry[1] - entry[0])
+        return True
+
+    def remove(self, task_id: str) -> None:
+        entry = self.by_id.pop(task_id, None)
+        if entry is None:
+            return
+        i = bisect_left(self.starts, entry)
+        if i < len(self.starts) and self.starts[i] == entry:
+            del self.starts[i]
+        day = entry[0].date()
+        left = self.day_minutes.get(day, 0) - int((entry[1] - entry[0]).total_seconds() // 60)
+        if left > 0:
+            self.day_minutes[day] = left
+        else:
+            self.day_minutes.pop(day, None)
+
+    def overlapping(self, start: datetime, end: datetime) -> List[Tuple[datetime, datetime, str]]:
+        # Candidates start in (start - longest, end); of those, keep the ones ending after start
+        lo = bisect_left(self.starts, (start - self.longest,))
+        hi = bisect_left(self.starts, (end,))
+        return [e for e in self.starts[lo:hi] if e[1] > start]
+
+
+class ScheduleIndex:
+    """
+    In-memory interval index of users' open timed tasks.
+
+    Answers "which tasks overlap [start, end)" and "minutes planned on day D" for a
+    user; TaskDialog uses check() to warn before saving a double-booked slot or an
+    overloaded day.
+    """
+
+    def __init__(
+        self,
+        task_repo: Optional[TaskRepository] = None,
+        event_bus: Optional[EventBus] = None,
+        day_capacity_minutes: int = DEFAULT_DAY_CAPACITY_MINUTES,
+    ) -> None:
+        self._repo = task_repo or TaskRepository()
+        self._users: Dict[str, _UserSchedule] = {}
+        self._owner: Dict[str, str] = {}  # task_id -> user_id (deletes carry no entity)
+        self.day_capacity_minutes = day_capacity_minutes
+        (event_bus or get_event_bus()).subscribe(self._on_task_changes, kinds=TASK_KINDS)
+
+    def _schedule(self, user_id: str) -> _UserSchedule:
+        schedule = self._users.get(user_id)
+        if schedule is None:
+            schedule = _UserSchedule()
+            try:
+                rows = sorted(self._repo.iter_open_intervals(user_id))
+            except DatabaseError:
+                raise
+            except Exception as e:
+                raise DatabaseError(f"load schedule failed: {e}") from e
+            for task_id, start, minutes in rows:
+                if schedule.add(task_id, start, minutes):
+                    self._owner[task_id] = user_id
+            self._users[user_id] = schedule
+        return schedule
+
+    def invalidate(self, user_id: Optional[str] = None) -> None:
+        """Drop a user's index (None = all); it is reloaded on next use. Call after bulk imports."""
+        for uid in [user_id] if user_id is not None else list(self._users):
+            schedule = self._users.pop(uid, None)
+            if schedule is not None:
+                for task_id in schedule.by_id:
+                    self._owner.pop(task_id, None)
+
+    def overlaps(
+        self,
+        user_id: str,
+        start: datetime,
+        end: datetime,
+        exclude_task_id: Optional[str] = None,
+    ) -> List[ScheduledSlot]:
+        """Open tasks of user_id whose slot intersects [start, end), by start."""
+        if end <= start:
+            return []
+        return [
+            ScheduledSlot(task_id, s, e)
+            for s, e, task_id in self._schedule(user_id).overlapping(start, end)
+            if task_id != exclude_task_id
+        ]
+
+    def planned_minutes(self, user_id: str, day: date) -> int:
+        """Minutes of open tasks due on day."""
+        return self._schedule(user_id).day_minutes.get(day, 0)
+
+    def check(
+        self,
+        user_id: str,
+        start: datetime,
+        duration_minutes: int,
+        exclude_task_id: Optional[str] = None,
+    ) -> ScheduleCheck:
+        """
+        Check a proposed slot for user_id.
+
+        Args:
+            exclude_task_id: The task being edited (its current slot is ignored).
+        """
+        schedule = self._schedule(user_id)
+        minutes = max(duration_minutes or 0, 0)
+        day_minutes = schedule.day_minutes.get(start.date(), 0)
+        current = schedule.by_id.get(exclude_task_id) if exclude_task_id else None
+        if current is not None and current[0].date() == start.date():
+            day_minutes -= int((current[1] - current[0]).total_seconds() // 60)
+        return ScheduleCheck(
+            conflicts=self.overlaps(user_id, start, start + timedelta(minutes=minutes), exclude_task_id),
+            day_minutes=day_minutes,
+            minutes=minutes,
+            capacity=self.day_capacity_minutes,
+        )
+
+    def _on_task_changes(self, events: List[ChangeEvent]) -> None:
+        for ev in events:
+            user_id = self._owner.pop(ev.entity_id, None)
+            if user_id is not None:
+                self._users[user_id].remove(ev.entity_id)
+            task = ev.entity
+            if ev.kind == ChangeKind.TASK_DELETED or task is None:
+                continue
+            schedule = self._users.get(task.user_id)
+            if schedule is None or task.is_completed or task.due_date_time is None:
+                continue  # not loaded yet (loaded from the table on first use) or not indexed
+            if schedule.add(task.task_id, task.due_date_time, task.duration_minutes):
+                self._owner[task.task_id] = task.user_id
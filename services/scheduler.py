@@ -0,0 +1,245 @@
+"""
+Auto-scheduler: give unscheduled tasks (a duration but no due date) a slot.
+
+Free time is working hours (and, in student mode, a separate evening study
+window for STUDY_SESSION tasks) minus the user's open timed tasks, over a
+horizon of days. Tasks are placed greedily, highest priority first and then
+oldest first (pending tasks have no deadline), each at the earliest free slot
+long enough for it.
+
+Placing a task at the start of a free interval only shrinks that interval, so
+the set of intervals is fixed once built. A max segment tree over their
+remaining lengths finds the earliest interval that fits in O(log m), and a
+whole run is O(n log n + m log m) for n tasks and m free intervals.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from models import Task, User
+from models.enums import Priority, TaskType
+from repository.database import DatabaseError
+from repository.task_repository import TaskRepository
+from services.task_service import TaskService
+
+_PRIORITY_RANK = {Priority.URGENT: 0, Priority.HIGH: 1, Priority.MEDIUM: 2, Priority.LOW: 3}
+
+
+@dataclass
+class SchedulerConfig:
+    """
+    Where tasks may be placed.
+
+    Attributes:
+        work_start / work_end: Daily working window for ordinary tasks.
+        work_days: Weekdays (0 = Monday) with a working window.
+        study_start / study_end: Daily window for STUDY_SESSION tasks in student mode
+            (every day); ordinary tasks never use it.
+        slot_minutes: Start times are multiples of this; durations are rounded up to it.
+    """
+
+    work_start: time = time(9, 0)
+    work_end: time = time(17, 0)
+    work_days: Tuple[int, ...] = (0, 1, 2, 3, 4)
+    study_start: time = time(18, 0)
+    study_end: time = time(21, 0)
+    slot_minutes: int = 15
+
+
+@dataclass
+class SchedulePlan:
+    """
+    Result of a scheduling run (nothing is written until AutoScheduler.apply).
+
+    Attributes:
+        assignments: (task, start) pairs in placement order.
+        unplaced: Tasks that fit in no free slot of the horizon.
+    """
+
+    assignments: List[Tuple[Task, datetime]] = field(default_factory=list)
+    unplaced: List[Task] = field(default_factory=list)
+
+
+class _FreeSlots:
+    """Fixed list of free intervals (start minute, remaining minutes) with a max segment tree."""
+
+    def __init__(self, intervals: Sequence[Tuple[datetime, int]]) -> None:
+        self.starts = [start for start, _ in intervals]
+        size = 1
+        while size < max(len(intervals), 1):
+            size *= 2
+        self._size = size
+        self._tree = [0] * (2 * size)
+        for i, (_, length) in enumerate(intervals):
+            self._tree[size + i] = length
+        for i in range(size - 1, 0, -1):
+            self._tree[i] = max(self._tree[2 * i], self._tree[2 * i + 1])
+
+    def take(self, minutes: int) -> Optional[datetime]:
+        """Reserve minutes at the start of the earliest interval long enough; None if none is."""
+        tree = self._tree
+        if tree[1] < minutes:
+            return None
+        i = 1
+        while i < self._size:
+            i = 2 * i if tree[2 * i] >= minutes else 2 * i + 1
+        index = i - self._size
+        start = self.starts[index]
+        self.starts[index] = start + timedelta(minutes=minutes)
+        tree[i] -= minutes
+        i //= 2
+        while i:
+            tree[i] = max(tree[2 * i], tree[2 * i + 1])
+            i //= 2
+        return start
+
+
+def _round_up(minutes: int, slot: int) -> int:
+    return -(-minutes // slot) * slot
+
+
+def free_intervals(
+    busy: Iterable[Tuple[datetime, int]],
+    first_day: date,
+    days: int,
+    window_start: time,
+    window_end: time,
+    weekdays: Optional[Sequence[int]] = None,
+    not_before: Optional[datetime] = None,
+    slot_minutes: int = 15,
+) -> List[Tuple[datetime, int]]:
+    """
+    Free (start, minutes) intervals of a daily window over days, minus busy slots.
+
+    Starts are aligned up to slot_minutes; intervals shorter than one slot are dropped.
+
+    Args:
+        busy: (start, minutes) of existing timed tasks, in any order.
+        weekdays: Days the window exists (None = every day).
+        not_before: Nothing starts earlier (e.g. now).
+    """
+    by_day: Dict[date, List[Tuple[datetime, datetime]]] = {}
+    for start, minutes in busy:
+        end = start + timedelta(minutes=minutes)
+        day = start.date()
+        while day <= end.date():
+            by_day.setdefault(day, []).append((start, end))
+            day += timedelta(days=1)
+    slot = timedelta(minutes=slot_minutes)
+    result = []
+    for offset in range(days):
+        day = first_day + timedelta(days=offset)
+        if weekdays is not None and day.weekday() not in weekdays:
+            continue
+        cursor = datetime.combine(day, window_start)
+        end_of_window = datetime.combine(day, window_end)
+        if not_before is not None and cursor < not_before:
+            cursor = not_before
+        for b_start, b_end in sorted(by_day.get(day, [])) + [(end_of_window, end_of_window)]:
+            # Align up to the slot grid (measured from midnight)
+            since_midnight = cursor - datetime.combine(cursor.date(), time())
+            if since_midnight % slot:
+                cursor += slot - since_midnight % slot
+            gap_end = min(b_start, end_of_window)
+            if gap_end - cursor >= slot:
+                result.append((cursor, int((gap_end - cursor).total_seconds() // 60)))
+            cursor = max(cursor, b_end)
+            if cursor >= end_of_window:
+                break
+    return result
+
+
+def plan_schedule(
+    pending: Iterable[Task],
+    busy: Iterable[Tuple[datetime, int]],
+    first_day: date,
+    days: int,
+    config: Optional[SchedulerConfig] = None,
+    student_mode: bool = False,
+    not_before: Optional[datetime] = None,
+) -> SchedulePlan:
+    """
+    Place pending tasks into the free time of [first_day, first_day + days).
+
+    Args:
+        pending: Tasks to place (their duration_minutes is used; due dates are ignored).
+        busy: (start, minutes) of the user's existing timed tasks.
+        student_mode: Put STUDY_SESSION tasks in the study window instead of working hours.
+        not_before: Earliest start (default: no limit).
+    """
+    config = config or SchedulerConfig()
+    busy = list(busy)
+    work = _FreeSlots(
+        free_intervals(
+            busy, first_day, days, config.work_start, config.work_end,
+            config.work_days, not_before, config.slot_minutes,
+        )
+    )
+    study = None
+    if student_mode:
+        study = _FreeSlots(
+            free_intervals(
+                busy, first_day, days, config.study_start, config.study_end,
+                None, not_before, config.slot_minutes,
+            )
+        )
+    order = sorted(
+        pending,
+        key=lambda t: (_PRIORITY_RANK.get(t.priority, 2), t.created_at or datetime.min, t.task_id),
+    )
+    plan = SchedulePlan()
+    for task in order:
+        slots = study if study is not None and task.type == TaskType.STUDY_SESSION else work
+        start = slots.take(_round_up(max(task.duration_minutes, 1), config.slot_minutes))
+        if start is None:
+            plan.unplaced.append(task)
+        else:
+            plan.assignments.append((task, start))
+    return plan
+
+
+class AutoScheduler:
+    """Plans and applies schedules for a user's unscheduled tasks."""
+
+    def __init__(
+        self,
+        task_service: Optional[TaskService] = None,
+        task_repo: Optional[TaskRepository] = None,
+        config: Optional[SchedulerConfig] = None,
+    ) -> None:
+        # Busy intervals are read from the database the service writes to
+        if task_repo is None:
+            task_repo = task_service.repository if task_service is not None else TaskRepository()
+        self._repo = task_repo
+        self._service = task_service or TaskService(self._repo)
+        self.config = config or SchedulerConfig()
+
+    def plan(self, user: User, days: int = 14, now: Optional[datetime] = None) -> SchedulePlan:
+        """
+        Plan the user's unscheduled tasks over the next days (starting today, after now).
+
+        Raises:
+            DatabaseError: If reading tasks fails.
+        """
+        now = now or datetime.now()
+        try:
+            pending = self._service.get_unscheduled(user.user_id)
+            busy = [(start, minutes) for _, start, minutes in self._repo.iter_open_intervals(user.user_id)]
+        except DatabaseError:
+            raise
+        except Exception as e:
+            raise DatabaseError(f"plan schedule failed: {e}") from e
+        return plan_schedule(
+            pending,
+            busy,
+            now.date(),
+            days,
+            self.config,
+            student_mode=user.is_student_mode,
+            not_before=now,
+        )
+
+    def apply(self, plan: SchedulePlan) -> int:
+        """Write the plan's due dates in one transaction; returns the number of tasks scheduled."""
+        return len(self._service.schedule_tasks(plan.assignments))
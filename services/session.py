@@ -0,0 +1,96 @@
+"""Per-user service bundle: services bound to the database that holds the user's data."""
+
+from dataclasses import dataclass
+from typing import Optional
+
+from models import User
+from repository.database import Database
+from repository.goal_repository import GoalRepository
+from repository.summary_repository import DailySummaryRepository
+from repository.task_repository import TaskRepository
+from repository.user_registry import UserRegistry, get_user_registry
+from repository.user_repository import UserRepository
+from services.backup import BackupManager
+from services.commands import CommandStack
+from services.events import EventBus, get_event_bus
+from services.goal_service import GoalService
+from services.history_service import HistoryService
+from services.ranking import RankingEngine
+from services.schedule_index import ScheduleIndex
+from services.scheduler import AutoScheduler
+from services.task_service import TaskService
+from services.user_service import UserService
+
+
+@dataclass
+class UserSession:
+    """
+    Services for one user.
+
+    Attributes:
+        user: The session's user.
+        db: Database holding the user's goals and tasks (their shard, or the shared file).
+        tasks: TaskService over db.
+        goals: GoalService over db.
+        users: UserService over the user directory.
+        history: HistoryService (daily trends) over db.
+        schedule: ScheduleIndex (double-booking/overload checks), loaded on first use.
+        auto_scheduler: AutoScheduler placing unscheduled tasks into free time.
+        ranking: RankingEngine ("what next" by urgency), loaded on first use.
+        backups: BackupManager (snapshots of db, retention and restore).
+        commands: CommandStack (undo/redo of task edits, written in batches).
+    """
+
+    user: User
+    db: Database
+    tasks: TaskService
+    goals: GoalService
+    users: UserService
+    history: HistoryService
+    schedule: ScheduleIndex
+    auto_scheduler: AutoScheduler
+    ranking: RankingEngine
+    backups: BackupManager
+    commands: CommandStack
+
+
+def open_session(
+    user_id: Optional[str] = None,
+    registry: Optional[UserRegistry] = None,
+    event_bus: Optional[EventBus] = None,
+) -> UserSession:
+    """
+    Bind services to user_id's database.
+
+    Args:
+        user_id: User to act as (None = the default user, created if needed).
+        registry: Routes users to databases (default: the app registry).
+        event_bus: Bus the services publish on (default: the app bus).
+
+    Raises:
+        ValueError: If user_id does not exist.
+        DatabaseError: If the database fails.
+    """
+    registry = registry or get_user_registry()
+    events = event_bus or get_event_bus()
+    users = UserService(UserRepository(registry.directory))
+    user = users.get_or_create_default_user() if user_id is None else users.get_user(user_id)
+    if user is None:
+        raise ValueError(f"unknown user {user_id!r}")
+    db = registry.database_for(user.user_id)
+    task_repo = TaskRepository(db)
+    tasks = TaskService(task_repo, event_bus=events)
+    goal_repo = GoalRepository(db)
+    return UserSession(
+        user=user,
+        db=db,
+        tasks=tasks,
+        goals=GoalService(goal_repo, event_bus=events, task_repo=task_repo),
+        users=users,
+        history=HistoryService(DailySummaryRepository(db)),
+        schedule=ScheduleIndex(task_repo, event_bus=events),
+        auto_scheduler=AutoScheduler(tasks, task_repo),
+        ranking=RankingEngine(task_repo, goal_repo, event_bus=events),
+        backups=BackupManager(db),
+        commands=CommandStack(task_repo, event_bus=events),
+    )
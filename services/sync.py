@@ -0,0 +1,233 @@
+"""
+Sync between copies of the database through their change logs.
+
+A sync pulls the peer's change rows after the last cursor, applies the ones
+that win (last writer wins per field, see repository.change_log), then pushes
+local rows the peer has not seen. Only change rows travel, never whole files.
+Peers are another local database file (LocalFilePeer) or a running
+``python -m tasks_manager serve`` (HttpPeer, the /sync endpoints).
+
+    engine = SyncEngine(db)
+    result = engine.sync(LocalFilePeer(Path("/mnt/usb/tasks.db")))
+
+Repository caches are cleared after changes are applied; open views reload
+on their next refresh.
+"""
+
+import json
+import urllib.error
+import urllib.request
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from repository.change_log import Change, ChangeLog
+from repository.database import Database, DatabaseError
+
+# Rows per pull/push request
+DEFAULT_BATCH_SIZE = 2000
+# Compact after a sync once the log has grown by this many rows since the last compaction.
+DEFAULT_COMPACT_EVERY = 10_000
+
+
+class SyncPeer:
+    """The other side of a sync: its node id, its rows after a cursor, and a way to send it rows."""
+
+    def node_id(self) -> str:
+        raise NotImplementedError
+
+    def origin(self) -> Optional[Tuple[str, int]]:
+        """(node id, seq) the peer's file was copied from, if any (see ChangeLog.origin)."""
+        return None
+
+    def pull(self, after_seq: int, exclude_node: str, limit: int) -> Tuple[List[Change], int]:
+        """Peer's rows after after_seq not made by exclude_node; returns (changes, next cursor)."""
+        raise NotImplementedError
+
+    def push(self, changes: List[Change]) -> int:
+        """Apply changes on the peer; returns how many won there."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class LocalFilePeer(SyncPeer):
+    """Another database file on this machine (a USB stick, a network share, a second profile)."""
+
+    def __init__(self, path: Path) -> None:
+        if not Path(path).exists():
+            raise DatabaseError(f"no database at {path}")
+        self._db = Database(Path(path), cache_size=0)
+        self._log = self._db.change_log()
+        self._log.enable()
+
+    def node_id(self) -> str:
+        return self._log.node_id
+
+    def origin(self) -> Optional[Tuple[str, int]]:
+        return self._log.origin()
+
+    def pull(self, after_seq: int, exclude_node: str, limit: int) -> Tuple[List[Change], int]:
+        return self._log.since(after_seq, exclude_node, limit)
+
+    def push(self, changes: List[Change]) -> int:
+        return self._log.apply(changes)
+
+    def close(self) -> None:
+        self._db.close()
+
+
+class HttpPeer(SyncPeer):
+    """A ``tasks_manager serve`` instance (POST /sync/node, GET/POST /sync/changes)."""
+
+    def __init__(self, base_url: str, timeout: float = 30.0) -> None:
+        self._base = base_url.rstrip("/")
+        self._timeout = timeout
+        self._node: Optional[Dict[str, Any]] = None
+
+    def _request(self, method: str, path: str, body: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        request = urllib.request.Request(
+            self._base + path,
+            data=data,
+            method=method,
+            headers={"Content-Type": "application/json"} if data is not None else {},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self._timeout) as response:
+                return json.loads(response.read() or b"{}")
+        except urllib.error.HTTPError as e:
+            raise DatabaseError(f"sync peer {self._base} answered {e.code}: {e.read().decode('utf-8', 'replace')}") from e
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            raise DatabaseError(f"sync peer {self._base} failed: {e}") from e
+
+    def _node_info(self) -> Dict[str, Any]:
+        if self._node is None:
+            # POST enables the server's change log (as LocalFilePeer does for a file)
+            self._node = self._request("POST", "/sync/node")
+        return self._node
+
+    def node_id(self) -> str:
+        return self._node_info()["node_id"]
+
+    def origin(self) -> Optional[Tuple[str, int]]:
+        origin = self._node_info().get("origin")
+        return (origin[0], int(origin[1])) if origin else None
+
+    def pull(self, after_seq: int, exclude_node: str, limit: int) -> Tuple[List[Change], int]:
+        query = urlencode({"since": after_seq, "exclude": exclude_node, "limit": limit})
+        data = self._request("GET", f"/sync/changes?{query}")
+        return data["changes"], data["cursor"]
+
+    def push(self, changes: List[Change]) -> int:
+        return self._request("POST", "/sync/changes", {"changes": changes})["applied"]
+
+
+@dataclass
+class SyncResult:
+    """
+    Outcome of one sync.
+
+    Attributes:
+        pulled / applied: Rows received from the peer / of those, rows that won here.
+        pushed / accepted: Rows sent to the peer / of those, rows that won there.
+        compacted: Log rows removed by compaction afterwards (0 if it was not due).
+    """
+
+    pulled: int = 0
+    applied: int = 0
+    pushed: int = 0
+    accepted: int = 0
+    compacted: int = 0
+
+
+class SyncEngine:
+    """Two-way delta sync of one database with peers, with periodic log compaction."""
+
+    def __init__(
+        self,
+        db: Database,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        compact_every: int = DEFAULT_COMPACT_EVERY,
+    ) -> None:
+        self._db = db
+        self._log: ChangeLog = db.change_log()
+        self._batch_size = batch_size
+        self._compact_every = compact_every
+
+    @property
+    def log(self) -> ChangeLog:
+        return self._log
+
+    def enable(self) -> int:
+        """Start recording changes (see ChangeLog.enable); returns baseline rows written."""
+        return self._log.enable()
+
+    def sync(self, peer: SyncPeer) -> SyncResult:
+        """
+        Pull then push all changes not yet exchanged with peer.
+
+        Cursors are saved after every batch, so an interrupted sync resumes where
+        it stopped; re-sending rows is harmless (they no longer win).
+
+        Raises:
+            DatabaseError: If either side fails.
+        """
+        self._log.enable()
+        node = self._log.node_id
+        peer_node = peer.node_id()
+        if peer_node == node:
+            raise DatabaseError("peer is this database (same node id)")
+        received, sent = f"received:{peer_node}", f"sent:{peer_node}"
+        origin = peer.origin()
+        if origin is not None and origin[0] == node and not self._log.cursor(received) and not self._log.cursor(sent):
+            # The peer is a copy of this file: both logs are identical up to the copy's seq
+            self._log.set_cursor(received, origin[1])
+            self._log.set_cursor(sent, origin[1])
+        result = SyncResult()
+        while True:
+            after = self._log.cursor(received)
+            changes, cursor = peer.pull(after, node, self._batch_size)
+            result.pulled += len(changes)
+            result.applied += self._log.apply(changes)
+            self._log.set_cursor(received, cursor)
+            if len(changes) < self._batch_size:
+                break
+        while True:
+            after = self._log.cursor(sent)
+            changes, cursor = self._log.since(after, peer_node, self._batch_size)
+            if changes:
+                result.accepted += peer.push(changes)
+                result.pushed += len(changes)
+            self._log.set_cursor(sent, cursor)
+            if len(changes) < self._batch_size:
+                break
+        stats = self._log.stats()
+        if stats["last_seq"] - stats["compacted_seq"] >= self._compact_every:
+            result.compacted = self._log.compact()
+        return result
+
+    def compact(self) -> int:
+        """Compact the log now; returns rows removed."""
+        return self._log.compact()
+
+    def status(self) -> Dict[str, Any]:
+        """Change log stats plus the peers' cursors."""
+        stats = self._log.stats()
+        try:
+            rows = self._db.connect().execute(
+                "SELECT key, value FROM sync_state WHERE key LIKE 'cursor:%' ORDER BY key"
+            ).fetchall()
+        except Exception as e:
+            raise DatabaseError(f"read sync state failed: {e}") from e
+        stats["cursors"] = {key[len("cursor:"):]: int(value) for key, value in rows}
+        return stats
+
+
+def open_peer(target: str) -> SyncPeer:
+    """Peer for a database path or an http(s):// URL of a running server."""
+    if target.startswith(("http://", "https://")):
+        return HttpPeer(target)
+    return LocalFilePeer(Path(target))
@@ -1,13 +1,45 @@
 """Task service (use cases: CRUD, complete, filter)."""
 
 import uuid
-from datetime import datetime
-from typing import List, Optional
+from dataclasses import fields
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 from repository import TaskRepository
+from repository.task_repository import TaskPage
 from repository.database import DatabaseError
 from models import Task
 from models.enums import TaskStatus, TaskType, Priority
+from services.events import ChangeEvent, ChangeKind, EventBus, get_event_bus
+from services.purge import DEFAULT_UNDO_WINDOW
+
+_TASK_FIELDS = frozenset(f.name for f in fields(Task))
+
+# Fields update_task (and an edit command) may change
+_EDITABLE_FIELDS = (
+    "title", "description", "due_date_time", "duration_minutes", "priority", "progress_percent", "status",
+)
+
+
+def apply_updates(task: Task, **updates: Any) -> Set[str]:
+    """
+    Set the given editable fields on task in place (None = leave unchanged) and touch updated_at.
+
+    progress_percent is clamped to 0..100. Returns the names of the fields that changed.
+    """
+    unknown = set(updates) - set(_EDITABLE_FIELDS)
+    if unknown:
+        raise TypeError(f"not editable: {', '.join(sorted(unknown))}")
+    if updates.get("progress_percent") is not None:
+        updates["progress_percent"] = max(0, min(100, updates["progress_percent"]))
+    changed = set()
+    for name, value in updates.items():
+        if value is not None and getattr(task, name) != value:
+            setattr(task, name, value)
+            changed.add(name)
+    task.updated_at = datetime.now()
+    changed.add("updated_at")
+    return changed
 
 
 class TaskService:
@@ -15,10 +47,35 @@ class TaskService:
     Use cases for Task: Create, Read, Update, Delete, Complete, and list/filter.
 
     Follows sequence diagram: Controller calls Service, Service uses Repository.
+    Every successful write publishes a ChangeEvent on the event bus. Deletes are
+    soft: restore_task undoes one within undo_window, then it is purged (services.purge).
     """
 
-    def __init__(self, task_repo: Optional[TaskRepository] = None) -> None:
+    def __init__(
+        self,
+        task_repo: Optional[TaskRepository] = None,
+        event_bus: Optional[EventBus] = None,
+        undo_window: timedelta = DEFAULT_UNDO_WINDOW,
+    ) -> None:
         self._repo = task_repo or TaskRepository()
+        self._events = event_bus or get_event_bus()
+        self.undo_window = undo_window
+
+    @property
+    def repository(self) -> TaskRepository:
+        """The repository behind this service (other services on the same database share it)."""
+        return self._repo
+
+    def _publish(self, kind: ChangeKind, task: Task, changed_fields: Iterable[str] = _TASK_FIELDS) -> None:
+        self._events.publish(
+            ChangeEvent(
+                kind=kind,
+                entity_id=task.task_id,
+                user_id=task.user_id,
+                changed_fields=frozenset(changed_fields),
+                entity=task,
+            )
+        )
 
     def get_by_id(self, task_id: str) -> Optional[Task]:
         """Return task by id or None."""
@@ -63,6 +120,93 @@ class TaskService:
         except Exception as e:
             raise DatabaseError(f"get_tasks_for_user failed: {e}") from e
 
+    def iter_tasks_for_user(
+        self,
+        user_id: Optional[str],
+        from_date: Optional[datetime] = None,
+        to_date: Optional[datetime] = None,
+        include_completed: bool = True,
+        search_query: Optional[str] = None,
+        batch_size: int = 500,
+    ) -> Iterator[Task]:
+        """
+        Stream tasks for user (None = all users) with the get_tasks_for_user filters.
+
+        Uses constant memory; intended for exports and CLI listings of large data sets.
+        """
+        return self._repo.iter_by_user(
+            user_id,
+            from_date=from_date,
+            to_date=to_date,
+            include_completed=include_completed,
+            search_query=search_query,
+            batch_size=batch_size,
+        )
+
+    def get_task_page(
+        self,
+        user_id: str,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        from_date: Optional[datetime] = None,
+        to_date: Optional[datetime] = None,
+        include_completed: bool = True,
+        search_query: Optional[str] = None,
+    ) -> TaskPage:
+        """
+        Return one page of tasks (get_tasks_for_user filters and order).
+
+        Pass the returned next_cursor to get the following page; it is None on the last one.
+
+        Raises:
+            ValueError: If cursor is malformed.
+            DatabaseError: If repository fails.
+        """
+        try:
+            return self._repo.get_page(
+                user_id,
+                limit=limit,
+                cursor=cursor,
+                from_date=from_date,
+                to_date=to_date,
+                include_completed=include_completed,
+                search_query=search_query,
+            )
+        except (DatabaseError, ValueError):
+            raise
+        except Exception as e:
+            raise DatabaseError(f"get_task_page failed: {e}") from e
+
+    def get_summary(self, user_id: str) -> Dict[str, Any]:
+        """Return task counts for user (total, completed, open, overdue, unscheduled, by_priority)."""
+        try:
+            return self._repo.summary_by_user(user_id)
+        except DatabaseError:
+            raise
+        except Exception as e:
+            raise DatabaseError(f"get_summary failed: {e}") from e
+
+    def import_tasks(self, tasks: Iterable[Task]) -> int:
+        """
+        Persist many tasks through the repository bulk path (one transaction).
+
+        No per-task change events are published; a running UI picks the rows up on
+        its next reload. A task whose id already belongs to another user gets a new
+        id instead of overwriting that user's task. Returns the number of tasks written.
+        """
+        try:
+            tasks = list(tasks)
+            owners = self._repo.owners(task.task_id for task in tasks)
+            for task in tasks:
+                owner = owners.get(task.task_id)
+                if owner is not None and owner != task.user_id:
+                    task.task_id = str(uuid.uuid4())
+            return self._repo.save_many(tasks)
+        except DatabaseError:
+            raise
+        except Exception as e:
+            raise DatabaseError(f"import_tasks failed: {e}") from e
+
     def create_task(
         self,
         user_id: str,
@@ -103,11 +247,12 @@ class TaskService:
         )
         try:
             self._repo.save(task)
-            return task
         except DatabaseError:
             raise
         except Exception as e:
             raise DatabaseError(f"create_task failed: {e}") from e
+        self._publish(ChangeKind.TASK_CREATED, task)
+        return task
 
     def update_task(
         self,
@@ -130,28 +275,24 @@ class TaskService:
         task = self._repo.get_by_id(task_id)
         if task is None:
             return None
-        if title is not None:
-            task.title = title
-        if description is not None:
-            task.description = description
-        if due_date_time is not None:
-            task.due_date_time = due_date_time
-        if duration_minutes is not None:
-            task.duration_minutes = duration_minutes
-        if priority is not None:
-            task.priority = priority
-        if progress_percent is not None:
-            task.progress_percent = max(0, min(100, progress_percent))
-        if status is not None:
-            task.status = status
-        task.updated_at = datetime.now()
+        changed = apply_updates(
+            task,
+            title=title,
+            description=description,
+            due_date_time=due_date_time,
+            duration_minutes=duration_minutes,
+            priority=priority,
+            progress_percent=progress_percent,
+            status=status,
+        )
         try:
             self._repo.save(task)
-            return task
         except DatabaseError:
             raise
         except Exception as e:
             raise DatabaseError(f"update_task failed: {e}") from e
+        self._publish(ChangeKind.TASK_UPDATED, task, changed)
+        return task
 
     def complete_task(self, task_id: str) -> Optional[Task]:
         """
@@ -166,11 +307,85 @@ class TaskService:
         task.complete()
         try:
             self._repo.save(task)
-            return task
         except DatabaseError:
             raise
         except Exception as e:
             raise DatabaseError(f"complete_task failed: {e}") from e
+        self._publish(
+            ChangeKind.TASK_COMPLETED,
+            task,
+            ("is_completed", "completed_at", "status", "progress_percent", "updated_at"),
+        )
+        return task
+
+    def complete_tasks(self, task_ids: Iterable[str]) -> List[Task]:
+        """
+        Mark many tasks completed with one bulk write.
+
+        Unknown and already completed ids are skipped. Publishes TASK_COMPLETED per task.
+
+        Returns:
+            The tasks that were completed.
+        """
+        completed = []
+        for task_id in task_ids:
+            task = self._repo.get_by_id(task_id)
+            if task is None or task.is_completed:
+                continue
+            task.complete()
+            completed.append(task)
+        if not completed:
+            return []
+        try:
+            self._repo.save_many(completed)
+        except DatabaseError:
+            raise
+        except Exception as e:
+            raise DatabaseError(f"complete_tasks failed: {e}") from e
+        for task in completed:
+            self._publish(
+                ChangeKind.TASK_COMPLETED,
+                task,
+                ("is_completed", "completed_at", "status", "progress_percent", "updated_at"),
+            )
+        return completed
+
+    def get_unscheduled(self, user_id: str) -> List[Task]:
+        """Return open tasks with a duration but no due date, oldest first."""
+        try:
+            return self._repo.get_unscheduled(user_id)
+        except DatabaseError:
+            raise
+        except Exception as e:
+            raise DatabaseError(f"get_unscheduled failed: {e}") from e
+
+    def schedule_tasks(self, assignments: Iterable[Tuple[Task, datetime]]) -> List[Task]:
+        """
+        Give many tasks a due date with one bulk write (status SCHEDULED).
+
+        Publishes TASK_UPDATED per task.
+
+        Returns:
+            The scheduled tasks.
+        """
+        now = datetime.now()
+        scheduled = []
+        for task, due in assignments:
+            task.due_date_time = due
+            task.status = TaskStatus.SCHEDULED
+            task.updated_at = now
+            scheduled.append(task)
+        if not scheduled:
+            return []
+        try:
+            self._repo.save_many(scheduled)
+        except DatabaseError:
+            raise
+        except Exception as e:
+            raise DatabaseError(f"schedule_tasks failed: {e}") from e
+        for task in scheduled:
+            self._publish(ChangeKind.TASK_UPDATED, task, ("due_date_time", "status", "updated_at"))
+        return scheduled
 
     def cancel_task(self, task_id: str) -> Optional[Task]:
         """Mark task as cancelled/rejected. Returns updated task or None."""
@@ -181,11 +396,30 @@ class TaskService:
         return self.update_task(task_id, status=TaskStatus.IN_PROGRESS)
 
     def delete_task(self, task_id: str) -> bool:
-        """Delete task by id. Returns True if deleted."""
+        """Delete task by id (restore_task undoes it within undo_window). Returns True if deleted."""
         try:
-            self._repo.delete(task_id)
-            return True
+            deleted = self._repo.delete(task_id)
         except DatabaseError:
             raise
         except Exception as e:
             raise DatabaseError(f"delete_task failed: {e}") from e
+        if deleted:
+            self._events.publish(ChangeEvent(kind=ChangeKind.TASK_DELETED, entity_id=task_id))
+        return deleted
+
+    def restore_task(self, task_id: str) -> Optional[Task]:
+        """
+        Undo delete_task if it happened within undo_window. Publishes TASK_CREATED.
+
+        Returns:
+            The restored task, or None if it is not deleted or the window has passed.
+        """
+        try:
+            task = self._repo.restore(task_id, deleted_after=datetime.now() - self.undo_window)
+        except DatabaseError:
+            raise
+        except Exception as e:
+            raise DatabaseError(f"restore_task failed: {e}") from e
+        if task is not None:
+            self._publish(ChangeKind.TASK_CREATED, task)
+        return task
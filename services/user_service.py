@@ -1,34 +1,92 @@
 """User service (use cases for User)."""
 
-from typing import Optional
+import os
+import uuid
+from typing import List, Optional
 
 from repository import UserRepository
 from repository.database import DatabaseError
 from models import User
 
+DEFAULT_USER_ID = "default_user"
+# Set to a user id to make it the current user of this process (UI and CLI default).
+USER_ENV = "TASKS_USER"
+
 
 class UserService:
-    """Use cases for User: get or create default user."""
+    """Use cases for User: look up, list and create users; get or create the current default user."""
 
-    def __init__(self, user_repo: Optional[UserRepository] = None) -> None:
+    def __init__(self, user_repo: Optional[UserRepository] = None, default_user_id: Optional[str] = None) -> None:
+        """
+        Args:
+            user_repo: Repository over the user directory (default: the app database).
+            default_user_id: User returned by get_or_create_default_user
+                (default: TASKS_USER env var, else "default_user").
+        """
         self._repo = user_repo or UserRepository()
+        self._default_id = default_user_id or os.environ.get(USER_ENV) or DEFAULT_USER_ID
+
+    def get_user(self, user_id: str) -> Optional[User]:
+        """Return user by id or None."""
+        try:
+            return self._repo.get_by_id(user_id)
+        except DatabaseError:
+            raise
+        except Exception as e:
+            raise DatabaseError(f"get_user failed: {e}") from e
+
+    def list_users(self) -> List[User]:
+        """Return all users ordered by name."""
+        try:
+            return self._repo.get_all()
+        except DatabaseError:
+            raise
+        except Exception as e:
+            raise DatabaseError(f"list_users failed: {e}") from e
+
+    def create_user(
+        self,
+        name: str,
+        email: str = "",
+        user_id: Optional[str] = None,
+        is_student_mode: bool = False,
+    ) -> User:
+        """
+        Create and persist a new user.
+
+        Raises:
+            ValueError: If name is empty or user_id is already taken.
+            DatabaseError: If repository fails.
+        """
+        if not name.strip():
+            raise ValueError("user name must not be empty")
+        user_id = user_id or str(uuid.uuid4())
+        if self.get_user(user_id) is not None:
+            raise ValueError(f"user {user_id!r} already exists")
+        user = User(user_id=user_id, name=name.strip(), email=email, is_student_mode=is_student_mode)
+        try:
+            self._repo.save(user)
+        except DatabaseError:
+            raise
+        except Exception as e:
+            raise DatabaseError(f"create_user failed: {e}") from e
+        return user
 
     def get_or_create_default_user(self) -> User:
         """
         Return the default user; create one if none exists.
 
         Returns:
-            Default user (single-user app).
+            Default user (TASKS_USER or "default_user" unless default_user_id was given).
 
         Raises:
             DatabaseError: If repository fails.
         """
-        default_id = "default_user"
-        user = self._repo.get_by_id(default_id)
+        user = self._repo.get_by_id(self._default_id)
         if user is not None:
             return user
         user = User(
-            user_id=default_id,
+            user_id=self._default_id,
             name="User",
             email="user@local",
             is_student_mode=False,
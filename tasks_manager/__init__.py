@@ -0,0 +1 @@
+"""Headless entry points (``python -m tasks_manager``); see ``tasks_manager/cli.py``."""
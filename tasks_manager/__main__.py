@@ -0,0 +1,8 @@
+"""Run the command-line interface: ``python -m tasks_manager --help``."""
+
+import sys
+
+from tasks_manager.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,661 @@
+"""
+Command-line interface for scripted task operations (no display needed).
+
+Usage:
+    python -m tasks_manager list --date today
+    python -m tasks_manager list --open --format jsonl > open.jsonl
+    python -m tasks_manager add "Write report" --due "2026-03-01 14:00" --priority high
+    python -m tasks_manager complete <task_id> [<task_id> ...]   (or - to read ids from stdin)
+    python -m tasks_manager export tasks.csv          (csv, jsonl or ics; from the suffix or --format)
+    python -m tasks_manager import todo.ics --batch-size 5000
+    python -m tasks_manager stats [--json]
+    python -m tasks_manager goals list | goals check [--repair]
+    python -m tasks_manager history trend --days 365 --bucket 7 | history backfill | history check [--repair]
+    python -m tasks_manager schedule --days 14 [--dry-run]   (place unscheduled tasks into free time)
+    python -m tasks_manager sync run /mnt/usb/tasks.db | sync run http://host:8765 | sync status | sync compact
+    python -m tasks_manager backup create --label before-import | backup list | backup prune [--dry-run] | backup restore latest
+    python -m tasks_manager purge [--older-than 0]   (remove deleted tasks/goals past the undo window)
+    python -m tasks_manager vacuum
+    python -m tasks_manager benchmark --scale 100k
+    python -m tasks_manager serve --port 8765         (local HTTP/JSON API, see server.py)
+    python -m tasks_manager users add "Alice" --email alice@example.com
+    python -m tasks_manager --shards shards users shard --all   (one database file per user)
+
+Every command goes through TaskService / GoalService; listings and exports are
+streamed, imports and multi-task completes use the repository bulk paths.
+Global options: --db PATH (default: the app's tasks.db), --user USER_ID
+(default: the app's default user), --shards DIR (per-user database files; the
+--db file then only holds the user directory).
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, List, Optional, TextIO
+
+from models.enums import Priority, TaskType
+from repository.database import Database, DatabaseError, get_database
+from repository.user_registry import SHARDS_ENV, UserRegistry
+from repository.user_repository import UserRepository
+from services.backup import BackupManager, RetentionPolicy
+from services.events import EventBus
+from services.goal_service import GoalService
+from services.import_export import FORMATS, ImportExportService, ImportFormatError, detect_format, task_to_record
+from services.session import UserSession, open_session
+from services.task_service import TaskService
+from services.user_service import UserService
+
+
+class CliError(Exception):
+    """Raised for user-facing command failures (printed without a traceback)."""
+
+    pass
+
+
+class CliContext:
+    """Services bound to the selected user's database (opened on first use)."""
+
+    def __init__(self, registry: UserRegistry, user_id: Optional[str] = None) -> None:
+        self.registry = registry
+        # Private bus: there is no UI listening in this process.
+        self._events = EventBus()
+        self.users = UserService(UserRepository(registry.directory))
+        self._user_id = user_id
+        self._session: Optional[UserSession] = None
+
+    @property
+    def session(self) -> UserSession:
+        if self._session is None:
+            try:
+                self._session = open_session(self._user_id, self.registry, self._events)
+            except ValueError as e:
+                raise CliError(str(e)) from e
+        return self._session
+
+    @property
+    def user_id(self) -> str:
+        return self.session.user.user_id
+
+    @property
+    def db(self) -> Database:
+        return self.session.db
+
+    @property
+    def tasks(self) -> TaskService:
+        return self.session.tasks
+
+    @property
+    def goals(self) -> GoalService:
+        return self.session.goals
+
+    @property
+    def import_export(self) -> ImportExportService:
+        return ImportExportService(self.tasks)
+
+
+def parse_when(text: str) -> datetime:
+    """Parse "today", "tomorrow", "YYYY-MM-DD" or "YYYY-MM-DD HH:MM" (argparse type)."""
+    value = text.strip().lower()
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    if value == "today":
+        return today
+    if value == "tomorrow":
+        return today + timedelta(days=1)
+    try:
+        return datetime.fromisoformat(text.strip())
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date {text!r} (use YYYY-MM-DD [HH:MM], today or tomorrow)")
+
+
+def _open_output(path: str) -> TextIO:
+    return sys.stdout if path == "-" else open(path, "w", encoding="utf-8", newline="")
+
+
+def _open_input(path: str) -> TextIO:
+    return sys.stdin if path == "-" else open(path, encoding="utf-8-sig", newline="")
+
+
+def _progress(verb: str) -> Callable[[int], None]:
+    def report(count: int) -> None:
+        print(f"{verb} {count:,} task(s)", file=sys.stderr, flush=True)
+
+    return report
+
+
+def cmd_list(ctx: CliContext, args: argparse.Namespace) -> int:
+    from_date, to_date = args.from_date, args.to_date
+    if args.date is not None:
+        from_date = to_date = args.date
+    tasks = ctx.tasks.iter_tasks_for_user(
+        ctx.user_id,
+        from_date=from_date,
+        to_date=to_date,
+        include_completed=not args.open,
+        search_query=args.search,
+    )
+    out = sys.stdout
+    for n, task in enumerate(tasks, 1):
+        if args.format == "jsonl":
+            out.write(json.dumps(task_to_record(task)) + "\n")
+        else:
+            due = task.due_date_time.strftime("%Y-%m-%d %H:%M") if task.due_date_time else "-"
+            done = "x" if task.is_completed else " "
+            out.write(f"[{done}] {task.task_id}  {due:<16}  {task.priority.value:<6}  {task.title}\n")
+        if args.limit and n >= args.limit:
+            break
+    return 0
+
+
+def cmd_add(ctx: CliContext, args: argparse.Namespace) -> int:
+    task = ctx.tasks.create_task(
+        user_id=ctx.user_id,
+        title=args.title,
+        description=args.description,
+        due_date_time=args.due,
+        duration_minutes=args.duration,
+        priority=Priority(args.priority),
+        goal_id=args.goal,
+        task_type=TaskType.GOAL if args.goal else TaskType.FREE,
+    )
+    print(task.task_id)
+    return 0
+
+
+def cmd_complete(ctx: CliContext, args: argparse.Namespace) -> int:
+    ids = [line.strip() for line in sys.stdin if line.strip()] if args.task_ids == ["-"] else args.task_ids
+    completed = {t.task_id for t in ctx.tasks.complete_tasks(ids)}
+    skipped = [tid for tid in ids if tid not in completed]
+    print(f"completed {len(completed)} task(s)")
+    for tid in skipped:
+        print(f"skipped {tid} (not found or already completed)", file=sys.stderr)
+    return 1 if skipped else 0
+
+
+def cmd_export(ctx: CliContext, args: argparse.Namespace) -> int:
+    fmt = args.format or detect_format(args.path)
+    out = _open_output(args.path)
+    try:
+        ctx.import_export.export_tasks(
+            out,
+            fmt,
+            None if args.all_users else ctx.user_id,
+            include_completed=not args.open,
+            progress=_progress("exported"),
+        )
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+def cmd_import(ctx: CliContext, args: argparse.Namespace) -> int:
+    fmt = args.format or detect_format(args.path)
+    source = _open_input(args.path)
+    try:
+        ImportExportService(ctx.tasks, batch_size=args.batch_size).import_tasks(
+            source, fmt, ctx.user_id, progress=_progress("imported")
+        )
+    except ImportFormatError as e:
+        raise CliError(str(e)) from e
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    return 0
+
+
+def cmd_stats(ctx: CliContext, args: argparse.Namespace) -> int:
+    summary = ctx.tasks.get_summary(ctx.user_id)
+    goals = ctx.goals.get_all_for_user(ctx.user_id, include_archived=True)
+    summary["goals"] = {
+        "active": sum(1 for g in goals if not g.is_archived),
+        "archived": sum(1 for g in goals if g.is_archived),
+    }
+    if args.db_stats:
+        summary["database"] = ctx.db.stats()
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return 0
+    print(f"user       {ctx.user_id}")
+    for key in ("total", "completed", "open", "overdue", "unscheduled"):
+        print(f"{key:<10} {summary[key]}")
+    for priority, n in sorted(summary["by_priority"].items()):
+        print(f"  open {priority:<6} {n}")
+    print(f"goals      {summary['goals']['active']} active, {summary['goals']['archived']} archived")
+    if args.db_stats:
+        print(json.dumps(summary["database"], indent=2))
+    return 0
+
+
+def cmd_vacuum(ctx: CliContext, args: argparse.Namespace) -> int:
+    sizes = ctx.db.vacuum()
+    print(f"vacuumed: {sizes['before']:,} -> {sizes['after']:,} bytes")
+    return 0
+
+
+def cmd_purge(ctx: CliContext, args: argparse.Namespace) -> int:
+    from services.purge import TombstonePurger
+
+    window = timedelta(minutes=args.older_than) if args.older_than is not None else ctx.tasks.undo_window
+    result = TombstonePurger(ctx.db, undo_window=window, batch_size=args.batch_size).run_once()
+    print(f"purged {result.goals:,} goal(s) and {result.tasks:,} task(s)")
+    return 0
+
+
+def cmd_benchmark(ctx: CliContext, args: argparse.Namespace) -> int:
+    try:
+        from benchmarks.__main__ import main as bench_main
+    except ImportError as e:
+        raise CliError(f"benchmarks are not available in this build: {e}") from e
+    return bench_main(args.bench_args)
+
+
+def cmd_goals_list(ctx: CliContext, args: argparse.Namespace) -> int:
+    goals = ctx.goals.get_all_for_user(ctx.user_id, include_archived=args.archived)
+    progress = ctx.goals.get_progress(g.goal_id for g in goals)
+    for goal in goals:
+        p = progress[goal.goal_id]
+        archived = "  (archived)" if goal.is_archived else ""
+        print(
+            f"{goal.goal_id}  {p.completed:>4}/{p.scheduled:<4} {p.completion_rate:>4.0%}  "
+            f"{p.completed_minutes:>5}/{p.total_minutes:<5} min  {goal.title}{archived}"
+        )
+    return 0
+
+
+def cmd_goals_check(ctx: CliContext, args: argparse.Namespace) -> int:
+    mismatched = ctx.goals.check_progress(repair=args.repair)
+    if not mismatched:
+        print("goal progress counters are consistent")
+        return 0
+    for goal_id in mismatched:
+        print(f"inconsistent: {goal_id}", file=sys.stderr)
+    if args.repair:
+        print(f"rebuilt counters ({len(mismatched)} goal(s) were inconsistent)")
+        return 0
+    return 1
+
+
+def cmd_history_trend(ctx: CliContext, args: argparse.Namespace) -> int:
+    trend = ctx.session.history.get_trend(ctx.user_id, days=args.days, bucket_days=args.bucket)
+    if args.json:
+        json.dump(
+            [
+                {
+                    "day": b.day.isoformat(),
+                    "created": b.created,
+                    "completed": b.completed,
+                    "minutes_planned": b.minutes_planned,
+                    "minutes_done": b.minutes_done,
+                }
+                for b in trend
+            ],
+            sys.stdout,
+            indent=2,
+        )
+        print()
+        return 0
+    for b in trend:
+        print(f"{b.day.isoformat()}  {b.created:>4} created  {b.completed:>4} completed  {b.minutes_done:>5}/{b.minutes_planned:<5} min")
+    return 0
+
+
+def cmd_history_backfill(ctx: CliContext, args: argparse.Namespace) -> int:
+    user_id = None if args.all else ctx.user_id
+    count = ctx.session.history.backfill(user_id, progress=lambda uid: print(f"rebuilt {uid}"))
+    print(f"rebuilt daily summaries for {count} user(s)")
+    return 0
+
+
+def cmd_history_check(ctx: CliContext, args: argparse.Namespace) -> int:
+    mismatched = ctx.session.history.check(ctx.user_id, repair=args.repair)
+    if not mismatched:
+        print("daily summaries are consistent")
+        return 0
+    for day in mismatched:
+        print(f"inconsistent: {day.isoformat()}", file=sys.stderr)
+    if args.repair:
+        print(f"rebuilt daily summaries ({len(mismatched)} day(s) were inconsistent)")
+        return 0
+    return 1
+
+
+def cmd_schedule(ctx: CliContext, args: argparse.Namespace) -> int:
+    scheduler = ctx.session.auto_scheduler
+    plan = scheduler.plan(ctx.session.user, days=args.days)
+    for task, start in plan.assignments:
+        print(f"{start:%Y-%m-%d %H:%M}  {task.duration_minutes:>4} min  {task.title}")
+    for task in plan.unplaced:
+        print(f"did not fit: {task.title} ({task.duration_minutes} min)", file=sys.stderr)
+    if args.dry_run:
+        print(f"would schedule {len(plan.assignments)} task(s); {len(plan.unplaced)} did not fit")
+        return 0
+    print(f"scheduled {scheduler.apply(plan)} task(s); {len(plan.unplaced)} did not fit")
+    return 0
+
+
+def cmd_sync_run(ctx: CliContext, args: argparse.Namespace) -> int:
+    from services.sync import SyncEngine, open_peer
+
+    engine = SyncEngine(ctx.db, batch_size=args.batch_size)
+    peer = open_peer(args.peer)
+    try:
+        result = engine.sync(peer)
+    finally:
+        peer.close()
+    print(f"pulled {result.pulled:,} change(s), {result.applied:,} applied")
+    print(f"pushed {result.pushed:,} change(s), {result.accepted:,} accepted")
+    if result.compacted:
+        print(f"compacted the change log: {result.compacted:,} row(s) removed")
+    return 0
+
+
+def cmd_sync_status(ctx: CliContext, args: argparse.Namespace) -> int:
+    from services.sync import SyncEngine
+
+    status = SyncEngine(ctx.db).status()
+    if args.json:
+        print(json.dumps(status, indent=2))
+        return 0
+    if not status["enabled"]:
+        print("change log not enabled (run 'sync enable' or a first 'sync run')")
+        return 0
+    print(f"node       {status['node_id']}")
+    print(f"log        {status['rows']:,} row(s), {status['tombstones']:,} tombstone(s), last seq {status['last_seq']:,}")
+    print(f"compacted  at seq {status['compacted_seq']:,}")
+    for name, seq in status["cursors"].items():
+        print(f"cursor     {name:<30} {seq:,}")
+    return 0
+
+
+def cmd_sync_enable(ctx: CliContext, args: argparse.Namespace) -> int:
+    from services.sync import SyncEngine
+
+    written = SyncEngine(ctx.db).enable()
+    print(f"change log enabled ({written:,} baseline row(s))")
+    return 0
+
+
+def cmd_sync_compact(ctx: CliContext, args: argparse.Namespace) -> int:
+    from services.sync import SyncEngine
+
+    print(f"removed {SyncEngine(ctx.db).compact():,} superseded row(s)")
+    return 0
+
+
+def _backups(ctx: CliContext, args: argparse.Namespace) -> BackupManager:
+    return BackupManager(ctx.db, directory=args.dir) if args.dir else ctx.session.backups
+
+
+def _size(size: int) -> str:
+    return f"{size / (1024 * 1024):,.1f} MiB"
+
+
+def cmd_backup_create(ctx: CliContext, args: argparse.Namespace) -> int:
+    started = time.perf_counter()
+    snapshot = _backups(ctx, args).backup(args.label)
+    print(f"{snapshot.path}  {_size(snapshot.size)}  in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+def cmd_backup_list(ctx: CliContext, args: argparse.Namespace) -> int:
+    snapshots = _backups(ctx, args).snapshots()
+    if args.json:
+        print(json.dumps(
+            [{"name": s.name, "path": str(s.path), "created": s.created.isoformat(), "label": s.label, "size": s.size}
+             for s in snapshots],
+            indent=2,
+        ))
+        return 0
+    for s in snapshots:
+        print(f"{s.name:<52}  {s.created:%Y-%m-%d %H:%M:%S}  {_size(s.size):>12}  {s.label or 'auto'}")
+    return 0
+
+
+def cmd_backup_prune(ctx: CliContext, args: argparse.Namespace) -> int:
+    policy = RetentionPolicy(
+        keep_last=args.keep_last,
+        daily=args.daily,
+        weekly=args.weekly,
+        monthly=args.monthly,
+        prune_labelled=args.all,
+    )
+    removed = _backups(ctx, args).prune(policy, dry_run=args.dry_run)
+    for s in removed:
+        print(s.name)
+    verb = "would remove" if args.dry_run else "removed"
+    print(f"{verb} {len(removed)} snapshot(s), {_size(sum(s.size for s in removed))}", file=sys.stderr)
+    return 0
+
+
+def cmd_backup_restore(ctx: CliContext, args: argparse.Namespace) -> int:
+    backups = _backups(ctx, args)
+    snapshot = backups.find(args.snapshot)
+    safety = backups.restore(snapshot, keep_current=not args.no_keep)
+    print(f"restored {snapshot.name}")
+    if safety is not None:
+        print(f"previous contents saved as {safety.name}")
+    return 0
+
+
+def cmd_users_list(ctx: CliContext, args: argparse.Namespace) -> int:
+    for user in ctx.users.list_users():
+        where = ctx.registry.shard_path(user.user_id).name if ctx.registry.sharded else "shared"
+        print(f"{user.user_id}  {user.name:<20}  {user.email:<24}  {where}")
+    return 0
+
+
+def cmd_users_add(ctx: CliContext, args: argparse.Namespace) -> int:
+    try:
+        user = ctx.users.create_user(args.name, email=args.email, user_id=args.id)
+    except ValueError as e:
+        raise CliError(str(e)) from e
+    print(user.user_id)
+    return 0
+
+
+def cmd_users_shard(ctx: CliContext, args: argparse.Namespace) -> int:
+    if not ctx.registry.sharded:
+        raise CliError(f"sharding is not enabled (use --shards DIR or set {SHARDS_ENV})")
+    user_ids = [u.user_id for u in ctx.users.list_users()] if args.all else args.user_ids
+    if not user_ids:
+        raise CliError("name user ids or pass --all")
+    for user_id in user_ids:
+        if ctx.users.get_user(user_id) is None:
+            raise CliError(f"unknown user {user_id!r}")
+        moved = ctx.registry.migrate_user(user_id, batch_size=args.batch_size)
+        path = ctx.registry.shard_path(user_id)
+        print(f"{user_id}: moved {moved['goals']} goal(s), {moved['tasks']:,} task(s) to {path}")
+    return 0
+
+
+def cmd_serve(ctx: CliContext, args: argparse.Namespace) -> int:
+    from tasks_manager.server import serve
+
+    # The server opens connections on its worker threads; these are not needed.
+    ctx.registry.close()
+    ctx.registry.directory.close()
+    serve(args.db, host=args.host, port=args.port, workers=args.workers, shard_dir=args.shards)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="tasks_manager", description="Task Manager command-line interface.")
+    parser.add_argument("--db", type=Path, help="SQLite database file (default: the app's tasks.db).")
+    parser.add_argument("--user", help="User id to act as (default: TASKS_USER, else the app's default user).")
+    parser.add_argument(
+        "--shards",
+        type=Path,
+        default=Path(os.environ[SHARDS_ENV]) if os.environ.get(SHARDS_ENV) else None,
+        help=f"Directory of per-user database files (default: {SHARDS_ENV}; unset = one shared file).",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("list", help="List tasks (streamed).")
+    p.add_argument("--date", type=parse_when, help="Only tasks due on this day.")
+    p.add_argument("--from", dest="from_date", type=parse_when, help="Only tasks due on or after this day.")
+    p.add_argument("--to", dest="to_date", type=parse_when, help="Only tasks due on or before this day.")
+    p.add_argument("--search", help="Title/description contains this text.")
+    p.add_argument("--open", action="store_true", help="Hide completed tasks.")
+    p.add_argument("--limit", type=int, default=0, help="Stop after N tasks.")
+    p.add_argument("--format", choices=["table", "jsonl"], default="table")
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser("add", help="Create a task; prints its id.")
+    p.add_argument("title")
+    p.add_argument("--description", default="")
+    p.add_argument("--due", type=parse_when)
+    p.add_argument("--duration", type=int, default=0, help="Minutes.")
+    p.add_argument("--priority", choices=[x.value for x in Priority], default=Priority.MEDIUM.value)
+    p.add_argument("--goal", help="Goal id to link.")
+    p.set_defaults(func=cmd_add)
+
+    p = sub.add_parser("complete", help="Mark tasks completed ('-' reads ids from stdin).")
+    p.add_argument("task_ids", nargs="+")
+    p.set_defaults(func=cmd_complete)
+
+    p = sub.add_parser("export", help="Export tasks as CSV, JSON Lines or iCalendar ('-' = stdout).")
+    p.add_argument("path")
+    p.add_argument("--format", choices=FORMATS, help="Default: from the file suffix, else jsonl.")
+    p.add_argument("--all-users", action="store_true", help="Export every user's tasks.")
+    p.add_argument("--open", action="store_true", help="Skip completed tasks.")
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("import", help="Import tasks from CSV, JSON Lines or iCalendar ('-' = stdin).")
+    p.add_argument("path")
+    p.add_argument("--format", choices=FORMATS, help="Default: from the file suffix, else jsonl.")
+    p.add_argument("--batch-size", type=int, default=5000, help="Tasks per transaction.")
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser("stats", help="Task and goal counts.")
+    p.add_argument("--json", action="store_true")
+    p.add_argument("--db-stats", action="store_true", help="Include query/cache statistics.")
+    p.set_defaults(func=cmd_stats)
+
+    p = sub.add_parser("purge", help="Permanently remove deleted tasks and goals whose undo window has passed.")
+    p.add_argument("--older-than", type=float, metavar="MINUTES", help="Deleted at least this long ago (default: the undo window).")
+    p.add_argument("--batch-size", type=int, default=500, help="Rows per transaction.")
+    p.set_defaults(func=cmd_purge)
+
+    p = sub.add_parser("vacuum", help="Compact the database file and refresh statistics.")
+    p.set_defaults(func=cmd_vacuum)
+
+    p = sub.add_parser("goals", help="Goal progress (completed/scheduled tasks and minutes).")
+    goals = p.add_subparsers(dest="goals_command", required=True)
+    g = goals.add_parser("list", help="Goals with their progress counters.")
+    g.add_argument("--archived", action="store_true", help="Include archived goals.")
+    g.set_defaults(func=cmd_goals_list)
+    g = goals.add_parser("check", help="Verify the progress counters against the tasks (exit 1 if they differ).")
+    g.add_argument("--repair", action="store_true", help="Rebuild the counters when they differ.")
+    g.set_defaults(func=cmd_goals_check)
+
+    p = sub.add_parser("history", help="Daily activity summaries (created/completed tasks and minutes).")
+    history = p.add_subparsers(dest="history_command", required=True)
+    h = history.add_parser("trend", help="Per-day (or per-bucket) counters, oldest first.")
+    h.add_argument("--days", type=int, default=30, help="Days up to today (default 30).")
+    h.add_argument("--bucket", type=int, default=1, help="Sum this many days per line (e.g. 7 = weekly).")
+    h.add_argument("--json", action="store_true", help="Print JSON instead of text.")
+    h.set_defaults(func=cmd_history_trend)
+    h = history.add_parser("backfill", help="Rebuild the summaries from the tasks (one transaction per user).")
+    h.add_argument("--all", action="store_true", help="Every user in the database, not only --user.")
+    h.set_defaults(func=cmd_history_backfill)
+    h = history.add_parser("check", help="Verify the summaries against the tasks (exit 1 if they differ).")
+    h.add_argument("--repair", action="store_true", help="Rebuild the user's summaries when they differ.")
+    h.set_defaults(func=cmd_history_check)
+
+    p = sub.add_parser("schedule", help="Give unscheduled tasks (duration, no due date) a slot in free time.")
+    p.add_argument("--days", type=int, default=14, help="Horizon in days from today (default 14).")
+    p.add_argument("--dry-run", action="store_true", help="Print the plan without saving it.")
+    p.set_defaults(func=cmd_schedule)
+
+    p = sub.add_parser("sync", help="Exchange changes with another copy of the database (change log deltas).")
+    sync = p.add_subparsers(dest="sync_command", required=True)
+    y = sync.add_parser("run", help="Pull and push changes not yet exchanged with a peer.")
+    y.add_argument("peer", help="Path of another tasks.db, or the URL of a running 'serve'.")
+    y.add_argument("--batch-size", type=int, default=2000, help="Change rows per request.")
+    y.set_defaults(func=cmd_sync_run)
+    y = sync.add_parser("status", help="Node id, change log size and peer cursors.")
+    y.add_argument("--json", action="store_true", help="Print JSON instead of text.")
+    y.set_defaults(func=cmd_sync_status)
+    y = sync.add_parser("enable", help="Start recording changes (writes a baseline of the current rows).")
+    y.set_defaults(func=cmd_sync_enable)
+    y = sync.add_parser("compact", help="Drop superseded rows from the change log.")
+    y.set_defaults(func=cmd_sync_compact)
+
+    p = sub.add_parser("backup", help="Snapshots of the database: create, list, prune, restore.")
+    p.add_argument("--dir", type=Path, help="Snapshot directory (default: TASKS_BACKUP_DIR, else backups/ next to the database).")
+    backup = p.add_subparsers(dest="backup_command", required=True)
+    b = backup.add_parser("create", help="Copy the database into a new snapshot (online; writers are not blocked).")
+    b.add_argument("--label", default="manual", help="Label of the snapshot (unlabelled ones are automatic).")
+    b.set_defaults(func=cmd_backup_create)
+    b = backup.add_parser("list", help="Snapshots of this database, newest first.")
+    b.add_argument("--json", action="store_true")
+    b.set_defaults(func=cmd_backup_list)
+    b = backup.add_parser("prune", help="Delete automatic snapshots outside the retention policy.")
+    b.add_argument("--keep-last", type=int, default=5, help="Newest snapshots always kept.")
+    b.add_argument("--daily", type=int, default=7, help="Days with one snapshot kept.")
+    b.add_argument("--weekly", type=int, default=4, help="Weeks with one snapshot kept.")
+    b.add_argument("--monthly", type=int, default=12, help="Months with one snapshot kept.")
+    b.add_argument("--all", action="store_true", help="Apply the policy to labelled snapshots too.")
+    b.add_argument("--dry-run", action="store_true", help="Only list what would be removed.")
+    b.set_defaults(func=cmd_backup_prune)
+    b = backup.add_parser("restore", help="Replace the database contents with a snapshot (name, path or 'latest').")
+    b.add_argument("snapshot")
+    b.add_argument("--no-keep", action="store_true", help="Do not snapshot the current contents first.")
+    b.set_defaults(func=cmd_backup_restore)
+
+    p = sub.add_parser("users", help="List, add and shard users.")
+    users = p.add_subparsers(dest="users_command", required=True)
+    u = users.add_parser("list", help="List users and where their data lives.")
+    u.set_defaults(func=cmd_users_list)
+    u = users.add_parser("add", help="Create a user; prints its id.")
+    u.add_argument("name")
+    u.add_argument("--email", default="")
+    u.add_argument("--id", help="User id (default: a new UUID).")
+    u.set_defaults(func=cmd_users_add)
+    u = users.add_parser("shard", help="Move users' goals and tasks from the shared file into their shards.")
+    u.add_argument("user_ids", nargs="*")
+    u.add_argument("--all", action="store_true", help="Every user in the directory.")
+    u.add_argument("--batch-size", type=int, default=5000, help="Tasks per transaction.")
+    u.set_defaults(func=cmd_users_shard)
+
+    p = sub.add_parser("serve", help="Serve the local HTTP/JSON API until interrupted.")
+    p.add_argument("--host", default="127.0.0.1", help="Interface to bind (no authentication: keep it local).")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--workers", type=int, default=1, help="Threads running SQLite work.")
+    p.set_defaults(func=cmd_serve)
+
+    # Unknown arguments after "benchmark" are passed through (see main)
+    p = sub.add_parser("benchmark", help="Run the benchmark suite (arguments are passed through).")
+    p.set_defaults(func=cmd_benchmark, bench_args=[])
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    if extra:
+        if args.command != "benchmark":
+            parser.error(f"unrecognized arguments: {' '.join(extra)}")
+        args.bench_args = extra
+    db = Database(args.db) if args.db else get_database()
+    registry = UserRegistry(db, args.shards)
+    try:
+        ctx = CliContext(registry, args.user)
+        if args.user is not None and ctx.users.get_user(args.user) is None:
+            raise CliError(f"unknown user {args.user!r}")
+        return args.func(ctx, args)
+    except (CliError, DatabaseError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        # Output piped into e.g. `head`: stop quietly.
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 0
+    finally:
+        registry.close()
+        db.close()
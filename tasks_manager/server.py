@@ -0,0 +1,654 @@
+"""
+Local HTTP/JSON API over the service layer (asyncio, stdlib only).
+
+    python -m tasks_manager serve --port 8765
+
+Endpoints (user = ?user=<id> or X-User-Id header, default: the app's default user):
+    GET    /health
+    GET    /user
+    GET    /tasks?date=&from=&to=&search=&open=1[&limit=&cursor=]   (ETag)
+    POST   /tasks                       {"title", "description", "due_date_time", ...}
+    GET    /tasks/{id}                  (ETag)
+    PATCH  /tasks/{id}                  {"title", "due_date_time", "priority", ...}
+    POST   /tasks/{id}/complete
+    DELETE /tasks/{id}
+    GET    /goals?archived=1            (ETag)
+    POST   /goals                       {"title", "description", "color_hex", "category", "frequency"}
+    POST   /goals/{id}/archive
+    DELETE /goals/{id}
+    GET    /stats
+    GET    /sync/node                   this database's change-log node id (and copy origin)
+    POST   /sync/node                   enable the change log (baseline rows), then as GET
+    GET    /sync/changes?since=&exclude=&limit=   change rows after a cursor (see services.sync)
+    POST   /sync/changes                {"changes": [...]}  apply a peer's rows (last writer wins)
+
+The /sync endpoints replicate a whole database file, so they answer 403 unless
+the user's database holds no other user's data (their shard, or a single-user
+file), and 409 until the change log has been enabled.
+
+The event loop only parses HTTP; handlers run on a small thread pool. SQLite
+connections are bound to the thread that opened them, so every worker thread
+owns its UserRegistry (the shared database plus, when sharded, the per-user
+files). With more than one worker the repository caches are turned off,
+because each thread's cache would only see its own writes. Tasks and goals of
+other users answer 404.
+
+ETags are derived from the request, a change counter bumped by the services'
+change events and SQLite's ``PRAGMA data_version`` (which moves when another
+process commits), so a matching If-None-Match is answered with 304 without
+running the query. When data_version moves, the worker's repository caches
+for that database are cleared first, so the body matches its ETag. There is
+no authentication: bind to localhost only.
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from models import Goal, Task
+from models.enums import FrequencyType, GoalCategory, Priority, TaskStatus, TaskType
+from repository.change_log import ChangeLog
+from repository.database import Database, DatabaseError, get_database
+from repository.user_registry import UserRegistry
+from services.events import ChangeEvent, EventBus
+from services.import_export import parse_local_datetime, task_to_record
+from services.session import UserSession, open_session
+
+MAX_BODY = 1 << 20  # 1 MiB
+_CHANGE_KEYS = ("hlc", "node", "entity", "entity_id", "field")
+
+
+class HttpError(Exception):
+    """Raised by handlers to return an error status with a JSON message."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class Request:
+    """Parsed HTTP request."""
+
+    method: str
+    path: str
+    query: Dict[str, str]
+    headers: Dict[str, str]
+    body: bytes = b""
+
+    def json(self) -> Dict[str, Any]:
+        if not self.body:
+            return {}
+        try:
+            data = json.loads(self.body)
+        except ValueError as e:
+            raise HttpError(400, f"invalid JSON body: {e}")
+        if not isinstance(data, dict):
+            raise HttpError(400, "JSON body must be an object")
+        return data
+
+
+@dataclass
+class Response:
+    """Handler result (body is JSON-encoded unless None)."""
+
+    status: int = 200
+    body: Any = None
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+def goal_to_record(goal: Goal) -> Dict[str, Any]:
+    """Goal as a JSON-serialisable dict."""
+    return {
+        "goal_id": goal.goal_id,
+        "user_id": goal.user_id,
+        "title": goal.title,
+        "description": goal.description,
+        "category": goal.category.value,
+        "color_hex": goal.color_hex,
+        "frequency": goal.frequency.value,
+        "created_at": goal.created_at.isoformat() if goal.created_at else None,
+        "is_archived": goal.is_archived,
+        "current_streak": goal.current_streak,
+        "longest_streak": goal.longest_streak,
+    }
+
+
+def _parse_day(value: Optional[str], name: str) -> Optional[datetime]:
+    """ISO date/time as naive local time (a UTC offset is converted, as on import)."""
+    if not value:
+        return None
+    try:
+        return parse_local_datetime(value)
+    except ValueError:
+        raise HttpError(400, f"invalid {name}: {value!r}")
+
+
+def _enum(enum_type: Any, value: Any, name: str) -> Any:
+    try:
+        return enum_type(value)
+    except ValueError:
+        raise HttpError(400, f"invalid {name}: {value!r}")
+
+
+class _Worker:
+    """Per-thread state: user registry (connections) and the sessions opened on it."""
+
+    def __init__(self, registry: UserRegistry, events: EventBus) -> None:
+        self.registry = registry
+        self.events = events
+        self.sessions: Dict[str, UserSession] = {}
+        self.default_session: Optional[UserSession] = None
+        # Last PRAGMA data_version seen per Database (by id; the pragma is per connection)
+        self.data_versions: Dict[int, int] = {}
+
+
+class TaskApi:
+    """Routes requests to the services; every method runs on a worker thread."""
+
+    def __init__(self, registry_factory: Callable[[], UserRegistry]) -> None:
+        self._registry_factory = registry_factory
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._routes: List[Tuple[str, Pattern[str], Callable[..., Response], bool]] = []
+        for method, pattern, handler, etag in (
+            ("GET", r"/health", self.health, False),
+            ("GET", r"/user", self.get_user, True),
+            ("GET", r"/tasks", self.list_tasks, True),
+            ("POST", r"/tasks", self.create_task, False),
+            ("GET", r"/tasks/(?P<task_id>[^/]+)", self.get_task, True),
+            ("PATCH", r"/tasks/(?P<task_id>[^/]+)", self.update_task, False),
+            ("POST", r"/tasks/(?P<task_id>[^/]+)/complete", self.complete_task, False),
+            ("DELETE", r"/tasks/(?P<task_id>[^/]+)", self.delete_task, False),
+            ("GET", r"/goals", self.list_goals, True),
+            ("POST", r"/goals", self.create_goal, False),
+            ("POST", r"/goals/(?P<goal_id>[^/]+)/archive", self.archive_goal, False),
+            ("DELETE", r"/goals/(?P<goal_id>[^/]+)", self.delete_goal, False),
+            ("GET", r"/stats", self.stats, True),
+            ("GET", r"/sync/node", self.sync_node, False),
+            ("POST", r"/sync/node", self.enable_sync, False),
+            ("GET", r"/sync/changes", self.sync_changes, False),
+            ("POST", r"/sync/changes", self.sync_apply, False),
+        ):
+            self._routes.append((method, re.compile(pattern + r"/?$"), handler, etag))
+
+    # --- plumbing -----------------------------------------------------------
+
+    def _on_changes(self, events: List[ChangeEvent]) -> None:
+        with self._lock:
+            self._generation += 1
+
+    def _worker(self) -> _Worker:
+        worker = getattr(self._local, "worker", None)
+        if worker is None:
+            # EventBus is not thread-safe: one per worker, all bumping the shared counter
+            events = EventBus()
+            events.subscribe(self._on_changes)
+            worker = _Worker(self._registry_factory(), events)
+            self._local.worker = worker
+        return worker
+
+    def close_thread(self) -> None:
+        """Close the calling worker thread's connections."""
+        worker = getattr(self._local, "worker", None)
+        if worker is not None:
+            worker.registry.close()
+            worker.registry.directory.close()
+            self._local.worker = None
+
+    def _session(self, request: Request) -> UserSession:
+        """Session of the requesting user (?user= or X-User-Id; default user otherwise)."""
+        worker = self._worker()
+        user_id = request.query.get("user") or request.headers.get("x-user-id")
+        if not user_id:
+            if worker.default_session is None:
+                worker.default_session = open_session(None, worker.registry, worker.events)
+            session = worker.default_session
+        else:
+            session = worker.sessions.get(user_id)
+            if session is None:
+                try:
+                    session = open_session(user_id, worker.registry, worker.events)
+                except ValueError:
+                    raise HttpError(404, f"unknown user {user_id!r}")
+                worker.sessions[user_id] = session
+        # Touch the route so the registry's LRU sees the user as active
+        worker.registry.database_for(session.user.user_id)
+        return session
+
+    def _sync_caches(self, session: UserSession) -> int:
+        """
+        Return the session database's PRAGMA data_version, clearing its caches if it moved.
+
+        The version moves when another process commits; the repository caches do not
+        see those writes, so they are dropped before the request reads through them.
+        """
+        data_version = session.db.connect().execute("PRAGMA data_version").fetchone()[0]
+        seen = self._worker().data_versions
+        if seen.get(id(session.db)) != data_version:
+            session.db.clear_caches()
+            seen[id(session.db)] = data_version
+        return data_version
+
+    def _etag(self, request: Request, session: UserSession, data_version: int) -> str:
+        key = "|".join(
+            [
+                request.path,
+                json.dumps(sorted(request.query.items())),
+                session.user.user_id,
+                str(self._generation),
+                str(data_version),
+                str(id(session.db)),  # data_version is per connection
+                datetime.now().strftime("%Y-%m-%d"),  # "today" defaults roll over
+            ]
+        )
+        return '"' + hashlib.sha1(key.encode("utf-8")).hexdigest()[:20] + '"'
+
+    def handle(self, request: Request) -> Response:
+        """Dispatch request (runs on a worker thread)."""
+        allowed = []
+        for method, pattern, handler, etag in self._routes:
+            match = pattern.match(request.path)
+            if match is None:
+                continue
+            if method != request.method:
+                allowed.append(method)
+                continue
+            try:
+                if handler == self.health:
+                    return handler(request)
+                session = self._session(request)
+                data_version = self._sync_caches(session)
+                if not etag:
+                    return handler(request, session, **match.groupdict())
+                tag = self._etag(request, session, data_version)
+                if tag in [t.strip() for t in request.headers.get("if-none-match", "").split(",")]:
+                    return Response(304, None, {"ETag": tag})
+                response = handler(request, session, **match.groupdict())
+                if response.status == 200:
+                    response.headers["ETag"] = tag
+                return response
+            except HttpError as e:
+                return Response(e.status, {"error": str(e)})
+            except ValueError as e:
+                return Response(400, {"error": str(e)})
+            except DatabaseError as e:
+                return Response(500, {"error": str(e)})
+            except Exception as e:  # keep the connection (and the server) alive
+                return Response(500, {"error": f"{type(e).__name__}: {e}"})
+        if allowed:
+            return Response(405, {"error": "method not allowed"}, {"Allow": ", ".join(sorted(set(allowed)))})
+        return Response(404, {"error": f"no route for {request.path}"})
+
+    # --- handlers -----------------------------------------------------------
+
+    def health(self, request: Request) -> Response:
+        return Response(200, {"status": "ok"})
+
+    def get_user(self, request: Request, session: UserSession) -> Response:
+        user = session.user
+        return Response(200, {"user_id": user.user_id, "name": user.name, "email": user.email})
+
+    def list_tasks(self, request: Request, session: UserSession) -> Response:
+        q = request.query
+        user_id = session.user.user_id
+        from_date = _parse_day(q.get("from"), "from")
+        to_date = _parse_day(q.get("to"), "to")
+        if q.get("date"):
+            from_date = to_date = _parse_day(q["date"], "date")
+        include_completed = q.get("open", "") not in ("1", "true")
+        if "limit" in q or "cursor" in q:
+            page = session.tasks.get_task_page(
+                user_id,
+                limit=int(q.get("limit") or 50),
+                cursor=q.get("cursor") or None,
+                from_date=from_date,
+                to_date=to_date,
+                include_completed=include_completed,
+                search_query=q.get("search"),
+            )
+            return Response(200, {"tasks": [task_to_record(t) for t in page.tasks], "next_cursor": page.next_cursor})
+        tasks = session.tasks.get_tasks_for_user(
+            user_id,
+            from_date=from_date,
+            to_date=to_date,
+            include_completed=include_completed,
+            search_query=q.get("search"),
+        )
+        return Response(200, {"tasks": [task_to_record(t) for t in tasks], "next_cursor": None})
+
+    def _task_or_404(self, session: UserSession, task_id: str) -> Task:
+        task = session.tasks.get_by_id(task_id)
+        if task is None or task.user_id != session.user.user_id:
+            raise HttpError(404, f"task {task_id!r} not found")
+        return task
+
+    def _goal_or_404(self, session: UserSession, goal_id: str) -> Goal:
+        goal = session.goals.get_by_id(goal_id)
+        if goal is None or goal.user_id != session.user.user_id:
+            raise HttpError(404, f"goal {goal_id!r} not found")
+        return goal
+
+    def get_task(self, request: Request, session: UserSession, task_id: str) -> Response:
+        return Response(200, task_to_record(self._task_or_404(session, task_id)))
+
+    def create_task(self, request: Request, session: UserSession) -> Response:
+        data = request.json()
+        if not data.get("title"):
+            raise HttpError(400, "title is required")
+        goal_id = data.get("goal_id")
+        task = session.tasks.create_task(
+            user_id=session.user.user_id,
+            title=data["title"],
+            description=data.get("description") or "",
+            due_date_time=_parse_day(data.get("due_date_time"), "due_date_time"),
+            duration_minutes=int(data.get("duration_minutes") or 0),
+            priority=_enum(Priority, data.get("priority") or Priority.MEDIUM.value, "priority"),
+            goal_id=goal_id,
+            task_type=_enum(TaskType, data.get("type") or (TaskType.GOAL if goal_id else TaskType.FREE).value, "type"),
+        )
+        return Response(201, task_to_record(task), {"Location": f"/tasks/{task.task_id}"})
+
+    def update_task(self, request: Request, session: UserSession, task_id: str) -> Response:
+        data = request.json()
+        self._task_or_404(session, task_id)
+        task = session.tasks.update_task(
+            task_id,
+            title=data.get("title"),
+            description=data.get("description"),
+            due_date_time=_parse_day(data.get("due_date_time"), "due_date_time"),
+            duration_minutes=int(data["duration_minutes"]) if data.get("duration_minutes") is not None else None,
+            priority=_enum(Priority, data["priority"], "priority") if data.get("priority") else None,
+            progress_percent=int(data["progress_percent"]) if data.get("progress_percent") is not None else None,
+            status=_enum(TaskStatus, data["status"], "status") if data.get("status") else None,
+        )
+        if task is None:
+            raise HttpError(404, f"task {task_id!r} not found")
+        return Response(200, task_to_record(task))
+
+    def complete_task(self, request: Request, session: UserSession, task_id: str) -> Response:
+        self._task_or_404(session, task_id)
+        task = session.tasks.complete_task(task_id)
+        if task is None:
+            raise HttpError(404, f"task {task_id!r} not found")
+        return Response(200, task_to_record(task))
+
+    def delete_task(self, request: Request, session: UserSession, task_id: str) -> Response:
+        self._task_or_404(session, task_id)
+        session.tasks.delete_task(task_id)
+        return Response(204)
+
+    def list_goals(self, request: Request, session: UserSession) -> Response:
+        archived = request.query.get("archived", "") in ("1", "true")
+        goals = session.goals.get_all_for_user(session.user.user_id, include_archived=True)
+        return Response(200, {"goals": [goal_to_record(g) for g in goals if g.is_archived == archived]})
+
+    def create_goal(self, request: Request, session: UserSession) -> Response:
+        data = request.json()
+        if not data.get("title"):
+            raise HttpError(400, "title is required")
+        goal = Goal(
+            goal_id=str(uuid.uuid4()),
+            user_id=session.user.user_id,
+            title=data["title"],
+            description=data.get("description") or "",
+            color_hex=data.get("color_hex") or "#4CAF50",
+            category=_enum(GoalCategory, data.get("category") or GoalCategory.OTHER.value, "category"),
+            frequency=_enum(FrequencyType, data.get("frequency") or FrequencyType.DAILY.value, "frequency"),
+        )
+        session.goals.save_goal(goal)
+        return Response(201, goal_to_record(goal), {"Location": f"/goals/{goal.goal_id}"})
+
+    def archive_goal(self, request: Request, session: UserSession, goal_id: str) -> Response:
+        self._goal_or_404(session, goal_id)
+        goal = session.goals.archive_goal(goal_id)
+        if goal is None:
+            raise HttpError(404, f"goal {goal_id!r} not found")
+        return Response(200, goal_to_record(goal))
+
+    def delete_goal(self, request: Request, session: UserSession, goal_id: str) -> Response:
+        self._goal_or_404(session, goal_id)
+        session.goals.delete_goal(goal_id)
+        return Response(204)
+
+    def stats(self, request: Request, session: UserSession) -> Response:
+        return Response(200, session.tasks.get_summary(session.user.user_id))
+
+    def _change_log(self, session: UserSession, enable: bool = False) -> ChangeLog:
+        """
+        The change log of the user's database, if it is the user's alone.
+
+        The log covers every row of the file, so on a shared database it would
+        expose (and let a peer overwrite) other users' tasks and goals.
+        """
+        user_id = session.user.user_id
+        if not self._worker().registry.sharded:
+            try:
+                other = session.db.connect().execute(
+                    "SELECT 1 FROM user WHERE user_id <> ? LIMIT 1", (user_id,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                raise DatabaseError(f"sync owner check failed: {e}") from e
+            if other is not None:
+                raise HttpError(403, "sync needs a database holding only this user's data (serve with --shards)")
+        log = session.db.change_log()
+        if enable:
+            log.enable()
+        elif not log.enabled:
+            raise HttpError(409, "change log is not enabled (POST /sync/node or 'sync enable')")
+        return log
+
+    def sync_node(self, request: Request, session: UserSession) -> Response:
+        log = self._change_log(session)
+        return Response(200, {"node_id": log.node_id, "origin": log.origin()})
+
+    def enable_sync(self, request: Request, session: UserSession) -> Response:
+        log = self._change_log(session, enable=True)
+        return Response(200, {"node_id": log.node_id, "origin": log.origin()})
+
+    def sync_changes(self, request: Request, session: UserSession) -> Response:
+        q = request.query
+        try:
+            since, limit = int(q.get("since") or 0), min(int(q.get("limit") or 1000), 10_000)
+        except ValueError:
+            raise HttpError(400, "since and limit must be integers")
+        changes, cursor = self._change_log(session).since(since, q.get("exclude") or None, limit)
+        return Response(200, {"changes": changes, "cursor": cursor})
+
+    def sync_apply(self, request: Request, session: UserSession) -> Response:
+        changes = request.json().get("changes")
+        if not isinstance(changes, list) or not all(
+            isinstance(c, dict) and all(isinstance(c.get(k), str) for k in _CHANGE_KEYS) for c in changes
+        ):
+            raise HttpError(400, f"changes must be a list of objects with string {', '.join(_CHANGE_KEYS)}")
+        user_id = session.user.user_id
+        # Rows may not create or move data of another user into this user's database
+        foreign = [
+            c for c in changes
+            if (c["entity"] == "user" and c["entity_id"] != user_id)
+            or (c["field"] == "user_id" and c.get("value") != user_id)
+        ]
+        if foreign:
+            raise HttpError(403, f"{len(foreign)} change(s) belong to another user")
+        applied = self._change_log(session).apply(changes)
+        # Own-connection writes do not move PRAGMA data_version: bump the ETag counter
+        self._on_changes([])
+        return Response(200, {"applied": applied})
+
+
+class TaskApiServer:
+    """asyncio HTTP/1.1 server (keep-alive, Content-Length bodies) in front of TaskApi."""
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        workers: int = 1,
+        shard_dir: Optional[Path] = None,
+    ) -> None:
+        """
+        Args:
+            db_path: SQLite file (None = the app's tasks.db).
+            host: Interface to bind (keep it local: there is no authentication).
+            port: TCP port (0 = pick a free one; see .port after start()).
+            workers: Threads running SQLite work, each with its own connections.
+            shard_dir: Per-user database directory (None = all users in db_path).
+        """
+        self.host = host
+        self.port = port
+        self._workers = max(1, workers)
+        cache_size = 1024 if self._workers == 1 else 0
+
+        def registry_factory() -> UserRegistry:
+            if db_path is None and self._workers == 1:
+                directory = get_database()
+            else:
+                directory = Database(db_path, cache_size=cache_size)
+            return UserRegistry(directory, shard_dir, cache_size=cache_size)
+
+        self.api = TaskApi(registry_factory)
+        self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="tasks-db")
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._serve_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        # Connections must be closed on the threads that opened them
+        barrier = threading.Barrier(self._workers)
+
+        def close_worker() -> None:
+            try:
+                barrier.wait(timeout=5)  # park so each worker thread takes exactly one job
+            except threading.BrokenBarrierError:
+                pass
+            self.api.close_thread()
+
+        for _ in range(self._workers):
+            self._executor.submit(close_worker)
+        self._executor.shutdown(wait=True)
+
+    async def _serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                if isinstance(request, Response):
+                    await self._write_response(writer, request, keep_alive=False)
+                    break
+                response = await loop.run_in_executor(self._executor, self.api.handle, request)
+                keep_alive = request.headers.get("connection", "").lower() != "close"
+                await self._write_response(writer, response, keep_alive, head=request.method == "HEAD")
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Any:
+        """Return a Request, an error Response, or None when the client closed the connection."""
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError:
+            return Response(431, {"error": "request header too large"})
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, _version = lines[0].split(" ", 2)
+        except ValueError:
+            return Response(400, {"error": "malformed request line"})
+        headers: Dict[str, str] = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            return Response(400, {"error": "invalid Content-Length"})
+        if length < 0:
+            return Response(400, {"error": "invalid Content-Length"})
+        if length > MAX_BODY:
+            return Response(413, {"error": "request body too large"})
+        body = await reader.readexactly(length) if length else b""
+        url = urlsplit(target)
+        query = {k: v[-1] for k, v in parse_qs(url.query, keep_blank_values=True).items()}
+        return Request(method.upper(), url.path or "/", query, headers, body)
+
+    async def _write_response(
+        self,
+        writer: asyncio.StreamWriter,
+        response: Response,
+        keep_alive: bool,
+        head: bool = False,
+    ) -> None:
+        body = b"" if response.body is None else json.dumps(response.body).encode("utf-8")
+        try:
+            reason = HTTPStatus(response.status).phrase
+        except ValueError:
+            reason = ""
+        headers = {
+            "Content-Length": str(len(body)),
+            "Connection": "keep-alive" if keep_alive else "close",
+            **response.headers,
+        }
+        if body:
+            headers["Content-Type"] = "application/json; charset=utf-8"
+        lines = [f"HTTP/1.1 {response.status} {reason}"] + [f"{k}: {v}" for k, v in headers.items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (b"" if head else body))
+        await writer.drain()
+
+
+def serve(
+    db_path: Optional[Path] = None,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    workers: int = 1,
+    shard_dir: Optional[Path] = None,
+) -> None:
+    """Run the server until interrupted (Ctrl+C)."""
+    server = TaskApiServer(db_path, host, port, workers, shard_dir)
+
+    async def main() -> None:
+        await server.start()
+        print(f"serving on http://{server.host}:{server.port} (workers={workers})", flush=True)
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -1,5 +1,21 @@
-"""UI layer (CustomTkinter views and presenter)."""
+"""UI layer (CustomTkinter views and presenter).
 
-from ui.main_window import MainWindow
+Public names are resolved lazily (PEP 562) so that importing e.g. ``ui.theme``
+does not load CustomTkinter and every screen.
+"""
 
-__all__ = ["MainWindow"]
+from typing import TYPE_CHECKING
+
+from lazy_exports import lazy_exports
+
+if TYPE_CHECKING:
+    from ui.main_window import MainWindow
+
+# Public name -> defining submodule
+_LAZY_ATTRS = {
+    "MainWindow": "ui.main_window",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_ATTRS)
@@ -1,7 +1,27 @@
-"""Reusable UI components."""
+"""Reusable UI components (resolved lazily, PEP 562)."""
 
-from ui.components.date_selector import DateSelector
-from ui.components.task_card import TaskCard
-from ui.components.search_bar import SearchBar
+from typing import TYPE_CHECKING
 
-__all__ = ["DateSelector", "TaskCard", "SearchBar"]
+from lazy_exports import lazy_exports
+
+if TYPE_CHECKING:
+    from ui.components.date_selector import DateSelector
+    from ui.components.task_card import TaskCard
+    from ui.components.card_style import CardTemplate
+    from ui.components.search_bar import SearchBar
+    from ui.components.timeline_canvas import TimelineCanvas
+    from ui.components.month_canvas import MonthCanvas
+
+# Public name -> defining submodule
+_LAZY_ATTRS = {
+    "DateSelector": "ui.components.date_selector",
+    "TaskCard": "ui.components.task_card",
+    "CardTemplate": "ui.components.card_style",
+    "SearchBar": "ui.components.search_bar",
+    "TimelineCanvas": "ui.components.timeline_canvas",
+    "MonthCanvas": "ui.components.month_canvas",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_ATTRS)
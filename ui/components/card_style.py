@@ -0,0 +1,85 @@
+"""
+Task card style sheet: colors, fonts and labels resolved once per status.
+
+There are a dozen statuses, so every card of the same status shares one frozen
+CardStyle instead of re-deriving it from substring matches.
+CardTemplate says which optional widgets a card builds.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Tuple
+
+from ui.theme import (
+    BG_DARK,
+    CARD_SHOW_AVATAR_PLACEHOLDERS,
+    FONT_BODY,
+    FONT_SMALL,
+    FONT_TITLE,
+    status_to_color,
+)
+
+def status_display_name(status: str) -> str:
+    """Map internal status to UI label."""
+    s = status.lower() if status else ""
+    if "completed" in s:
+        return "Completed"
+    if "cancelled" in s or "rejected" in s:
+        return "Rejected"
+    if "in_progress" in s or "running" in s:
+        return "Running"
+    if "upcoming" in s or "today" in s or "pending" in s or "scheduled" in s:
+        return "Upcoming"
+    if "overdue" in s:
+        return "Overdue"
+    return "Task"
+
+
+@dataclass(frozen=True)
+class CardStyle:
+    """Pre-resolved look of a task card."""
+
+    card_color: str
+    status_label: str
+    text_color: str = BG_DARK
+    title_font: Tuple = FONT_TITLE
+    body_font: Tuple = FONT_BODY
+    small_font: Tuple = FONT_SMALL
+
+
+@dataclass(frozen=True)
+class CardTemplate:
+    """
+    Which optional widgets a card builds.
+
+    Attributes:
+        avatar_placeholders: The decorative avatar circles next to the status pill
+            (four labels in a frame; they show no data).
+    """
+
+    avatar_placeholders: bool = CARD_SHOW_AVATAR_PLACEHOLDERS
+
+
+DEFAULT_TEMPLATE = CardTemplate()
+
+
+def _key(value: Any) -> str:
+    return getattr(value, "value", str(value)) if value is not None else ""
+
+
+# status -> style. TaskStatus is a str enum, so an enum and its value are the same key.
+_STYLES: Dict[Any, CardStyle] = {}
+
+
+def card_style(status: Any) -> CardStyle:
+    """Return the shared CardStyle for a status (enum or its value)."""
+    style = _STYLES.get(status)
+    if style is None:
+        status_key = _key(status)
+        style = CardStyle(card_color=status_to_color(status_key), status_label=status_display_name(status_key))
+        _STYLES[status] = style
+    return style
+
+
+def clear_card_styles() -> None:
+    """Forget resolved styles (after changing theme colors at runtime)."""
+    _STYLES.clear()
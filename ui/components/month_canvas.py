@@ -0,0 +1,230 @@
+"""Month canvas: a 6x7 month grid drawn on one Tk Canvas, with per-day task dots."""
+
+import calendar as cal_module
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, Dict, List, Optional, Tuple
+
+import customtkinter as ctk
+
+from ui.theme import (
+    BG_DARK,
+    BG_CARD,
+    TEXT_PRIMARY,
+    TEXT_MUTED,
+    ACCENT_MINT_LIGHT,
+    ACCENT_TEAL,
+    FONT_SMALL,
+    FONT_CAPTION,
+)
+
+ROWS = 6
+COLUMNS = 7
+HEADER_HEIGHT = 24
+CELL_GAP = 4
+MAX_DOTS = 3
+DOT_SIZE = 6
+
+DAY_NAMES = ["MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN"]
+
+
+@dataclass(frozen=True)
+class CellState:
+    """What one cell shows; a cell is redrawn only when its state changes."""
+
+    day: int = 0            # 0 = blank (outside the month)
+    selected: bool = False
+    today: bool = False
+    open_tasks: int = 0
+    done_tasks: int = 0
+
+
+class MonthGeometry:
+    """Pixel layout of the grid for a canvas size; maps points to cells and back."""
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = max(width, COLUMNS)
+        self.height = max(height, HEADER_HEIGHT + ROWS)
+        self.cell_w = self.width / COLUMNS
+        self.cell_h = (self.height - HEADER_HEIGHT) / ROWS
+
+    def cell_box(self, index: int) -> Tuple[float, float, float, float]:
+        """(x0, y0, x1, y1) of cell index (row-major, 0..41), inside the gaps."""
+        row, col = divmod(index, COLUMNS)
+        x0 = col * self.cell_w + CELL_GAP / 2
+        y0 = HEADER_HEIGHT + row * self.cell_h + CELL_GAP / 2
+        return x0, y0, x0 + self.cell_w - CELL_GAP, y0 + self.cell_h - CELL_GAP
+
+    def cell_at(self, x: float, y: float) -> Optional[int]:
+        """Cell index under (x, y) (gaps count as their cell), or None outside the grid."""
+        if y < HEADER_HEIGHT or x < 0 or x >= self.width or y >= self.height:
+            return None
+        col = int(x // self.cell_w)
+        row = int((y - HEADER_HEIGHT) // self.cell_h)
+        if row >= ROWS or col >= COLUMNS:
+            return None
+        return row * COLUMNS + col
+
+
+def month_days(year: int, month: int) -> List[int]:
+    """The 42 day numbers of the grid (Monday first), 0 for cells outside the month."""
+    days = [d for week in cal_module.Calendar(firstweekday=0).monthdayscalendar(year, month) for d in week]
+    return days + [0] * (ROWS * COLUMNS - len(days))
+
+
+class MonthCanvas(ctk.CTkFrame):
+    """
+    Month grid on a single canvas.
+
+    The 42 cells' items (background, day number, task dots, "+N" count) are created
+    once and only reconfigured afterwards: set_month() and select() compare each
+    cell's CellState with what is drawn and touch only the damaged cells, and a
+    resize only moves items. Clicks are hit-tested arithmetically (MonthGeometry),
+    not through item lookups.
+    """
+
+    def __init__(
+        self,
+        master: ctk.CTk,
+        on_day_click: Optional[Callable[[date], None]] = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(master, fg_color="transparent", **kwargs)
+        self._on_day_click = on_day_click
+        self._year = date.today().year
+        self._month = date.today().month
+        self._days: List[int] = [0] * (ROWS * COLUMNS)
+        self._drawn: List[Optional[CellState]] = [None] * (ROWS * COLUMNS)
+        self._counts: Dict[int, Tuple[int, int]] = {}
+        self._selected: Optional[date] = None
+        self._damaged = 0
+        self._size = (0, 0)
+        self._geometry = MonthGeometry(1, 1)
+        self._canvas = ctk.CTkCanvas(self, bg=BG_DARK, highlightthickness=0)
+        self._canvas.pack(fill="both", expand=True)
+        self._headers = [
+            self._canvas.create_text(0, 0, text=name, fill=TEXT_MUTED, font=FONT_CAPTION)
+            for name in DAY_NAMES
+        ]
+        # Per cell: [rect, number, dot * MAX_DOTS, count]
+        self._cells: List[List[int]] = []
+        for _ in range(ROWS * COLUMNS):
+            items = [
+                self._canvas.create_rectangle(0, 0, 0, 0, fill=BG_CARD, outline="", width=0),
+                self._canvas.create_text(0, 0, text="", anchor="nw", fill=TEXT_PRIMARY, font=FONT_SMALL),
+            ]
+            items += [
+                self._canvas.create_oval(0, 0, 0, 0, fill=ACCENT_TEAL, outline="", state="hidden")
+                for _ in range(MAX_DOTS)
+            ]
+            items.append(self._canvas.create_text(0, 0, text="", anchor="w", fill=TEXT_MUTED, font=FONT_CAPTION))
+            self._cells.append(items)
+        self._canvas.bind("<Configure>", self._on_resize)
+        self._canvas.bind("<Button-1>", self._on_click)
+
+    @property
+    def damaged_last(self) -> int:
+        """Cells reconfigured by the last set_month/select (for profiling)."""
+        return self._damaged
+
+    def set_month(
+        self,
+        year: int,
+        month: int,
+        counts: Optional[Dict[int, Tuple[int, int]]] = None,
+        selected: Optional[date] = None,
+    ) -> None:
+        """
+        Show a month.
+
+        Args:
+            counts: Day of month -> (open tasks, completed tasks); missing days have none.
+            selected: Highlighted day (kept only if it falls in this month).
+        """
+        self._year, self._month = year, month
+        self._days = month_days(year, month)
+        self._counts = counts or {}
+        self._selected = selected
+        self._update_cells()
+
+    def select(self, day: Optional[date]) -> None:
+        """Move the highlight (redraws at most the old and new cell)."""
+        self._selected = day
+        self._update_cells()
+
+    def _state(self, index: int, today: date) -> CellState:
+        day = self._days[index]
+        if not day:
+            return CellState()
+        current = date(self._year, self._month, day)
+        open_tasks, done_tasks = self._counts.get(day, (0, 0))
+        return CellState(day, current == self._selected, current == today, open_tasks, done_tasks)
+
+    def _update_cells(self) -> None:
+        today = date.today()
+        damaged = 0
+        for index in range(ROWS * COLUMNS):
+            state = self._state(index, today)
+            if state != self._drawn[index]:
+                self._draw_cell(index, state)
+                damaged += 1
+        self._damaged = damaged
+
+    def _draw_cell(self, index: int, state: CellState) -> None:
+        canvas = self._canvas
+        rect, number, *dots, count = self._cells[index]
+        if state.selected:
+            canvas.itemconfigure(rect, outline=ACCENT_MINT_LIGHT, width=2)
+        else:
+            canvas.itemconfigure(rect, outline="", width=0)
+        canvas.itemconfigure(
+            number,
+            text=str(state.day) if state.day else "",
+            fill=ACCENT_MINT_LIGHT if state.today else TEXT_PRIMARY,
+        )
+        # Open tasks first, then completed ones
+        colors = ([ACCENT_TEAL] * min(state.open_tasks, MAX_DOTS) + [TEXT_MUTED] * MAX_DOTS)[:MAX_DOTS]
+        colors = colors[: state.open_tasks + state.done_tasks]
+        for i, dot in enumerate(dots):
+            if i < len(colors):
+                canvas.itemconfigure(dot, state="normal", fill=colors[i])
+            else:
+                canvas.itemconfigure(dot, state="hidden")
+        extra = state.open_tasks + state.done_tasks - MAX_DOTS
+        canvas.itemconfigure(count, text=f"+{extra}" if extra > 0 else "")
+        self._drawn[index] = state
+
+    def _place_items(self) -> None:
+        """Move every item to the current geometry (sizes change, content does not)."""
+        canvas = self._canvas
+        geo = self._geometry
+        for col, item in enumerate(self._headers):
+            canvas.coords(item, (col + 0.5) * geo.cell_w, HEADER_HEIGHT / 2)
+        for index, (rect, number, *dots, count) in enumerate(self._cells):
+            x0, y0, x1, y1 = geo.cell_box(index)
+            canvas.coords(rect, x0, y0, x1, y1)
+            canvas.coords(number, x0 + 6, y0 + 4)
+            dot_y = y1 - DOT_SIZE - 6
+            for i, dot in enumerate(dots):
+                dx = x0 + 6 + i * (DOT_SIZE + 3)
+                canvas.coords(dot, dx, dot_y, dx + DOT_SIZE, dot_y + DOT_SIZE)
+            canvas.coords(count, x0 + 6 + MAX_DOTS * (DOT_SIZE + 3), dot_y + DOT_SIZE / 2)
+
+    def _on_resize(self, event) -> None:
+        if (event.width, event.height) == self._size:
+            return
+        self._size = (event.width, event.height)
+        self._geometry = MonthGeometry(event.width, event.height)
+        self._place_items()
+
+    def day_at(self, x: float, y: float) -> Optional[date]:
+        """Date under canvas point (x, y), or None for blanks and the header."""
+        index = self._geometry.cell_at(x, y)
+        if index is None or not self._days[index]:
+            return None
+        return date(self._year, self._month, self._days[index])
+
+    def _on_click(self, event) -> None:
+        day = self.day_at(event.x, event.y)
+        if day is not None and self._on_day_click:
+            self._on_day_click(day)
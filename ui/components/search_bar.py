@@ -11,7 +11,9 @@ class SearchBar(ctk.CTkFrame):
     """
     Search and filter bar: entry + optional placeholder.
 
-    Calls on_search when text changes (debounced or on return).
+    Calls on_search when text changes (debounced) or immediately on Return.
+    Each keystroke cancels the pending search, so only the query the user settles
+    on is run. debounce_ms=None disables live search (Return only).
     """
 
     def __init__(
@@ -19,10 +21,14 @@ class SearchBar(ctk.CTkFrame):
         master: ctk.CTk,
         placeholder: str = "Search tasks...",
         on_search: Optional[Callable[[str], None]] = None,
+        debounce_ms: Optional[int] = 250,
         **kwargs,
     ) -> None:
         super().__init__(master, fg_color="transparent", **kwargs)
         self._on_search = on_search
+        self._debounce_ms = debounce_ms
+        self._pending: Optional[str] = None  # Tk after() id of the scheduled search
+        self._last_query: Optional[str] = None
         self._entry = ctk.CTkEntry(
             self,
             placeholder_text=placeholder,
@@ -39,18 +45,41 @@ class SearchBar(ctk.CTkFrame):
         self._entry.bind("<KeyRelease>", self._on_key)
 
     def _do_search(self, event=None) -> None:
-        if self._on_search:
-            self._on_search(self._entry.get().strip())
+        self._cancel_pending()
+        self._emit(force=True)
 
     def _on_key(self, event=None) -> None:
-        # Optional: debounce or trigger on Return only. We trigger on Return.
-        pass
+        if self._debounce_ms is None:
+            return
+        self._cancel_pending()
+        self._pending = self.after(self._debounce_ms, self._emit)
+
+    def _cancel_pending(self) -> None:
+        if self._pending is not None:
+            self.after_cancel(self._pending)
+            self._pending = None
+
+    def _emit(self, force: bool = False) -> None:
+        self._pending = None
+        query = self.get_query()
+        # Arrow keys, modifiers etc. also fire KeyRelease; skip if the text is unchanged
+        if not force and query == self._last_query:
+            return
+        self._last_query = query
+        if self._on_search:
+            self._on_search(query)
 
     def get_query(self) -> str:
         """Return current search text."""
         return self._entry.get().strip()
 
     def set_query(self, text: str) -> None:
-        """Set search text."""
+        """Set search text (does not trigger a search)."""
+        self._cancel_pending()
         self._entry.delete(0, "end")
         self._entry.insert(0, text)
+        self._last_query = self.get_query()
+
+    def destroy(self) -> None:
+        self._cancel_pending()
+        super().destroy()
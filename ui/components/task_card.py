@@ -4,15 +4,8 @@ from typing import Callable, Optional
 
 import customtkinter as ctk
 
-from ui.theme import (
-    status_to_color,
-    CARD_CORNER_RADIUS,
-    FONT_TITLE,
-    FONT_BODY,
-    FONT_SMALL,
-    TEXT_PRIMARY,
-    BG_DARK,
-)
+from ui.components.card_style import DEFAULT_TEMPLATE, CardTemplate, card_style, status_display_name
+from ui.theme import CARD_CORNER_RADIUS, BG_DARK
 from models import Task
 
 
@@ -20,7 +13,8 @@ class TaskCard(ctk.CTkFrame):
     """
     Single task card with status pill, progress bar, title, description, and menu.
 
-    Callbacks: on_complete, on_edit, on_delete, on_menu.
+    Callbacks: on_complete, on_edit, on_delete, on_menu. Colors, fonts and the status
+    label come from the shared style sheet (card_style); template picks optional widgets.
     """
 
     def __init__(
@@ -31,6 +25,7 @@ class TaskCard(ctk.CTkFrame):
         on_edit: Optional[Callable[[str], None]] = None,
         on_delete: Optional[Callable[[str], None]] = None,
         on_menu: Optional[Callable[[str], None]] = None,
+        template: CardTemplate = DEFAULT_TEMPLATE,
         **kwargs,
     ) -> None:
         super().__init__(master, fg_color="transparent", **kwargs)
@@ -40,10 +35,8 @@ class TaskCard(ctk.CTkFrame):
         self._on_delete = on_delete
         self._on_menu = on_menu
 
-        status_str = getattr(task.status, "value", str(task.status))
-        card_color = status_to_color(status_str)
-        # Display label: Completed, Rejected, Running, Upcoming
-        display_status = self._status_display_name(status_str)
+        style = card_style(task.status)
+        card_color = style.card_color
 
         inner = ctk.CTkFrame(
             self,
@@ -61,37 +54,38 @@ class TaskCard(ctk.CTkFrame):
         row1.pack(fill="x")
         pill = ctk.CTkLabel(
             row1,
-            text=display_status,
-            font=FONT_SMALL,
-            text_color=BG_DARK,
+            text=style.status_label,
+            font=style.small_font,
+            text_color=style.text_color,
             fg_color=card_color,
             corner_radius=8,
             padx=8,
             pady=2,
         )
         pill.pack(side="left")
-        # Placeholder: "avatars" (three circles + plus)
-        avatars = ctk.CTkFrame(row1, fg_color="transparent")
-        avatars.pack(side="left", padx=(12, 0))
-        for _ in range(3):
+        if template.avatar_placeholders:
+            # Placeholder: "avatars" (three circles + plus)
+            avatars = ctk.CTkFrame(row1, fg_color="transparent")
+            avatars.pack(side="left", padx=(12, 0))
+            for _ in range(3):
+                ctk.CTkLabel(
+                    avatars,
+                    text="",
+                    width=24,
+                    height=24,
+                    fg_color=BG_DARK,
+                    corner_radius=12,
+                ).pack(side="left", padx=2)
             ctk.CTkLabel(
                 avatars,
-                text="",
+                text="+",
                 width=24,
                 height=24,
                 fg_color=BG_DARK,
                 corner_radius=12,
+                text_color=card_color,
+                font=style.body_font,
             ).pack(side="left", padx=2)
-        ctk.CTkLabel(
-            avatars,
-            text="+",
-            width=24,
-            height=24,
-            fg_color=BG_DARK,
-            corner_radius=12,
-            text_color=card_color,
-            font=FONT_BODY,
-        ).pack(side="left", padx=2)
         # Progress
         prog_frame = ctk.CTkFrame(row1, fg_color="transparent")
         prog_frame.pack(side="left", expand=True, fill="x", padx=8)
@@ -108,8 +102,8 @@ class TaskCard(ctk.CTkFrame):
         ctk.CTkLabel(
             prog_frame,
             text=f"{pct}%",
-            font=FONT_SMALL,
-            text_color=BG_DARK,
+            font=style.small_font,
+            text_color=style.text_color,
         ).pack(side="left", padx=4)
         # Menu button
         menu_btn = ctk.CTkButton(
@@ -119,8 +113,8 @@ class TaskCard(ctk.CTkFrame):
             height=32,
             fg_color="transparent",
             hover_color=BG_DARK,
-            text_color=BG_DARK,
-            font=FONT_BODY,
+            text_color=style.text_color,
+            font=style.body_font,
             command=self._on_menu_click,
         )
         menu_btn.pack(side="right")
@@ -135,8 +129,8 @@ class TaskCard(ctk.CTkFrame):
             height=40,
             fg_color=BG_DARK,
             corner_radius=8,
-            text_color=card_color,
-            font=FONT_BODY,
+            text_color=style.card_color,
+            font=style.body_font,
         )
         icon.pack(side="left")
         titles = ctk.CTkFrame(row2, fg_color="transparent")
@@ -144,33 +138,22 @@ class TaskCard(ctk.CTkFrame):
         ctk.CTkLabel(
             titles,
             text=task.title,
-            font=FONT_TITLE,
-            text_color=BG_DARK,
+            font=style.title_font,
+            text_color=style.text_color,
             anchor="w",
         ).pack(fill="x")
         if task.description:
             ctk.CTkLabel(
                 titles,
                 text=task.description,
-                font=FONT_SMALL,
-                text_color=BG_DARK,
+                font=style.small_font,
+                text_color=style.text_color,
                 anchor="w",
             ).pack(fill="x")
 
     def _status_display_name(self, status: str) -> str:
         """Map internal status to UI label."""
-        s = status.lower()
-        if "completed" in s:
-            return "Completed"
-        if "cancelled" in s or "rejected" in s:
-            return "Rejected"
-        if "in_progress" in s or "running" in s:
-            return "Running"
-        if "upcoming" in s or "today" in s or "pending" in s or "scheduled" in s:
-            return "Upcoming"
-        if "overdue" in s:
-            return "Overdue"
-        return "Task"
+        return status_display_name(status)
 
     def _on_menu_click(self) -> None:
         if self._on_menu:
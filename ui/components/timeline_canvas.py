@@ -0,0 +1,199 @@
+"""Timeline canvas: a day's tasks as time blocks on one Tk Canvas (hours down the left)."""
+
+from datetime import date, datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+import customtkinter as ctk
+
+from ui.theme import (
+    status_to_color,
+    BG_DARK,
+    BG_CARD,
+    ACCENT_ORANGE,
+    ACCENT_RED,
+    TEXT_MUTED,
+    TIME_MARKER_COLOR,
+    TIMELINE_LABEL_WIDTH,
+    TIMELINE_HOUR_HEIGHT,
+    TIMELINE_FIRST_HOUR,
+    FONT_SMALL,
+    FONT_CAPTION,
+)
+from ui.timeline_layout import MINUTES_PER_DAY, TimelineBlock, layout_day, minutes_since_midnight
+from models import Task
+
+# Approximate FONT_SMALL character width; titles are cut by length instead of
+# measuring text, which would cost a Tk round trip per block.
+_CHAR_PX = 7
+_TEXT_MIN_HEIGHT = 14
+_GAP = 2
+
+
+class TimelineCanvas(ctk.CTkFrame):
+    """
+    Vertical 24-hour timeline for one day.
+
+    Blocks are placed by ui.timeline_layout (overlapping tasks side by side) and
+    drawn as one rectangle plus, when it fits, one text item each; the hour grid
+    is only redrawn when the width changes. Clicking a block calls on_select,
+    double-clicking calls on_open (both with the task id).
+    """
+
+    def __init__(
+        self,
+        master: ctk.CTk,
+        on_select: Optional[Callable[[str], None]] = None,
+        on_open: Optional[Callable[[str], None]] = None,
+        hour_height: int = TIMELINE_HOUR_HEIGHT,
+        **kwargs,
+    ) -> None:
+        super().__init__(master, fg_color="transparent", **kwargs)
+        self._on_select = on_select
+        self._on_open = on_open
+        self._hour_height = hour_height
+        self._px_per_minute = hour_height / 60
+        self._day: Optional[date] = None
+        self._blocks: List[TimelineBlock] = []
+        self._item_task: Dict[int, str] = {}  # canvas item id -> task id
+        self._rect_of: Dict[str, int] = {}    # task id -> rectangle item id
+        self._selected: Optional[str] = None
+        self._grid_width = 0
+
+        height = 24 * hour_height
+        self._canvas = ctk.CTkCanvas(
+            self,
+            bg=BG_DARK,
+            highlightthickness=0,
+            scrollregion=(0, 0, 0, height),
+        )
+        scrollbar = ctk.CTkScrollbar(
+            self,
+            command=self._canvas.yview,
+            button_color=BG_CARD,
+            button_hover_color=TEXT_MUTED,
+        )
+        self._canvas.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y")
+        self._canvas.pack(side="left", fill="both", expand=True)
+        self._canvas.bind("<Configure>", self._on_resize)
+        self._canvas.bind("<MouseWheel>", self._on_wheel)
+        self._canvas.tag_bind("block", "<Button-1>", self._on_click)
+        self._canvas.tag_bind("block", "<Double-Button-1>", self._on_double_click)
+
+    @property
+    def blocks(self) -> List[TimelineBlock]:
+        """Current layout (sorted by start)."""
+        return self._blocks
+
+    def set_tasks(self, day: date, tasks: Iterable[Task]) -> None:
+        """Lay out and draw the tasks due on day; keeps the selection if its task is still shown."""
+        scroll_to_start = day != self._day
+        self._day = day
+        self._blocks = layout_day(tasks, day)
+        self._draw_blocks()
+        if scroll_to_start:
+            self.scroll_to_hour(TIMELINE_FIRST_HOUR)
+
+    def select(self, task_id: Optional[str]) -> None:
+        """Highlight one block (None clears); only the two affected rectangles are touched."""
+        previous = self._rect_of.get(self._selected) if self._selected else None
+        if previous is not None:
+            self._canvas.itemconfigure(previous, outline="", width=0)
+        self._selected = task_id
+        current = self._rect_of.get(task_id) if task_id else None
+        if current is not None:
+            self._canvas.itemconfigure(current, outline=ACCENT_ORANGE, width=2)
+
+    def scroll_to_hour(self, hour: int) -> None:
+        self._canvas.yview_moveto(hour / 24)
+
+    def _x_bounds(self, width: int, block: TimelineBlock) -> tuple:
+        left = TIMELINE_LABEL_WIDTH + _GAP
+        span = max(width - left - _GAP, 1) / block.columns
+        x0 = left + block.column * span
+        return x0, x0 + span - _GAP
+
+    def _draw_grid(self, width: int) -> None:
+        canvas = self._canvas
+        canvas.delete("grid")
+        for hour in range(25):
+            y = hour * self._hour_height
+            canvas.create_line(TIMELINE_LABEL_WIDTH, y, width, y, fill=BG_CARD, tags="grid")
+            if hour < 24:
+                label = f"{hour % 12 or 12:02d} {'am' if hour < 12 else 'pm'}"
+                canvas.create_text(
+                    4, y + 2, text=label, anchor="nw", fill=TIME_MARKER_COLOR, font=FONT_CAPTION, tags="grid"
+                )
+        canvas.tag_lower("grid")
+        self._grid_width = width
+
+    def _draw_now(self, width: int) -> None:
+        self._canvas.delete("now")
+        now = datetime.now()
+        if self._day != now.date():
+            return
+        y = minutes_since_midnight(now) * self._px_per_minute
+        self._canvas.create_line(TIMELINE_LABEL_WIDTH, y, width, y, fill=ACCENT_RED, width=2, tags="now")
+
+    def _draw_blocks(self) -> None:
+        canvas = self._canvas
+        width = canvas.winfo_width()
+        if width <= 1:
+            return  # not mapped yet; _on_resize draws once the size is known
+        if width != self._grid_width:
+            self._draw_grid(width)
+        canvas.delete("block")
+        self._item_task.clear()
+        self._rect_of.clear()
+        ppm = self._px_per_minute
+        for block in self._blocks:
+            task = block.task
+            x0, x1 = self._x_bounds(width, block)
+            y0 = block.start * ppm + 1
+            y1 = min(block.end, MINUTES_PER_DAY) * ppm - 1
+            selected = task.task_id == self._selected
+            rect = canvas.create_rectangle(
+                x0,
+                y0,
+                x1,
+                y1,
+                fill=status_to_color(getattr(task.status, "value", str(task.status))),
+                outline=ACCENT_ORANGE if selected else "",
+                width=2 if selected else 0,
+                tags="block",
+            )
+            self._item_task[rect] = task.task_id
+            self._rect_of[task.task_id] = rect
+            chars = int((x1 - x0 - 8) // _CHAR_PX)
+            if y1 - y0 >= _TEXT_MIN_HEIGHT and chars >= 3:
+                title = ("✓ " if task.is_completed else "") + task.title
+                if len(title) > chars:
+                    title = title[: chars - 1] + "…"
+                text = canvas.create_text(
+                    x0 + 4, y0 + 2, text=title, anchor="nw", fill=BG_DARK, font=FONT_SMALL, tags="block"
+                )
+                self._item_task[text] = task.task_id
+        self._draw_now(width)
+
+    def _task_at_pointer(self) -> Optional[str]:
+        items = self._canvas.find_withtag("current")
+        return self._item_task.get(items[0]) if items else None
+
+    def _on_click(self, event=None) -> None:
+        task_id = self._task_at_pointer()
+        if task_id is not None:
+            self.select(task_id)
+            if self._on_select:
+                self._on_select(task_id)
+
+    def _on_double_click(self, event=None) -> None:
+        task_id = self._task_at_pointer()
+        if task_id is not None and self._on_open:
+            self._on_open(task_id)
+
+    def _on_resize(self, event) -> None:
+        if event.width != self._grid_width:
+            self._draw_blocks()
+
+    def _on_wheel(self, event) -> None:
+        self._canvas.yview_scroll(-1 if event.delta > 0 else 1, "units")
@@ -1,38 +1,74 @@
 """Goal presenter: connects Goals UI to GoalService."""
 
-from typing import Callable, List, Optional
+from typing import Callable, Dict, List, Optional
 
-from models import Goal, User
+from models import Goal, GoalProgress, User
 from models.enums import GoalCategory, FrequencyType
 from services import GoalService, UserService
+from services.events import GOAL_KINDS, TASK_KINDS, ChangeEvent, ChangeKind, EventBus, get_event_bus
 from repository.database import DatabaseError
 
+# Task fields that feed the goal progress counters
+_PROGRESS_FIELDS = frozenset({"goal_id", "is_completed", "duration_minutes"})
+
 
 class GoalPresenter:
-    """Presenter for Goals screen: list active/archived, create, archive."""
+    """
+    Presenter for Goals screen: list active/archived, create, archive.
+
+    The goal list is reloaded when the service publishes goal change events, and
+    when a goal-linked task change moves a goal's progress counters, but only while
+    it is visible (see set_is_visible); a hidden list is reloaded when shown.
+    """
 
     def __init__(
         self,
         goal_service: Optional[GoalService] = None,
         user_service: Optional[UserService] = None,
+        event_bus: Optional[EventBus] = None,
     ) -> None:
-        self._goal_service = goal_service or GoalService()
+        self._events = event_bus or get_event_bus()
+        self._goal_service = goal_service or GoalService(event_bus=self._events)
         self._user_service = user_service or UserService()
-        self._user: Optional[User] = None
-        self._refresh_view: Optional[Callable[[List[Goal]], None]] = None
+        self._refresh_view: Optional[Callable[[List[Goal], Dict[str, GoalProgress]], None]] = None
         self._on_error: Optional[Callable[[str], None]] = None
+        self._is_visible: Callable[[], bool] = lambda: True
         self._show_active = True  # Active tab vs Archived
+        self._events.subscribe(self._on_goal_changes, kinds=GOAL_KINDS)
+        self._events.subscribe(self._on_task_changes, kinds=TASK_KINDS)
 
-    def set_refresh_view(self, callback: Callable[[List[Goal]], None]) -> None:
+    def set_refresh_view(self, callback: Callable[[List[Goal], Dict[str, GoalProgress]], None]) -> None:
+        """Set callback receiving the goals to show and their progress counters by goal id."""
         self._refresh_view = callback
 
     def set_on_error(self, callback: Callable[[str], None]) -> None:
         self._on_error = callback
 
+    def set_is_visible(self, callback: Callable[[], bool]) -> None:
+        """Set callback telling whether the goal list is on screen (change events skip it otherwise)."""
+        self._is_visible = callback
+
+    def _on_goal_changes(self, events: List[ChangeEvent]) -> None:
+        if self._refresh_view is not None and self._is_visible():
+            self.load_goals(self._show_active)
+
+    def _on_task_changes(self, events: List[ChangeEvent]) -> None:
+        # Progress bars only move when a goal-linked task is added, completed, resized or relinked
+        if self._refresh_view is None or not self._is_visible():
+            return
+        for e in events:
+            changed = e.changed_fields
+            if (
+                e.entity is None
+                or (e.entity.goal_id is not None and changed & _PROGRESS_FIELDS)
+                or (e.kind == ChangeKind.TASK_UPDATED and "goal_id" in changed)
+            ):
+                self.load_goals(self._show_active)
+                return
+
     def get_user(self) -> User:
-        if self._user is None:
-            self._user = self._user_service.get_or_create_default_user()
-        return self._user
+        """Return current user (served from the repository cache shared with TaskPresenter)."""
+        return self._user_service.get_or_create_default_user()
 
     def load_goals(self, active_only: bool = True) -> None:
         """Load goals and refresh view. active_only=True = active only; False = archived only."""
@@ -48,7 +84,9 @@ class GoalPresenter:
             else:
                 goals = [g for g in goals if g.is_archived]
             if self._refresh_view:
-                self._refresh_view(goals)
+                # Counters are maintained by the database: one lookup, no task scan
+                progress = self._goal_service.get_progress(g.goal_id for g in goals)
+                self._refresh_view(goals, progress)
         except DatabaseError as e:
             if self._on_error:
                 self._on_error(str(e))
@@ -79,7 +117,7 @@ class GoalPresenter:
         category: GoalCategory = GoalCategory.OTHER,
         frequency: FrequencyType = FrequencyType.DAILY,
     ) -> Optional[Goal]:
-        """Create goal and refresh list."""
+        """Create goal (the list reloads from the change event)."""
         import uuid
         user = self.get_user()
         goal = Goal(
@@ -93,7 +131,6 @@ class GoalPresenter:
         )
         try:
             self._goal_service.save_goal(goal)
-            self.load_goals(self._show_active)
             return goal
         except DatabaseError as e:
             if self._on_error:
@@ -101,20 +138,15 @@ class GoalPresenter:
             return None
 
     def archive_goal(self, goal_id: str) -> None:
-        goal = self._goal_service.get_by_id(goal_id)
-        if goal:
-            goal.archive()
-            try:
-                self._goal_service.save_goal(goal)
-                self.load_goals(self._show_active)
-            except DatabaseError as e:
-                if self._on_error:
-                    self._on_error(str(e))
+        try:
+            self._goal_service.archive_goal(goal_id)
+        except DatabaseError as e:
+            if self._on_error:
+                self._on_error(str(e))
 
     def delete_goal(self, goal_id: str) -> None:
         try:
             self._goal_service.delete_goal(goal_id)
-            self.load_goals(self._show_active)
         except DatabaseError as e:
             if self._on_error:
                 self._on_error(str(e))
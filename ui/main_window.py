@@ -1,31 +1,34 @@
 """Main application: bottom nav + screen switching (Home, Goals, Tasks, Calendar, Settings)."""
 
 from datetime import date, datetime
-from typing import List, Optional
+from concurrent.futures import Future
+from typing import Callable, List, Optional
 
 import customtkinter as ctk
 
 from ui.theme import BG_DARK, FONT_BODY
 from ui.nav_bar import NavBar
 from ui.presenter import TaskPresenter
+from ui.profiling import install as install_profiling
 from ui.goal_presenter import GoalPresenter
-from ui.screens import (
-    HomeDashboardView,
-    GoalsView,
-    TasksView,
-    CalendarView,
-    SettingsView,
-)
-from ui.wizards import NewGoalWizard, NewTaskWizard
-from ui.task_dialog import TaskDialog
 from models import Task, Goal
 from models.enums import TaskType
+from services.backup import BackupScheduler, Snapshot
+from services.purge import PurgeScheduler
+from services.events import GOAL_KINDS, TASK_KINDS, ChangeEvent, get_event_bus
+from services.session import open_session
 
 
 class MainWindow(ctk.CTk):
     """
     Main window: Deep Navy background, content area + fixed bottom nav.
     Screens: Home, Goals, Tasks, Calendar, Settings. Wired to TaskPresenter and GoalPresenter.
+    Model change events are coalesced per Tk idle cycle and only the visible screen is patched;
+    hidden screens are refreshed when shown. Snapshots of the database are taken on a
+    background thread (BackupScheduler) and before "Delete All Data"; deleted tasks and
+    goals past their undo window are purged on another (PurgeScheduler). Task edits go
+    through the session's CommandStack: Ctrl+Z / Ctrl+Y undo and redo them, and they are
+    written in batches on Tk timers.
     """
 
     def __init__(self, **kwargs) -> None:
@@ -37,17 +40,49 @@ class MainWindow(ctk.CTk):
         self.geometry("900x700")
         self.minsize(600, 500)
 
-        self._task_presenter = TaskPresenter()
-        self._goal_presenter = GoalPresenter()
+        self._events = get_event_bus()
+        self._events.set_scheduler(self.after_idle)
+        # Current user (TASKS_USER or the default user); services run on the
+        # database holding their data (a per-user shard if TASKS_DB_SHARDS is set)
+        self._session = open_session(event_bus=self._events)
+        self._task_presenter = TaskPresenter(
+            task_service=self._session.tasks,
+            user_service=self._session.users,
+            goal_service=self._session.goals,
+            event_bus=self._events,
+            history_service=self._session.history,
+            schedule_index=self._session.schedule,
+            auto_scheduler=self._session.auto_scheduler,
+            ranking_engine=self._session.ranking,
+            command_stack=self._session.commands,
+        )
+        self._session.commands.set_scheduler(self.after)
+        self._goal_presenter = GoalPresenter(
+            goal_service=self._session.goals,
+            user_service=self._session.users,
+            event_bus=self._events,
+        )
         self._task_presenter.set_on_error(self._show_error)
         self._goal_presenter.set_on_error(self._show_error)
 
         self._screens: dict = {}
         self._current_screen: Optional[str] = None
         self._build_ui()
+        self._events.subscribe(self._on_model_changes)
+        install_profiling(self)  # no-op unless TASKS_UI_PROFILE is set
+        self._backup_scheduler = BackupScheduler(self._session.backups)
+        self._backup_scheduler.start()
+        self._purge_scheduler = PurgeScheduler(self._session.db.path)
+        self._purge_scheduler.start()
+        self.bind("<Control-z>", lambda e: self._task_presenter.undo())
+        self.bind("<Control-y>", lambda e: self._task_presenter.redo())
+        self.bind("<Control-Shift-Z>", lambda e: self._task_presenter.redo())
         self._show_screen("home")
 
     def _build_ui(self) -> None:
+        # Imported here, not at module level, so importing ui.main_window stays cheap
+        from ui.screens import CalendarView, GoalsView, HomeDashboardView, SettingsView, TasksView
+
         content_frame = ctk.CTkFrame(self, fg_color="transparent")
         content_frame.pack(fill="both", expand=True)
         content_frame.columnconfigure(0, weight=1)
@@ -59,6 +94,7 @@ class MainWindow(ctk.CTk):
             on_new_task=self._open_new_task,
             on_new_goal=self._open_new_goal,
             on_view_all_tasks=lambda: self._show_screen("tasks"),
+            on_trend_period=lambda days: home.set_trend(self._task_presenter.get_trend(days)),
         )
         home.grid(row=0, column=0, sticky="nsew")
         self._screens["home"] = home
@@ -71,8 +107,10 @@ class MainWindow(ctk.CTk):
         goals.grid(row=0, column=0, sticky="nsew")
         goals.set_tab_callback(self._on_goals_tab)
         self._goal_presenter.set_refresh_view(
-            lambda g: goals.show_goals(g, self._goal_presenter._show_active)
+            lambda g, progress: goals.show_goals(g, self._goal_presenter._show_active, progress)
         )
+        # Hidden goal lists are reloaded by _show_screen instead
+        self._goal_presenter.set_is_visible(lambda: self._current_screen == "goals")
         self._screens["goals"] = goals
 
         # Tasks
@@ -84,6 +122,7 @@ class MainWindow(ctk.CTk):
         )
         tasks.grid(row=0, column=0, sticky="nsew")
         self._task_presenter.set_refresh_view(tasks.show_tasks)
+        self._task_presenter.set_patch_view(tasks.apply_changes)
         tasks.show_tasks([])
         self._screens["tasks"] = tasks
 
@@ -95,6 +134,7 @@ class MainWindow(ctk.CTk):
             _, last = cal_module.monthrange(y, m)
             from_dt = datetime(y, m, 1)
             to_dt = datetime(y, m, last, 23, 59, 59)
+            self._task_presenter.flush()
             return self._task_presenter._task_service.get_tasks_for_user(
                 user_id=user.user_id,
                 from_date=from_dt,
@@ -118,6 +158,9 @@ class MainWindow(ctk.CTk):
             on_student_mode_toggle=self._on_student_mode_toggle,
             on_dark_mode_toggle=self._on_dark_mode_toggle,
             on_delete_all=self._on_delete_all_data,
+            on_export_stats=self._on_export_stats,
+            on_backup_now=self._on_backup_now,
+            on_restore=self._on_restore_backup,
         )
         settings.grid(row=0, column=0, sticky="nsew")
         settings.set_user_name(user.name)
@@ -143,6 +186,7 @@ class MainWindow(ctk.CTk):
             elif tab_id == "goals":
                 self._refresh_goals()
             elif tab_id == "tasks":
+                self._screens["tasks"].clear_search()
                 self._task_presenter.load_tasks(selected_date=date.today(), search_query="")
             elif tab_id == "calendar":
                 today = date.today()
@@ -152,6 +196,29 @@ class MainWindow(ctk.CTk):
                 self._screens["settings"].set_user_name(user.name)
                 self._screens["settings"].set_notifications(user.preferences.enabled)
                 self._screens["settings"].set_student_mode(user.is_student_mode)
+                self._screens["settings"].set_backup_status(self._backup_status())
+
+    def _on_model_changes(self, events: List[ChangeEvent]) -> None:
+        """Update the visible screen for a coalesced batch of model changes."""
+        screen = self._current_screen
+        task_events = [e for e in events if e.kind in TASK_KINDS]
+        if screen == "home":
+            self._refresh_home()
+        elif screen == "goals" and any(e.kind in GOAL_KINDS for e in events):
+            self._refresh_goal_counts()
+        elif screen == "calendar" and task_events:
+            calendar = self._screens["calendar"]
+            year, month = calendar.get_month()
+            for e in task_events:
+                due = e.entity.due_date_time if e.entity is not None else None
+                if (
+                    e.entity is None
+                    or "due_date_time" in e.changed_fields
+                    or (due is not None and (due.year, due.month) == (year, month))
+                ):
+                    calendar.refresh_events()
+                    break
+        # The tasks screen is patched by TaskPresenter and the goal list by GoalPresenter.
 
     def _refresh_home(self) -> None:
         home = self._screens.get("home")
@@ -161,9 +228,17 @@ class MainWindow(ctk.CTk):
         pct = self._task_presenter.get_completion_rate_today()
         streaks = self._task_presenter.get_active_streaks()
         upcoming = self._task_presenter.get_upcoming_tasks(limit=10)
-        home.refresh(user.name, pct, streaks, upcoming)
+        trend = self._task_presenter.get_trend(home.trend_days)
+        home.refresh(user.name, pct, streaks, upcoming, trend)
 
     def _refresh_goals(self) -> None:
+        if not self._screens.get("goals"):
+            return
+        self._refresh_goal_counts()
+        self._goal_presenter.load_goals(active_only=True)
+
+    def _refresh_goal_counts(self) -> None:
+        """Update banner and tab counts on the Goals screen."""
         goals_view = self._screens.get("goals")
         if not goals_view:
             return
@@ -174,29 +249,25 @@ class MainWindow(ctk.CTk):
         total_streaks = sum(g.current_streak for g in all_goals if not g.is_archived)
         goals_view.set_banner_counts(active_count, total_streaks)
         goals_view.set_tab_labels(active_count, archived_count)
-        self._goal_presenter.load_goals(active_only=True)
 
     def _on_goals_tab(self, active: bool) -> None:
         self._goal_presenter.load_goals(active_only=active)
-        goals_view = self._screens.get("goals")
-        if goals_view:
-            user = self._goal_presenter.get_user()
-            all_goals = self._goal_presenter._goal_service.get_all_for_user(user.user_id, include_archived=True)
-            active_count = sum(1 for g in all_goals if not g.is_archived)
-            archived_count = sum(1 for g in all_goals if g.is_archived)
-            goals_view.set_tab_labels(active_count, archived_count)
+        self._refresh_goal_counts()
 
     def _open_new_goal(self) -> None:
+        from ui.wizards import NewGoalWizard
+
         def save(title: str, description: str, color_hex: str) -> None:
             self._goal_presenter.create_goal(title=title, description=description, color_hex=color_hex)
-            self._refresh_goals()
-            self._refresh_home()
 
         w = NewGoalWizard(self, on_save=save, on_back=lambda: None)
         self.after(50, w.lift)
         self.after(50, w.focus_force)
 
     def _open_new_task(self) -> None:
+        from ui.wizards import NewTaskWizard
+        from ui.task_dialog import TaskDialog
+
         def on_type_selected(task_type: TaskType) -> None:
             def save_new(**kwargs) -> None:
                 self._task_presenter.create_task(
@@ -207,13 +278,13 @@ class MainWindow(ctk.CTk):
                     priority=kwargs.get("priority"),
                     task_type=task_type,
                 )
-                self._refresh_home()
-                if self._current_screen == "tasks":
-                    self._task_presenter.load_tasks()
-                if self._current_screen == "calendar":
-                    self._screens["calendar"].refresh_events()
 
-            dlg = TaskDialog(self, dialog_title="New Task", on_save=save_new)
+            dlg = TaskDialog(
+                self,
+                dialog_title="New Task",
+                on_save=save_new,
+                check_schedule=self._task_presenter.schedule_warning,
+            )
             self.after(50, dlg.focus_force)
 
         w = NewTaskWizard(self, on_select_type=on_type_selected, on_back=lambda: None)
@@ -221,6 +292,8 @@ class MainWindow(ctk.CTk):
         self.after(50, w.focus_force)
 
     def _edit_task_from_calendar(self, task: Task) -> None:
+        from ui.task_dialog import TaskDialog
+
         def save_edit(**kwargs) -> None:
             self._task_presenter.update_task(
                 kwargs["task_id"],
@@ -230,9 +303,13 @@ class MainWindow(ctk.CTk):
                 duration_minutes=kwargs.get("duration_minutes"),
                 priority=kwargs.get("priority"),
             )
-            self._screens["calendar"].refresh_events()
 
-        dlg = TaskDialog(self, dialog_title="Edit Task", on_save=save_edit)
+        dlg = TaskDialog(
+            self,
+            dialog_title="Edit Task",
+            on_save=save_edit,
+            check_schedule=self._task_presenter.schedule_warning,
+        )
         dlg.set_task(task)
 
     def _on_notifications_toggle(self, enabled: bool) -> None:
@@ -249,24 +326,149 @@ class MainWindow(ctk.CTk):
         ctk.set_appearance_mode("dark" if enabled else "light")
 
     def _on_delete_all_data(self) -> None:
-        # Confirm then delete all tasks and goals for user
+        # Confirm, snapshot, then delete all tasks and goals for user
         result = self._ask_confirm("Type 'DELETE' to confirm:")
         if result and result.strip().upper() == "DELETE":
-            user = self._task_presenter.get_user()
-            for task in self._task_presenter._task_service.get_tasks_for_user(user_id=user.user_id, include_completed=True):
-                self._task_presenter._task_service.delete_task(task.task_id)
-            for goal in self._goal_presenter._goal_service.get_all_for_user(user.user_id, include_archived=True):
-                self._goal_presenter._goal_service.delete_goal(goal.goal_id)
-            self._refresh_home()
-            self._refresh_goals()
-            if self._current_screen == "tasks":
-                self._task_presenter.load_tasks()
-            if self._current_screen == "calendar":
-                self._screens["calendar"].refresh_events()
-            self._show_error("All data deleted.")
+            self._after_backup("pre_delete", self._delete_all_data)
         elif result is not None:
             self._show_error("Cancelled. Type DELETE to confirm.")
 
+    def _delete_all_data(self, snapshot: Snapshot) -> None:
+        self._task_presenter.flush()
+        user = self._task_presenter.get_user()
+        for task in self._task_presenter._task_service.get_tasks_for_user(user_id=user.user_id, include_completed=True):
+            self._task_presenter._task_service.delete_task(task.task_id)
+        for goal in self._goal_presenter._goal_service.get_all_for_user(user.user_id, include_archived=True):
+            self._goal_presenter._goal_service.delete_goal(goal.goal_id)
+        # Screens update from the coalesced delete events on the next idle cycle
+        self._show_error(f"All data deleted. Settings > Backups > Restore brings it back ({snapshot.name}).")
+
+    def _backup_status(self) -> str:
+        snapshots = self._session.backups.snapshots()
+        if not snapshots:
+            return "No backups yet"
+        latest = snapshots[0]
+        return f"Last backup {latest.created:%Y-%m-%d %H:%M} ({latest.label or 'automatic'}), {len(snapshots)} kept"
+
+    def _after_backup(self, label: str, then: Callable[[Snapshot], None]) -> None:
+        """Snapshot on the backup thread, then call then(snapshot) on the Tk thread."""
+        self._task_presenter.flush()  # the snapshot includes every edit made so far
+        future = self._session.backups.submit(label)
+        self._screens["settings"].set_backup_status("Backing up…")
+
+        def poll(future: Future) -> None:
+            if not future.done():
+                self.after(100, poll, future)
+                return
+            self._screens["settings"].set_backup_status(self._backup_status())
+            try:
+                snapshot = future.result()
+            except Exception as e:
+                self._show_error(f"Backup failed, nothing was changed: {e}")
+                return
+            then(snapshot)
+
+        poll(future)
+
+    def _on_backup_now(self) -> None:
+        self._after_backup("manual", lambda snapshot: self._show_error(f"Backup saved: {snapshot.path}"))
+
+    def _on_restore_backup(self) -> None:
+        snapshots = self._session.backups.snapshots()
+        if not snapshots:
+            self._show_error("There are no backups to restore yet.")
+            return
+        snapshot = self._choose_snapshot(snapshots)
+        if snapshot is None:
+            return
+        result = self._ask_confirm("Type 'RESTORE' to replace all data:")
+        if not result or result.strip().upper() != "RESTORE":
+            if result is not None:
+                self._show_error("Cancelled. Type RESTORE to confirm.")
+            return
+
+        def restore(safety: Snapshot) -> None:
+            try:
+                self._session.backups.restore(snapshot, keep_current=False)
+            except Exception as e:
+                self._show_error(f"Restore failed: {e}")
+                return
+            self._session.db.clear_caches()
+            self._session.schedule.invalidate()
+            self._session.ranking.invalidate()
+            self._session.commands.clear()  # undo steps refer to the replaced data
+            self._reload_screens()
+            self._screens["settings"].set_backup_status(self._backup_status())
+            self._show_error(f"Restored {snapshot.name}. The previous data was saved as {safety.name}.")
+
+        self._task_presenter.flush()  # so the safety snapshot has every edit
+        self._after_backup("pre_restore", restore)
+
+    def _reload_screens(self) -> None:
+        """Re-read everything shown (after the data was replaced underneath the UI)."""
+        self._task_presenter.reset()
+        screen = self._current_screen
+        if screen == "home":
+            self._refresh_home()
+        elif screen == "goals":
+            self._refresh_goal_counts()
+            self._goal_presenter.load_goals(active_only=self._goal_presenter._show_active)
+        elif screen == "calendar":
+            self._screens["calendar"].refresh_events()
+        elif screen == "settings":
+            self._show_screen("settings")
+
+    def _choose_snapshot(self, snapshots: List[Snapshot]) -> Optional[Snapshot]:
+        """Dialog: pick a snapshot from a menu. Returns it or None."""
+        choices = {
+            f"{s.created:%Y-%m-%d %H:%M:%S}  {s.label or 'automatic'}  ({s.size / (1024 * 1024):.1f} MB)": s
+            for s in snapshots
+        }
+        d = ctk.CTkToplevel(self)
+        d.title("Restore backup")
+        d.geometry("420x140")
+        d.configure(fg_color=BG_DARK)
+        d.transient(self)
+        menu = ctk.CTkOptionMenu(d, values=list(choices), width=380)
+        menu.pack(padx=20, pady=(20, 12))
+        result: List[Optional[Snapshot]] = [None]
+
+        def ok() -> None:
+            result[0] = choices[menu.get()]
+            d.destroy()
+
+        btn_row = ctk.CTkFrame(d, fg_color="transparent")
+        btn_row.pack(pady=(0, 16))
+        ctk.CTkButton(btn_row, text="Cancel", command=d.destroy).pack(side="left", padx=8)
+        ctk.CTkButton(btn_row, text="Restore", command=ok).pack(side="left", padx=8)
+        d.grab_set()
+        self.wait_window(d)
+        return result[0]
+
+    def _on_export_stats(self) -> None:
+        """Save query and cache statistics of the app database as JSON."""
+        import json
+        from tkinter import filedialog
+
+        path = filedialog.asksaveasfilename(
+            parent=self,
+            title="Export database stats",
+            defaultextension=".json",
+            initialfile="db_stats.json",
+            filetypes=[("JSON", "*.json")],
+        )
+        if not path:
+            return
+        db = self._session.db
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(db.stats(), f, indent=2)
+        except OSError as e:
+            self._show_error(f"Could not write stats: {e}")
+            return
+        note = "" if db.instrumented else " (query timings need TASKS_DB_INSTRUMENT=1)"
+        self._show_error(f"Stats written to {path}{note}")
+
     def _ask_confirm(self, prompt: str) -> Optional[str]:
         """Simple dialog: entry + OK/Cancel. Returns entry value or None."""
         d = ctk.CTkToplevel(self)
@@ -297,6 +499,15 @@ class MainWindow(ctk.CTk):
         self.wait_window(d)
         return result[0]
 
+    def destroy(self) -> None:
+        try:
+            self._session.commands.set_scheduler(None)  # writes pending edits
+        finally:
+            # Cancels a copy in progress; it leaves only a .partial file, removed next time
+            self._backup_scheduler.stop()
+            self._purge_scheduler.stop()
+            super().destroy()
+
     def _show_error(self, message: str) -> None:
         err = ctk.CTkToplevel(self)
         err.title("Error")
@@ -1,19 +1,41 @@
 """Presenter: connects UI to Service Layer (MVP)."""
 
-from datetime import datetime, date, timedelta
-from typing import Callable, List, Optional
+from datetime import datetime, date
+from typing import Callable, List, Optional, Tuple
 
-from models import Task, User
+from models import DailySummary, Task, User
 from models.enums import Priority, TaskStatus, TaskType
-from services import TaskService, UserService, GoalService
+from services import (
+    AutoScheduler,
+    GoalService,
+    HistoryService,
+    RankingEngine,
+    ScheduleIndex,
+    TaskService,
+    UserService,
+)
+from services.commands import CommandStack
+from services.events import TASK_KINDS, ChangeEvent, EventBus, get_event_bus
 from repository.database import DatabaseError
+from repository.goal_repository import GoalRepository
+from repository.summary_repository import DailySummaryRepository
+
+# SQLite LIKE folds ASCII letters only; in-memory narrowing must match the same rows.
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+def _fold(text: Optional[str]) -> str:
+    return (text or "").translate(_ASCII_LOWER)
 
 
 class TaskPresenter:
     """
     Presenter/Controller: handles user actions and updates the view.
 
-    View calls presenter methods; presenter calls services and then refresh_view(tasks).
+    View calls presenter methods; presenter calls services. Services publish change
+    events; the presenter lets the view patch itself (patch_view) or reloads and
+    calls refresh_view(tasks). With a command stack, complete/delete/update are
+    undoable and written in batches; reads flush pending edits first.
     """
 
     def __init__(
@@ -21,29 +43,93 @@ class TaskPresenter:
         task_service: Optional[TaskService] = None,
         user_service: Optional[UserService] = None,
         goal_service: Optional[GoalService] = None,
+        event_bus: Optional[EventBus] = None,
+        history_service: Optional[HistoryService] = None,
+        schedule_index: Optional[ScheduleIndex] = None,
+        auto_scheduler: Optional[AutoScheduler] = None,
+        ranking_engine: Optional[RankingEngine] = None,
+        command_stack: Optional[CommandStack] = None,
     ) -> None:
-        self._task_service = task_service or TaskService()
+        self._events = event_bus or get_event_bus()
+        self._task_service = task_service or TaskService(event_bus=self._events)
         self._user_service = user_service or UserService()
-        self._goal_service = goal_service or GoalService()
-        self._user: Optional[User] = None
+        self._goal_service = goal_service or GoalService(event_bus=self._events)
+        # Defaults read the task service's database, not the app's default one
+        task_db = self._task_service.repository.db
+        self._history_service = history_service or HistoryService(DailySummaryRepository(task_db))
+        self._schedule = schedule_index
+        self._auto_scheduler = auto_scheduler or AutoScheduler(self._task_service, self._task_service.repository)
+        self._ranking = ranking_engine or RankingEngine(
+            self._task_service.repository, GoalRepository(task_db), event_bus=self._events
+        )
+        self._commands = command_stack
         self._refresh_view: Optional[Callable[[List[Task]], None]] = None
+        self._patch_view: Optional[Callable[[List[ChangeEvent]], bool]] = None
         self._on_error: Optional[Callable[[str], None]] = None
         self._last_date: Optional[date] = None
         self._last_search: Optional[str] = None
+        # Last result set and its (date, folded query); a query that contains the
+        # previous one is narrowed in memory instead of re-querying SQLite.
+        self._results: Optional[List[Task]] = None
+        self._results_key: Optional[Tuple[date, str]] = None
+        self._events.subscribe(self._on_task_changes, kinds=TASK_KINDS)
 
     def set_refresh_view(self, callback: Callable[[List[Task]], None]) -> None:
         """Set callback to refresh the task list UI with new tasks."""
         self._refresh_view = callback
 
+    def set_patch_view(self, callback: Callable[[List[ChangeEvent]], bool]) -> None:
+        """
+        Set callback that patches the task list in place for a batch of task changes.
+
+        The callback returns False when it cannot patch (e.g. a new task needs to be
+        inserted in order); the presenter then reloads the list.
+        """
+        self._patch_view = callback
+
     def set_on_error(self, callback: Callable[[str], None]) -> None:
         """Set callback to show error messages."""
         self._on_error = callback
+        if self._commands is not None:
+            self._commands.set_on_error(callback)
+
+    def flush(self) -> bool:
+        """Write edits the command stack has not written yet. Returns False on error (reported)."""
+        if self._commands is None:
+            return True
+        try:
+            self._commands.flush()
+            return True
+        except DatabaseError as e:
+            if self._on_error:
+                self._on_error(str(e))
+            return False
+
+    def undo(self) -> Optional[str]:
+        """Undo the last task edit; returns its label (None if nothing to undo)."""
+        return self._commands.undo() if self._commands is not None else None
+
+    def redo(self) -> Optional[str]:
+        """Redo the last undone task edit; returns its label (None if nothing to redo)."""
+        return self._commands.redo() if self._commands is not None else None
+
+    def reset(self) -> None:
+        """Drop the cached results (the data was replaced, e.g. by a backup restore) and reload the view."""
+        self._results = None
+        if self._refresh_view is not None:
+            self.load_tasks()
+
+    def _on_task_changes(self, events: List[ChangeEvent]) -> None:
+        self._results = None
+        if self._refresh_view is None:
+            return
+        if self._patch_view is not None and self._patch_view(events):
+            return
+        self.load_tasks()
 
     def get_user(self) -> User:
-        """Return current user (creates default if needed)."""
-        if self._user is None:
-            self._user = self._user_service.get_or_create_default_user()
-        return self._user
+        """Return current user (creates default if needed; served from the repository cache)."""
+        return self._user_service.get_or_create_default_user()
 
     def load_tasks(
         self,
@@ -62,39 +148,69 @@ class TaskPresenter:
             self._last_date = selected_date
         if search_query is not None:
             self._last_search = search_query
+        self.flush()
         date_use = self._last_date or date.today()
-        query_use = self._last_search if self._last_search is not None else ""
-        user = self.get_user()
-        try:
-            from_dt = datetime(date_use.year, date_use.month, date_use.day)
-            to_dt = datetime(date_use.year, date_use.month, date_use.day, 23, 59, 59)
-            tasks = self._task_service.get_tasks_for_user(
-                user_id=user.user_id,
-                from_date=from_dt,
-                to_date=to_dt,
-                include_completed=True,
-                search_query=query_use.strip() or None,
-            )
-            if self._refresh_view:
-                self._refresh_view(tasks)
-        except DatabaseError as e:
-            if self._on_error:
-                self._on_error(str(e))
+        query_use = (self._last_search if self._last_search is not None else "").strip()
+        folded = _fold(query_use)
+        tasks = self._narrow(date_use, folded)
+        if tasks is None:
+            user = self.get_user()
+            try:
+                from_dt = datetime(date_use.year, date_use.month, date_use.day)
+                to_dt = datetime(date_use.year, date_use.month, date_use.day, 23, 59, 59)
+                tasks = self._task_service.get_tasks_for_user(
+                    user_id=user.user_id,
+                    from_date=from_dt,
+                    to_date=to_dt,
+                    include_completed=True,
+                    search_query=query_use or None,
+                )
+            except DatabaseError as e:
+                if self._on_error:
+                    self._on_error(str(e))
+                return
+        self._results = tasks
+        self._results_key = (date_use, folded)
+        if self._refresh_view:
+            self._refresh_view(tasks)
+
+    def _narrow(self, day: date, folded_query: str) -> Optional[List[Task]]:
+        """
+        Filter the previous result set in memory when the new query extends it.
+
+        Any task matching the new query also matches every substring of it, so the
+        previous results (same day, query strictly contained in the new one) are a
+        superset. Returns None when the database must be queried.
+        """
+        if self._results is None or self._results_key is None:
+            return None
+        prev_day, prev_query = self._results_key
+        # The same query again (e.g. a screen switch) always re-reads the database
+        if prev_day != day or prev_query == folded_query or prev_query not in folded_query:
+            return None
+        return [
+            t for t in self._results
+            if folded_query in _fold(t.title) or folded_query in _fold(t.description)
+        ]
 
     def complete_task(self, task_id: str) -> None:
-        """Mark task complete and refresh."""
+        """Mark task complete (the view updates from the change event)."""
         try:
+            if self._commands is not None:
+                self._commands.complete(task_id)
+                return
             self._task_service.complete_task(task_id)
-            self.load_tasks(self._last_date, self._last_search or "")
         except DatabaseError as e:
             if self._on_error:
                 self._on_error(str(e))
 
     def delete_task(self, task_id: str) -> None:
-        """Delete task and refresh."""
+        """Delete task (the view updates from the change event)."""
         try:
+            if self._commands is not None:
+                self._commands.delete(task_id)
+                return
             self._task_service.delete_task(task_id)
-            self.load_tasks(self._last_date, self._last_search or "")
         except DatabaseError as e:
             if self._on_error:
                 self._on_error(str(e))
@@ -109,7 +225,7 @@ class TaskPresenter:
         task_type: TaskType = TaskType.FREE,
         goal_id: Optional[str] = None,
     ) -> Optional[Task]:
-        """Create task and refresh. Returns created task or None on error."""
+        """Create task (the view updates from the change event). Returns created task or None on error."""
         user = self.get_user()
         try:
             task = self._task_service.create_task(
@@ -122,7 +238,6 @@ class TaskPresenter:
                 task_type=task_type,
                 goal_id=goal_id,
             )
-            self.load_tasks(self._last_date, self._last_search or "")
             return task
         except DatabaseError as e:
             if self._on_error:
@@ -139,8 +254,23 @@ class TaskPresenter:
         priority: Optional[Priority] = None,
         progress_percent: Optional[int] = None,
     ) -> Optional[Task]:
-        """Update task and refresh. Returns updated task or None."""
+        """
+        Update task (the view updates from the change event). Returns updated task or None.
+
+        With a command stack, quick successive updates of one task (e.g. a progress
+        slider drag) are one undo step and one write.
+        """
         try:
+            if self._commands is not None:
+                return self._commands.update(
+                    task_id,
+                    title=title,
+                    description=description,
+                    due_date_time=due_date,
+                    duration_minutes=duration_minutes,
+                    priority=priority,
+                    progress_percent=progress_percent,
+                )
             task = self._task_service.update_task(
                 task_id,
                 title=title,
@@ -150,7 +280,6 @@ class TaskPresenter:
                 priority=priority,
                 progress_percent=progress_percent,
             )
-            self.load_tasks(self._last_date, self._last_search or "")
             return task
         except DatabaseError as e:
             if self._on_error:
@@ -159,6 +288,7 @@ class TaskPresenter:
 
     def get_task_by_id(self, task_id: str) -> Optional[Task]:
         """Return task by id (for edit dialog)."""
+        self.flush()
         try:
             return self._task_service.get_by_id(task_id)
         except DatabaseError as e:
@@ -167,21 +297,11 @@ class TaskPresenter:
             return None
 
     def get_upcoming_tasks(self, limit: int = 10) -> List[Task]:
-        """Return upcoming tasks (next 7 days) for home dashboard."""
+        """Return the `limit` most urgent open tasks (from the ranking engine's heap)."""
+        self.flush()
         user = self.get_user()
-        today = date.today()
-        to_date = today + timedelta(days=7)
         try:
-            from_dt = datetime(today.year, today.month, today.day)
-            to_dt = datetime(to_date.year, to_date.month, to_date.day, 23, 59, 59)
-            tasks = self._task_service.get_tasks_for_user(
-                user_id=user.user_id,
-                from_date=from_dt,
-                to_date=to_dt,
-                include_completed=False,
-                search_query=None,
-            )
-            return tasks[:limit]
+            return self._ranking.top_tasks(user.user_id, limit)
         except DatabaseError as e:
             if self._on_error:
                 self._on_error(str(e))
@@ -189,6 +309,7 @@ class TaskPresenter:
 
     def get_completion_rate_today(self) -> int:
         """Return completion rate for today (0-100). Tasks due today: completed/total."""
+        self.flush()
         user = self.get_user()
         today = date.today()
         try:
@@ -211,6 +332,72 @@ class TaskPresenter:
                 self._on_error(str(e))
             return 0
 
+    def get_trend(self, days: int = 7) -> List[DailySummary]:
+        """
+        Return daily activity for the last `days` days, oldest first (read from the
+        daily_summary table: at most `days` rows). Periods over 90 days are summed per week.
+        """
+        self.flush()
+        user = self.get_user()
+        try:
+            return self._history_service.get_trend(user.user_id, days, bucket_days=7 if days > 90 else 1)
+        except DatabaseError as e:
+            if self._on_error:
+                self._on_error(str(e))
+            return []
+
+    def schedule_warning(
+        self,
+        due: Optional[datetime],
+        duration_minutes: int,
+        task_id: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Return a warning if the slot double-books open tasks or overloads its day, else None.
+
+        Args:
+            task_id: The task being edited (its own slot is ignored).
+        """
+        if self._schedule is None or due is None:
+            return None
+        self.flush()
+        user = self.get_user()
+        try:
+            check = self._schedule.check(user.user_id, due, duration_minutes, exclude_task_id=task_id)
+        except DatabaseError as e:
+            if self._on_error:
+                self._on_error(str(e))
+            return None
+        lines = []
+        if check.conflicts:
+            titles = []
+            for slot in check.conflicts[:3]:
+                task = self._task_service.get_by_id(slot.task_id)
+                titles.append(f"{task.title if task else slot.task_id} ({slot.start:%H:%M}-{slot.end:%H:%M})")
+            more = f" and {len(check.conflicts) - 3} more" if len(check.conflicts) > 3 else ""
+            lines.append("Overlaps " + ", ".join(titles) + more + ".")
+        if check.overloaded:
+            planned = (check.day_minutes + check.minutes) / 60
+            lines.append(f"{due:%a %d %b} would have {planned:.1f} h planned (capacity {check.capacity / 60:.0f} h).")
+        return " ".join(lines) or None
+
+    def auto_schedule(self, days: int = 14) -> Tuple[int, int]:
+        """
+        Place the user's unscheduled tasks into free time over the next days.
+
+        Returns:
+            (tasks scheduled, tasks that did not fit).
+        """
+        self.flush()
+        user = self.get_user()
+        try:
+            plan = self._auto_scheduler.plan(user, days=days)
+            return self._auto_scheduler.apply(plan), len(plan.unplaced)
+        except DatabaseError as e:
+            if self._on_error:
+                self._on_error(str(e))
+            return 0, 0
+
     def get_active_streaks(self) -> int:
         """Return total active streaks (sum of current_streak for active goals)."""
         user = self.get_user()
@@ -0,0 +1,268 @@
+"""
+UI refresh profiler and event-loop lag monitor.
+
+Off by default. Set ``TASKS_UI_PROFILE`` before starting the app:
+    log      record refreshes and loop lag; write a JSON summary on exit
+             (to ``TASKS_UI_PROFILE_LOG`` or stderr)
+    overlay  same, plus a live readout in the corner of the main window
+
+Views mark their refresh methods with ``@profile_refresh("screen.method")``; a
+disabled profiler adds one attribute check per call.
+"""
+
+import atexit
+import functools
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, TypeVar
+
+PROFILE_ENV = "TASKS_UI_PROFILE"
+PROFILE_LOG_ENV = "TASKS_UI_PROFILE_LOG"
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def count_widgets(widget: Any) -> int:
+    """Number of Tk widgets in the tree rooted at widget (including itself)."""
+    count = 0
+    stack = [widget]
+    while stack:
+        w = stack.pop()
+        count += 1
+        stack.extend(w.winfo_children())
+    return count
+
+
+def _p95(values: List[float]) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))] if ordered else 0.0
+
+
+@dataclass
+class RefreshSample:
+    """One profiled refresh."""
+
+    name: str
+    wall_ms: float
+    widgets: Optional[int] = None
+    widget_delta: Optional[int] = None
+    settle_ms: Optional[float] = None  # until Tk was idle again (layout + redraw)
+    at: str = field(default_factory=lambda: datetime.now().isoformat(timespec="milliseconds"))
+
+
+class UIProfiler:
+    """Collects refresh samples and event-loop lag; produces summaries."""
+
+    def __init__(self, enabled: bool = False, max_samples: int = 500) -> None:
+        self.enabled = enabled
+        self._samples: Deque[RefreshSample] = deque(maxlen=max_samples)
+        self._by_name: Dict[str, Deque[float]] = {}
+        self._counts: Dict[str, int] = {}
+        self._lag: Deque[float] = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+
+    def add(self, sample: RefreshSample) -> None:
+        with self._lock:
+            self._samples.append(sample)
+            self._by_name.setdefault(sample.name, deque(maxlen=self._samples.maxlen)).append(sample.wall_ms)
+            self._counts[sample.name] = self._counts.get(sample.name, 0) + 1
+
+    def add_lag(self, lag_ms: float) -> None:
+        with self._lock:
+            self._lag.append(lag_ms)
+
+    def last(self, n: int = 5) -> List[RefreshSample]:
+        """Most recent n samples, newest first."""
+        with self._lock:
+            return list(self._samples)[-n:][::-1]
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-refresh count/median/p95/max wall time, loop lag stats and recent samples."""
+        with self._lock:
+            refreshes = {
+                name: {
+                    "count": self._counts[name],
+                    "median_ms": round(statistics.median(walls), 2),
+                    "p95_ms": round(_p95(list(walls)), 2),
+                    "max_ms": round(max(walls), 2),
+                }
+                for name, walls in self._by_name.items()
+            }
+            lag = list(self._lag)
+            return {
+                "refreshes": refreshes,
+                "loop_lag": {
+                    "samples": len(lag),
+                    "median_ms": round(statistics.median(lag), 2) if lag else 0.0,
+                    "p95_ms": round(_p95(lag), 2),
+                    "max_ms": round(max(lag), 2) if lag else 0.0,
+                },
+                "recent": [s.__dict__ for s in list(self._samples)[-50:]],
+            }
+
+    def dump(self, path: Optional[str] = None) -> None:
+        """Write summary() as JSON to path (stderr if None)."""
+        text = json.dumps(self.summary(), indent=2)
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+        else:
+            print(text, file=sys.stderr)
+
+    @contextmanager
+    def measure(self, name: str, widget: Any = None) -> Iterator[None]:
+        """Time the block as refresh name; count widgets under widget (if given)."""
+        if not self.enabled:
+            yield
+            return
+        before = count_widgets(widget) if widget is not None else None
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall_ms = (time.perf_counter() - start) * 1000
+            after = count_widgets(widget) if widget is not None else None
+            sample = RefreshSample(
+                name=name,
+                wall_ms=wall_ms,
+                widgets=after,
+                widget_delta=after - before if after is not None and before is not None else None,
+            )
+            self.add(sample)
+            after_idle = getattr(widget, "after_idle", None)
+            if after_idle is not None:
+                # Geometry and redraw happen when Tk is next idle; attribute them too.
+                def settled() -> None:
+                    sample.settle_ms = (time.perf_counter() - start) * 1000
+
+                try:
+                    after_idle(settled)
+                except Exception:
+                    pass
+
+
+_profiler: Optional[UIProfiler] = None
+
+
+def get_profiler() -> UIProfiler:
+    """Return singleton UIProfiler (enabled when TASKS_UI_PROFILE is set)."""
+    global _profiler
+    if _profiler is None:
+        _profiler = UIProfiler(enabled=bool(os.environ.get(PROFILE_ENV, "").strip()))
+    return _profiler
+
+
+def profile_refresh(name: str) -> Callable[[F], F]:
+    """
+    Decorator for view methods that rebuild widgets: records wall time, widget
+    count of the view (self) and time until Tk is idle again.
+    """
+
+    def decorate(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            profiler = get_profiler()
+            if not profiler.enabled:
+                return func(self, *args, **kwargs)
+            with profiler.measure(name, self):
+                return func(self, *args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+class EventLoopLagMonitor:
+    """
+    Measures how late ``after(interval)`` callbacks fire. Lag is the drift past
+    the requested interval, i.e. how long the loop was blocked by other work.
+    """
+
+    def __init__(self, root: Any, profiler: UIProfiler, interval_ms: int = 100) -> None:
+        self._root = root
+        self._profiler = profiler
+        self._interval_ms = interval_ms
+        self._expected = 0.0
+        self._after_id: Optional[str] = None
+
+    def start(self) -> None:
+        self._schedule()
+
+    def stop(self) -> None:
+        if self._after_id is not None:
+            try:
+                self._root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def _schedule(self) -> None:
+        self._expected = time.perf_counter() + self._interval_ms / 1000
+        self._after_id = self._root.after(self._interval_ms, self._tick)
+
+    def _tick(self) -> None:
+        lag_ms = max(0.0, (time.perf_counter() - self._expected) * 1000)
+        self._profiler.add_lag(lag_ms)
+        self._schedule()
+
+
+class ProfilerOverlay:
+    """Small always-on-top readout of recent refreshes and loop lag, placed over the root window."""
+
+    def __init__(self, root: Any, profiler: UIProfiler, update_ms: int = 1000) -> None:
+        import customtkinter as ctk
+        from ui.theme import FONT_SMALL
+
+        self._root = root
+        self._profiler = profiler
+        self._update_ms = update_ms
+        self._label = ctk.CTkLabel(
+            root,
+            text="",
+            font=(FONT_SMALL[0], 11),
+            text_color="#E0E0E0",
+            fg_color="#000000",
+            justify="left",
+            anchor="w",
+            corner_radius=4,
+        )
+        self._label.place(relx=1.0, rely=0.0, x=-8, y=8, anchor="ne")
+        self._update()
+
+    def _update(self) -> None:
+        summary = self._profiler.summary()
+        lag = summary["loop_lag"]
+        lines = [f"loop lag p95 {lag['p95_ms']:.0f} ms  max {lag['max_ms']:.0f} ms"]
+        for s in self._profiler.last(4):
+            widgets = f"  {s.widgets} w" if s.widgets is not None else ""
+            settle = f" / {s.settle_ms:.0f}" if s.settle_ms is not None else ""
+            lines.append(f"{s.name}: {s.wall_ms:.0f}{settle} ms{widgets}")
+        self._label.configure(text="\n".join(lines))
+        self._label.lift()
+        self._root.after(self._update_ms, self._update)
+
+
+def install(root: Any) -> Optional[UIProfiler]:
+    """
+    Start lag monitoring (and the overlay / exit dump) on root when profiling is enabled.
+
+    Returns:
+        The active profiler, or None when TASKS_UI_PROFILE is not set.
+    """
+    mode = os.environ.get(PROFILE_ENV, "").strip().lower()
+    profiler = get_profiler()
+    if not mode or not profiler.enabled:
+        return None
+    EventLoopLagMonitor(root, profiler).start()
+    if mode == "overlay":
+        ProfilerOverlay(root, profiler)
+    atexit.register(profiler.dump, os.environ.get(PROFILE_LOG_ENV) or None)
+    return profiler
@@ -1,15 +1,25 @@
-"""App screens: Home, Goals, Tasks, Calendar, Settings."""
-
-from ui.screens.home_dashboard import HomeDashboardView
-from ui.screens.goals_view import GoalsView
-from ui.screens.tasks_view import TasksView
-from ui.screens.calendar_view import CalendarView
-from ui.screens.settings_view import SettingsView
-
-__all__ = [
-    "HomeDashboardView",
-    "GoalsView",
-    "TasksView",
-    "CalendarView",
-    "SettingsView",
-]
+"""App screens: Home, Goals, Tasks, Calendar, Settings (resolved lazily, PEP 562)."""
+
+from typing import TYPE_CHECKING
+
+from lazy_exports import lazy_exports
+
+if TYPE_CHECKING:
+    from ui.screens.home_dashboard import HomeDashboardView
+    from ui.screens.goals_view import GoalsView
+    from ui.screens.tasks_view import TasksView
+    from ui.screens.calendar_view import CalendarView
+    from ui.screens.settings_view import SettingsView
+
+# Public name -> defining submodule
+_LAZY_ATTRS = {
+    "HomeDashboardView": "ui.screens.home_dashboard",
+    "GoalsView": "ui.screens.goals_view",
+    "TasksView": "ui.screens.tasks_view",
+    "CalendarView": "ui.screens.calendar_view",
+    "SettingsView": "ui.screens.settings_view",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_ATTRS)
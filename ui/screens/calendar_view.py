@@ -2,7 +2,7 @@
 
 import calendar as cal_module
 from datetime import date, datetime, timedelta
-from typing import Callable, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 import customtkinter as ctk
 
@@ -11,8 +11,6 @@ from ui.theme import (
     BG_CARD,
     BG_SIDEBAR,
     TEXT_PRIMARY,
-    TEXT_MUTED,
-    ACCENT_MINT_LIGHT,
     ACCENT_PURPLE_CAL,
     ACCENT_TEAL,
     ACCENT_BLUE,
@@ -22,6 +20,8 @@ from ui.theme import (
     FONT_SMALL,
     FONT_CAPTION,
 )
+from ui.profiling import profile_refresh
+from ui.components import MonthCanvas
 from models import Task
 
 
@@ -31,12 +31,11 @@ EVENT_COLORS = [ACCENT_PURPLE_CAL, ACCENT_TEAL, ACCENT_BLUE, ACCENT_PINK, "#FFA5
 
 class CalendarView(ctk.CTkFrame):
     """
-    Split view: left = month grid (7 columns), right = event list for selected day.
+    Split view: left = month grid (7 columns, one canvas), right = event list for selected day.
     Background #121D2D. On day click: highlight border #B7E4C7, filter sidebar to that day.
+    The month's tasks are fetched once per month change or task change.
     """
 
-    DAYS_HEADER = ["MONDAY", "TUESDAY", "WEDNESDAY", "THURSDAY", "FRIDAY", "SATURDAY", "SUNDAY"]
-
     def __init__(
         self,
         master: ctk.CTk,
@@ -49,6 +48,7 @@ class CalendarView(ctk.CTkFrame):
         self._on_task_click = on_task_click
         self._current = date.today()
         self._selected_day: Optional[date] = None
+        self._month_tasks: List[Task] = []
         self._build_ui()
 
     def _build_ui(self) -> None:
@@ -83,27 +83,21 @@ class CalendarView(ctk.CTkFrame):
             command=lambda: None,
         )
         pill.grid(row=0, column=1)
-        # Days of week header
-        header_row = ctk.CTkFrame(left, fg_color="transparent")
-        header_row.grid(row=1, column=0, sticky="ew", pady=(0, 4))
-        for c, day in enumerate(self.DAYS_HEADER):
-            cell = ctk.CTkLabel(
-                header_row,
-                text=day[:3],
-                font=FONT_CAPTION,
-                text_color=TEXT_MUTED,
-            )
-            cell.grid(row=0, column=c, padx=2, pady=2, sticky="ew")
-            header_row.columnconfigure(c, weight=1)
-        # Grid 7 x 6
-        self._grid_frame = ctk.CTkFrame(left, fg_color="transparent")
-        self._grid_frame.grid(row=2, column=0, sticky="nsew", pady=(0, 8))
-        left.rowconfigure(2, weight=1)
-        for c in range(7):
-            self._grid_frame.columnconfigure(c, weight=1)
-        for r in range(6):
-            self._grid_frame.rowconfigure(r, weight=1)
-        self._day_cells: list = []
+        for col, (text, step) in enumerate((("‹", -1), ("›", 1)), start=2):
+            ctk.CTkButton(
+                top,
+                text=text,
+                font=FONT_HEADING,
+                fg_color="transparent",
+                hover_color=BG_CARD,
+                text_color=TEXT_PRIMARY,
+                width=36,
+                command=lambda s=step: self._shift_month(s),
+            ).grid(row=0, column=col, padx=(8 if col == 2 else 0, 0))
+        # Month grid: one canvas, redrawn per damaged cell
+        self._month_canvas = MonthCanvas(left, on_day_click=self._on_day_click)
+        self._month_canvas.grid(row=1, column=0, sticky="nsew", pady=(0, 8))
+        left.rowconfigure(1, weight=1)
         self._fill_grid()
 
         # Right: event sidebar
@@ -119,54 +113,36 @@ class CalendarView(ctk.CTkFrame):
         self._events_list = ctk.CTkScrollableFrame(right, fg_color="transparent")
         self._events_list.pack(fill="both", expand=True, padx=8, pady=8)
 
+    @profile_refresh("calendar.fill_grid")
     def _fill_grid(self) -> None:
-        for w in self._grid_frame.winfo_children():
-            w.destroy()
-        self._day_cells.clear()
         year, month = self._current.year, self._current.month
         self._title_label.configure(text=f"{cal_module.month_name[month]} {year}")
-        cal = cal_module.Calendar(firstweekday=0)  # Monday
-        weeks = cal.monthdayscalendar(year, month)
-        # Pad to 6 rows
-        while len(weeks) < 6:
-            weeks.append([0] * 7)
-        for r, week in enumerate(weeks[:6]):
-            for c, day in enumerate(week):
-                cell = ctk.CTkFrame(
-                    self._grid_frame,
-                    fg_color=BG_CARD,
-                    corner_radius=4,
-                    border_width=0,
-                )
-                cell.grid(row=r, column=c, padx=2, pady=2, sticky="nsew")
-                if day == 0:
-                    lbl = ctk.CTkLabel(cell, text="", font=FONT_SMALL, text_color=TEXT_MUTED)
-                else:
-                    d = date(year, month, day)
-                    is_selected = self._selected_day == d
-                    lbl = ctk.CTkLabel(
-                        cell,
-                        text=str(day),
-                        font=FONT_SMALL,
-                        text_color=TEXT_PRIMARY if d.month == month else TEXT_MUTED,
-                    )
-                    if is_selected:
-                        cell.configure(border_width=2, border_color=ACCENT_MINT_LIGHT)
-                    cell.bind("<Button-1>", lambda e, dt=d: self._on_day_click(dt))
-                    lbl.bind("<Button-1>", lambda e, dt=d: self._on_day_click(dt))
-                lbl.pack(expand=True)
-                self._day_cells.append((cell, day, (year, month, day) if day else None))
+        counts: Dict[int, Tuple[int, int]] = {}
+        for task in self._month_tasks:
+            due = task.due_date_time
+            if due is None or (due.year, due.month) != (year, month):
+                continue
+            open_tasks, done_tasks = counts.get(due.day, (0, 0))
+            counts[due.day] = (open_tasks, done_tasks + 1) if task.is_completed else (open_tasks + 1, done_tasks)
+        self._month_canvas.set_month(year, month, counts, self._selected_day)
+
+    def _load_month(self) -> None:
+        """Fetch the displayed month's tasks once; day clicks filter this list."""
+        self._month_tasks = self._get_tasks(self._current.year, self._current.month)
+
+    def _shift_month(self, step: int) -> None:
+        index = self._current.year * 12 + self._current.month - 1 + step
+        self.set_month(index // 12, index % 12 + 1)
 
     def _on_day_click(self, d: date) -> None:
         self._selected_day = d
-        self._fill_grid()
+        self._month_canvas.select(d)
         self._refresh_events()
 
     def _refresh_events(self) -> None:
         for w in self._events_list.winfo_children():
             w.destroy()
-        year, month = self._current.year, self._current.month
-        tasks = self._get_tasks(year, month)
+        tasks = list(self._month_tasks)
         if self._selected_day:
             tasks = [t for t in tasks if t.due_date_time and t.due_date_time.date() == self._selected_day]
         tasks.sort(key=lambda t: (t.due_date_time or datetime.max))
@@ -216,10 +192,16 @@ class CalendarView(ctk.CTkFrame):
 
     def set_month(self, year: int, month: int) -> None:
         self._current = date(year, month, 1)
+        self._load_month()
         self._fill_grid()
         self._refresh_events()
 
+    def get_month(self) -> Tuple[int, int]:
+        """Return (year, month) currently displayed."""
+        return self._current.year, self._current.month
+
     def refresh_events(self) -> None:
-        """Call when tasks change (e.g. after create/update)."""
+        """Call when tasks change (e.g. after create/update); only cells whose counts changed are redrawn."""
+        self._load_month()
         self._fill_grid()
         self._refresh_events()
@@ -1,6 +1,6 @@
 """Goals Page: banner, Active/Archived tab, list, empty state, FAB (Phase 2 spec)."""
 
-from typing import Callable, List, Optional
+from typing import Callable, Dict, List, Optional
 
 import customtkinter as ctk
 
@@ -16,7 +16,8 @@ from ui.theme import (
     FONT_BODY,
     FONT_SMALL,
 )
-from models import Goal
+from ui.profiling import profile_refresh
+from models import Goal, GoalProgress
 
 
 class GoalsView(ctk.CTkFrame):
@@ -163,8 +164,14 @@ class GoalsView(ctk.CTkFrame):
         self._btn_active.configure(text=f"Active ({active_count})")
         self._btn_archived.configure(text=f"Archived ({archived_count})")
 
-    def show_goals(self, goals: List[Goal], active: bool) -> None:
-        """Show goal list or empty state."""
+    @profile_refresh("goals.show_goals")
+    def show_goals(
+        self,
+        goals: List[Goal],
+        active: bool,
+        progress: Optional[Dict[str, GoalProgress]] = None,
+    ) -> None:
+        """Show goal list or empty state; progress (by goal id) adds a completion bar per goal."""
         for w in self._content.winfo_children():
             w.destroy()
         if not goals:
@@ -199,3 +206,22 @@ class GoalsView(ctk.CTkFrame):
                 color_dot.pack(side="left", padx=(0, 12))
                 ctk.CTkLabel(row, text=goal.title, font=FONT_BODY, text_color=TEXT_PRIMARY, anchor="w").pack(side="left", fill="x", expand=True)
                 ctk.CTkLabel(row, text=f"Streak: {goal.current_streak}", font=FONT_SMALL, text_color=TEXT_MUTED).pack(side="right")
+                counters = progress.get(goal.goal_id) if progress else None
+                if counters is not None and counters.scheduled:
+                    bar_row = ctk.CTkFrame(card, fg_color="transparent")
+                    bar_row.pack(fill="x", padx=16, pady=(0, 12))
+                    bar = ctk.CTkProgressBar(
+                        bar_row,
+                        height=6,
+                        progress_color=goal.color_hex or "#4CAF50",
+                        corner_radius=3,
+                    )
+                    bar.set(counters.completion_rate)
+                    bar.pack(side="left", fill="x", expand=True)
+                    hours = counters.total_minutes / 60
+                    ctk.CTkLabel(
+                        bar_row,
+                        text=f"{counters.completed}/{counters.scheduled} tasks · {hours:.1f} h",
+                        font=FONT_SMALL,
+                        text_color=TEXT_MUTED,
+                    ).pack(side="right", padx=(12, 0))
@@ -1,7 +1,7 @@
-"""Home Dashboard: greeting, KPI cards, upcoming tasks, quick actions (Phase 2 spec)."""
+"""Home Dashboard: greeting, KPI cards, activity trend, upcoming tasks, quick actions (Phase 2 spec)."""
 
 from datetime import datetime
-from typing import Callable, List, Optional
+from typing import Callable, Dict, List, Optional
 
 import customtkinter as ctk
 
@@ -22,13 +22,18 @@ from ui.theme import (
     FONT_SMALL,
     FONT_FAMILY,
 )
-from models import Task
+from ui.profiling import profile_refresh
+from models import DailySummary, Task
+
+# Trend period selector label -> days
+TREND_PERIODS: Dict[str, int] = {"7d": 7, "30d": 30, "1y": 365}
 
 
 class HomeDashboardView(ctk.CTkScrollableFrame):
     """
     Home screen: header (date + greeting), two KPI cards (completion rate, streaks),
-    upcoming tasks list, quick actions (New Task, New Goal).
+    activity trend (completed tasks per day, or per week for a year), upcoming
+    tasks list, quick actions (New Task, New Goal).
     """
 
     def __init__(
@@ -37,12 +42,16 @@ class HomeDashboardView(ctk.CTkScrollableFrame):
         on_new_task: Optional[Callable[[], None]] = None,
         on_new_goal: Optional[Callable[[], None]] = None,
         on_view_all_tasks: Optional[Callable[[], None]] = None,
+        on_trend_period: Optional[Callable[[int], None]] = None,
         **kwargs,
     ) -> None:
         super().__init__(master, fg_color=BG_DARK, **kwargs)
         self._on_new_task = on_new_task
         self._on_new_goal = on_new_goal
         self._on_view_all = on_view_all_tasks
+        self._on_trend_period = on_trend_period
+        self.trend_days = TREND_PERIODS["7d"]
+        self._trend: List[DailySummary] = []
         self._build_ui()
 
     def _build_ui(self) -> None:
@@ -90,6 +99,32 @@ class HomeDashboardView(ctk.CTkScrollableFrame):
             col=1,
         )
 
+        # Activity trend: completed tasks per day (per week for 1y) from daily_summary
+        trend_frame = ctk.CTkFrame(self, fg_color=BG_CARD, corner_radius=CORNER_RADIUS)
+        trend_frame.pack(fill="x", padx=16, pady=(4, 0))
+        trend_header = ctk.CTkFrame(trend_frame, fg_color="transparent")
+        trend_header.pack(fill="x", padx=12, pady=(10, 0))
+        ctk.CTkLabel(
+            trend_header,
+            text="📈  Activity",
+            font=FONT_HEADING,
+            text_color=TEXT_PRIMARY,
+        ).pack(side="left")
+        period = ctk.CTkSegmentedButton(
+            trend_header,
+            values=list(TREND_PERIODS),
+            font=FONT_SMALL,
+            selected_color=ACCENT_MINT,
+            command=self._select_trend_period,
+        )
+        period.set("7d")
+        period.pack(side="right")
+        self._trend_canvas = ctk.CTkCanvas(trend_frame, height=90, bg=BG_CARD, highlightthickness=0)
+        self._trend_canvas.pack(fill="x", padx=12, pady=(8, 0))
+        self._trend_canvas.bind("<Configure>", lambda _e: self._draw_trend())
+        self._trend_caption = ctk.CTkLabel(trend_frame, text="", font=FONT_SMALL, text_color=TEXT_MUTED)
+        self._trend_caption.pack(anchor="w", padx=12, pady=(2, 8))
+
         # Upcoming Tasks section
         upcoming_frame = ctk.CTkFrame(self, fg_color="transparent")
         upcoming_frame.pack(fill="x", padx=16, pady=16)
@@ -246,14 +281,48 @@ class HomeDashboardView(ctk.CTkScrollableFrame):
                     anchor="w",
                 ).pack(fill="x", pady=2)
 
+    def _select_trend_period(self, label: str) -> None:
+        self.trend_days = TREND_PERIODS[label]
+        if self._on_trend_period:
+            self._on_trend_period(self.trend_days)
+
+    def set_trend(self, trend: List[DailySummary]) -> None:
+        """Show activity buckets (oldest first) as bars of completed tasks."""
+        self._trend = trend
+        self._draw_trend()
+        completed = sum(b.completed for b in trend)
+        created = sum(b.created for b in trend)
+        hours = sum(b.minutes_done for b in trend) / 60
+        self._trend_caption.configure(text=f"{completed} completed · {created} created · {hours:.1f} h done")
+
+    def _draw_trend(self) -> None:
+        canvas = self._trend_canvas
+        canvas.delete("all")
+        width = canvas.winfo_width()
+        height = int(canvas.cget("height"))
+        if not self._trend or width <= 1:
+            return
+        peak = max(max(b.completed for b in self._trend), 1)
+        step = width / len(self._trend)
+        gap = 1 if step < 6 else 2
+        for i, bucket in enumerate(self._trend):
+            x0 = i * step + gap
+            x1 = max(x0 + 1, (i + 1) * step - gap)
+            bar = (height - 4) * bucket.completed / peak
+            canvas.create_rectangle(x0, height - 2, x1, height - 2 - max(bar, 1), fill=ACCENT_MINT if bucket.completed else TEXT_MUTED, width=0)
+
+    @profile_refresh("home.refresh")
     def refresh(
         self,
         user_name: str,
         completion_pct: int,
         active_streaks: int,
         upcoming_tasks: List[Task],
+        trend: Optional[List[DailySummary]] = None,
     ) -> None:
         self.set_user_name(user_name)
         self.set_completion_rate(completion_pct)
         self.set_active_streaks(active_streaks)
         self.set_upcoming_tasks(upcoming_tasks)
+        if trend is not None:
+            self.set_trend(trend)
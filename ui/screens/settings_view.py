@@ -1,4 +1,4 @@
-"""Settings page: profile, toggles (Notifications, Student Mode, dark/light), Danger Zone."""
+"""Settings page: profile, toggles (Notifications, Student Mode, dark/light), Backups, Danger Zone."""
 
 from typing import Callable, Optional
 
@@ -22,7 +22,7 @@ from ui.theme import (
 class SettingsView(ctk.CTkScrollableFrame):
     """
     Settings: header "Settings", profile (avatar, name, subtext), App Settings toggles,
-    Notification Types list, Danger Zone (Delete All Data), footer version.
+    Notification Types list, Backups (back up now, restore), Danger Zone (Delete All Data), footer version.
     """
 
     def __init__(
@@ -33,6 +33,9 @@ class SettingsView(ctk.CTkScrollableFrame):
         on_student_mode_toggle: Optional[Callable[[bool], None]] = None,
         on_dark_mode_toggle: Optional[Callable[[bool], None]] = None,
         on_delete_all: Optional[Callable[[], None]] = None,
+        on_export_stats: Optional[Callable[[], None]] = None,
+        on_backup_now: Optional[Callable[[], None]] = None,
+        on_restore: Optional[Callable[[], None]] = None,
         **kwargs,
     ) -> None:
         super().__init__(master, fg_color=BG_DARK, **kwargs)
@@ -41,6 +44,10 @@ class SettingsView(ctk.CTkScrollableFrame):
         self._on_student = on_student_mode_toggle
         self._on_dark = on_dark_mode_toggle
         self._on_delete_all = on_delete_all
+        self._on_export_stats = on_export_stats
+        self._on_backup_now = on_backup_now
+        self._on_restore = on_restore
+        self._backup_label: Optional[ctk.CTkLabel] = None
         self._build_ui()
 
     def _build_ui(self) -> None:
@@ -157,6 +164,60 @@ class SettingsView(ctk.CTkScrollableFrame):
         ctk.CTkLabel(sub, text="🔔 In-app", font=FONT_SMALL, text_color=TEXT_PRIMARY).pack(side="left")
         ctk.CTkLabel(sub, text="Enabled", font=FONT_SMALL, text_color="#FF9F1C").pack(side="right")
 
+        # Diagnostics
+        if self._on_export_stats:
+            diag = ctk.CTkFrame(self, fg_color="transparent")
+            diag.pack(fill="x", padx=16, pady=8)
+            ctk.CTkLabel(
+                diag,
+                text="Diagnostics",
+                font=FONT_BODY,
+                text_color=TEXT_SECONDARY,
+            ).pack(anchor="w", pady=(0, 8))
+            ctk.CTkButton(
+                diag,
+                text="Export database stats",
+                font=FONT_SMALL,
+                fg_color=BG_CARD,
+                hover_color=BG_DARK,
+                text_color=TEXT_PRIMARY,
+                corner_radius=CORNER_RADIUS,
+                command=self._on_export_stats,
+            ).pack(anchor="w")
+
+        # Backups
+        if self._on_backup_now or self._on_restore:
+            backups = ctk.CTkFrame(self, fg_color="transparent")
+            backups.pack(fill="x", padx=16, pady=8)
+            ctk.CTkLabel(
+                backups,
+                text="Backups",
+                font=FONT_BODY,
+                text_color=TEXT_SECONDARY,
+            ).pack(anchor="w", pady=(0, 8))
+            self._backup_label = ctk.CTkLabel(
+                backups,
+                text="No backups yet",
+                font=FONT_SMALL,
+                text_color=TEXT_MUTED,
+                anchor="w",
+            )
+            self._backup_label.pack(anchor="w", pady=(0, 8))
+            backup_row = ctk.CTkFrame(backups, fg_color="transparent")
+            backup_row.pack(fill="x")
+            for text, command in (("Back up now", self._on_backup_now), ("Restore…", self._on_restore)):
+                if command:
+                    ctk.CTkButton(
+                        backup_row,
+                        text=text,
+                        font=FONT_SMALL,
+                        fg_color=BG_CARD,
+                        hover_color=BG_DARK,
+                        text_color=TEXT_PRIMARY,
+                        corner_radius=CORNER_RADIUS,
+                        command=command,
+                    ).pack(side="left", padx=(0, 8))
+
         # Danger Zone
         danger = ctk.CTkFrame(self, fg_color="transparent")
         danger.pack(fill="x", padx=16, pady=16)
@@ -216,6 +277,10 @@ class SettingsView(ctk.CTkScrollableFrame):
         else:
             self._student_switch.deselect()
 
+    def set_backup_status(self, text: str) -> None:
+        if self._backup_label is not None:
+            self._backup_label.configure(text=text)
+
     def set_dark_mode(self, enabled: bool) -> None:
         if enabled:
             self._dark_switch.select()
@@ -1,7 +1,7 @@
-"""Tasks screen: date strip, time grid, task cards, FAB (Phase 2 spec)."""
+"""Tasks screen: date strip, timeline of the day's tasks, selected task card, FAB (Phase 2 spec)."""
 
 from datetime import date, timedelta
-from typing import Callable, List, Optional
+from typing import Callable, Dict, List, Optional
 
 import customtkinter as ctk
 
@@ -12,19 +12,20 @@ from ui.theme import (
     TEXT_MUTED,
     ACCENT_MINT_LIGHT,
     CORNER_RADIUS,
-    TIMELINE_LABEL_WIDTH,
     FONT_HEADING,
     FONT_BODY,
     FONT_SMALL,
 )
-from ui.components import TaskCard
-from ui.task_dialog import TaskDialog
+from ui.profiling import profile_refresh
+from ui.components import SearchBar, TaskCard, TimelineCanvas
 from models import Task
+from services.events import ChangeEvent, ChangeKind
 
 
 class TasksView(ctk.CTkFrame):
     """
-    Tasks screen: date strip (horizontal days), time grid on left, task cards on right, FAB.
+    Tasks screen: date strip (horizontal days), timeline canvas with the day's tasks
+    placed by time (overlaps side by side), card of the selected task, FAB.
     Connects to TaskPresenter for load/complete/edit/delete/create.
     """
 
@@ -42,6 +43,9 @@ class TasksView(ctk.CTkFrame):
         self._get_presenter = get_presenter
         self._selected_date = date.today()
         self._day_buttons: list = []
+        self._tasks: Dict[str, Task] = {}
+        self._selected_id: Optional[str] = None
+        self._card: Optional[TaskCard] = None
         self._build_ui()
 
     def _build_ui(self) -> None:
@@ -65,34 +69,38 @@ class TasksView(ctk.CTkFrame):
             font=FONT_HEADING,
             text_color=TEXT_PRIMARY,
         ).pack(side="left")
+        ctk.CTkButton(
+            header,
+            text="Auto-schedule",
+            width=120,
+            height=32,
+            fg_color=BG_CARD,
+            hover_color=TEXT_MUTED,
+            text_color=TEXT_PRIMARY,
+            font=FONT_SMALL,
+            command=self._auto_schedule,
+        ).pack(side="right")
+        self._schedule_status = ctk.CTkLabel(header, text="", font=FONT_SMALL, text_color=TEXT_MUTED)
+        self._schedule_status.pack(side="right", padx=8)
+        # Live search (debounced; narrows the previous results while typing)
+        self._search_bar = SearchBar(self, on_search=self._on_search)
+        self._search_bar.pack(fill="x", padx=16, pady=(12, 0))
         # Date strip: horizontal day pills
         strip = ctk.CTkScrollableFrame(self, fg_color="transparent", orientation="horizontal")
         strip.pack(fill="x", padx=16, pady=(12, 8))
         self._days_frame = strip
         self._rebuild_days()
 
-        # Content: time labels + scrollable task list
-        content = ctk.CTkFrame(self, fg_color="transparent")
-        content.pack(fill="both", expand=True, padx=16, pady=8)
-        left = ctk.CTkFrame(content, fg_color="transparent", width=TIMELINE_LABEL_WIDTH)
-        left.pack(side="left", fill="y", padx=(0, 8))
-        for hour in range(8, 23):
-            label = f"{hour:02d} am" if hour < 12 else f"{hour - 12:02d} pm"
-            if hour >= 12 and hour != 12:
-                label = f"{hour - 12:02d} pm"
-            ctk.CTkLabel(
-                left,
-                text=label,
-                font=FONT_SMALL,
-                text_color=TEXT_MUTED,
-            ).pack(anchor="w", pady=4)
-        self._task_list = ctk.CTkScrollableFrame(
-            content,
-            fg_color="transparent",
-            scrollbar_button_color=BG_CARD,
-            scrollbar_button_hover_color=TEXT_MUTED,
+        # Content: one canvas for the whole day (blocks placed by due time and
+        # duration) and, below it, the full card of the selected task
+        self._timeline = TimelineCanvas(
+            self,
+            on_select=self._select_task,
+            on_open=self._on_edit_task,
         )
-        self._task_list.pack(side="left", fill="both", expand=True)
+        self._timeline.pack(fill="both", expand=True, padx=16, pady=8)
+        self._detail = ctk.CTkFrame(self, fg_color="transparent")
+        self._detail.pack(fill="x", padx=16, pady=(0, 8))
 
         # FAB
         self._fab = ctk.CTkButton(
@@ -138,23 +146,111 @@ class TasksView(ctk.CTkFrame):
             if p and hasattr(p, "load_tasks"):
                 p.load_tasks(selected_date=d, search_query=p._last_search or "")
 
+    def _auto_schedule(self) -> None:
+        presenter = self._get_presenter() if self._get_presenter else None
+        if not presenter:
+            return
+        placed, unplaced = presenter.auto_schedule()
+        text = f"Scheduled {placed} task(s)"
+        if unplaced:
+            text += f", {unplaced} did not fit"
+        self._schedule_status.configure(text=text)
+
     def get_selected_date(self) -> date:
         return self._selected_date
 
+    def _on_search(self, query: str) -> None:
+        if self._get_presenter:
+            p = self._get_presenter()
+            if p and hasattr(p, "load_tasks"):
+                p.load_tasks(selected_date=self._selected_date, search_query=query)
+
+    def clear_search(self) -> None:
+        """Empty the search box without triggering a search."""
+        self._search_bar.set_query("")
+
+    @profile_refresh("tasks.show_tasks")
     def show_tasks(self, tasks: List[Task]) -> None:
-        for w in self._task_list.winfo_children():
-            w.destroy()
+        self._tasks = {task.task_id: task for task in tasks}
+        self._redraw()
+
+    def _redraw(self) -> None:
+        """Re-layout the timeline and refresh (or drop) the selected task's card."""
+        self._timeline.set_tasks(self._selected_date, self._tasks.values())
+        if self._selected_id not in self._tasks:
+            self._selected_id = None
+        self._timeline.select(self._selected_id)
+        self._show_card(self._tasks.get(self._selected_id) if self._selected_id else None)
+
+    def _select_task(self, task_id: str) -> None:
+        self._selected_id = task_id
+        self._show_card(self._tasks.get(task_id))
+
+    def _show_card(self, task: Optional[Task]) -> None:
+        if self._card is not None:
+            self._card.destroy()
+            self._card = None
+        if task is None:
+            return
         presenter = self._get_presenter() if self._get_presenter else None
-        for task in tasks:
-            card = TaskCard(
-                self._task_list,
-                task=task,
-                on_complete=presenter.complete_task if presenter else None,
-                on_edit=self._on_edit_task,
-                on_delete=presenter.delete_task if presenter else None,
-                on_menu=lambda tid: None,
+        self._card = TaskCard(
+            self._detail,
+            task=task,
+            on_complete=presenter.complete_task if presenter else None,
+            on_edit=self._on_edit_task,
+            on_delete=presenter.delete_task if presenter else None,
+            on_menu=lambda tid: None,
+        )
+        self._card.pack(fill="x", pady=4)
+
+    def apply_changes(self, events: List[ChangeEvent]) -> bool:
+        """
+        Patch the shown tasks for a batch of task changes and re-layout the day once.
+
+        Deleted tasks and tasks moved to another day are dropped; updated/completed
+        tasks (including time changes within the day) are replaced. Returns False
+        when the list must be reloaded instead (a task appears on the selected day,
+        or the active search may no longer match).
+        """
+        if not self.winfo_ismapped():
+            return True  # MainWindow reloads the list when the screen is shown
+        presenter = self._get_presenter() if self._get_presenter else None
+        searching = bool(presenter and (presenter._last_search or "").strip())
+        for ev in events:
+            task = ev.entity
+            on_day = (
+                task is not None
+                and task.due_date_time is not None
+                and task.due_date_time.date() == self._selected_date
+            )
+            if ev.kind == ChangeKind.TASK_DELETED:
+                continue
+            if ev.entity_id not in self._tasks:
+                if on_day:
+                    return False
+                continue
+            if searching and ev.changed_fields & {"title", "description"}:
+                return False
+        # Only patch once we know no full reload is needed
+        changed = False
+        for ev in events:
+            if ev.entity_id not in self._tasks:
+                continue
+            task = ev.entity
+            gone = (
+                ev.kind == ChangeKind.TASK_DELETED
+                or task is None
+                or task.due_date_time is None
+                or task.due_date_time.date() != self._selected_date
             )
-            card.pack(fill="x", pady=4)
+            if gone:
+                del self._tasks[ev.entity_id]
+            else:
+                self._tasks[ev.entity_id] = task
+            changed = True
+        if changed:
+            self._redraw()
+        return True
 
     def _on_edit_task(self, task_id: str) -> None:
         presenter = self._get_presenter() if self._get_presenter else None
@@ -163,6 +259,7 @@ class TasksView(ctk.CTkFrame):
         task = presenter.get_task_by_id(task_id)
         if not task:
             return
+        from ui.task_dialog import TaskDialog
 
         def save_edit(**kwargs) -> None:
             presenter.update_task(
@@ -174,5 +271,10 @@ class TasksView(ctk.CTkFrame):
                 priority=kwargs.get("priority"),
             )
 
-        dlg = TaskDialog(self.winfo_toplevel(), dialog_title="Edit Task", on_save=save_edit)
+        dlg = TaskDialog(
+            self.winfo_toplevel(),
+            dialog_title="Edit Task",
+            on_save=save_edit,
+            check_schedule=presenter.schedule_warning,
+        )
         dlg.set_task(task)
@@ -5,7 +5,7 @@ from typing import Any, Callable, Optional
 
 import customtkinter as ctk
 
-from ui.theme import BG_DARK, BG_INPUT, TEXT_PRIMARY, TEXT_SECONDARY, CORNER_RADIUS, FONT_BODY
+from ui.theme import ACCENT_RED, BG_DARK, BG_INPUT, TEXT_PRIMARY, TEXT_SECONDARY, CORNER_RADIUS, FONT_BODY, FONT_SMALL
 from models import Task
 from models.enums import Priority
 
@@ -15,14 +15,24 @@ class TaskDialog(ctk.CTkToplevel):
     Modal dialog to create or edit a task.
     On OK calls on_save(**kwargs). For create: title, description, due_date, duration_minutes, priority.
     For edit: task_id, title, description, due_date, duration_minutes, priority.
+    check_schedule(due, duration_minutes, task_id) may return a warning (double
+    booking, overloaded day); it is shown and a second Save confirms.
     """
 
-    def __init__(self, parent: ctk.CTk, dialog_title: str = "New Task", on_save: Optional[Callable[..., None]] = None):
+    def __init__(
+        self,
+        parent: ctk.CTk,
+        dialog_title: str = "New Task",
+        on_save: Optional[Callable[..., None]] = None,
+        check_schedule: Optional[Callable[[datetime, int, Optional[str]], Optional[str]]] = None,
+    ):
         super().__init__(parent)
         self._on_save = on_save
+        self._check_schedule = check_schedule
+        self._confirmed_slot: Optional[tuple] = None  # (due, duration) the user saved despite a warning
         self._task: Optional[Task] = None
         self.title(dialog_title)
-        self.geometry("420x380")
+        self.geometry("420x420")
         self.configure(fg_color=BG_DARK)
         self._build_ui()
         self.transient(parent)
@@ -94,6 +104,10 @@ class TaskDialog(ctk.CTkToplevel):
             button_hover_color=BG_INPUT,
         )
         self._priority_combo.pack(fill="x", pady=(4, 16))
+        self._warning_label = ctk.CTkLabel(
+            f, text="", font=FONT_SMALL, text_color=ACCENT_RED, wraplength=360, justify="left"
+        )
+        self._warning_label.pack(anchor="w")
         btn_row = ctk.CTkFrame(f, fg_color="transparent")
         btn_row.pack(fill="x")
         ctk.CTkButton(
@@ -103,7 +117,8 @@ class TaskDialog(ctk.CTkToplevel):
             hover_color=TEXT_SECONDARY,
             command=lambda: (self.withdraw(), self.after(200, self._safe_destroy)),
         ).pack(side="right", padx=8)
-        ctk.CTkButton(btn_row, text="Save →", command=self._save).pack(side="right")
+        self._save_button = ctk.CTkButton(btn_row, text="Save →", command=self._save)
+        self._save_button.pack(side="right")
 
     def set_task(self, task: Task) -> None:
         """Pre-fill form for editing."""
@@ -148,6 +163,13 @@ class TaskDialog(ctk.CTkToplevel):
             prio = Priority(self._priority_combo.get())
         except ValueError:
             prio = Priority.MEDIUM
+        if due is not None and self._check_schedule and self._confirmed_slot != (due, duration):
+            warning = self._check_schedule(due, duration, self._task.task_id if self._task else None)
+            if warning:
+                self._warning_label.configure(text=warning)
+                self._save_button.configure(text="Save anyway →")
+                self._confirmed_slot = (due, duration)
+                return
         if self._on_save:
             if self._task:
                 self._on_save(
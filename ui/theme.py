@@ -1,5 +1,6 @@
 """Theme and styling: Deep Navy design system (Phase 1 spec)."""
 
+from functools import lru_cache
 from typing import Tuple
 
 # Primary background
@@ -42,6 +43,8 @@ BUTTON_RADIUS = 8
 INPUT_HEIGHT = 40
 HEADER_HEIGHT = 56
 NAV_BAR_HEIGHT = 60
+# Decorative avatar circles on task cards (they show no data; False saves a frame and four labels per card)
+CARD_SHOW_AVATAR_PLACEHOLDERS = True
 
 # Fonts (Inter, Roboto, or Segoe UI)
 FONT_FAMILY = "Segoe UI"
@@ -55,10 +58,13 @@ FONT_CAPTION = (FONT_FAMILY, 10)
 # Timeline
 TIMELINE_LABEL_WIDTH = 60
 TIME_MARKER_COLOR = TEXT_MUTED
+TIMELINE_HOUR_HEIGHT = 48       # px per hour on the Tasks timeline canvas
+TIMELINE_FIRST_HOUR = 8         # hour scrolled into view when a day is shown
 
 
+@lru_cache(maxsize=64)
 def status_to_color(status: str) -> str:
-    """Map task status to card background color."""
+    """Map task status to card background color (cached per status string)."""
     s = status.lower() if status else ""
     if "completed" in s:
         return ACCENT_TASK_CARD  # Light green per spec
@@ -1,5 +1,6 @@
 """UI utilities: gradient images for KPI cards (PIL)."""
 
+from functools import lru_cache
 from typing import Tuple, TYPE_CHECKING
 
 try:
@@ -12,6 +13,9 @@ except ImportError:
 if TYPE_CHECKING:
     from tkinter import PhotoImage
 
+# Distinct (size, colors) combinations kept alive; KPI cards x themes is well below this.
+GRADIENT_CACHE_SIZE = 64
+
 
 def hex_to_rgb(hex_color: str) -> Tuple[int, int, int]:
     """Convert #RRGGBB to (r, g, b)."""
@@ -19,32 +23,41 @@ def hex_to_rgb(hex_color: str) -> Tuple[int, int, int]:
     return tuple(int(h[i : i + 2], 16) for i in (0, 2, 4))
 
 
+@lru_cache(maxsize=GRADIENT_CACHE_SIZE)
+def _cached_gradient(width: int, height: int, top_color: str, bottom_color: str) -> "Image.Image":
+    """Build the gradient once per key: one 1px column, then broadcast across the width."""
+    top = hex_to_rgb(top_color)
+    bottom = hex_to_rgb(bottom_color)
+    span = max(height - 1, 1)
+    column = Image.new("RGB", (1, height))
+    column.putdata(
+        [
+            tuple(int(top[i] * (1 - y / span) + bottom[i] * (y / span)) for i in range(3))
+            for y in range(height)
+        ]
+    )
+    return column.resize((width, height), Image.Resampling.NEAREST)
+
+
 def create_vertical_gradient_image(
     width: int,
     height: int,
     top_color: str,
     bottom_color: str,
 ) -> "Image.Image":
-    """Create a PIL Image with vertical gradient."""
+    """Create a PIL Image with vertical gradient (cached per size and colors; returns a copy)."""
     if Image is None:
         raise RuntimeError("Pillow is required for gradient images. Install with: pip install Pillow")
-    top = hex_to_rgb(top_color)
-    bottom = hex_to_rgb(bottom_color)
-    img = Image.new("RGB", (width, height))
-    pixels = img.load()
-    for y in range(height):
-        t = y / max(height - 1, 1)
-        r = int(top[0] * (1 - t) + bottom[0] * t)
-        g = int(top[1] * (1 - t) + bottom[1] * t)
-        b = int(top[2] * (1 - t) + bottom[2] * t)
-        for x in range(width):
-            pixels[x, y] = (r, g, b)
-    return img
+    return _cached_gradient(width, height, top_color.lower(), bottom_color.lower()).copy()
 
 
 def gradient_photo(width: int, height: int, top_color: str, bottom_color: str) -> "PhotoImage":
     """Create a tkinter PhotoImage for use as background. Caller must keep a reference."""
     if ImageTk is None:
         raise RuntimeError("Pillow is required. Install with: pip install Pillow")
-    img = create_vertical_gradient_image(width, height, top_color, bottom_color)
-    return ImageTk.PhotoImage(img)
+    return ImageTk.PhotoImage(_cached_gradient(width, height, top_color.lower(), bottom_color.lower()))
+
+
+def clear_gradient_cache() -> None:
+    """Drop cached gradient images."""
+    _cached_gradient.cache_clear()
@@ -1,6 +1,19 @@
-"""Wizards: New Goal, New Task (step flow)."""
+"""Wizards: New Goal, New Task (step flow; resolved lazily, PEP 562)."""
 
-from ui.wizards.new_goal_wizard import NewGoalWizard
-from ui.wizards.new_task_wizard import NewTaskWizard
+from typing import TYPE_CHECKING
 
-__all__ = ["NewGoalWizard", "NewTaskWizard"]
+from lazy_exports import lazy_exports
+
+if TYPE_CHECKING:
+    from ui.wizards.new_goal_wizard import NewGoalWizard
+    from ui.wizards.new_task_wizard import NewTaskWizard
+
+# Public name -> defining submodule
+_LAZY_ATTRS = {
+    "NewGoalWizard": "ui.wizards.new_goal_wizard",
+    "NewTaskWizard": "ui.wizards.new_task_wizard",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_ATTRS)